@@ -0,0 +1,6 @@
+"""`python -m nemo` - the Nemo control client (see nemo.cli.client)"""
+import sys
+
+from nemo.cli.client import main
+
+sys.exit(main())
@@ -0,0 +1 @@
+"""Nemo Bench - Deterministic benchmarks for the hotkey pipeline"""
@@ -0,0 +1,225 @@
+"""
+Benchmark fakes - Deterministic stand-ins for OS-facing backends
+
+- VirtualClock: wall clock driven by the replayed trace
+- FakeKeyboard: drop-in for the `keyboard` module (on_press/on_release/unhook_all)
+- FakeImageGrab: returns a fixed synthetic desktop frame
+- FakeMicrophone: returns fixed PCM blocks (also feeds the shared AudioBroker)
+
+install_fakes() must run before nemo.core / nemo.tools are imported when the
+real packages are missing, and patches the already-imported modules otherwise.
+"""
+
+from typing import Callable, List, Optional, Tuple
+import random
+import sys
+import types
+
+
+class VirtualClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self, start: float = 1_760_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def set(self, timestamp: float) -> None:
+        self.now = timestamp
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeKeyEvent:
+    """Mimics keyboard.KeyboardEvent"""
+
+    __slots__ = ('name', 'event_type', 'time', 'scan_code')
+
+    def __init__(self, name: str, event_type: str, time: float):
+        self.name = name
+        self.event_type = event_type
+        self.time = time
+        self.scan_code = 0
+
+
+class FakeKeyboard(types.ModuleType):
+    """Replacement for the `keyboard` package driven by emit()"""
+
+    def __init__(self):
+        super().__init__('keyboard')
+        self.press_handlers: List[Callable] = []
+        self.release_handlers: List[Callable] = []
+        self.written: List[str] = []
+
+    def on_press(self, callback: Callable) -> Callable:
+        self.press_handlers.append(callback)
+        return callback
+
+    def on_release(self, callback: Callable) -> Callable:
+        self.release_handlers.append(callback)
+        return callback
+
+    def unhook_all(self) -> None:
+        self.press_handlers.clear()
+        self.release_handlers.clear()
+
+    def write(self, text: str, interval: float = 0) -> None:
+        self.written.append(text)
+
+    def emit(self, name: str, event_type: str, timestamp: float) -> None:
+        """Deliver one event to the hooked callbacks"""
+        event = FakeKeyEvent(name, event_type, timestamp)
+        handlers = self.press_handlers if event_type == 'down' else self.release_handlers
+        for handler in handlers:
+            handler(event)
+
+
+class _FakeImage:
+    """Minimal PIL.Image stand-in when Pillow is not installed"""
+
+    def __init__(self, size: Tuple[int, int], payload: bytes):
+        self.size = size
+        self.payload = payload
+
+    def save(self, fp, format: str = 'PNG', **params) -> None:
+        fp.write(self.payload)
+
+    def crop(self, box):
+        return self
+
+    def resize(self, size, *args, **kwargs):
+        return _FakeImage(size, self.payload[: max(1, len(self.payload) // 16)])
+
+
+class FakeImageGrab(types.ModuleType):
+    """Replacement for PIL.ImageGrab returning a fixed synthetic desktop"""
+
+    def __init__(self, size: Tuple[int, int] = (1920, 1080), seed: int = 0, frame=None):
+        super().__init__('PIL.ImageGrab')
+        self.frame = frame if frame is not None else make_desktop_frame(size, seed)
+        self.size = getattr(self.frame, 'size', size)
+        self.grabs = 0
+
+    def grab(self, bbox=None, include_layered_windows=False, all_screens=False, **kwargs):
+        self.grabs += 1
+        if bbox is not None and hasattr(self.frame, 'crop'):
+            return self.frame.crop(bbox)
+        return self.frame
+
+
+def make_desktop_frame(size: Tuple[int, int], seed: int = 0):
+    """Synthetic desktop: flat panels, title bars and text-like noise"""
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        rng = random.Random(seed)
+        return _FakeImage(size, bytes(rng.randrange(256) for _ in range(64 * 1024)))
+
+    rng = random.Random(seed)
+    width, height = size
+    image = Image.new('RGB', size, (236, 239, 244))
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        x0, y0 = rng.randrange(0, width - 400), rng.randrange(0, height - 300)
+        x1, y1 = x0 + rng.randrange(300, 900), y0 + rng.randrange(200, 600)
+        draw.rectangle([x0, y0, x1, y1], fill=(255, 255, 255), outline=(180, 180, 190))
+        draw.rectangle([x0, y0, x1, y0 + 28], fill=(60, 90, 160))
+        for row in range(y0 + 40, min(y1, height) - 10, 18):
+            x = x0 + 10
+            while x < min(x1, width) - 20:
+                word = rng.randrange(12, 60)
+                draw.rectangle([x, row, x + word, row + 9], fill=(40, 40, 40))
+                x += word + 8
+    return image
+
+
+class FakeMicrophone:
+    """Deterministic PCM source (16 kHz, 16-bit mono)"""
+
+    def __init__(self, sample_rate: int = 16000, block_ms: int = 20, seed: int = 0):
+        self.sample_rate = sample_rate
+        self.sample_width = 2
+        rng = random.Random(seed)
+        samples = block_ms * sample_rate // 1000
+        self.block = b''.join(
+            int(rng.gauss(0, 800)).to_bytes(2, 'little', signed=True) for _ in range(samples)
+        )
+        self.block_seconds = block_ms / 1000.0
+        self.reads = 0
+
+    def read(self, seconds: float) -> bytes:
+        """PCM for a recording of the given length"""
+        self.reads += 1
+        blocks = max(1, int(seconds / self.block_seconds))
+        return self.block * blocks
+
+    def source(self):
+        """AudioBroker source emitting this microphone's block in real time"""
+        from nemo.tools.audio_capture.broker import AudioSource
+        import time
+
+        microphone = self
+
+        class FakeAudioSource(AudioSource):
+            sample_rate = microphone.sample_rate
+            block_frames = len(microphone.block) // 2
+
+            def open(self):
+                self.next_due = time.perf_counter()
+
+            def read(self):
+                self.next_due += self.block_seconds
+                delay = self.next_due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                return microphone.block
+
+        return FakeAudioSource()
+
+
+class Fakes:
+    """Handles to the installed fakes"""
+
+    def __init__(self, clock: VirtualClock, keyboard: FakeKeyboard,
+                 image_grab: FakeImageGrab, microphone: FakeMicrophone):
+        self.clock = clock
+        self.keyboard = keyboard
+        self.image_grab = image_grab
+        self.microphone = microphone
+
+
+def install_fakes(screen_size: Tuple[int, int] = (1920, 1080),
+                  clock: Optional[VirtualClock] = None) -> Fakes:
+    """
+    Swap OS-facing backends for fakes
+
+    Registers the fakes in sys.modules (so imports succeed without the real
+    packages) and rebinds them in already-imported Nemo modules.
+    """
+    fakes = Fakes(clock or VirtualClock(), FakeKeyboard(),
+                  FakeImageGrab(screen_size), FakeMicrophone())
+
+    sys.modules['keyboard'] = fakes.keyboard
+    try:
+        import PIL  # noqa: F401
+        sys.modules['PIL.ImageGrab'] = fakes.image_grab
+        PIL.ImageGrab = fakes.image_grab
+    except ImportError:
+        pil = types.ModuleType('PIL')
+        pil.ImageGrab = fakes.image_grab
+        sys.modules['PIL'] = pil
+        sys.modules['PIL.ImageGrab'] = fakes.image_grab
+
+    listener_module = sys.modules.get('nemo.core.keyboard_listener')
+    if listener_module is not None:
+        listener_module.keyboard = fakes.keyboard
+    capture_module = sys.modules.get('nemo.tools.screen_capture.capture')
+    if capture_module is not None:
+        capture_module.ImageGrab = fakes.image_grab
+
+    # Shared microphone stream fed by the fake microphone
+    from nemo.tools.audio_capture import AudioBroker, set_broker
+    set_broker(AudioBroker(source_factory=fakes.microphone.source))
+    return fakes
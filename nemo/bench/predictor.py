@@ -0,0 +1,179 @@
+"""
+Predictor benchmark - Accuracy and throughput of the Forward key model
+
+Generates synthetic typing corpora (Zipf-distributed prose, code-like text,
+repeated shell commands), streams them through KeystrokePredictor online
+(predict, then learn) and reports top-1 accuracy, precision/coverage at the
+confidence threshold, update/predict latency and save/load cost.
+
+Usage:
+    python -m nemo.bench.predictor
+    python -m nemo.bench.predictor --corpus code --keys 200000 --order 5 --json
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from nemo.keys.right_alt_right_forward.predictor import KeystrokePredictor
+
+LETTERS = 'etaoinshrdlucmfwypvbgkjqxz'
+
+
+def _keys(text: str) -> List[str]:
+    """Text → key names as the keyboard hook reports them"""
+    names = {' ': 'space', '\n': 'enter', '\t': 'tab', '.': '.', '(': '(', ')': ')'}
+    return [names.get(c, c) for c in text]
+
+
+def _zipf_choice(rng: random.Random, items: List[str], s: float = 1.1) -> str:
+    weights = [1.0 / (rank + 1) ** s for rank in range(len(items))]
+    return rng.choices(items, weights)[0]
+
+
+def prose(length: int, seed: int = 0) -> List[str]:
+    """Words from a fixed Zipf-weighted vocabulary"""
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choice(LETTERS[:18]) for _ in range(rng.randrange(2, 9)))
+                  for _ in range(2000)]
+    weights = [1.0 / (rank + 1) ** 1.1 for rank in range(len(vocabulary))]
+    keys: List[str] = []
+    while len(keys) < length:
+        for word in rng.choices(vocabulary, weights, k=64):
+            keys.extend(word)
+            keys.append('space')
+    return keys[:length]
+
+
+def code(length: int, seed: int = 1) -> List[str]:
+    """Code-like lines built from recurring identifiers and keywords"""
+    rng = random.Random(seed)
+    identifiers = [''.join(rng.choice(LETTERS) for _ in range(rng.randrange(3, 12)))
+                   for _ in range(300)]
+    templates = ['self.{a} = {b}\n', 'def {a}(self, {b}):\n', 'return self.{a}({b})\n',
+                 'if {a} is None:\n', 'for {a} in {b}:\n', '{a}.append({b})\n']
+    keys: List[str] = []
+    while len(keys) < length:
+        line = _zipf_choice(rng, templates, 0.8).format(a=_zipf_choice(rng, identifiers),
+                                                        b=_zipf_choice(rng, identifiers))
+        keys.extend(['tab'] * rng.randrange(0, 3))
+        keys.extend(_keys(line))
+    return keys[:length]
+
+
+def commands(length: int, seed: int = 2) -> List[str]:
+    """A small set of shell commands typed over and over"""
+    rng = random.Random(seed)
+    history = ['git status\n', 'git diff\n', 'git add -a\n', 'ls -la\n', 'cd ..\n',
+               'python -m pytest -q\n', 'make test\n', 'git commit -m wip\n']
+    keys: List[str] = []
+    while len(keys) < length:
+        keys.extend(_keys(_zipf_choice(rng, history, 1.2)))
+    return keys[:length]
+
+
+CORPORA = {
+    'prose': prose,
+    'code': code,
+    'commands': commands,
+}
+
+
+def run_corpus(name: str, keys: List[str], max_order: int = 4, table_bits: int = 14,
+               threshold: float = 0.7) -> Dict:
+    """
+    Online evaluation: for every keystroke predict, then learn
+
+    Returns:
+        accuracy (top-1 over all keys), precision/coverage at threshold,
+        update_us / predict_us (mean), file_bytes, save_ms, load_ms
+    """
+    predictor = KeystrokePredictor(max_order=max_order, table_bits=table_bits)
+    correct = confident = confident_correct = 0
+    predict_ns = update_ns = 0
+    clock = time.perf_counter_ns
+
+    for key in keys:
+        t0 = clock()
+        prediction = predictor.predict(threshold)
+        t1 = clock()
+        predictor.update(key)
+        t2 = clock()
+        predict_ns += t1 - t0
+        update_ns += t2 - t1
+
+        if prediction is not None:
+            hit = prediction[0] == key
+            correct += hit
+            if prediction[1] >= threshold:
+                confident += 1
+                confident_correct += hit
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.bin')
+        t0 = clock()
+        predictor.save(path)
+        t1 = clock()
+        loaded = KeystrokePredictor.load(path)
+        t2 = clock()
+        file_bytes = os.path.getsize(path)
+    assert loaded.get_status()['vocabulary'] == predictor.get_status()['vocabulary']
+
+    n = max(len(keys), 1)
+    return {
+        'corpus': name,
+        'keys': len(keys),
+        'accuracy': correct / n,
+        'coverage': confident / n,
+        'precision': confident_correct / confident if confident else 0.0,
+        'update_us': update_ns / n / 1e3,
+        'predict_us': predict_ns / n / 1e3,
+        'table_bytes': predictor.memory_bytes(),
+        'file_bytes': file_bytes,
+        'save_ms': (t1 - t0) / 1e6,
+        'load_ms': (t2 - t1) / 1e6,
+    }
+
+
+def print_results(results: List[Dict], threshold: float) -> None:
+    """Print results as a table"""
+    print(f"{'corpus':<10}{'keys':>9}{'top-1':>8}{'cover':>8}{'prec':>8}"
+          f"{'upd µs':>9}{'pred µs':>9}{'file KiB':>10}{'save ms':>9}{'load ms':>9}")
+    for r in results:
+        print(f"{r['corpus']:<10}{r['keys']:>9}{r['accuracy']:>8.1%}{r['coverage']:>8.1%}"
+              f"{r['precision']:>8.1%}{r['update_us']:>9.2f}{r['predict_us']:>9.2f}"
+              f"{r['file_bytes'] / 1024:>10.0f}{r['save_ms']:>9.2f}{r['load_ms']:>9.2f}")
+    print(f"(cover/prec: predictions with confidence >= {threshold})")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Forward key predictor benchmark")
+    parser.add_argument('--corpus', action='append', choices=list(CORPORA),
+                        help="Corpus to run (repeatable, default all)")
+    parser.add_argument('--keys', type=int, default=100000, help="Keystrokes per corpus")
+    parser.add_argument('--order', type=int, default=4, help="Maximum context order")
+    parser.add_argument('--table-bits', type=int, default=14, help="log2 slots per order")
+    parser.add_argument('--threshold', type=float, default=0.7, help="Confidence threshold")
+    parser.add_argument('--json', action='store_true', help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    results = [
+        run_corpus(name, CORPORA[name](args.keys), max_order=args.order,
+                   table_bits=args.table_bits, threshold=args.threshold)
+        for name in args.corpus or list(CORPORA)
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results, args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Replay benchmark - Deterministic input replay through the hotkey pipeline
+
+Replays keyboard traces through KeyboardListener → NemoEngine → stub keys
+with fake keyboard, ImageGrab and microphone backends on a virtual clock,
+then reports events/sec, per-stage latency percentiles (from the metrics
+registry) and allocations (tracemalloc peak and retained bytes), and compares
+against a stored baseline: by default baseline.json next to this module,
+recorded on a developer machine. Regressions past the warning tolerance are
+reported; past the failure tolerance the run exits 1.
+
+Usage:
+    python -m nemo.bench.replay                      # all traces vs baseline.json
+    python -m nemo.bench.replay --trace chords --trace my_session.jsonl
+    python -m nemo.bench.replay --save-baseline      # refresh baseline.json
+    python -m nemo.bench.replay --baseline mine.json --tolerance 0.3
+"""
+
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from .fakes import Fakes, install_fakes
+from .traces import SYNTHETIC, Event, load_trace
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+STAGES = [
+    'listener_handler_seconds',
+    'key_press_seconds',
+    'key_release_seconds',
+    'screen_grab_seconds',
+    'screen_encode_seconds',
+]
+
+
+class ReplayPipeline:
+    """Listener, engine and stub keys wired to fake backends"""
+
+    def __init__(self, fakes: Fakes, screen_keys: bool = True):
+        """
+        Args:
+            fakes: Installed fakes (see install_fakes)
+            screen_keys: Give RIGHT ALT a screenshot-taking stub key
+        """
+        # Imported here so the fakes are in place first
+        from nemo.core.keyboard_listener import KeyboardListener
+        from nemo.tools import NemoEngine
+        from nemo.tools.metrics import get_registry
+        from .stubs import StubKey, StubScreenVoiceKey, StubVoiceKey
+
+        self.fakes = fakes
+        self.registry = get_registry()
+        self.engine = NemoEngine()
+        self.engine.register_key(StubVoiceKey('right shift', fakes.microphone))
+        if screen_keys:
+            self.engine.register_key(StubScreenVoiceKey('right alt', fakes.microphone))
+        else:
+            self.engine.register_key(StubVoiceKey('right alt', fakes.microphone))
+        for combo in ('right alt + left', 'right alt + right', 'right alt + up'):
+            self.engine.register_key(StubKey(combo))
+
+        self.listener = KeyboardListener(self.engine, clock=fakes.clock)
+        self.listener.start()
+
+    def replay(self, events: List[Event]) -> float:
+        """
+        Feed events through the pipeline
+
+        Returns:
+            Wall seconds spent
+        """
+        clock = self.fakes.clock
+        emit = self.fakes.keyboard.emit
+        started = time.perf_counter()
+        for t, name, event_type in events:
+            clock.set(t)
+            emit(name, event_type, t)
+        return time.perf_counter() - started
+
+    def close(self) -> None:
+        self.listener.stop()
+
+
+def run_trace(name: str, events: List[Event], fakes: Fakes, repeat: int = 3,
+              screen_keys: bool = True) -> Dict:
+    """
+    Benchmark one trace
+
+    Returns:
+        events, events_per_sec (best of repeat), stage latency percentiles (ms),
+        alloc_peak_bytes (transient high-water mark during one pass) and
+        retained_bytes_per_event / retained_blocks_per_event
+    """
+    pipeline = ReplayPipeline(fakes, screen_keys=screen_keys)
+    try:
+        pipeline.replay(events)  # warm-up
+        pipeline.registry.reset()
+
+        best = None
+        for _ in range(repeat):
+            elapsed = pipeline.replay(events)
+            best = elapsed if best is None else min(best, elapsed)
+
+        stages = {}
+        for histogram in pipeline.registry.iter_histograms():
+            if histogram.name in STAGES and histogram.count:
+                label = histogram.name.replace('_seconds', '')
+                key = dict(histogram.labels).get('key')
+                if key:
+                    label = f"{label}[{key}]"
+                stages[label] = {
+                    'count': histogram.count // repeat,
+                    'p50_ms': histogram.percentile(50) / 1e6,
+                    'p90_ms': histogram.percentile(90) / 1e6,
+                    'p99_ms': histogram.percentile(99) / 1e6,
+                    'max_ms': histogram.max / 1e6,
+                }
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        pipeline.replay(events)
+        peak_bytes = tracemalloc.get_traced_memory()[1] - start_bytes
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        diff = after.compare_to(before, 'filename')
+        retained_bytes = sum(max(d.size_diff, 0) for d in diff)
+        retained_blocks = sum(max(d.count_diff, 0) for d in diff)
+    finally:
+        pipeline.close()
+
+    return {
+        'trace': name,
+        'events': len(events),
+        'events_per_sec': len(events) / best if best else 0.0,
+        'stages': stages,
+        'alloc_peak_bytes': peak_bytes,
+        'retained_bytes_per_event': retained_bytes / max(len(events), 1),
+        'retained_blocks_per_event': retained_blocks / max(len(events), 1),
+    }
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float = 0.5,
+            warn_tolerance: float = 0.15, min_delta_ms: float = 0.5,
+            min_delta_bytes: float = 16.0) -> Tuple[List[str], List[str]]:
+    """
+    Compare results with a baseline
+
+    A regression is events/sec dropping, or a stage p99 or retained
+    bytes/event rising, by more than warn_tolerance (fractional); past
+    tolerance it is a failure. Run-to-run noise on one machine reaches ~30%,
+    and p99s within min_delta_ms (retained bytes within min_delta_bytes) of
+    the baseline are never regressions.
+
+    Returns:
+        (failures, warnings) as human-readable descriptions
+    """
+    failures, warnings = [], []
+
+    def check(worse: float, line: str) -> None:
+        if worse > tolerance:
+            failures.append(f"{line} ({worse:+.0%})")
+        elif worse > warn_tolerance:
+            warnings.append(f"{line} ({worse:+.0%})")
+
+    for result in results:
+        base = baseline.get('traces', {}).get(result['trace'])
+        if base is None:
+            continue
+        trace = result['trace']
+        if result['events_per_sec'] and base['events_per_sec']:
+            check(base['events_per_sec'] / result['events_per_sec'] - 1,
+                  f"{trace}: events/sec {result['events_per_sec']:.0f} "
+                  f"< baseline {base['events_per_sec']:.0f}")
+        for stage, stats in result['stages'].items():
+            base_stage = base['stages'].get(stage)
+            if base_stage and stats['p99_ms'] - base_stage['p99_ms'] > min_delta_ms:
+                check(stats['p99_ms'] / base_stage['p99_ms'] - 1,
+                      f"{trace}: {stage} p99 {stats['p99_ms']:.3f}ms "
+                      f"> baseline {base_stage['p99_ms']:.3f}ms")
+        retained, base_retained = (result['retained_bytes_per_event'],
+                                   base.get('retained_bytes_per_event'))
+        if base_retained is not None and retained - base_retained > min_delta_bytes:
+            check(retained / max(base_retained, 1.0) - 1,
+                  f"{trace}: retained {retained:.1f} B/event "
+                  f"> baseline {base_retained:.1f} B/event")
+    return failures, warnings
+
+
+def print_results(results: List[Dict]) -> None:
+    """Print results as tables"""
+    for r in results:
+        print(f"\n[{r['trace']}] {r['events']} events, {r['events_per_sec']:,.0f} events/sec, "
+              f"peak alloc {r['alloc_peak_bytes'] / 1024:.1f} KiB, "
+              f"retained {r['retained_bytes_per_event']:.1f} B/event")
+        print(f"  {'stage':<42}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for stage, s in sorted(r['stages'].items()):
+            print(f"  {stage:<42}{s['count']:>7}{s['p50_ms']:>10.4f}{s['p90_ms']:>10.4f}"
+                  f"{s['p99_ms']:>10.4f}{s['max_ms']:>10.4f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Replay benchmark for the hotkey pipeline")
+    parser.add_argument('--trace', action='append',
+                        help=f"Synthetic trace ({', '.join(SYNTHETIC)}) or JSONL file (repeatable)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes per trace")
+    parser.add_argument('--no-screen', action='store_true',
+                        help="Skip screenshot work in the RIGHT ALT stub")
+    parser.add_argument('--baseline', default=BASELINE,
+                        help="Compare against this baseline JSON (default: the committed one)")
+    parser.add_argument('--no-baseline', action='store_true', help="Skip the comparison")
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE,
+                        help="Write results as a new baseline (default: the committed one)")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="Regression fraction that fails the run (default 0.5)")
+    parser.add_argument('--warn-tolerance', type=float, default=0.15,
+                        help="Regression fraction that is reported (default 0.15)")
+    parser.add_argument('--json', action='store_true', help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    fakes = install_fakes()
+    results = []
+    for name in args.trace or list(SYNTHETIC):
+        events = SYNTHETIC[name]() if name in SYNTHETIC else load_trace(name)
+        label = name if name in SYNTHETIC else os.path.basename(name)
+        results.append(run_trace(label, events, fakes, repeat=args.repeat,
+                                 screen_keys=not args.no_screen))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'created': time.time(), 'python': sys.version.split()[0],
+                       'platform': platform.platform(), 'processor': platform.processor(),
+                       'traces': {r['trace']: r for r in results}}, f, indent=2)
+            f.write('\n')
+        print(f"\n[BENCH] Baseline written to {args.save_baseline}")
+    elif not args.no_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"\n[BENCH] No baseline at {args.baseline}; run with --save-baseline")
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('platform') != platform.platform():
+            print(f"\n[BENCH] Baseline recorded on {baseline.get('platform', 'unknown')}: "
+                  "absolute numbers differ between machines")
+        failures, warnings = compare(results, baseline, args.tolerance, args.warn_tolerance)
+        if warnings:
+            print(f"\n[BENCH] Slower than baseline (> {args.warn_tolerance:.0%}):")
+            for line in warnings:
+                print(f"  - {line}")
+        if failures:
+            print(f"\n[BENCH] REGRESSIONS (> {args.tolerance:.0%}):")
+            for line in failures:
+                print(f"  - {line}")
+            return 1
+        print(f"\n[BENCH] No regressions past {args.tolerance:.0%} against "
+              f"{os.path.basename(args.baseline)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Runtime benchmark - Sync dispatch vs AsyncRuntime
+
+Measures, for NemoEngine without and with an AsyncRuntime:
+- Idle CPU of the app's main wait (the old 100 ms sleep poll vs blocking
+  on the event loop)
+- Hook-thread time per press/release when the key's on_release takes
+  --delay seconds (the hook is blocked for all of it in sync mode)
+- Keypress-to-answer for a second press made 50 ms into the first query:
+  sync waits for the stale answer first, async supersedes it
+
+Usage:
+    python -m nemo.bench.runtime
+    python -m nemo.bench.runtime --delay 1.0 --idle 3 --json
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import threading
+import time
+
+from nemo.tools import AsyncRuntime, NemoEngine, NemoKey
+
+
+class QueryKey(NemoKey):
+    """Stand-in for a network-bound key (staged like GeminiVoiceKey)"""
+
+    def __init__(self, delay: float):
+        super().__init__(key_name="Query", key_combo="right alt",
+                         description="Slow query benchmark key")
+        self.delay = delay
+        self.answers = 0
+
+    def on_press(self) -> None:
+        pass
+
+    def on_hold(self, duration: float) -> None:
+        pass
+
+    def on_release(self, total_duration: float) -> float:
+        time.sleep(self.delay)
+        self.answers += 1
+        return total_duration
+
+    async def on_release_async(self, total_duration: float) -> float:
+        await asyncio.to_thread(time.sleep, self.delay)
+        self.answers += 1
+        return total_duration
+
+
+def _cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def idle_cpu(seconds: float, use_loop: bool) -> float:
+    """CPU seconds used by the main wait over `seconds`"""
+    if use_loop:
+        runtime = AsyncRuntime()
+        thread = threading.Thread(target=runtime.run)
+        thread.start()
+        start = _cpu()
+        time.sleep(seconds)
+        used = _cpu() - start
+        runtime.stop()
+        thread.join()
+        return used
+    running = [True]
+    timer = threading.Timer(seconds, lambda: running.__setitem__(0, False))
+    start = _cpu()
+    timer.start()
+    while running[0]:
+        time.sleep(0.1)
+    return _cpu() - start
+
+
+def run(use_runtime: bool, delay: float, idle: float) -> Dict:
+    """Dispatch and supersede timings for one mode"""
+    runtime = AsyncRuntime() if use_runtime else None
+    engine = NemoEngine(runtime=runtime)
+    key = QueryKey(delay)
+    engine.register_key(key)
+    if runtime:
+        runtime.start()
+
+    # Hook-thread time per press + release
+    hook: List[float] = []
+    for _ in range(5):
+        start = time.perf_counter()
+        engine.on_key_press('right alt')
+        result = engine.on_key_release('right alt', 0.5)
+        hook.append(time.perf_counter() - start)
+        if runtime:
+            result.result()
+
+    # Ask, then ask again 50 ms later: time from the second keypress to
+    # its answer (in sync mode the hook only sees that press once the
+    # first release returns)
+    engine.on_key_press('right alt')
+    start = time.perf_counter() + 0.05
+    first = engine.on_key_release('right alt', 0.5)
+    time.sleep(max(0.0, start - time.perf_counter()))
+    engine.on_key_press('right alt')
+    second = engine.on_key_release('right alt', 0.6)
+    if runtime:
+        second.result()
+    answer = time.perf_counter() - start
+    stale = 0 if runtime and first.cancelled() else 1
+
+    engine.shutdown()
+    ms = 1000.0
+    return {
+        'mode': 'async' if runtime else 'sync',
+        'idle_cpu_ms_per_s': idle_cpu(idle, use_runtime) / idle * ms,
+        'hook_blocked_ms': sum(hook) / len(hook) * ms,
+        'second_answer_ms': answer * ms,
+        'stale_answers': stale,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Sync vs AsyncRuntime benchmark")
+    parser.add_argument('--delay', type=float, default=0.5, help="on_release duration (s)")
+    parser.add_argument('--idle', type=float, default=2.0, help="Idle measurement (s)")
+    parser.add_argument('--json', action='store_true', help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    results = [run(False, args.delay, args.idle), run(True, args.delay, args.idle)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'':<20}" + ''.join(f"{r['mode']:>12}" for r in results))
+    for name in results[0]:
+        if name != 'mode':
+            print(f"{name:<20}" + ''.join(f"{r[name]:>12,.3f}" for r in results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
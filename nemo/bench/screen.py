@@ -0,0 +1,123 @@
+"""
+Screen capture benchmark - Payload size and encode time by capture region
+
+Builds a synthetic multi-monitor desktop (default: three 4K monitors side by
+side), focuses a window on the middle screen and captures it with
+ScreenCapture in each mode:
+
+- full:             whole virtual desktop (previous behaviour)
+- monitor:          the focused window's monitor
+- window:           the focused window only
+- window+overview:  the window plus a low-res JPEG of the other screens
+
+and reports bytes uploaded and grab/encode time per capture, relative to
+full-desktop capture.
+
+Usage:
+    python -m nemo.bench.screen
+    python -m nemo.bench.screen --monitors 2 --resolution 2560x1440 --profile fast
+    python -m nemo.bench.screen --window 0.5 --json
+"""
+
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import sys
+import time
+
+from PIL import Image
+
+from nemo.bench.fakes import FakeImageGrab, make_desktop_frame
+from nemo.tools.screen_capture import FixedLayout, ScreenCapture, Window
+import nemo.tools.screen_capture.capture as capture_module
+
+MODES = [
+    ('full', 'full', False),
+    ('monitor', 'monitor', False),
+    ('window', 'window', False),
+    ('window+overview', 'window', True),
+]
+
+
+def synthetic_desktop(monitors: int, size: Tuple[int, int], window_fraction: float,
+                      seed: int = 0) -> Tuple[Image.Image, FixedLayout]:
+    """Side-by-side monitors with a focused window centred on the middle one"""
+    width, height = size
+    desktop = Image.new('RGB', (width * monitors, height))
+    rects = []
+    for index in range(monitors):
+        desktop.paste(make_desktop_frame(size, seed + index), (index * width, 0))
+        rects.append((index * width, 0, (index + 1) * width, height))
+
+    focus = rects[monitors // 2]
+    w, h = int(width * window_fraction), int(height * window_fraction)
+    left, top = focus[0] + (width - w) // 2, (height - h) // 2
+    window = Window('Editor', (left, top, left + w, top + h))
+    return desktop, FixedLayout(rects, window)
+
+
+def run(monitors: int = 3, size: Tuple[int, int] = (3840, 2160), window_fraction: float = 1.0,
+        profile: str = 'balanced', overview_max_side: int = 1024, repeat: int = 3,
+        seed: int = 0) -> List[Dict]:
+    """Capture the synthetic desktop in every mode; best-of-repeat timings"""
+    desktop, layout = synthetic_desktop(monitors, size, window_fraction, seed)
+    grab = FakeImageGrab(frame=desktop)
+    original, capture_module.ImageGrab = capture_module.ImageGrab, grab
+
+    results = []
+    try:
+        for label, region, overview in MODES:
+            screen = ScreenCapture(encode_profile=profile, region=region, overview=overview,
+                                   overview_max_side=overview_max_side, layout=layout)
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                views = screen.capture_views()
+                best = min(best, time.perf_counter() - start)
+            results.append({
+                'mode': label,
+                'bytes': sum(len(view['data']) for view in views),
+                'pixels': sum(view['size'][0] * view['size'][1] for view in views),
+                'seconds': best,
+                'images': [f"{view['name']} {view['size'][0]}x{view['size'][1]}" for view in views],
+            })
+    finally:
+        capture_module.ImageGrab = original
+
+    baseline = results[0]
+    for result in results:
+        result['bytes_vs_full'] = result['bytes'] / baseline['bytes']
+        result['time_vs_full'] = result['seconds'] / baseline['seconds']
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Screen capture region benchmark")
+    parser.add_argument('--monitors', type=int, default=3)
+    parser.add_argument('--resolution', default='3840x2160', help="Per-monitor WxH")
+    parser.add_argument('--window', type=float, default=1.0,
+                        help="Focused window size as a fraction of its monitor")
+    parser.add_argument('--profile', default='balanced', help="PNG encode profile")
+    parser.add_argument('--overview-max-side', type=int, default=1024)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    width, height = (int(part) for part in args.resolution.lower().split('x'))
+    results = run(args.monitors, (width, height), args.window, args.profile,
+                  args.overview_max_side, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'mode':<18}{'bytes':>14}{'vs full':>9}{'ms':>10}{'vs full':>9}  images")
+    for result in results:
+        print(f"{result['mode']:<18}{result['bytes']:>14,}{result['bytes_vs_full']:>9.1%}"
+              f"{result['seconds'] * 1000:>10.1f}{result['time_vs_full']:>9.1%}  "
+              + ', '.join(result['images']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Benchmark stub keys - NemoKeys with realistic but offline work
+
+Import only after install_fakes(): they use ScreenCapture (fake ImageGrab)
+and a FakeMicrophone instead of network STT/Gemini.
+"""
+
+from typing import Optional
+
+from nemo.tools import NemoKey, AudioCapture, ScreenCapture
+
+from .fakes import FakeMicrophone
+
+
+class StubKey(NemoKey):
+    """No-op key: measures pure dispatch overhead"""
+
+    def __init__(self, key_combo: str):
+        super().__init__(key_name=f"Stub {key_combo}", key_combo=key_combo,
+                         description="Benchmark stub")
+        self.presses = 0
+        self.releases = 0
+
+    def on_press(self) -> None:
+        self.presses += 1
+
+    def on_hold(self, duration: float) -> None:
+        pass
+
+    def on_release(self, total_duration: float) -> Optional[int]:
+        self.releases += 1
+        return self.releases
+
+
+class StubVoiceKey(StubKey):
+    """Push-to-talk: records on press, reads fake PCM on release"""
+
+    def __init__(self, key_combo: str, microphone: FakeMicrophone):
+        super().__init__(key_combo)
+        self.audio = AudioCapture(energy_threshold=300, timeout=5)
+        self.microphone = microphone
+        self.last_pcm_bytes = 0
+
+    def on_press(self) -> None:
+        super().on_press()
+        self.audio.start_recording()
+
+    def on_release(self, total_duration: float) -> Optional[int]:
+        self.audio.stop_recording()
+        pcm = self.microphone.read(min(total_duration, self.audio.timeout))
+        self.last_pcm_bytes = len(pcm)
+        return super().on_release(total_duration)
+
+
+class StubScreenVoiceKey(StubVoiceKey):
+    """
+    Gemini-like: screenshot + audio on release
+
+    The listener only dispatches solo RIGHT ALT on release (a press may still
+    turn into a combo), so the screenshot is taken there.
+    """
+
+    def __init__(self, key_combo: str, microphone: FakeMicrophone):
+        super().__init__(key_combo, microphone)
+        self.screen = ScreenCapture(encode_profile='fast')
+        self.last_png_bytes = 0
+
+    def on_release(self, total_duration: float) -> Optional[int]:
+        png = self.screen.capture()
+        self.last_png_bytes = len(png) if png else 0
+        return super().on_release(total_duration)
@@ -0,0 +1,114 @@
+"""
+Benchmark traces - Synthetic and recorded keyboard event streams
+
+A trace is a list of (timestamp, key name, 'down'|'up') tuples, sorted by
+time. Stored traces are JSON lines so recordings from real sessions can be
+replayed (`keyboard.record()` events convert with from_keyboard_events()).
+"""
+
+from typing import Iterable, List, Tuple
+import json
+import random
+
+Event = Tuple[float, str, str]
+
+LETTERS = 'etaoinshrdlucmfwypvbgkjqxz'
+COMBO_KEYS = ['left', 'right', 'up']
+
+
+def typing_burst(words: int = 400, wpm: float = 90, seed: int = 0,
+                 start: float = 0.0) -> List[Event]:
+    """Ordinary typing (no hotkeys): stresses the listener's filtering path"""
+    rng = random.Random(seed)
+    t = start
+    events: List[Event] = []
+    per_char = 60.0 / (wpm * 5)
+    for _ in range(words):
+        for _ in range(rng.randrange(2, 9)):
+            key = LETTERS[min(int(rng.expovariate(0.25)), len(LETTERS) - 1)]
+            events.append((t, key, 'down'))
+            events.append((t + per_char * 0.4, key, 'up'))
+            t += rng.uniform(0.5, 1.5) * per_char
+        events.append((t, 'space', 'down'))
+        events.append((t + per_char * 0.3, 'space', 'up'))
+        t += per_char
+    return events
+
+
+def chords(count: int = 300, seed: int = 1, start: float = 0.0) -> List[Event]:
+    """RIGHT ALT + LEFT/RIGHT/UP combos and solo RIGHT ALT taps"""
+    rng = random.Random(seed)
+    t = start
+    events: List[Event] = []
+    for _ in range(count):
+        events.append((t, 'right alt', 'down'))
+        if rng.random() < 0.8:
+            combo = rng.choice(COMBO_KEYS)
+            events.append((t + 0.05, combo, 'down'))
+            events.append((t + 0.15, combo, 'up'))
+        hold = rng.uniform(0.2, 0.6)
+        events.append((t + hold, 'right alt', 'up'))
+        t += hold + rng.uniform(0.2, 1.0)
+    return events
+
+
+def long_holds(count: int = 60, seed: int = 2, start: float = 0.0) -> List[Event]:
+    """Push-to-talk holds of RIGHT SHIFT / RIGHT ALT, with typing noise mid-hold"""
+    rng = random.Random(seed)
+    t = start
+    events: List[Event] = []
+    for _ in range(count):
+        key = rng.choice(['right shift', 'right alt'])
+        hold = rng.uniform(1.0, 6.0)
+        events.append((t, key, 'down'))
+        # Keyboard auto-repeat delivers repeated 'down' events while held
+        repeat = t + 0.5
+        while repeat < t + hold:
+            events.append((repeat, key, 'down'))
+            repeat += 0.033
+        events.append((t + hold, key, 'up'))
+        t += hold + rng.uniform(0.5, 3.0)
+    return events
+
+
+def mixed(seed: int = 3) -> List[Event]:
+    """Typing interleaved with chords and holds"""
+    events = typing_burst(200, seed=seed)
+    end = events[-1][0] + 1.0
+    events += chords(150, seed=seed + 1, start=end)
+    end = events[-1][0] + 1.0
+    events += long_holds(30, seed=seed + 2, start=end)
+    return sorted(events, key=lambda e: e[0])
+
+
+SYNTHETIC = {
+    'typing': typing_burst,
+    'chords': chords,
+    'holds': long_holds,
+    'mixed': mixed,
+}
+
+
+def save_trace(path: str, events: Iterable[Event]) -> None:
+    """Write a trace as JSON lines"""
+    with open(path, 'w') as f:
+        for t, name, event_type in events:
+            f.write(json.dumps([round(t, 6), name, event_type]) + '\n')
+
+
+def load_trace(path: str) -> List[Event]:
+    """Read a JSON-lines trace"""
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                t, name, event_type = json.loads(line)
+                events.append((float(t), name, event_type))
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def from_keyboard_events(recorded) -> List[Event]:
+    """Convert `keyboard.record()` output into a trace"""
+    return [(e.time, e.name, e.event_type) for e in recorded if e.name]
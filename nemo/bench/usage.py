@@ -0,0 +1,196 @@
+"""
+Usage benchmark - UsageStore cost and what the keys learn from it
+
+Simulates --days of RIGHT SHIFT use by one synthetic user: accidental taps
+(silent, < 0.2 s), quick one-word answers (0.15-0.4 s) and dictation, at
+the user's usual hours, with recognizers that differ in speed and success
+rate on this machine's network. Every interaction goes through the store
+the way the engine and STTKey record it, then the store is reopened from
+disk.
+
+Reports record() cost, batch write cost, bytes per record, reopen time,
+and for the default settings vs the learned ones: speech holds dropped by
+the minimum hold, silent holds processed, mean time to a confident
+transcript, and the usual hours found.
+
+Usage:
+    python -m nemo.bench.usage
+    python -m nemo.bench.usage --days 60 --json
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from nemo.tools.usage_store import (ENGINE, FALLBACK, FAILED, HOLD, INTERACTION, OK, EMPTY,
+                                    SILENT, SPEECH, UsageStore)
+
+KEY = 'right shift'
+DEFAULT_ORDER = ['google', 'sphinx', 'bing']
+DEFAULT_MIN_HOLD = 0.3
+# name: (mean latency s, success rate); sphinx never reaches insert confidence
+ENGINES = {'google': (1.1, 0.90), 'sphinx': (0.4, 0.0), 'bing': (0.45, 0.93)}
+USUAL_HOURS = (9, 10, 11, 14, 15, 16)
+
+
+def synthetic_holds(days: int, per_day: int, seed: int) -> List[Dict]:
+    """(timestamp, hold, speech) for each press"""
+    rng = random.Random(seed)
+    start = time.time() - days * 86400
+    day_start = start - (start % 86400) + time.timezone
+    holds = []
+    for day in range(days):
+        for _ in range(per_day):
+            hour = rng.choice(USUAL_HOURS) if rng.random() < 0.9 else rng.randrange(24)
+            timestamp = day_start + day * 86400 + hour * 3600 + rng.uniform(0, 3600)
+            kind = rng.random()
+            if kind < 0.15:
+                hold, speech = rng.uniform(0.03, 0.18), False  # accidental tap
+            elif kind < 0.35:
+                hold, speech = rng.uniform(0.15, 0.4), True  # "yes", "send it"
+            else:
+                hold, speech = rng.uniform(0.8, 8.0), rng.random() < 0.97
+            holds.append({'timestamp': timestamp, 'hold': hold, 'speech': speech})
+    return holds
+
+
+def transcribe(order: List[str], rng: random.Random) -> tuple:
+    """Modeled fallback chain: (seconds to a confident transcript or None, attempts)"""
+    elapsed = 0.0
+    attempts = []
+    for position, engine in enumerate(order):
+        latency, success = ENGINES[engine]
+        latency *= rng.uniform(0.8, 1.2)
+        elapsed += latency
+        ok = rng.random() < success
+        attempts.append((engine, latency, ok, position))
+        if ok:
+            return elapsed, attempts
+        if engine == 'sphinx':
+            return None, attempts  # low-confidence transcript ends the chain
+    return None, attempts
+
+
+def simulate(store: Optional[UsageStore], holds: List[Dict], seed: int) -> Dict:
+    """Run the presses with default or learned settings; record into store"""
+    rng = random.Random(seed)
+    dropped = processed_silent = 0
+    times = []
+    record_ns = []
+    for press in holds:
+        min_hold = store.min_hold(KEY, DEFAULT_MIN_HOLD) if store else DEFAULT_MIN_HOLD
+        order = store.engine_order(KEY, DEFAULT_ORDER) if store else DEFAULT_ORDER
+        hold, speech = press['hold'], press['speech']
+        outcome = EMPTY
+        queued = len(store._pending) if store else 0
+        if hold < min_hold:
+            dropped += speech
+        elif not speech:
+            processed_silent += 1
+        else:
+            seconds, attempts = transcribe(order, rng)
+            if seconds is not None:
+                times.append(seconds)
+                outcome = OK
+            if store:
+                for engine, latency, ok, position in attempts:
+                    store.record(KEY, ENGINE, OK if ok else FAILED, latency=latency,
+                                 engine=engine, flags=FALLBACK if position else 0)
+        if store:
+            start = time.perf_counter_ns()
+            store.record(KEY, HOLD, SPEECH if speech else SILENT, hold=hold)
+            store.record(KEY, INTERACTION, outcome, hold=hold)
+            record_ns.append((time.perf_counter_ns() - start) / 2)
+            # Replayed history: stamp this press's records with its time
+            fresh = [store._pending.pop() for _ in range(len(store._pending) - queued)]
+            store._pending.extend((press['timestamp'],) + record[1:]
+                                  for record in reversed(fresh))
+            if len(store._pending) >= store.batch_size:
+                store.flush()
+    return {
+        'speech_dropped': dropped,
+        'silent_processed': processed_silent,
+        'mean_transcript_s': sum(times) / len(times) if times else 0.0,
+        'record_ns': record_ns,
+    }
+
+
+def run(days: int = 30, per_day: int = 40, seed: int = 0) -> Dict:
+    """Default vs learned settings over the same presses"""
+    holds = synthetic_holds(days, per_day, seed)
+    root = tempfile.mkdtemp(prefix='nemo-usage-')
+    try:
+        store = UsageStore(root)
+        store.rng.seed(seed)
+        half = len(holds) // 2
+        simulate(store, holds[:half], seed)  # learning period
+        flush_start = time.perf_counter_ns()
+        store.flush()
+        store.rollup()
+        flush_ms = (time.perf_counter_ns() - flush_start) / 1e6
+        learned = simulate(store, holds[half:], seed + 1)
+        store.stop()
+        default = simulate(None, holds[half:], seed + 1)
+
+        log_bytes = sum(os.path.getsize(os.path.join(root, name)) for name in os.listdir(root)
+                        if name.startswith('usage.log'))
+        start = time.perf_counter()
+        reopened = UsageStore(root)
+        reopen_ms = (time.perf_counter() - start) * 1000
+        records = store.records_written.value
+        record_ns = sorted(learned['record_ns'])
+        return {
+            'presses': len(holds),
+            'records': records,
+            'log_bytes': log_bytes,
+            'record_us_p50': record_ns[len(record_ns) // 2] / 1000,
+            'record_us_p99': record_ns[int(len(record_ns) * 0.99)] / 1000,
+            'final_flush_ms': flush_ms,
+            'reopen_ms': reopen_ms,
+            'min_hold': {'default': DEFAULT_MIN_HOLD, 'learned': reopened.min_hold(KEY)},
+            'engine_order': {'default': DEFAULT_ORDER,
+                             'learned': reopened.engine_order(KEY, DEFAULT_ORDER)},
+            'speech_dropped': {'default': default['speech_dropped'],
+                               'learned': learned['speech_dropped']},
+            'silent_processed': {'default': default['silent_processed'],
+                                 'learned': learned['silent_processed']},
+            'mean_transcript_s': {'default': round(default['mean_transcript_s'], 3),
+                                  'learned': round(learned['mean_transcript_s'], 3)},
+            'usual_hours': {'true': list(USUAL_HOURS),
+                            'learned': reopened.learned.get(KEY, {}).get('hours', [])},
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="UsageStore benchmark")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--per-day', type=int, default=40, help="Presses per day")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    result = run(args.days, args.per_day, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    for name, value in result.items():
+        if isinstance(value, dict):
+            print(f"{name:<20}" + '  '.join(f"{k}={v}" for k, v in value.items()))
+        elif isinstance(value, float):
+            print(f"{name:<20}{value:,.3f}")
+        else:
+            print(f"{name:<20}{value:,}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
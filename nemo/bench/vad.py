@@ -0,0 +1,190 @@
+"""
+VAD benchmark - Bytes sent and latency saved by silence trimming and endpointing
+
+Runs push-to-talk recordings through AudioCapture's VAD and compares with
+sending the whole window:
+
+- bytes sent to the recognizer (whole recording vs trimmed speech)
+- recognizer calls skipped on speechless recordings (and any missed speech)
+- modeled transcription latency: upload at --uplink-kbps plus recognizer
+  time at --rtf seconds per audio second
+- endpointing: delay after the true end of speech, and head start before the
+  key is released (early transcription)
+- VAD cost in µs per second of audio
+
+Recordings are synthetic by default (voiced syllables and fricatives over
+background noise, with leading/trailing silence and labelled speech bounds);
+pass --wav to measure recorded 16-bit mono files (bytes/latency only).
+
+Usage:
+    python -m nemo.bench.vad
+    python -m nemo.bench.vad --dynamic --noise 400 --json
+    python -m nemo.bench.vad --wav take1.wav --wav take2.wav
+"""
+
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import sys
+import time
+import wave
+
+import numpy as np
+
+from nemo.tools.audio_capture.vad import Endpointer, VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+BLOCK_BYTES = 640  # 20 ms blocks, as the broker delivers them
+
+Sample = Tuple[bytes, Optional[Tuple[float, float]]]  # pcm, (speech start, end) seconds
+
+
+def synthetic_recording(rng: np.random.Generator, noise: float = 120.0,
+                        speech: bool = True) -> Sample:
+    """One push-to-talk recording with labelled speech bounds"""
+    lead = rng.uniform(0.3, 1.5)
+    tail = rng.uniform(0.5, 2.0)
+    talk = rng.uniform(1.0, 4.0) if speech else 0.0
+    total = lead + talk + tail
+    n = int(total * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+
+    # Background: broadband noise with slow level drift, plus key clicks
+    drift = 1.0 + 0.3 * np.sin(2 * np.pi * rng.uniform(0.1, 0.3) * t)
+    signal = rng.normal(0, noise, n) * drift
+    for click in rng.uniform(0, total, 3):
+        start = int(click * SAMPLE_RATE)
+        signal[start:start + 40] += rng.normal(0, noise * 20, len(signal[start:start + 40]))
+
+    if speech:
+        a, b = int(lead * SAMPLE_RATE), int((lead + talk) * SAMPLE_RATE)
+        ts = t[a:b] - lead
+        f0 = rng.uniform(100, 220) * (1 + 0.05 * np.sin(2 * np.pi * 3 * ts))
+        phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+        # Syllables: ~4.5 Hz envelope with short gaps between words
+        syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3.5, 5.5) * ts), 0, None) ** 0.6
+        words = (np.sin(2 * np.pi * 0.7 * ts + rng.uniform(0, 6)) > -0.85).astype(float)
+        level = rng.uniform(1500, 5000)
+        fricative = rng.normal(0, level * 0.15, b - a) * (syllables < 0.2) * words
+        signal[a:b] += level * voiced * syllables * words + fricative
+        bounds = (lead, lead + talk)
+    else:
+        bounds = None
+
+    pcm = np.clip(signal, -32768, 32767).astype('<i2').tobytes()
+    return pcm, bounds
+
+
+def load_wav(path: str) -> Sample:
+    with wave.open(path, 'rb') as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1 or wav.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path}: need 16 kHz 16-bit mono")
+        return wav.readframes(wav.getnframes()), None
+
+
+def run(samples: List[Sample], energy_threshold: float = 300, dynamic: bool = False,
+        rtf: float = 0.25, uplink_kbps: float = 256.0, end_silence_ms: int = 700) -> Dict:
+    """Measure VAD savings over a set of recordings"""
+    vad = VoiceActivityDetector(energy_threshold=energy_threshold, dynamic=dynamic)
+    bytes_per_sec = SAMPLE_RATE * 2
+
+    def modeled_latency(nbytes: int) -> float:
+        seconds = nbytes / bytes_per_sec
+        return nbytes * 8 / (uplink_kbps * 1000) + rtf * seconds if nbytes else 0.0
+
+    raw_bytes = sent_bytes = 0
+    baseline_latency = vad_latency = 0.0
+    skipped = missed = false_speech = 0
+    endpoint_delays: List[float] = []
+    head_starts: List[float] = []
+    vad_seconds = 0.0
+    labelled = any(bounds is not None for _, bounds in samples)
+
+    for pcm, bounds in samples:
+        started = time.perf_counter()
+        trimmed = vad.trim(pcm)
+        endpointer = Endpointer(vad, end_silence_ms)
+        end_at = None
+        for offset in range(0, len(pcm), BLOCK_BYTES):
+            if endpointer.feed(pcm[offset:offset + BLOCK_BYTES]) == 'end':
+                end_at = endpointer.frames * vad.frame_samples / SAMPLE_RATE
+        vad_seconds += time.perf_counter() - started
+
+        raw_bytes += len(pcm)
+        sent_bytes += len(trimmed)
+        baseline_latency += modeled_latency(len(pcm))
+        vad_latency += modeled_latency(len(trimmed))
+        if not trimmed:
+            skipped += 1
+        if bounds is not None and not trimmed:
+            missed += 1
+        if bounds is None and trimmed and labelled:
+            false_speech += 1
+
+        if bounds is not None and end_at is not None:
+            release = len(pcm) / bytes_per_sec
+            endpoint_delays.append(end_at - bounds[1])
+            head_starts.append(release - end_at)
+
+    audio_seconds = raw_bytes / bytes_per_sec
+    n = max(len(samples), 1)
+    return {
+        'recordings': len(samples),
+        'audio_seconds': audio_seconds,
+        'raw_bytes': raw_bytes,
+        'sent_bytes': sent_bytes,
+        'bytes_saved_pct': 100.0 * (1 - sent_bytes / raw_bytes) if raw_bytes else 0.0,
+        'recognizer_calls_skipped': skipped,
+        'speech_missed': missed,
+        'noise_sent_as_speech': false_speech,
+        'baseline_latency_s': baseline_latency / n,
+        'vad_latency_s': vad_latency / n,
+        'latency_saved_s': (baseline_latency - vad_latency) / n,
+        'endpoint_delay_ms_p50': _pct(endpoint_delays, 50) * 1000,
+        'endpoint_delay_ms_p90': _pct(endpoint_delays, 90) * 1000,
+        'early_head_start_s_p50': _pct(head_starts, 50),
+        'vad_us_per_audio_sec': vad_seconds / audio_seconds * 1e6 if audio_seconds else 0.0,
+    }
+
+
+def _pct(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="VAD / endpointing benchmark")
+    parser.add_argument('--wav', action='append', help="Recorded 16 kHz mono WAV (repeatable)")
+    parser.add_argument('--recordings', type=int, default=200, help="Synthetic recordings")
+    parser.add_argument('--silent-fraction', type=float, default=0.2,
+                        help="Synthetic recordings without speech")
+    parser.add_argument('--noise', type=float, default=120.0, help="Background noise RMS")
+    parser.add_argument('--energy-threshold', type=float, default=300)
+    parser.add_argument('--dynamic', action='store_true', help="Adaptive noise floor")
+    parser.add_argument('--rtf', type=float, default=0.25,
+                        help="Recognizer seconds per audio second")
+    parser.add_argument('--uplink-kbps', type=float, default=256.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    if args.wav:
+        samples = [load_wav(path) for path in args.wav]
+    else:
+        rng = np.random.default_rng(args.seed)
+        samples = [synthetic_recording(rng, args.noise, speech=rng.random() >= args.silent_fraction)
+                   for _ in range(args.recordings)]
+
+    result = run(samples, args.energy_threshold, args.dynamic, args.rtf, args.uplink_kbps)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for name, value in result.items():
+            print(f"{name:<28}{value:>14,.3f}" if isinstance(value, float)
+                  else f"{name:<28}{value:>14,d}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
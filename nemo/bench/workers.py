@@ -0,0 +1,148 @@
+"""
+Worker benchmark - Hook-thread latency with a CPU-heavy key in-process vs isolated
+
+A simulated keyboard hook fires keystrokes at --rate Hz into NemoEngine while
+a heavy key (PNG-encodes a synthetic 4K frame, base64-encodes it and runs a
+pure-Python decode loop on every release) is pressed and released
+repeatedly. The key runs either in the engine's process or in a KeyWorker.
+Reports hook wake-up lateness and keystroke dispatch percentiles (GIL
+contention shows up here), release latency, and the worker's CPU time and
+shared-memory traffic.
+
+Usage:
+    python -m nemo.bench.workers
+    python -m nemo.bench.workers --presses 20 --rate 500 --json
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import base64
+import io
+import json
+import sys
+import threading
+import time
+
+from nemo.tools import NemoEngine, NemoKey
+
+
+class HeavyKey(NemoKey):
+    """Gemini-like CPU load on release (module level: picklable for workers)"""
+
+    observes_keystrokes = True
+
+    def __init__(self, frame_size=(3840, 2160), decode_steps: int = 300_000):
+        super().__init__(key_name="Heavy", key_combo="right alt",
+                         description="CPU-heavy benchmark key")
+        from nemo.bench.fakes import make_desktop_frame
+        self.frame = make_desktop_frame(frame_size)
+        self.decode_steps = decode_steps
+        self.keystrokes = 0
+
+    def on_press(self) -> None:
+        pass
+
+    def on_hold(self, duration: float) -> None:
+        pass
+
+    def on_keystroke(self, key: str, timestamp: float) -> None:
+        self.keystrokes += 1
+
+    def on_release(self, total_duration: float) -> Dict:
+        buffer = io.BytesIO()
+        self.frame.save(buffer, format='PNG', compress_level=3)
+        encoded = base64.b64encode(buffer.getvalue())
+        # Stand-in for recognizer decoding in Python
+        score = 0
+        for step in range(self.decode_steps):
+            score = (score * 31 + step) & 0xFFFFFFFF
+        return {'png': buffer.getvalue(), 'b64_bytes': len(encoded), 'score': score}
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def run(isolated: bool, presses: int = 10, rate: float = 1000.0) -> Dict:
+    """Drive the hook and the heavy key together; collect latencies"""
+    engine = NemoEngine()
+    if isolated:
+        key = engine.register_isolated(HeavyKey, audio=False)
+    else:
+        key = HeavyKey()
+        engine.register_key(key)
+
+    lateness: List[float] = []
+    dispatch: List[float] = []
+    releases: List[float] = []
+    done = threading.Event()
+
+    def hook() -> None:
+        interval = 1.0 / rate
+        due = time.perf_counter()
+        while not done.is_set():
+            due += interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            woke = time.perf_counter()
+            lateness.append(max(0.0, woke - due))
+            engine.on_keystroke('a', time.time())
+            dispatch.append(time.perf_counter() - woke)
+
+    thread = threading.Thread(target=hook, daemon=True)
+    thread.start()
+    payload = 0
+    for _ in range(presses):
+        engine.on_key_press('right alt')
+        time.sleep(0.05)
+        start = time.perf_counter()
+        result = engine.on_key_release('right alt', 0.05)
+        releases.append(time.perf_counter() - start)
+        payload += len(result['png']) if result else 0
+    done.set()
+    thread.join()
+
+    worker = key.worker.get_status() if isolated else {}
+    engine.shutdown()
+    ms = 1000.0
+    return {
+        'mode': 'isolated' if isolated else 'in-process',
+        'hook_events': len(lateness),
+        'hook_late_p50_ms': _pct(lateness, 50) * ms,
+        'hook_late_p99_ms': _pct(lateness, 99) * ms,
+        'hook_late_max_ms': max(lateness) * ms if lateness else 0.0,
+        'dispatch_p99_ms': _pct(dispatch, 99) * ms,
+        'release_p50_ms': _pct(releases, 50) * ms,
+        'payload_bytes': payload,
+        'worker_cpu_s': worker.get('cpu_seconds', 0.0),
+        'shared_bytes': worker.get('shared_bytes', 0),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="In-process vs isolated key benchmark")
+    parser.add_argument('--presses', type=int, default=10)
+    parser.add_argument('--rate', type=float, default=1000.0, help="Hook events per second")
+    parser.add_argument('--json', action='store_true', help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    results = [run(False, args.presses, args.rate), run(True, args.presses, args.rate)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    names = [name for name in results[0] if name != 'mode']
+    print(f"{'':<20}" + ''.join(f"{r['mode']:>14}" for r in results))
+    for name in names:
+        print(f"{name:<20}" + ''.join(
+            f"{r[name]:>14,.2f}" if isinstance(r[name], float) else f"{r[name]:>14,}"
+            for r in results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Nemo Client - Thin control client for the Nemo daemon
+
+Talks to `python -m nemo.cli.daemon` over its Unix-domain socket
+(protocol.py). Imports only the standard library, so every command starts
+instantly instead of loading the capture stack.
+
+Usage:
+    nemo status [--json]
+    nemo metrics [--prometheus]
+    nemo keys
+    nemo enable "right alt + up"
+    nemo disable "right shift"
+    nemo timeline [--since 2h] [--start TS] [--end TS] [--limit N]
+    nemo search "budget spreadsheet" [--since 1d] [--k 5]
+    nemo ping | stop
+    nemo daemon          (run the daemon in the foreground)
+
+(`nemo` is `python -m nemo`; `python -m nemo.cli.client` works too.
+`--socket PATH` and `--timeout SECONDS` go before the command.)
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import socket
+import sys
+import time
+
+from .protocol import ERROR, REQUEST, ProtocolError, default_socket_path, encode_frame, read_frame
+
+
+class RemoteError(Exception):
+    """A daemon method failed"""
+
+
+class NemoClient:
+    """Connection to the Nemo daemon"""
+
+    def __init__(self, path: Optional[str] = None, timeout: Optional[float] = 10.0):
+        """
+        Args:
+            path: Socket path (default: default_socket_path())
+            timeout: Socket timeout in seconds (None = wait forever)
+        """
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self.sock: Optional[socket.socket] = None
+        self.rfile = None
+        self.next_id = 1
+
+    def connect(self) -> None:
+        if self.sock is not None:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        self.rfile = sock.makefile('rb')
+
+    def close(self) -> None:
+        if self.sock is not None:
+            self.rfile.close()
+            self.sock.close()
+            self.sock = None
+            self.rfile = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def call(self, method: str, **params: Any) -> Any:
+        """Run one method; raises RemoteError if it failed"""
+        result = self.pipeline([(method, params)])[0]
+        if isinstance(result, RemoteError):
+            raise result
+        return result
+
+    def pipeline(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Send every request, then read every reply (one round trip)
+
+        Returns:
+            Results in call order; failed calls are RemoteError instances
+        """
+        self.connect()
+        ids = []
+        frames = []
+        for method, params in calls:
+            ids.append(self.next_id)
+            frames.append(encode_frame(self.next_id, REQUEST,
+                                       {'method': method, 'params': params}))
+            self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+        self.sock.sendall(b''.join(frames))
+
+        replies: Dict[int, Any] = {}
+        while len(replies) < len(ids):
+            frame = read_frame(self.rfile)
+            if frame is None:
+                raise ProtocolError("Daemon closed the connection")
+            request_id, kind, payload = frame
+            replies[request_id] = RemoteError(payload.get('error')) if kind == ERROR else payload
+        return [replies[request_id] for request_id in ids]
+
+
+def parse_duration(text: str) -> float:
+    """'90s', '15m', '2h', '1d' (or plain seconds) → seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def _time_range(args) -> Tuple[Optional[float], Optional[float]]:
+    start = time.time() - parse_duration(args.since) if args.since else args.start
+    return start, args.end
+
+
+def _print_status(status: dict) -> None:
+    engine = status['engine']
+    daemon = status.get('daemon', {})
+    governor = engine.get('governor') or {}
+    print(f"Nemo {engine['version']}  pid {daemon.get('pid')}  "
+          f"up {daemon.get('uptime', 0.0):.0f}s  running={status['running']}")
+    if governor:
+        print(f"Profile: {governor.get('profile')}")
+    _print_keys(engine['keys'])
+
+
+def _print_keys(keys: List[dict]) -> None:
+    for key in keys:
+        state = 'on ' if key.get('enabled') else 'off'
+        print(f"  [{state}] {key.get('combo', ''):<20} {key.get('name', '')}  "
+              f"({key.get('executions', 0)} runs)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='nemo', description="Control the Nemo daemon")
+    parser.add_argument('--socket', help="Daemon socket (default: $NEMO_SOCKET or runtime dir)")
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help="Seconds to wait for the daemon (default: 10)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    status = commands.add_parser('status', help="Engine, keys and daemon status")
+    status.add_argument('--json', action='store_true')
+    metrics = commands.add_parser('metrics', help="Metrics snapshot")
+    metrics.add_argument('--prometheus', action='store_true', help="Prometheus text format")
+    commands.add_parser('keys', help="Registered keys")
+    for name in ('enable', 'disable'):
+        toggle = commands.add_parser(name, help=f"{name.capitalize()} a key")
+        toggle.add_argument('key', help="Key combo, e.g. 'right alt + up'")
+    for name, helptext in (('timeline', "Snapshot history"), ('search', "Semantic context search")):
+        sub = commands.add_parser(name, help=helptext)
+        if name == 'search':
+            sub.add_argument('query')
+            sub.add_argument('--k', type=int, default=10)
+            sub.add_argument('--source')
+        else:
+            sub.add_argument('--limit', type=int, default=100)
+        sub.add_argument('--since', help="Relative start, e.g. 30m, 2h, 1d")
+        sub.add_argument('--start', type=float, help="Start (unix time)")
+        sub.add_argument('--end', type=float, help="End (unix time)")
+    commands.add_parser('ping', help="Check that the daemon is up")
+    commands.add_parser('stop', help="Stop the daemon")
+    commands.add_parser('daemon', help="Run the daemon in the foreground")
+    args = parser.parse_args(argv)
+
+    if args.command == 'daemon':
+        from .daemon import main as daemon_main
+        daemon_main(['--socket', args.socket] if args.socket else [])
+        return 0
+
+    client = NemoClient(args.socket, timeout=args.timeout)
+    try:
+        with client:
+            if args.command == 'status':
+                result = client.call('status')
+                if args.json:
+                    print(json.dumps(result, indent=2))
+                else:
+                    _print_status(result)
+            elif args.command == 'metrics':
+                result = client.call('metrics', format='prometheus' if args.prometheus else 'json')
+                print(result if args.prometheus else json.dumps(result, indent=2))
+            elif args.command == 'keys':
+                _print_keys(client.call('keys'))
+            elif args.command in ('enable', 'disable'):
+                client.call(f'{args.command}_key', key=args.key)
+                print(f"{args.key}: {args.command}d")
+            elif args.command == 'timeline':
+                start, end = _time_range(args)
+                for item in client.call('timeline', start=start, end=end, limit=args.limit):
+                    stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(item['timestamp']))
+                    pin = ' pinned' if item['pinned'] else ''
+                    print(f"{stamp}  {item['id']}  {item['chunks']} chunks{pin}")
+            elif args.command == 'search':
+                start, end = _time_range(args)
+                hits = client.call('search', query=args.query, k=args.k, start=start, end=end,
+                                   source=args.source)
+                print(json.dumps(hits, indent=2))
+            else:
+                print(json.dumps(client.call(args.command), indent=2))
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"[NEMO] No daemon listening on {client.path} (start one with `nemo daemon`)",
+              file=sys.stderr)
+        return 2
+    except socket.timeout:
+        print(f"[NEMO] Daemon did not reply within {client.timeout:g}s", file=sys.stderr)
+        return 2
+    except (ProtocolError, OSError) as e:  # daemon died mid-reply, bad frame, ...
+        print(f"[NEMO] Lost connection to the daemon: {e}", file=sys.stderr)
+        return 2
+    except RemoteError as e:
+        print(f"[NEMO] {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Nemo Daemon - Long-lived capture/engine service with a local socket API
+
+Runs NemoApp (listener, engine, keys, governor, shared microphone) and
+serves the binary-framed protocol (protocol.py) on a Unix-domain socket, so
+the `nemo` client can query and control it without starting the stack.
+
+Methods:
+- ping, status, metrics (format='json'|'prometheus'), keys
+- enable_key / disable_key (key)
+- timeline (start, end, limit) - snapshot history from the SnapshotStore
+- search (query, k, start, end, source) - semantic context index search
+- stop
+
+The socket is created with owner-only permissions. A failing method only
+fails its request; the connection and the daemon keep running.
+
+Usage:
+    python -m nemo.cli.daemon [--socket PATH]
+"""
+
+from typing import Any, Callable, Dict, Optional
+import argparse
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from .protocol import (ERROR, REQUEST, RESPONSE, ProtocolError, default_socket_path,
+                       encode_frame, read_frame)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class NemoDaemon:
+    """Unix-socket API in front of a NemoApp"""
+
+    def __init__(self, app, path: Optional[str] = None):
+        """
+        Args:
+            app: NemoApp (or anything with engine/get_status/stop)
+            path: Socket path (default: default_socket_path())
+        """
+        self.app = app
+        self.path = path or default_socket_path()
+        self.server: Optional[_Server] = None
+        self.thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+
+        self.methods: Dict[str, Callable[..., Any]] = {
+            'ping': self._ping,
+            'status': self._status,
+            'metrics': self._metrics,
+            'keys': self._keys,
+            'enable_key': self._enable_key,
+            'disable_key': self._disable_key,
+            'timeline': self._timeline,
+            'search': self._search,
+            'stop': self._stop,
+        }
+
+    def register(self, name: str, handler: Callable[..., Any]) -> None:
+        """Expose another method (handler receives the request params as kwargs)"""
+        self.methods[name] = handler
+
+    # ------------------------------------------------------------------
+    # Server
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Bind the socket and serve in a daemon thread"""
+        if self.server is not None:
+            return
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("Unix-domain sockets are not available on this platform")
+        self._remove_stale_socket()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                daemon.connections += 1
+                daemon._serve_connection(self.rfile, self.wfile)
+
+        old_umask = os.umask(0o177)
+        try:
+            self.server = _Server(self.path, Handler)
+        finally:
+            os.umask(old_umask)
+        self.started_at = time.time()
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       name='nemo-daemon-ipc', daemon=True)
+        self.thread.start()
+        print(f"[DAEMON] Listening on {self.path}")
+
+    def stop(self) -> None:
+        """Stop serving and remove the socket"""
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        self.thread = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        print("[DAEMON] Stopped")
+
+    def _remove_stale_socket(self) -> None:
+        """Unlink a socket left by a dead daemon; refuse if one is alive"""
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"A Nemo daemon is already listening on {self.path}")
+
+    def _serve_connection(self, rfile, wfile) -> None:
+        """Answer pipelined requests in order until the client disconnects"""
+        while True:
+            try:
+                frame = read_frame(rfile)
+            except (ProtocolError, OSError) as e:
+                print(f"[DAEMON] Dropping connection: {e}")
+                return
+            if frame is None:
+                return
+            request_id, kind, payload = frame
+            if kind != REQUEST or not isinstance(payload, dict):
+                reply = encode_frame(request_id, ERROR, {'error': 'Expected a request'})
+            else:
+                reply = self.handle(request_id, payload.get('method'),
+                                    payload.get('params') or {})
+            try:
+                wfile.write(reply)
+            except OSError:
+                return
+
+    def handle(self, request_id: int, method: Optional[str], params: Dict[str, Any]) -> bytes:
+        """Run one method and encode its reply frame"""
+        self.requests += 1
+        handler = self.methods.get(method)
+        if handler is None:
+            self.errors += 1
+            return encode_frame(request_id, ERROR, {'error': f"Unknown method: {method}"})
+        try:
+            return encode_frame(request_id, RESPONSE, handler(**params))
+        except Exception as e:
+            self.errors += 1
+            return encode_frame(request_id, ERROR, {'error': f"{type(e).__name__}: {e}"})
+
+    # ------------------------------------------------------------------
+    # Methods
+    # ------------------------------------------------------------------
+
+    def _ping(self) -> dict:
+        return {'pong': True, 'pid': os.getpid(), 'version': self.app.engine.version}
+
+    def _status(self) -> dict:
+        status = self.app.get_status()
+        status['daemon'] = self.get_status()
+        return status
+
+    def _metrics(self, format: str = 'json'):
+        from nemo.tools.metrics import get_registry
+        registry = get_registry()
+        if format == 'prometheus':
+            return registry.to_prometheus()
+        return registry.snapshot()
+
+    def _keys(self) -> list:
+        return [key.get_status() for key in self.app.engine.get_all_keys()]
+
+    def _enable_key(self, key: str) -> dict:
+        if not self.app.engine.enable_key(key):
+            raise ValueError(f"No key registered for '{key}'")
+        return {'key': key, 'enabled': True}
+
+    def _disable_key(self, key: str) -> dict:
+        if not self.app.engine.disable_key(key):
+            raise ValueError(f"No key registered for '{key}'")
+        return {'key': key, 'enabled': False}
+
+    def _timeline(self, start: Optional[float] = None, end: Optional[float] = None,
+                  limit: int = 100) -> list:
+        store = getattr(self.app, 'snapshots', None)
+        if store is None:
+            raise RuntimeError("No snapshot store configured (set NEMO_SNAPSHOT_DIR)")
+        items = store.list_snapshots(start, end)
+        if limit:
+            items = items[-limit:]  # most recent
+        return [{
+            'id': snapshot_id,
+            'timestamp': record['timestamp'],
+            'pinned': record['pinned'],
+            'chunks': len(record['chunks']),
+            'metadata': record['metadata'],
+        } for snapshot_id, record in items]
+
+    def _search(self, query: str, k: int = 10, start: Optional[float] = None,
+                end: Optional[float] = None, source: Optional[str] = None) -> list:
+        index = getattr(self.app, 'index', None)
+        if index is None:
+            raise RuntimeError("No context index configured (set NEMO_INDEX_DIR)")
+        # Requests run on several threads; the agent key adds from another
+        with index.lock:
+            return index.search(query, k=k, start=start, end=end, source=source)
+
+    def _stop(self) -> dict:
+        # Reply first; the app's event loop wakes up and shuts down
+        self.app.request_stop()
+        return {'stopping': True}
+
+    def get_status(self) -> dict:
+        """Return daemon status"""
+        return {
+            'socket': self.path,
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started_at if self.started_at else 0.0,
+            'connections': self.connections,
+            'requests': self.requests,
+            'errors': self.errors,
+        }
+
+
+def main(argv=None) -> None:
+    """Run Nemo as a daemon in the foreground"""
+    parser = argparse.ArgumentParser(description="Nemo capture daemon")
+    parser.add_argument('--socket', help="Socket path (default: $NEMO_SOCKET or runtime dir)")
+    args = parser.parse_args(argv)
+
+    from .main import NemoApp
+    app = NemoApp()
+    daemon = NemoDaemon(app, args.socket)
+    daemon.start()
+    try:
+        app.start()  # returns once stopped (Ctrl+C or the 'stop' method)
+    finally:
+        daemon.stop()
+
+
+if __name__ == '__main__':
+    main()
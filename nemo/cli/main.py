@@ -5,14 +5,29 @@ Initializes NemoEngine, KeyboardListener, and all 5 keys.
 Starts the system-level keyboard listener.
 """
 
-from nemo.tools import NemoEngine
+from nemo.tools import NemoEngine, SnapshotStore, AsyncRuntime
+from nemo.tools.resource_governor import ResourceGovernor
+from nemo.tools.snapshot_store import CompactionEngine, IOBudget, SnapshotRecorder
+from nemo.tools.metrics import PrometheusExporter, JsonDumper, get_registry
+from nemo.tools.tracing import get_tracer
+from nemo.tools.audio_capture import get_broker
+from nemo.tools.codec import default_codecs, load_key
+from nemo.tools.context_index import VectorIndex, WindowIndexer
+from nemo.tools.usage_store import open_usage_store, get_usage_store
 from nemo.core import KeyboardListener
 from nemo.keys.right_shift_stt import STTKey
 from nemo.keys.right_alt_gemini import GeminiVoiceKey
-from nemo.keys.right_alt_left_rewind import RewindKey
 from nemo.keys.right_alt_right_forward import ForwardKey
+from nemo.keys.right_alt_right_forward.config import ForwardConfig
 from nemo.keys.right_alt_up_agent import AgentSynthesisKey
+from functools import partial
 import os
+import time
+
+try:
+    from nemo.keys.right_alt_left_rewind import RewindKey
+except ImportError:  # proprietary, shipped compiled
+    RewindKey = None
 
 
 class NemoApp:
@@ -27,13 +42,87 @@ class NemoApp:
     
     def __init__(self):
         """Initialize Nemo app"""
-        self.engine = NemoEngine()
+        self.governor = ResourceGovernor()
+        
+        # Compression for everything stored on disk; NEMO_KEY_FILE (created
+        # if missing) also encrypts it. Encrypted stores reject plaintext;
+        # NEMO_ALLOW_PLAINTEXT=1 reads (and re-encrypts) data written before
+        key_file = os.getenv('NEMO_KEY_FILE')
+        allow_plaintext = os.getenv('NEMO_ALLOW_PLAINTEXT') == '1'
+        self.codecs = default_codecs(load_key(os.path.expanduser(key_file)) if key_file else None,
+                                     allow_plaintext=allow_plaintext)
+        # The Forward model learns everything typed (passwords too): it is
+        # encrypted even without NEMO_KEY_FILE, with a key of its own
+        self.forward_codecs = self.codecs
+        if not key_file:
+            try:
+                self.forward_codecs = default_codecs(
+                    load_key(os.path.expanduser(ForwardConfig.key_path)),
+                    allow_plaintext=allow_plaintext)
+            except (RuntimeError, OSError, ValueError) as e:
+                print(f"[NEMO] Forward model stays unencrypted: {e}")
+        
+        # Persistent usage patterns (keys learn hold, engine order, hours);
+        # NEMO_USAGE_DIR=off keeps them in memory
+        usage_dir = os.getenv('NEMO_USAGE_DIR', '~/.nemo/usage')
+        self.usage = (open_usage_store(os.path.expanduser(usage_dir), codecs=self.codecs)
+                      if usage_dir != 'off' else get_usage_store())
+        self.prewarm_interval = 900.0  # seconds between usual-hour checks
+        
+        # Event loop for the app; key interactions run on it too unless
+        # NEMO_RUNTIME=sync (handlers then run on the keyboard hook thread)
+        self.runtime = AsyncRuntime()
+        async_keys = os.getenv('NEMO_RUNTIME', 'async') != 'sync'
+        self.engine = NemoEngine(governor=self.governor,
+                                 runtime=self.runtime if async_keys else None)
         self.listener = KeyboardListener(self.engine)
         self.running = False
+        self.stopped = False
+        
+        # Optional history for timeline queries and semantic search
+        snapshot_dir = os.getenv('NEMO_SNAPSHOT_DIR')
+        index_dir = os.getenv('NEMO_INDEX_DIR')
+        self.snapshots = (SnapshotStore(os.path.expanduser(snapshot_dir), codecs=self.codecs)
+                          if snapshot_dir else None)
+        self.recorder = None
+        self.compactor = None
+        if self.snapshots is not None:
+            # Recording and compaction share the disk: compaction waits
+            # while a snapshot is being written
+            self.recorder = SnapshotRecorder(self.snapshots)
+            self.compactor = CompactionEngine(
+                self.snapshots, budget=IOBudget(is_busy=lambda: self.recorder.capturing))
+            for component in (self.recorder, self.compactor):
+                component.apply_resource_settings(self.governor.settings)
+                self.governor.subscribe(component.apply_resource_settings)
+        self.index = (VectorIndex(os.path.expanduser(index_dir), codecs=self.codecs)
+                      if index_dir else None)
+        # Focused-window titles go into the index in background batches
+        self.window_indexer = None
+        if self.index is not None:
+            self.window_indexer = WindowIndexer(
+                self.index, layout=self.recorder.screen.layout if self.recorder else None)
+            self.window_indexer.apply_resource_settings(self.governor.settings)
+            self.governor.subscribe(self.window_indexer.apply_resource_settings)
         
         # Initialize Gemini API key if available
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
         
+        # Optional metrics export (Prometheus on localhost, JSON dumps)
+        metrics_port = os.getenv('NEMO_METRICS_PORT')
+        metrics_json = os.getenv('NEMO_METRICS_JSON')
+        self.metrics_exporter = PrometheusExporter(port=int(metrics_port)) if metrics_port else None
+        self.metrics_dumper = JsonDumper(metrics_json) if metrics_json else None
+        
+        # Optional interaction tracing (Chrome trace written on stop)
+        self.trace_path = os.getenv('NEMO_TRACE')
+        if self.trace_path:
+            get_tracer().enable()
+        
+        # Keys to host in worker processes: combos, comma-separated, or 'all'
+        isolate = os.getenv('NEMO_ISOLATE_KEYS', '')
+        self.isolated_keys = {combo.strip() for combo in isolate.split(',') if combo.strip()}
+        
         # Register all keys
         self._register_keys()
     
@@ -42,27 +131,39 @@ class NemoApp:
         print("[NEMO] Registering keys...")
         
         # STT Key
-        stt_key = STTKey()
-        self.engine.register_key(stt_key)
+        self._add_key(STTKey, 'right shift')
         
         # Gemini Key
-        gemini_key = GeminiVoiceKey(api_key=self.gemini_api_key)
-        self.engine.register_key(gemini_key)
+        self._add_key(partial(GeminiVoiceKey, api_key=self.gemini_api_key), 'right alt')
         
-        # Rewind Key
-        rewind_key = RewindKey()
-        self.engine.register_key(rewind_key)
+        # Rewind Key (proprietary; absent from source checkouts)
+        if RewindKey is not None:
+            self._add_key(RewindKey, 'right alt + left', audio=False)
+        else:
+            print("[NEMO] Rewind key not installed (RIGHT ALT + LEFT inactive)")
         
         # Forward Key (proprietary stub)
-        forward_key = ForwardKey()
-        self.engine.register_key(forward_key)
+        self._add_key(partial(ForwardKey, codecs=self.forward_codecs), 'right alt + right', audio=False)
         
-        # Agent Key (proprietary stub)
-        agent_key = AgentSynthesisKey()
-        self.engine.register_key(agent_key)
+        # Agent Key (proprietary stub) - the context index stays in this
+        # process, so an isolated agent key runs without it
+        if self._isolated('right alt + up'):
+            self._add_key(AgentSynthesisKey, 'right alt + up', audio=False)
+        else:
+            self._add_key(partial(AgentSynthesisKey, index=self.index), 'right alt + up')
         
         print(f"[NEMO] Registered {len(self.engine.get_all_keys())} keys")
     
+    def _isolated(self, key_combo: str) -> bool:
+        return 'all' in self.isolated_keys or key_combo in self.isolated_keys
+    
+    def _add_key(self, factory, key_combo: str, audio: bool = True) -> None:
+        """Register a key in-process, or in a worker process (NEMO_ISOLATE_KEYS)"""
+        if self._isolated(key_combo):
+            self.engine.register_isolated(factory, key_combo=key_combo, audio=audio)
+        else:
+            self.engine.register_key(factory())
+    
     def start(self) -> None:
         """Start Nemo"""
         if self.running:
@@ -79,21 +180,66 @@ class NemoApp:
         print("  RIGHT ALT + UP   → Agent Synthesis")
         print("\n[NEMO] Ready! Press Ctrl+C to exit.")
         
-        # Start keyboard listener
+        # Start keyboard listener and resource governor. The microphone only
+        # opens on a press or ahead of a key's usual hours (UsageStore), so
+        # it isn't held open all day
         self.listener.start()
+        self.governor.start()
+        if self.metrics_exporter:
+            self.metrics_exporter.start()
+        if self.metrics_dumper:
+            self.metrics_dumper.start()
+        self.usage.start()
+        if self.recorder is not None:
+            self.recorder.start()
+            self.compactor.start()
+        if self.window_indexer is not None:
+            self.window_indexer.start()
+        self.engine.prewarm_usual()
+        self.runtime.schedule(self.prewarm_interval, self._prewarm_upcoming)
         
-        # Keep running
+        # Block on the event loop until request_stop() or Ctrl+C
         try:
-            while self.running:
-                import time
-                time.sleep(0.1)
+            self.runtime.run()
         except KeyboardInterrupt:
-            self.stop()
+            pass
+        self.stop()
+    
+    def _prewarm_upcoming(self) -> None:
+        """Prewarm keys typically used in the next prewarm_interval"""
+        self.engine.prewarm_usual(time.time() + self.prewarm_interval)
+    
+    def request_stop(self) -> None:
+        """Ask start() to return and shut down (any thread)"""
+        self.running = False
+        self.runtime.stop()
     
     def stop(self) -> None:
         """Stop Nemo"""
+        if self.stopped:
+            return
+        self.stopped = True
         self.running = False
+        self.runtime.stop()
         self.listener.stop()
+        self.governor.stop()
+        self.engine.shutdown()
+        self.usage.stop()
+        get_broker().stop()
+        if self.snapshots is not None:
+            self.recorder.stop()
+            self.compactor.stop()
+            self.snapshots.save()
+        if self.index is not None:
+            self.window_indexer.stop()
+            self.index.close()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        if self.metrics_dumper:
+            self.metrics_dumper.stop()
+        if self.trace_path:
+            count = get_tracer().dump_chrome_trace(self.trace_path)
+            print(f"[NEMO] Wrote {count} trace events to {self.trace_path}")
         print("[NEMO] Stopped")
     
     def get_status(self) -> dict:
@@ -102,6 +248,12 @@ class NemoApp:
             'running': self.running,
             'engine': self.engine.get_status(),
             'listener': self.listener.get_status(),
+            'metrics': get_registry().snapshot(),
+            'tracing': get_tracer().get_status(),
+            'usage': self.usage.get_status(),
+            'snapshots': self.recorder.get_status() if self.recorder else None,
+            'compaction': self.compactor.get_status() if self.compactor else None,
+            'window_index': self.window_indexer.get_status() if self.window_indexer else None,
         }
 
 
@@ -0,0 +1,85 @@
+"""
+Nemo IPC protocol - Binary framing for the daemon's Unix-domain socket
+
+Every message is one frame:
+
+    length (u32 BE) | request id (u32 BE) | kind (u8) | payload (length bytes)
+
+kind is REQUEST, RESPONSE or ERROR; the payload is compact UTF-8 JSON
+({"method": ..., "params": {...}} for requests, the result or
+{"error": ...} for replies). Clients may pipeline: send any number of
+requests before reading. The daemon answers each connection's requests in
+order, echoing the request id.
+
+Stdlib only: the CLI client imports this without the capture stack.
+"""
+
+from typing import Any, BinaryIO, Optional, Tuple
+import json
+import os
+import struct
+
+HEADER = struct.Struct('>IIB')
+MAX_FRAME = 64 * 1024 * 1024
+
+REQUEST = 0
+RESPONSE = 1
+ERROR = 2
+
+
+class ProtocolError(Exception):
+    """Malformed or oversized frame"""
+
+
+def default_socket_path() -> str:
+    """$NEMO_SOCKET, else $XDG_RUNTIME_DIR/nemo.sock, else ~/.nemo/nemo.sock"""
+    path = os.getenv('NEMO_SOCKET')
+    if path:
+        return os.path.expanduser(path)
+    runtime = os.getenv('XDG_RUNTIME_DIR')
+    if runtime:
+        return os.path.join(runtime, 'nemo.sock')
+    return os.path.expanduser(os.path.join('~', '.nemo', 'nemo.sock'))
+
+
+def _default(value: Any) -> Any:
+    """JSON fallback for NumPy scalars/arrays, tuples in sets, etc."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def encode_frame(request_id: int, kind: int, payload: Any) -> bytes:
+    """Header + JSON payload as one buffer (a single sendall)"""
+    body = json.dumps(payload, separators=(',', ':'), default=_default).encode('utf-8')
+    if len(body) > MAX_FRAME:
+        raise ProtocolError(f"Frame too large: {len(body)} bytes")
+    return HEADER.pack(len(body), request_id, kind) + body
+
+
+def read_frame(stream: BinaryIO) -> Optional[Tuple[int, int, Any]]:
+    """
+    Read one frame from a buffered stream
+
+    Returns:
+        (request id, kind, payload), or None on clean EOF
+    """
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ProtocolError("Truncated frame header")
+    length, request_id, kind = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"Frame too large: {length} bytes")
+    body = stream.read(length)
+    if len(body) < length:
+        raise ProtocolError("Truncated frame body")
+    try:
+        return request_id, kind, json.loads(body.decode('utf-8')) if body else None
+    except ValueError as e:
+        raise ProtocolError(f"Bad payload: {e}")
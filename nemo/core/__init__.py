@@ -1 +1,4 @@
 """Nemo Core - Main orchestrator and keyboard listener"""
+from .keyboard_listener import KeyboardListener
+
+__all__ = ['KeyboardListener']
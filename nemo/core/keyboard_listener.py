@@ -8,8 +8,11 @@ Routes events to NemoEngine for key lifecycle management.
 import keyboard
 import threading
 import time
-from typing import Dict, Callable, Optional
+from concurrent.futures import Future
+from typing import Dict, Callable, Optional, Set
 from nemo.tools import NemoEngine
+from nemo.tools.metrics import get_registry
+from nemo.tools.tracing import get_tracer
 
 
 class KeyboardListener:
@@ -26,14 +29,19 @@ class KeyboardListener:
     Routes to NemoEngine for handling.
     """
     
-    def __init__(self, engine: NemoEngine):
+    # Keys that turn a held RIGHT ALT into a combo
+    COMBO_KEYS = ('left', 'right', 'up')
+    
+    def __init__(self, engine: NemoEngine, clock: Callable[[], float] = time.time):
         """
         Initialize keyboard listener
         
         Args:
             engine: NemoEngine instance to route events to
+            clock: Wall-clock source for hold durations (virtual in benchmarks)
         """
         self.engine = engine
+        self.clock = clock
         self.listening = False
         self.thread = None
         
@@ -47,6 +55,20 @@ class KeyboardListener:
         # Track press times (for duration calculation)
         self.key_press_times: Dict[str, float] = {}
         self.combo_start_time: Optional[float] = None
+        
+        # Keys currently down (to drop auto-repeat from the keystroke stream)
+        self.held_keys: Set[str] = set()
+        
+        # Metrics: OS hook timestamp → our callback, and callback duration
+        metrics = get_registry()
+        self.hook_latency = metrics.histogram(
+            'hook_to_dispatch_seconds', "Delay from OS keyboard hook to listener callback")
+        self.handler_time = metrics.histogram(
+            'listener_handler_seconds', "Listener callback duration incl. key dispatch")
+        self.events_seen = metrics.counter('keyboard_events_total', "Keyboard events observed")
+        
+        # Tracing: one interaction per hotkey press → release
+        self.tracer = get_tracer()
     
     def start(self) -> None:
         """Start listening for hotkeys"""
@@ -71,48 +93,102 @@ class KeyboardListener:
         if not self.listening:
             return
         
-        key = event.name.lower()
+        start = time.perf_counter_ns()
+        self._record_hook_latency(event)
+        try:
+            key = event.name.lower()
+            if key in self.held_keys:
+                return  # OS auto-repeat of a held key: not a new press
+            self.held_keys.add(key)
+            self.engine.on_keystroke(key, self.clock())
+            self._handle_press(key)
+        finally:
+            self.handler_time.record_since(start)
+    
+    def _record_hook_latency(self, event) -> None:
+        """Record OS-hook-to-callback delay (keyboard events carry a wall-clock time)"""
+        self.events_seen.inc()
+        hooked_at = getattr(event, 'time', None)
+        if hooked_at:
+            self.hook_latency.record(int((self.clock() - hooked_at) * 1e9))
+    
+    def _handle_press(self, key: str) -> None:
+        """Update key state and dispatch presses"""
         
         # Track individual keys
         if key == 'right shift':
             self.right_shift_pressed = True
-            self.key_press_times['right shift'] = time.time()
-            self.engine.on_key_press('right shift')
+            self.key_press_times['right shift'] = self.clock()
+            self._dispatch_press('right shift')
         
         elif key == 'right alt':
             self.right_alt_pressed = True
-            self.key_press_times['right alt'] = time.time()
-            self.combo_start_time = time.time()
+            self.key_press_times['right alt'] = self.clock()
+            self.combo_start_time = self.clock()
+            self.tracer.begin_interaction('right alt')
         
         # Combo modifier keys (when right alt is held)
-        elif self.right_alt_pressed:
+        elif self.right_alt_pressed and key in self.COMBO_KEYS:
+            # The solo RIGHT ALT interaction became a combo
+            self.tracer.end_interaction('right alt', superseded=True)
+            
             if key == 'left':
                 self.left_pressed = True
-                self.key_press_times['right alt + left'] = time.time()
-                self.engine.on_key_press('right alt + left')
+                self.key_press_times['right alt + left'] = self.clock()
+                self._dispatch_press('right alt + left')
             
             elif key == 'right':
                 self.right_pressed = True
-                self.key_press_times['right alt + right'] = time.time()
-                self.engine.on_key_press('right alt + right')
+                self.key_press_times['right alt + right'] = self.clock()
+                self._dispatch_press('right alt + right')
             
             elif key == 'up':
                 self.up_pressed = True
-                self.key_press_times['right alt + up'] = time.time()
-                self.engine.on_key_press('right alt + up')
+                self.key_press_times['right alt + up'] = self.clock()
+                self._dispatch_press('right alt + up')
+    
+    def _dispatch_press(self, key_combo: str) -> None:
+        """Open the trace interaction and route the press to the engine"""
+        self.tracer.begin_interaction(key_combo)
+        with self.tracer.scope(key_combo):
+            self.engine.on_key_press(key_combo)
+    
+    def _dispatch_release(self, key_combo: str, duration: float) -> None:
+        """Route the release to the engine and close the trace interaction"""
+        with self.tracer.scope(key_combo):
+            result = self.engine.on_key_release(key_combo, duration)
+        if isinstance(result, Future):
+            # AsyncRuntime: the handler is still running; close when it ends
+            # (a superseded interaction was already replaced by the new press)
+            def close(done: Future) -> None:
+                if not done.cancelled():
+                    self.tracer.end_interaction(key_combo, hold=duration)
+            result.add_done_callback(close)
+        else:
+            self.tracer.end_interaction(key_combo, hold=duration)
     
     def _on_key_release(self, event) -> None:
         """Handle key release event"""
         if not self.listening:
             return
         
-        key = event.name.lower()
+        start = time.perf_counter_ns()
+        self._record_hook_latency(event)
+        try:
+            key = event.name.lower()
+            self.held_keys.discard(key)
+            self._handle_release(key)
+        finally:
+            self.handler_time.record_since(start)
+    
+    def _handle_release(self, key: str) -> None:
+        """Update key state and dispatch releases"""
         
         # RIGHT SHIFT release
         if key == 'right shift' and self.right_shift_pressed:
             self.right_shift_pressed = False
-            duration = time.time() - self.key_press_times.get('right shift', time.time())
-            self.engine.on_key_release('right shift', duration)
+            duration = self.clock() - self.key_press_times.get('right shift', self.clock())
+            self._dispatch_release('right shift', duration)
             del self.key_press_times['right shift']
         
         # RIGHT ALT release (may have combos)
@@ -122,26 +198,26 @@ class KeyboardListener:
             # Check which combo was active
             if self.left_pressed:
                 self.left_pressed = False
-                duration = time.time() - self.key_press_times.get('right alt + left', time.time())
-                self.engine.on_key_release('right alt + left', duration)
+                duration = self.clock() - self.key_press_times.get('right alt + left', self.clock())
+                self._dispatch_release('right alt + left', duration)
                 del self.key_press_times['right alt + left']
             
             elif self.right_pressed:
                 self.right_pressed = False
-                duration = time.time() - self.key_press_times.get('right alt + right', time.time())
-                self.engine.on_key_release('right alt + right', duration)
+                duration = self.clock() - self.key_press_times.get('right alt + right', self.clock())
+                self._dispatch_release('right alt + right', duration)
                 del self.key_press_times['right alt + right']
             
             elif self.up_pressed:
                 self.up_pressed = False
-                duration = time.time() - self.key_press_times.get('right alt + up', time.time())
-                self.engine.on_key_release('right alt + up', duration)
+                duration = self.clock() - self.key_press_times.get('right alt + up', self.clock())
+                self._dispatch_release('right alt + up', duration)
                 del self.key_press_times['right alt + up']
             
             else:
                 # Solo RIGHT ALT
-                duration = time.time() - self.key_press_times.get('right alt', time.time())
-                self.engine.on_key_release('right alt', duration)
+                duration = self.clock() - self.key_press_times.get('right alt', self.clock())
+                self._dispatch_release('right alt', duration)
             
             del self.key_press_times['right alt']
             self.combo_start_time = None
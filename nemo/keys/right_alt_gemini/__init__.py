@@ -1 +1,4 @@
 """RIGHT ALT - Gemini Voice AI with Screenshot Capture"""
+from .implementation import GeminiVoiceKey
+
+__all__ = ['GeminiVoiceKey']
@@ -6,3 +6,7 @@ class GeminiConfig:
     global_context = True
     artifact_persistence = False
     model = 'gemini-pro-vision'
+    screenshot_region = 'window'  # 'window', 'monitor' or 'full'
+    screenshot_overview = True  # low-res overview of the other screens
+    overview_max_side = 1024  # pixels
+    min_hold = 0.3  # seconds; until learned from usage
@@ -6,15 +6,21 @@ Ideal for: Screen-aware Q&A, contextual help, AI assistance with full context.
 
 Uses:
 - AudioCapture tool (voice recording)
-- ScreenCapture tool (screenshot)
+- ScreenCapture tool (focused window + low-res overview of the other screens)
 - google-generativeai (Gemini Pro Vision)
 """
 
 from nemo.tools import NemoKey, AudioCapture, ScreenCapture
+from nemo.tools.metrics import get_registry
+from nemo.tools.tracing import get_tracer, to_thread
+from nemo.tools.usage_store import HOLD, SPEECH, SILENT, get_usage_store
 import google.generativeai as genai
 import base64
-from typing import Optional
+from typing import Dict, List, Optional
 import speech_recognition as sr
+import time
+
+from .config import GeminiConfig
 
 
 class GeminiVoiceKey(NemoKey):
@@ -32,7 +38,11 @@ class GeminiVoiceKey(NemoKey):
             description="Hold to ask Gemini about your screen"
         )
         self.audio = AudioCapture(energy_threshold=300, timeout=5)
-        self.screen = ScreenCapture()
+        self.screen = ScreenCapture(
+            region=GeminiConfig.screenshot_region,
+            overview=GeminiConfig.screenshot_overview,
+            overview_max_side=GeminiConfig.overview_max_side,
+        )
         self.recognizer = sr.Recognizer()
         
         # Initialize Gemini
@@ -43,14 +53,29 @@ class GeminiVoiceKey(NemoKey):
         self.recording = False
         self.last_response = None
         self.last_screenshot = None
+        self.last_views: List[Dict] = []
+        self.model = None  # built on first query (or prewarm)
+        
+        metrics = get_registry()
+        self.transcribe_time = metrics.histogram('gemini_transcribe_seconds',
+                                                 "Voice question transcription latency")
+        self.model_time = metrics.histogram('gemini_query_seconds', "Gemini model latency")
+        self.tracer = get_tracer()
+    
+    def apply_resource_settings(self, settings: dict) -> None:
+        """Follow the governor's encode profile for screenshots"""
+        self.screen.set_encode_profile(settings['encode_profile'])
     
     def on_press(self) -> None:
         """Called when RIGHT ALT pressed"""
-        # Capture screenshot immediately
-        self.last_screenshot = self.screen.capture()
+        # Capture the focused window (and overview) immediately
+        with self.tracer.span('gemini.screenshot'):
+            self.last_views = self.screen.capture_views()
+        self.last_screenshot = self.last_views[0]['data'] if self.last_views else None
         
         # Start recording voice
-        self.audio.start_recording()
+        with self.tracer.span('gemini.mic_start'):
+            self.audio.start_recording()
         self.recording = True
     
     def on_hold(self, duration: float) -> None:
@@ -60,22 +85,56 @@ class GeminiVoiceKey(NemoKey):
     
     def on_release(self, total_duration: float) -> Optional[str]:
         """Called when RIGHT ALT released - query Gemini"""
+        question = self._question(total_duration)
+        if not question:
+            return None
+        return self._answer(self._ask(question, self.last_views))
+    
+    async def on_release_async(self, total_duration: float) -> Optional[str]:
+        """
+        on_release in stages (AsyncRuntime): a new press cancels between
+        transcription and the query, and a superseded answer is never shown
+        """
+        views = self.last_views  # the next press replaces last_views
+        question = await to_thread(self._question, total_duration)
+        if not question:
+            return None
+        response = await to_thread(self._ask, question, views)
+        return self._answer(response)
+    
+    def _question(self, total_duration: float) -> Optional[str]:
+        """Stop recording and transcribe the voice question"""
         self.audio.stop_recording()
         self.recording = False
         
-        if total_duration < 0.3:
+        # Label the hold (VAD: speech or not) to learn the minimum hold
+        usage = get_usage_store()
+        usage.record(self.key_combo, HOLD, SPEECH if self.audio.has_speech() else SILENT,
+                     hold=total_duration)
+        if total_duration < usage.min_hold(self.key_combo, GeminiConfig.min_hold):
             # Too short
             return None
         
         # Transcribe voice question
-        question = self._transcribe_audio()
+        start = time.perf_counter_ns()
+        with self.tracer.span('gemini.transcribe'):
+            question = self._transcribe_audio()
+        self.transcribe_time.record_since(start)
         if not question:
             self._notify("No speech detected")
             return None
-        
-        # Query Gemini with context
-        response = self._query_gemini(question, self.last_screenshot)
-        
+        return question
+    
+    def _ask(self, question: str, views: List[Dict]) -> Optional[str]:
+        """Query Gemini with context"""
+        start = time.perf_counter_ns()
+        with self.tracer.span('gemini.query', model='gemini-pro-vision'):
+            response = self._query_gemini(question, views)
+        self.model_time.record_since(start)
+        return response
+    
+    def _answer(self, response: Optional[str]) -> Optional[str]:
+        """Show the response (or the failure)"""
         if response:
             self.last_response = response
             self._display_response(response)
@@ -87,8 +146,9 @@ class GeminiVoiceKey(NemoKey):
     def _transcribe_audio(self) -> Optional[str]:
         """Transcribe audio to text"""
         try:
-            with sr.Microphone() as source:
-                audio = self.recognizer.listen(source, timeout=5)
+            audio = self.audio.get_audio_data()
+            if audio is None:
+                return None
             
             # Try Google first
             try:
@@ -104,29 +164,38 @@ class GeminiVoiceKey(NemoKey):
         except:
             return None
     
-    def _query_gemini(self, question: str, screenshot_bytes: Optional[bytes]) -> Optional[str]:
-        """Send question + screenshot to Gemini Pro Vision"""
+    def _query_gemini(self, question: str, views: List[Dict]) -> Optional[str]:
+        """Send question + screenshots to Gemini Pro Vision"""
         try:
-            model = genai.GenerativeModel('gemini-pro-vision')
+            model = self._model()
             
-            # Convert screenshot to base64
-            if screenshot_bytes:
-                screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
-                image_data = genai.types.ImageData(
-                    mime_type="image/png",
-                    data=screenshot_b64
-                )
+            if views:
+                images = [genai.types.ImageData(
+                    mime_type=view['mime_type'],
+                    data=base64.b64encode(view['data']).decode('utf-8'),
+                ) for view in views]
+                
+                # Describe what each image shows
+                main = views[0]
+                if main['name'] == 'window':
+                    described = f"the window the user is focused on ({main['title']})"
+                elif main['name'] == 'monitor':
+                    described = "the screen the user is working on"
+                else:
+                    described = "the user's screen"
+                if len(views) > 1:
+                    described += ", followed by a low-resolution overview of their other screens"
                 
                 # Create prompt with context
                 prompt = f"""User is asking about what they see on their screen.
                 
 User question: {question}
 
-Context: The screenshot above shows the current state of the user's screen. 
+Context: The first image shows {described}. 
 Please analyze it and answer their question directly and concisely.
 """
                 
-                response = model.generate_content([prompt, image_data])
+                response = model.generate_content([prompt] + images)
             else:
                 # No screenshot, just answer the question
                 response = model.generate_content(question)
@@ -136,6 +205,17 @@ Please analyze it and answer their question directly and concisely.
             print(f"[GEMINI ERROR] {e}")
             return None
     
+    def _model(self):
+        """Gemini model client (reused across queries)"""
+        if self.model is None:
+            self.model = genai.GenerativeModel(GeminiConfig.model)
+        return self.model
+    
+    def prewarm(self) -> None:
+        """Open the microphone stream and build the model client ahead of use"""
+        self.audio.prewarm()
+        self._model()
+    
     def _display_response(self, response: str) -> None:
         """Display Gemini response to user"""
         print("\n" + "="*60)
@@ -155,5 +235,6 @@ Please analyze it and answer their question directly and concisely.
             'recording': self.recording,
             'last_response': self.last_response[:100] if self.last_response else None,
             'has_screenshot': self.last_screenshot is not None,
+            'screenshot_bytes': sum(len(view['data']) for view in self.last_views),
         })
         return status
@@ -1 +1,4 @@
 """RIGHT ALT + RIGHT - Forward (Temporal Prediction) - PROPRIETARY"""
+from .implementation import ForwardKey
+
+__all__ = ['ForwardKey']
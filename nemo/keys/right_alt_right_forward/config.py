@@ -4,3 +4,10 @@ class ForwardConfig:
     """Forward prediction engine configuration - NEMO CODE"""
     max_prediction_window = 5000  # 5 seconds ahead
     prediction_confidence_threshold = 0.7
+    
+    # Keystroke model (see predictor.py)
+    max_order = 4  # longest context, in keystrokes
+    table_bits = 14  # 16K contexts per order (~1.3 MB total)
+    state_path = '~/.nemo/forward_model.bin'
+    key_path = '~/.nemo/forward.key'  # encrypts the model when NEMO_KEY_FILE is unset
+    save_every = 5000  # keystrokes between background saves
@@ -0,0 +1,153 @@
+"""
+ForwardKey - Temporal Prediction
+
+RIGHT ALT + RIGHT hotkey - Release to see what you are most likely to type next.
+
+Learns the keystroke stream online (KeystrokePredictor) and predicts as many
+keystrokes ahead as fit in max_prediction_window at the current typing rate,
+stopping when confidence drops below prediction_confidence_threshold.
+"""
+
+from nemo.tools import NemoKey
+from nemo.tools.codec import CodecSet
+from nemo.tools.metrics import get_registry
+from typing import List, Optional, Tuple
+import os
+import threading
+import time
+
+from .config import ForwardConfig
+from .predictor import KeystrokePredictor
+
+
+# Keys that render as text when showing a prediction
+PRINTABLE = {'space': ' ', 'enter': '\n', 'tab': '\t'}
+
+
+class ForwardKey(NemoKey):
+    """
+    Forward (Temporal Prediction) Key
+
+    Observes every keystroke; release RIGHT ALT + RIGHT to display the
+    predicted continuation.
+    """
+
+    observes_keystrokes = True
+
+    def __init__(self, config: type = ForwardConfig, state_path: Optional[str] = None,
+                 codecs: Optional[CodecSet] = None):
+        """
+        Args:
+            config: ForwardConfig-like settings
+            state_path: Model file (default: config.state_path)
+            codecs: Compression/encryption for the model file (it learns
+                everything typed, passwords included)
+        """
+        super().__init__(
+            key_name="Forward",
+            key_combo="right alt + right",
+            description="Predict your next keystrokes"
+        )
+        self.settings = config
+        self.state_path = os.path.expanduser(state_path or config.state_path)
+        self.codecs = codecs
+        self.predictor = self._load_predictor()
+
+        # Context captured when RIGHT ALT went down, so the hotkey itself
+        # is not part of what we predict from
+        self._anchor: List[int] = []
+        self._last_keystroke = 0.0
+        self._key_interval = 0.2  # EMA of seconds between keystrokes
+        self._unsaved = 0
+        self._save_lock = threading.Lock()
+
+        self.last_prediction: List[Tuple[str, float]] = []
+
+        metrics = get_registry()
+        self.update_time = metrics.histogram('forward_update_seconds', "Predictor update latency")
+        self.predict_time = metrics.histogram('forward_predict_seconds', "Predictor query latency")
+
+    def _load_predictor(self) -> KeystrokePredictor:
+        """Load saved model, or start fresh"""
+        if os.path.exists(self.state_path):
+            try:
+                predictor = KeystrokePredictor.load(self.state_path, codecs=self.codecs)
+                print(f"[FORWARD] Loaded model ({predictor.get_status()['vocabulary']} keys)")
+                return predictor
+            except Exception as e:  # unreadable, truncated, or another key
+                print(f"[FORWARD] Ignoring unreadable model: {e}")
+        return KeystrokePredictor(max_order=self.settings.max_order,
+                                  table_bits=self.settings.table_bits)
+
+    def on_keystroke(self, key: str, timestamp: float) -> None:
+        """Learn from one keystroke (called by the engine for every key down)"""
+        if key == 'right alt':
+            self._anchor = self.predictor.snapshot_history()
+            return
+
+        if self._last_keystroke:
+            gap = timestamp - self._last_keystroke
+            if 0 < gap < 2.0:  # ignore pauses
+                self._key_interval += 0.05 * (gap - self._key_interval)
+        self._last_keystroke = timestamp
+
+        start = time.perf_counter_ns()
+        self.predictor.update(key)
+        self.update_time.record_since(start)
+
+        self._unsaved += 1
+        if self._unsaved >= self.settings.save_every:
+            self._unsaved = 0
+            threading.Thread(target=self.save, daemon=True).start()
+
+    def on_press(self) -> None:
+        """Called when RIGHT ALT + RIGHT pressed"""
+        pass
+
+    def on_hold(self, duration: float) -> None:
+        """Called while held"""
+        pass
+
+    def on_release(self, total_duration: float) -> Optional[str]:
+        """Called when released - predict the continuation (returned, not printed)"""
+        steps = int(self.settings.max_prediction_window / 1000.0 / max(self._key_interval, 0.02))
+        start = time.perf_counter_ns()
+        self.last_prediction = self.predictor.predict_sequence(
+            max_length=max(1, min(steps, 64)),
+            threshold=self.settings.prediction_confidence_threshold,
+            history=self._anchor or None,
+        )
+        self._anchor = []
+        self.predict_time.record_since(start)
+
+        if not self.last_prediction:
+            print("[FORWARD] No confident prediction yet")
+            return None
+
+        text = ''.join(PRINTABLE.get(k, k if len(k) == 1 else f'<{k}>')
+                       for k, _ in self.last_prediction)
+        # The text is returned for the key's UI only; never logged (the model
+        # has seen passwords)
+        confidence = self.last_prediction[0][1]
+        print(f"[FORWARD] Predicted {len(self.last_prediction)} keys ({confidence:.0%})")
+        return text
+
+    def save(self) -> None:
+        """Persist the model (copied under the predictor lock, written without it)"""
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+                self.predictor.save(self.state_path, codecs=self.codecs)
+            except OSError as e:
+                print(f"[FORWARD] Could not save model: {e}")
+
+    def shutdown(self) -> None:
+        """Save the model on exit"""
+        self.save()
+
+    def get_status(self) -> dict:
+        """Return key status plus predictor stats"""
+        status = super().get_status()
+        status['predictor'] = self.predictor.get_status()
+        status['keystroke_interval'] = self._key_interval
+        return status
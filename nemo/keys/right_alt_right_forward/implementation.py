@@ -0,0 +1,4 @@
+"""ForwardKey - Temporal Prediction Implementation"""
+from .forward_key import ForwardKey
+
+__all__ = ['ForwardKey']
@@ -0,0 +1,312 @@
+"""
+KeystrokePredictor - Online variable-order n-gram predictor (PPM-style)
+
+Learns the keystroke/action stream incrementally and predicts what comes next.
+
+- Contexts of order 1..max_order are hashed into fixed-size direct-mapped
+  tables (one per order), so memory is bounded regardless of history length
+- Each slot keeps the top-k next symbols with 16-bit counts, updated
+  Space-Saving style; counts halve on overflow so old habits fade
+- update() and predict() touch max_order slots: O(1) per event
+- update() runs on the keyboard hook thread while predictions and saves
+  run elsewhere: all of them hold `lock`, predictions extend a scratch copy
+  of the history, and saves serialize a copy under the lock
+- State is a few flat arrays written verbatim to disk, so load is a read +
+  frombytes; with a CodecSet the file is one codec frame (the model can
+  hold typed passwords, so it should be encrypted when a key is set)
+"""
+
+from typing import Dict, List, Optional, Tuple
+from array import array
+import io
+import os
+import struct
+import threading
+
+from nemo.tools.codec import CodecSet
+
+
+MAGIC = b'NMPR'
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct('>4sHBBBI')  # magic, version, max_order, table_bits, top_k, vocab bytes
+
+FNV_PRIME = 0x100000001B3
+FNV_OFFSET = 0xCBF29CE484222325
+MASK64 = 0xFFFFFFFFFFFFFFFF
+COUNT_LIMIT = 0xFFFF
+
+
+class KeystrokePredictor:
+    """Bounded-memory online next-key predictor"""
+
+    def __init__(self, max_order: int = 4, table_bits: int = 14, top_k: int = 4,
+                 max_vocab: int = 4096):
+        """
+        Initialize predictor
+
+        Args:
+            max_order: Longest context (in keystrokes) considered
+            table_bits: log2 of slots per order
+            top_k: Next-symbol candidates kept per context
+            max_vocab: Distinct key names tracked (extra names share id 0)
+        """
+        self.max_order = max_order
+        self.table_bits = table_bits
+        self.table_size = 1 << table_bits
+        self.mask = self.table_size - 1
+        self.top_k = top_k
+        self.max_vocab = max_vocab
+
+        # Symbol id 0 is reserved for "unknown / vocabulary full"
+        self.symbols: List[str] = ['']
+        self.symbol_ids: Dict[str, int] = {}
+
+        size = self.table_size
+        self.tags = [array('I', bytes(4 * size)) for _ in range(max_order)]
+        self.slot_symbols = [array('H', bytes(2 * size * top_k)) for _ in range(max_order)]
+        self.slot_counts = [array('H', bytes(2 * size * top_k)) for _ in range(max_order)]
+
+        self.history: List[int] = []
+        self.updates = 0
+        self.lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Learning
+    # ------------------------------------------------------------------
+
+    def symbol_id(self, name: str) -> int:
+        """Id for a key name, registering it if there is room"""
+        sid = self.symbol_ids.get(name)
+        if sid is None:
+            if len(self.symbols) >= self.max_vocab:
+                return 0
+            sid = len(self.symbols)
+            self.symbols.append(name)
+            self.symbol_ids[name] = sid
+        return sid
+
+    def snapshot_history(self) -> List[int]:
+        """Copy of the current context, for predict_sequence(history=...)"""
+        with self.lock:
+            return self.history[-self.max_order:]
+
+    def _context_hashes(self, history: List[int]) -> List[int]:
+        """Hashes of the last 1..max_order symbols (most recent first)"""
+        hashes = []
+        h = FNV_OFFSET
+        for i in range(1, min(self.max_order, len(history)) + 1):
+            h = ((h ^ history[-i]) * FNV_PRIME) & MASK64
+            hashes.append(h)
+        return hashes
+
+    def update(self, name: str) -> None:
+        """Observe the next keystroke/action"""
+        with self.lock:
+            self._update(name)
+
+    def _update(self, name: str) -> None:
+        sid = self.symbol_id(name)
+        if sid == 0:
+            self.history.append(0)
+        else:
+            k = self.top_k
+            for order, h in enumerate(self._context_hashes(self.history)):
+                slot = (h & self.mask)
+                tag = (h >> 32) | 1
+                tags = self.tags[order]
+                syms = self.slot_symbols[order]
+                counts = self.slot_counts[order]
+                base = slot * k
+
+                if tags[slot] != tag:
+                    # Direct-mapped: a new context evicts the old one
+                    tags[slot] = tag
+                    for j in range(base, base + k):
+                        syms[j] = 0
+                        counts[j] = 0
+
+                weakest = base
+                for j in range(base, base + k):
+                    if syms[j] == sid:
+                        if counts[j] == COUNT_LIMIT:
+                            for m in range(base, base + k):
+                                counts[m] >>= 1
+                        counts[j] += 1
+                        break
+                    if counts[j] < counts[weakest]:
+                        weakest = j
+                else:
+                    # Space-Saving: replace the weakest candidate
+                    syms[weakest] = sid
+                    counts[weakest] = min(counts[weakest] + 1, COUNT_LIMIT)
+            self.history.append(sid)
+
+        if len(self.history) > 4 * self.max_order:
+            del self.history[:-self.max_order]
+        self.updates += 1
+
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+
+    def predict(self, threshold: float = 0.0) -> Optional[Tuple[str, float, int]]:
+        """
+        Most likely next keystroke
+
+        Walks from the longest matching context down (PPM escape): the first
+        order whose best candidate reaches threshold wins, otherwise the most
+        confident candidate seen.
+
+        Returns:
+            (key name, confidence, order) or None when nothing is known
+        """
+        with self.lock:
+            return self._predict(self.history, threshold)
+
+    def _predict(self, history: List[int], threshold: float) -> Optional[Tuple[str, float, int]]:
+        best = None
+        for order, h in reversed(list(enumerate(self._context_hashes(history)))):
+            candidate = self._best_in_slot(order, h)
+            if candidate is None:
+                continue
+            sid, confidence = candidate
+            if best is None or confidence > best[1]:
+                best = (self.symbols[sid], confidence, order + 1)
+            if confidence >= threshold:
+                return self.symbols[sid], confidence, order + 1
+        return best
+
+    def predict_sequence(self, max_length: int = 8, threshold: float = 0.7,
+                         min_joint: float = 0.3,
+                         history: Optional[List[int]] = None) -> List[Tuple[str, float]]:
+        """
+        Greedy multi-step prediction
+
+        Extends a scratch history one predicted key at a time while each step
+        reaches threshold and the joint confidence stays above min_joint.
+
+        Args:
+            history: Context to predict from (default: current history)
+        """
+        sequence = []
+        joint = 1.0
+        with self.lock:
+            scratch = list(self.history if history is None else history)
+            for _ in range(max_length):
+                prediction = self._predict(scratch, threshold)
+                if prediction is None or prediction[1] < threshold:
+                    break
+                joint *= prediction[1]
+                if joint < min_joint:
+                    break
+                sequence.append((prediction[0], prediction[1]))
+                scratch.append(self.symbol_ids[prediction[0]])
+        return sequence
+
+    def _best_in_slot(self, order: int, h: int) -> Optional[Tuple[int, float]]:
+        slot = h & self.mask
+        if self.tags[order][slot] != ((h >> 32) | 1):
+            return None
+        k = self.top_k
+        base = slot * k
+        syms = self.slot_symbols[order]
+        counts = self.slot_counts[order]
+        total = 0
+        best_j = base
+        for j in range(base, base + k):
+            total += counts[j]
+            if counts[j] > counts[best_j]:
+                best_j = j
+        if total == 0 or syms[best_j] == 0:
+            return None
+        # +1 escape mass so a context seen once is not 100% confident
+        return syms[best_j], counts[best_j] / (total + 1)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Serialize learned state (a consistent copy, safe to write from another thread)"""
+        with self.lock:
+            vocab = '\n'.join(self.symbols[1:]).encode('utf-8')
+            parts = [FILE_HEADER.pack(MAGIC, FILE_VERSION, self.max_order,
+                                      self.table_bits, self.top_k, len(vocab)), vocab]
+            for order in range(self.max_order):
+                parts += [self.tags[order].tobytes(), self.slot_symbols[order].tobytes(),
+                          self.slot_counts[order].tobytes()]
+        return b''.join(parts)
+
+    @staticmethod
+    def write_state(path: str, state: bytes, codecs: Optional[CodecSet] = None) -> None:
+        """Write to_bytes() output atomically, encoded with codecs if given"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(codecs.encode(state, 'keystrokes') if codecs else state)
+        os.replace(tmp_path, path)
+
+    def save(self, path: str, codecs: Optional[CodecSet] = None) -> None:
+        """Write learned state atomically"""
+        self.write_state(path, self.to_bytes(), codecs)
+
+    @classmethod
+    def load(cls, path: str, max_vocab: int = 4096,
+             codecs: Optional[CodecSet] = None) -> 'KeystrokePredictor':
+        """Load state written by save() (plain or encoded)"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:4] != MAGIC:
+            if codecs is None:
+                raise ValueError(f"{path} is encoded but no codecs are configured")
+            data = codecs.decode(data)
+        elif codecs is not None:
+            codecs.check_plaintext(path)
+        return cls.from_bytes(data, max_vocab, path)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_vocab: int = 4096,
+                   name: str = 'state') -> 'KeystrokePredictor':
+        """Rebuild a predictor from to_bytes() output"""
+        if len(data) < FILE_HEADER.size:
+            raise ValueError(f"Truncated predictor state file: {name}")
+        with io.BytesIO(data) as f:
+            magic, version, max_order, table_bits, top_k, vocab_len = \
+                FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+            if magic != MAGIC or version != FILE_VERSION:
+                raise ValueError(f"Not a predictor state file: {name}")
+
+            predictor = cls(max_order=max_order, table_bits=table_bits, top_k=top_k,
+                            max_vocab=max_vocab)
+            vocab = f.read(vocab_len).decode('utf-8')
+            for name in vocab.split('\n') if vocab else []:
+                predictor.symbol_id(name)
+
+            size = predictor.table_size
+            for order in range(max_order):
+                predictor.tags[order] = _read_array(f, 'I', size)
+                predictor.slot_symbols[order] = _read_array(f, 'H', size * top_k)
+                predictor.slot_counts[order] = _read_array(f, 'H', size * top_k)
+        return predictor
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the count tables"""
+        return sum(a.itemsize * len(a)
+                   for tables in (self.tags, self.slot_symbols, self.slot_counts)
+                   for a in tables)
+
+    def get_status(self) -> dict:
+        """Return predictor status"""
+        return {
+            'updates': self.updates,
+            'vocabulary': len(self.symbols) - 1,
+            'max_order': self.max_order,
+            'table_bytes': self.memory_bytes(),
+        }
+
+
+def _read_array(f, typecode: str, length: int) -> array:
+    data = array(typecode)
+    data.frombytes(f.read(data.itemsize * length))
+    if len(data) != length:
+        raise ValueError("Truncated predictor state file")
+    return data
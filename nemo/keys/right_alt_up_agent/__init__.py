@@ -1 +1,4 @@
 """RIGHT ALT + UP - Nemo Agent Synthesis (File Extraction) - PROPRIETARY"""
+from .implementation import AgentSynthesisKey
+
+__all__ = ['AgentSynthesisKey']
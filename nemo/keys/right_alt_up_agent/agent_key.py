@@ -0,0 +1,185 @@
+"""
+AgentSynthesisKey - Agent Synthesis over recently touched files
+
+RIGHT ALT + UP hotkey - Release to gather the files you worked on within
+temporal_context_window and extract their text for synthesis.
+
+Uses:
+- FileExtractor tool (streaming extraction in a process pool, cached by
+  path/mtime/size)
+
+Nothing runs on the hook thread: discovery and extraction happen in a
+background thread. The extraction pool follows the ResourceGovernor's
+indexing_concurrency; while background work is paused, synthesis still
+runs (it was asked for) but adding its text to the index waits until the
+governor resumes.
+"""
+
+from nemo.tools import NemoKey
+from nemo.tools.file_extraction import FileExtractor
+from typing import Any, Dict, List, Optional
+import os
+import threading
+import time
+
+from .config import AgentSynthesisConfig
+
+
+class AgentSynthesisKey(NemoKey):
+    """
+    Agent Synthesis Key
+
+    Release RIGHT ALT + UP to extract recently modified documents and code
+    into one synthesis context.
+    """
+
+    def __init__(self, config: type = AgentSynthesisConfig,
+                 watch_dirs: Optional[List[str]] = None, index=None):
+        """
+        Args:
+            config: AgentSynthesisConfig-like settings
+            watch_dirs: Directories searched for recent files
+            index: Optional VectorIndex; extracted text is added for
+                semantic search
+        """
+        super().__init__(
+            key_name="Agent Synthesis",
+            key_combo="right alt + up",
+            description="Synthesize the files you just worked on"
+        )
+        self.settings = config
+        self.watch_dirs = [os.path.expanduser(d) for d in (watch_dirs or config.watch_dirs)]
+        self.extractor = FileExtractor(
+            supported_file_types=config.supported_file_types,
+            max_file_size_mb=config.max_file_size_mb,
+            cache_ttl=config.temporal_context_window,
+            max_chars=config.max_chars_per_file,
+        )
+
+        self.index = index
+        self._indexed = set()  # (path, mtime_ns) already added to the index
+        self.indexing_paused = False
+        self._deferred: List[Dict[str, Any]] = []  # results held while paused
+        self._deferred_lock = threading.Lock()
+        self.worker: Optional[threading.Thread] = None
+        self.last_results: List[Dict[str, Any]] = []
+        self.last_synthesis: Optional[str] = None
+
+    def apply_resource_settings(self, settings: Dict[str, Any]) -> None:
+        """Follow ResourceGovernor's indexing_concurrency and background_paused"""
+        self.extractor.set_max_workers(settings['indexing_concurrency'])
+        with self._deferred_lock:
+            self.indexing_paused = settings['background_paused']
+            resume = not self.indexing_paused and self._deferred
+        if resume:
+            threading.Thread(target=self._index_deferred, daemon=True).start()
+
+    def on_press(self) -> None:
+        """Called when RIGHT ALT + UP pressed"""
+        pass
+
+    def on_hold(self, duration: float) -> None:
+        """Called while held"""
+        pass
+
+    def on_release(self, total_duration: float) -> Optional[threading.Thread]:
+        """Called when released - synthesize in the background"""
+        if self.worker is not None and self.worker.is_alive():
+            print("[AGENT] Synthesis already running")
+            return None
+        self.worker = threading.Thread(target=self.synthesize, daemon=True)
+        self.worker.start()
+        return self.worker
+
+    def recent_files(self, now: Optional[float] = None) -> List[str]:
+        """Supported files modified within temporal_context_window, newest first"""
+        now = time.time() if now is None else now
+        cutoff = now - self.settings.temporal_context_window
+        types = {t.lower() for t in self.settings.supported_file_types}
+        found = []
+
+        for root in self.watch_dirs:
+            if not os.path.isdir(root):
+                continue
+            base_depth = root.rstrip(os.sep).count(os.sep)
+            for dirpath, dirnames, filenames in os.walk(root):
+                if dirpath.count(os.sep) - base_depth >= self.settings.scan_depth:
+                    dirnames[:] = []
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                for name in filenames:
+                    if os.path.splitext(name)[1].lower() not in types:
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        mtime = os.stat(path).st_mtime
+                    except OSError:
+                        continue
+                    if mtime >= cutoff:
+                        found.append((mtime, path))
+
+        found.sort(reverse=True)
+        return [path for _, path in found[:self.settings.max_files]]
+
+    def synthesize(self, paths: Optional[List[str]] = None) -> Optional[str]:
+        """Extract files (default: recent files) and build the synthesis context"""
+        paths = self.recent_files() if paths is None else paths
+        if not paths:
+            print("[AGENT] No recently modified files")
+            return None
+
+        start = time.time()
+        self.last_results = self.extractor.extract(paths)
+        sections = []
+        for result in self.last_results:
+            if result['error']:
+                print(f"[AGENT] Skipped {result['path']}: {result['error']}")
+                continue
+            note = " (truncated)" if result['truncated'] else ""
+            sections.append(f"## {result['path']}{note}\n" + ''.join(result['chunks']))
+            if self.index is None:
+                continue
+            with self._deferred_lock:
+                if self.indexing_paused:
+                    self._deferred.append(result)
+                    continue
+            self._index_result(result)
+
+        self.last_synthesis = '\n\n'.join(sections)
+        print(f"[AGENT] Synthesized {len(sections)} files, {len(self.last_synthesis):,} chars "
+              f"in {time.time() - start:.2f}s")
+        return self.last_synthesis
+
+    def _index_result(self, result: Dict[str, Any], piece_chars: int = 1000) -> None:
+        """Add extracted text to the context index in ~piece_chars pieces"""
+        try:
+            version = (result['path'], os.stat(result['path']).st_mtime_ns)
+        except OSError:
+            return
+        if version in self._indexed:
+            return
+        self._indexed.add(version)
+        text = ''.join(result['chunks'])
+        pieces = [text[i:i + piece_chars] for i in range(0, len(text), piece_chars)]
+        if pieces:
+            self.index.add(pieces, source='file',
+                           metadata=[{'path': result['path']}] * len(pieces))
+
+    def _index_deferred(self) -> None:
+        """Index results held back while background work was paused"""
+        with self._deferred_lock:
+            results, self._deferred = self._deferred, []
+        for result in results:
+            self._index_result(result)
+
+    def shutdown(self) -> None:
+        """Stop extraction workers"""
+        self.extractor.shutdown()
+
+    def get_status(self) -> dict:
+        """Return key status plus extractor stats"""
+        status = super().get_status()
+        status['extractor'] = self.extractor.get_status()
+        status['watch_dirs'] = self.watch_dirs
+        status['indexing_paused'] = self.indexing_paused
+        status['deferred_results'] = len(self._deferred)
+        return status
@@ -5,3 +5,9 @@ class AgentSynthesisConfig:
     supported_file_types = ['.txt', '.py', '.xlsx', '.pdf', '.md']
     max_file_size_mb = 10
     temporal_context_window = 300  # 5 minutes
+    
+    # File discovery and extraction
+    watch_dirs = ['~/Documents', '~/Desktop', '~/Downloads']
+    scan_depth = 2  # directory levels below each watch dir
+    max_files = 20  # most recently modified files per synthesis
+    max_chars_per_file = 200_000
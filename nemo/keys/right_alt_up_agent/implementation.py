@@ -0,0 +1,4 @@
+"""AgentSynthesisKey - Agent Synthesis Implementation"""
+from .agent_key import AgentSynthesisKey
+
+__all__ = ['AgentSynthesisKey']
@@ -1 +1,4 @@
 """RIGHT SHIFT - Speech-to-Text with Highlighted Text Reading"""
+from .implementation import STTKey
+
+__all__ = ['STTKey']
@@ -6,3 +6,5 @@ class STTConfig:
     energy_threshold = 300  # ultra-sensitive
     language = 'en-US'
     dynamic_energy_threshold = False
+    min_hold = 0.3  # seconds; until learned from usage
+    insert_confidence = 0.80  # lower-confidence transcripts are only shown
@@ -10,8 +10,16 @@ Uses:
 """
 
 from nemo.tools import NemoKey, AudioCapture
+from nemo.tools.metrics import get_registry
+from nemo.tools.tracing import get_tracer, to_thread
+from nemo.tools.usage_store import (ENGINE, HOLD, OK, LOW_CONFIDENCE, FAILED, SPEECH, SILENT,
+                                    FALLBACK, get_usage_store)
 import speech_recognition as sr
-from typing import Optional
+from typing import Optional, Tuple
+import threading
+import time
+
+from .config import STTConfig
 
 
 class STTKey(NemoKey):
@@ -22,25 +30,48 @@ class STTKey(NemoKey):
     Release to insert transcript at cursor position.
     """
     
+    # Engines in default order, with the confidence of their transcripts:
+    # Google (online, accurate), Sphinx (offline, less accurate), Bing
+    # (online, reliable)
+    ENGINES = {'google': 0.95, 'sphinx': 0.75, 'bing': 0.90}
+    
     def __init__(self):
         super().__init__(
             key_name="Speech-to-Text",
             key_combo="right shift",
             description="Hold to record and transcribe speech"
         )
-        self.audio = AudioCapture(energy_threshold=300, timeout=5)
+        self.audio = AudioCapture(
+            energy_threshold=STTConfig.energy_threshold,
+            timeout=STTConfig.mic_timeout,
+            dynamic_energy_threshold=STTConfig.dynamic_energy_threshold,
+        )
         self.recognizer = sr.Recognizer()
-        self.recognizer.energy_threshold = 300
-        self.recognizer.dynamic_energy_threshold = False
+        self.recognizer.energy_threshold = STTConfig.energy_threshold
+        self.recognizer.dynamic_energy_threshold = STTConfig.dynamic_energy_threshold
         
         # Recording state
         self.recording = False
         self.transcript = None
         self.confidence = 0.0
+        
+        # Transcription started at end of speech, before release:
+        # (utterance count, thread, [transcript, confidence])
+        self._early: Optional[Tuple[int, threading.Thread, list]] = None
+        
+        # Per-engine transcription latency
+        metrics = get_registry()
+        self.engine_latency = {
+            engine: metrics.histogram('stt_transcribe_seconds', "STT engine latency",
+                                      engine=engine)
+            for engine in ('google', 'sphinx', 'bing')
+        }
+        self.tracer = get_tracer()
     
     def on_press(self) -> None:
         """Called when RIGHT SHIFT pressed"""
-        self.audio.start_recording()
+        self._early = None
+        self.audio.start_recording(on_speech_end=self._on_speech_end)
         self.recording = True
         self.transcript = None
         self.confidence = 0.0
@@ -54,17 +85,39 @@ class STTKey(NemoKey):
     
     def on_release(self, total_duration: float) -> Optional[str]:
         """Called when RIGHT SHIFT released - transcribe and insert"""
+        return self._deliver(self._finish(total_duration))
+    
+    async def on_release_async(self, total_duration: float) -> Optional[str]:
+        """
+        on_release in stages (AsyncRuntime): a new press during
+        transcription cancels the interaction before anything is typed
+        """
+        transcript = await to_thread(self._finish, total_duration)
+        return await to_thread(self._deliver, transcript)
+    
+    def _finish(self, total_duration: float) -> Optional[str]:
+        """Stop recording and transcribe"""
         self.audio.stop_recording()
         self.recording = False
         
-        if total_duration < 0.3:
+        # Label the hold (VAD: speech or not) to learn the minimum hold
+        usage = get_usage_store()
+        usage.record(self.key_combo, HOLD, SPEECH if self.audio.has_speech() else SILENT,
+                     hold=total_duration)
+        if total_duration < usage.min_hold(self.key_combo, STTConfig.min_hold):
             # Too short, ignore
             return None
         
-        # Transcribe using multiple engines
-        transcript = self._transcribe()
-        
-        if transcript and self.confidence >= 0.80:
+        # Transcribe using multiple engines (reusing the early result when
+        # nothing was said after the last pause)
+        transcript = self._early_result()
+        if transcript is None and self.audio.has_speech():
+            transcript = self._transcribe()
+        return transcript
+    
+    def _deliver(self, transcript: Optional[str]) -> Optional[str]:
+        """Insert or report the transcript"""
+        if transcript and self.confidence >= STTConfig.insert_confidence:
             # High confidence - insert directly
             self._insert_text(transcript)
             return transcript
@@ -76,63 +129,105 @@ class STTKey(NemoKey):
             # No speech detected
             return None
     
-    def _transcribe(self) -> Optional[str]:
-        """Transcribe audio using fallback engines"""
+    def prewarm(self) -> None:
+        """Open the shared microphone stream ahead of a usual hour of use"""
+        self.audio.prewarm()
+    
+    def _timed(self, engine: str, attempt, audio) -> Optional[str]:
+        """Run one engine attempt and record its latency"""
+        start = time.perf_counter_ns()
         try:
-            # Try Google Speech Recognition (online, accurate)
-            transcript = self._try_google()
-            if transcript:
-                self.confidence = 0.95
-                return transcript
-        except:
-            pass
+            with self.tracer.span(f'stt.{engine}'):
+                return attempt(audio)
+        finally:
+            self.engine_latency[engine].record_since(start)
+    
+    def _on_speech_end(self) -> None:
+        """Speaker paused while the key is still held: start transcribing"""
+        utterances = self.audio.endpointer.segments
+        result = [None, 0.0]
         
-        try:
-            # Fall back to Sphinx (offline, less accurate)
-            transcript = self._try_sphinx()
-            if transcript:
-                self.confidence = 0.75
-                return transcript
-        except:
-            pass
+        def run():
+            audio = self.audio.get_audio_data(self.audio.peek_pcm())
+            if audio is not None:
+                result[:] = self._recognize(audio)
         
-        try:
-            # Final fallback: Bing (online, reliable)
-            transcript = self._try_bing()
+        thread = threading.Thread(target=run, daemon=True)
+        self._early = (utterances, thread, result)
+        thread.start()
+    
+    def _early_result(self) -> Optional[str]:
+        """Early transcript, if it covers everything that was said"""
+        early, self._early = self._early, None
+        if early is None:
+            return None
+        utterances, thread, result = early
+        endpointer = self.audio.endpointer
+        if endpointer.segments != utterances or endpointer.in_speech:
+            return None  # spoke again after the pause
+        thread.join()
+        transcript, self.confidence = result
+        return transcript
+    
+    def _transcribe(self) -> Optional[str]:
+        """Transcribe audio using fallback engines"""
+        # One recording from the shared microphone, tried on every engine
+        audio = self.audio.get_audio_data()
+        if audio is None:
+            # No speech detected by VAD: don't call any recognizer
+            self.confidence = 0.0
+            return None
+        transcript, self.confidence = self._recognize(audio)
+        return transcript
+    
+    def _recognize(self, audio) -> Tuple[Optional[str], float]:
+        """
+        Run the engine fallback chain (the fastest engine to a confident
+        transcript first, once learned); returns (transcript, confidence)
+        """
+        usage = get_usage_store()
+        order = usage.engine_order(self.key_combo, list(self.ENGINES))
+        for position, engine in enumerate(order):
+            confidence = self.ENGINES[engine]
+            start = time.perf_counter_ns()
+            try:
+                transcript = self._timed(engine, getattr(self, f'_try_{engine}'), audio)
+            except:
+                transcript = None
+            if not transcript:
+                outcome = FAILED
+            elif confidence >= STTConfig.insert_confidence:
+                outcome = OK
+            else:
+                outcome = LOW_CONFIDENCE
+            usage.record(self.key_combo, ENGINE, outcome,
+                         latency=(time.perf_counter_ns() - start) / 1e9,
+                         confidence=confidence if transcript else 0.0, engine=engine,
+                         flags=FALLBACK if position else 0)
             if transcript:
-                self.confidence = 0.90
-                return transcript
-        except:
-            pass
+                return transcript, confidence
         
-        self.confidence = 0.0
-        return None
+        return None, 0.0
     
-    def _try_google(self) -> Optional[str]:
+    def _try_google(self, audio) -> Optional[str]:
         """Try Google Speech Recognition"""
         try:
-            with sr.Microphone() as source:
-                audio = self.recognizer.listen(source, timeout=5)
             text = self.recognizer.recognize_google(audio, language='en-US')
             return text
         except:
             return None
     
-    def _try_sphinx(self) -> Optional[str]:
+    def _try_sphinx(self, audio) -> Optional[str]:
         """Try Sphinx (offline)"""
         try:
-            with sr.Microphone() as source:
-                audio = self.recognizer.listen(source, timeout=5)
             text = self.recognizer.recognize_sphinx(audio)
             return text
         except:
             return None
     
-    def _try_bing(self) -> Optional[str]:
+    def _try_bing(self, audio) -> Optional[str]:
         """Try Microsoft Bing Speech Recognition"""
         try:
-            with sr.Microphone() as source:
-                audio = self.recognizer.listen(source, timeout=5)
             text = self.recognizer.recognize_bing(audio, language='en-US')
             return text
         except:
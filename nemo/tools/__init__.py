@@ -3,23 +3,38 @@ Nemo Tools - Reusable technology components
 
 PUBLIC TOOLS (Auditable):
 - NemoEngine: Core orchestrator and hotkey registry
+- AsyncRuntime: asyncio loop for cancellable key interactions
 - NemoKey: Base class for all hotkeys
 - AudioCapture: Microphone input abstraction
 - ScreenCapture: Screenshot abstraction
+- SnapshotStore: Snapshot history storage (with CompactionEngine)
+- FileExtractor: Streaming file text extraction (process pool + cache)
+- IsolatedKey: Run a key in a supervised worker process (shared-memory payloads)
+- UsageStore: Persistent per-key usage patterns (learned hold, engine order, hours)
 
 PROPRIETARY TOOLS (Compiled Only):
 - KeystrokeProcessor: NEMO CODE keystroke reversal
 - TemporalReasoner: Temporal inference logic
 """
 
-from .nemo_engine import NemoEngine
+from .nemo_engine import NemoEngine, AsyncRuntime
 from .nemo_key import NemoKey
 from .audio_capture import AudioCapture
 from .screen_capture import ScreenCapture
+from .snapshot_store import SnapshotStore, CompactionEngine
+from .file_extraction import FileExtractor
+from .key_worker import IsolatedKey
+from .usage_store import UsageStore
 
 __all__ = [
     'NemoEngine',
+    'AsyncRuntime',
     'NemoKey',
     'AudioCapture',
     'ScreenCapture',
+    'SnapshotStore',
+    'CompactionEngine',
+    'FileExtractor',
+    'IsolatedKey',
+    'UsageStore',
 ]
@@ -1,4 +1,8 @@
 """AudioCapture Tool - Microphone input abstraction"""
 from .capture import AudioCapture
+from .broker import (AudioBroker, AudioSource, PyAudioSource, WavFileSource,
+                     get_broker, set_broker)
+from .shared import SharedPcmRing, SharedPcmSource
 
-__all__ = ['AudioCapture']
+__all__ = ['AudioCapture', 'AudioBroker', 'AudioSource', 'PyAudioSource', 'WavFileSource',
+           'get_broker', 'set_broker', 'SharedPcmRing', 'SharedPcmSource']
@@ -0,0 +1,489 @@
+"""
+AudioBroker - One shared microphone stream for every audio key
+
+Opening a microphone per attempt re-probes the device each time (hundreds of
+ms) and lets two keys fight over it. The broker keeps a single input stream
+open and writes PCM into one ring buffer; subscribers (AudioCapture
+instances) only hold read positions into that ring:
+
+- Zero-copy fan-out: callbacks receive memoryviews of the ring, and
+  Subscription.views() returns slices of it without copying
+- Warm stream: opened on first use (or prewarm()) and kept open until idle
+  for idle_timeout seconds
+- Hot-plug: read errors close the source and reopen it with backoff; the
+  source is also reopened when the default input device changes (probed
+  on a separate watcher thread, never between reads)
+
+Sources: PyAudioSource (microphone via PyAudio, optional) and WavFileSource
+(a WAV file, optionally paced in real time - for tests and benchmarks).
+"""
+
+from typing import Callable, List, Optional
+import threading
+import time
+import wave
+
+try:
+    import pyaudio
+except ImportError:  # optional
+    pyaudio = None
+
+from ..metrics import get_registry
+
+
+class AudioSource:
+    """Base class for PCM sources (16-bit mono)"""
+
+    sample_rate = 16000
+    sample_width = 2
+    block_frames = 320  # 20 ms at 16 kHz
+
+    def open(self) -> None:
+        raise NotImplementedError
+
+    def read(self) -> bytes:
+        """Next block of PCM; raises OSError when the device goes away"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def device_changed(self) -> bool:
+        """True if the source should be reopened on another device (watcher thread)"""
+        return False
+
+    @property
+    def block_seconds(self) -> float:
+        return self.block_frames / self.sample_rate
+
+
+class PyAudioSource(AudioSource):
+    """Default (or chosen) microphone through PyAudio"""
+
+    def __init__(self, device_index: Optional[int] = None, sample_rate: int = 16000,
+                 block_frames: int = 320):
+        if pyaudio is None:
+            raise RuntimeError("PyAudio not installed - microphone input unavailable")
+        self.device_index = device_index
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self._audio = None
+        self._stream = None
+        self._opened_device: Optional[int] = None
+
+    def _default_device(self) -> Optional[int]:
+        try:
+            return self._audio.get_default_input_device_info()['index']
+        except (IOError, OSError):
+            return None
+
+    def open(self) -> None:
+        # A fresh PyAudio instance re-enumerates devices (hot-plug)
+        self._audio = pyaudio.PyAudio()
+        self._opened_device = (self.device_index if self.device_index is not None
+                               else self._default_device())
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16, channels=1, rate=self.sample_rate, input=True,
+            input_device_index=self._opened_device, frames_per_buffer=self.block_frames,
+        )
+
+    def read(self) -> bytes:
+        return self._stream.read(self.block_frames, exception_on_overflow=False)
+
+    def close(self) -> None:
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except (IOError, OSError):
+                pass
+            self._stream = None
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
+
+    def device_changed(self) -> bool:
+        if self.device_index is not None or self._audio is None:
+            return False
+        # PortAudio caches the device list; probe with a throwaway instance
+        probe = pyaudio.PyAudio()
+        try:
+            current = probe.get_default_input_device_info()['index']
+        except (IOError, OSError):
+            current = None
+        finally:
+            probe.terminate()
+        return current != self._opened_device
+
+
+class WavFileSource(AudioSource):
+    """PCM from a 16-bit mono WAV file"""
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = True,
+                 block_frames: int = 320):
+        """
+        Args:
+            path: WAV file (16-bit mono)
+            realtime: Pace blocks like a live microphone
+            loop: Restart at end of file (otherwise pad with silence)
+        """
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.block_frames = block_frames
+        with wave.open(path, 'rb') as wav:
+            if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                raise ValueError("WavFileSource needs 16-bit mono audio")
+            self.sample_rate = wav.getframerate()
+            self.pcm = wav.readframes(wav.getnframes())
+        self._offset = 0
+        self._next_due = 0.0
+        self.opened = 0
+
+    def open(self) -> None:
+        self.opened += 1
+        self._next_due = time.perf_counter()
+
+    def read(self) -> bytes:
+        size = self.block_frames * self.sample_width
+        block = self.pcm[self._offset:self._offset + size]
+        self._offset += size
+        if len(block) < size:
+            if self.loop and self.pcm:
+                self._offset = size - len(block)
+                block += self.pcm[:self._offset]
+            else:
+                block += bytes(size - len(block))
+        if self.realtime:
+            self._next_due += self.block_seconds
+            delay = self._next_due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return block
+
+
+class Subscription:
+    """A reader's position in the broker's ring buffer"""
+
+    def __init__(self, broker: 'AudioBroker', position: int,
+                 callback: Optional[Callable[[memoryview], None]] = None):
+        self.broker = broker
+        self.position = position  # absolute byte offset of the next unread byte
+        self.start = position
+        self.callback = callback
+        self.overruns = 0
+        self.active = True
+
+    def available(self) -> int:
+        """Unread bytes"""
+        return self.broker.written - self.position
+
+    def views(self, max_bytes: Optional[int] = None) -> List[memoryview]:
+        """
+        Unread PCM as memoryviews of the ring (no copy) and advance
+
+        One view, or two when the range wraps. Views are valid until the
+        broker overwrites that part of the ring (ring_seconds later).
+        """
+        return self.broker._consume(self, max_bytes)
+
+    def read(self, max_bytes: Optional[int] = None) -> bytes:
+        """Unread PCM as bytes (one copy) and advance"""
+        return b''.join(self.views(max_bytes))
+
+    def peek(self, max_bytes: Optional[int] = None) -> bytes:
+        """Unread PCM as bytes without advancing"""
+        position = self.position
+        data = b''.join(self.views(max_bytes))
+        self.position = position
+        return data
+
+    def wait(self, min_bytes: int, timeout: float) -> bool:
+        """Block until min_bytes are unread"""
+        return self.broker._wait(self, min_bytes, timeout)
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class AudioBroker:
+    """Process-wide shared microphone stream"""
+
+    def __init__(self, source_factory: Optional[Callable[[], AudioSource]] = None,
+                 ring_seconds: float = 30.0, idle_timeout: float = 300.0,
+                 device_check_interval: float = 2.0):
+        """
+        Args:
+            source_factory: Creates the audio source (default: PyAudioSource)
+            ring_seconds: Audio kept in the shared ring buffer
+            idle_timeout: Close the stream after this long with no subscribers
+            device_check_interval: Seconds between default-device checks
+        """
+        self.source_factory = source_factory or PyAudioSource
+        self.ring_seconds = ring_seconds
+        self.idle_timeout = idle_timeout
+        self.device_check_interval = device_check_interval
+
+        self.source: Optional[AudioSource] = None
+        self.sample_rate = 16000
+        self.sample_width = 2
+        self.ring = bytearray()
+        self._ring_view = memoryview(self.ring)
+        self.written = 0
+
+        self.subscribers: List[Subscription] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stop.set()
+        self._ready = threading.Event()
+        self._device_switch = threading.Event()
+        self._last_active = time.monotonic()
+        self.state = 'closed'  # closed, opening, streaming, reconnecting
+        self.reopens = 0
+        self.last_error: Optional[str] = None
+
+        metrics = get_registry()
+        self.open_time = metrics.histogram('audio_stream_open_seconds', "Audio stream open latency")
+        self.overrun_count = metrics.counter('audio_overruns_total', "Subscriber ring overruns")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def prewarm(self, wait: float = 0.0) -> bool:
+        """Open the stream now (optionally wait up to `wait` seconds)"""
+        with self._cond:
+            self._last_active = time.monotonic()
+            running = self._thread is not None and not self._stop.is_set()
+            previous = self._thread
+            if not running:
+                self._stop = threading.Event()
+                self._ready.clear()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                                daemon=True, name='nemo-audio-broker')
+        if not running:
+            # An idle-stopped capture thread may still be closing its source
+            if previous is not None:
+                previous.join()
+            self._thread.start()
+        return self._ready.wait(wait) if wait else self._ready.is_set()
+
+    def stop(self) -> None:
+        """Close the stream"""
+        with self._cond:
+            self._stop.set()
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=2)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stop.is_set()
+
+    def _open_source(self) -> None:
+        start = time.perf_counter_ns()
+        self.state = 'opening'
+        self._device_switch.clear()
+        source = self.source_factory()
+        source.open()
+        self.open_time.record_since(start)
+
+        with self._cond:
+            if (source.sample_rate != self.sample_rate or not self.ring):
+                self.sample_rate = source.sample_rate
+                self.sample_width = source.sample_width
+                block = source.block_frames * source.sample_width
+                blocks = max(2, int(self.ring_seconds / source.block_seconds))
+                self.ring = bytearray(block * blocks)
+                self._ring_view = memoryview(self.ring)
+                for subscription in self.subscribers:
+                    subscription.position = self.written
+            self.source = source
+            self.state = 'streaming'
+        self._ready.set()
+
+    def _close_source(self) -> None:
+        if self.source is not None:
+            try:
+                self.source.close()
+            except Exception:
+                pass
+            self.source = None
+
+    def _run(self, stop: threading.Event) -> None:
+        # Probing devices can take longer than a block (PyAudio re-enumerates
+        # them), so it runs beside the read loop and only raises a flag
+        watcher = threading.Thread(target=self._watch_device, args=(stop,), daemon=True,
+                                   name='nemo-audio-devices')
+        watcher.start()
+        backoff = 0.1
+        next_idle_check = time.monotonic() + self.device_check_interval
+        while not stop.is_set():
+            if self.source is None:
+                try:
+                    self._open_source()
+                    backoff = 0.1
+                except Exception as e:
+                    self.state = 'reconnecting'
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 2.0)
+                    continue
+
+            try:
+                block = self.source.read()
+            except (IOError, OSError) as e:
+                # Device unplugged or stream broken: reopen
+                print(f"[AUDIO] Input lost ({e}); reopening")
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._close_source()
+                self.reopens += 1
+                continue
+            self._publish(block)
+
+            if self._device_switch.is_set():
+                print("[AUDIO] Default input device changed; reopening")
+                self._close_source()
+                self.reopens += 1
+                continue
+            now = time.monotonic()
+            if now >= next_idle_check:
+                next_idle_check = now + self.device_check_interval
+                with self._cond:
+                    idle = not self.subscribers and now - self._last_active > self.idle_timeout
+                    if idle:
+                        stop.set()
+
+        self._close_source()
+        self.state = 'closed'
+        self._ready.clear()
+        watcher.join()
+
+    def _watch_device(self, stop: threading.Event) -> None:
+        """Flag a default-device change for the capture thread"""
+        while not stop.wait(self.device_check_interval):
+            source = self.source
+            if source is None or self._device_switch.is_set():
+                continue
+            try:
+                if source.device_changed() and source is self.source:
+                    self._device_switch.set()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def _publish(self, block: bytes) -> None:
+        """Copy one block into the ring and notify subscribers"""
+        size = len(self.ring)
+        with self._cond:
+            offset = self.written % size
+            end = offset + len(block)
+            if end <= size:
+                self.ring[offset:end] = block
+                view = self._ring_view[offset:end]
+            else:
+                first = size - offset
+                self.ring[offset:] = block[:first]
+                self.ring[:end - size] = block[first:]
+                view = memoryview(block)
+            self.written += len(block)
+            callbacks = [s.callback for s in self.subscribers if s.callback]
+            self._cond.notify_all()
+        for callback in callbacks:
+            try:
+                callback(view)
+            except Exception as e:
+                print(f"[AUDIO] Subscriber callback error: {e}")
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: Optional[Callable[[memoryview], None]] = None) -> Subscription:
+        """
+        Start receiving audio from now on
+
+        Args:
+            callback: Optional per-block callback (runs on the capture thread;
+                must be fast and must not keep the view)
+        """
+        self.prewarm()
+        with self._cond:
+            subscription = Subscription(self, self.written, callback)
+            self.subscribers.append(subscription)
+            self._last_active = time.monotonic()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._cond:
+            subscription.active = False
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+            self._last_active = time.monotonic()
+
+    def _consume(self, subscription: Subscription, max_bytes: Optional[int]) -> List[memoryview]:
+        with self._cond:
+            size = len(self.ring)
+            if not size:
+                return []
+            if self.written - subscription.position > size:
+                # Fell more than a ring behind: skip to the oldest data kept
+                subscription.overruns += 1
+                self.overrun_count.inc()
+                subscription.position = self.written - size
+            available = self.written - subscription.position
+            if max_bytes is not None:
+                available = min(available, max_bytes - max_bytes % self.sample_width)
+            offset = subscription.position % size
+            subscription.position += available
+
+            end = offset + available
+            if end <= size:
+                return [self._ring_view[offset:end]] if available else []
+            return [self._ring_view[offset:], self._ring_view[:end - size]]
+
+    def _wait(self, subscription: Subscription, min_bytes: int, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.written - subscription.position < min_bytes:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def get_status(self) -> dict:
+        """Return broker status"""
+        return {
+            'state': self.state,
+            'source': type(self.source).__name__ if self.source else None,
+            'sample_rate': self.sample_rate,
+            'subscribers': len(self.subscribers),
+            'buffered_seconds': min(self.written, len(self.ring))
+                                 / (self.sample_rate * self.sample_width),
+            'reopens': self.reopens,
+            'last_error': self.last_error,
+        }
+
+
+_broker: Optional[AudioBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> AudioBroker:
+    """Process-wide audio broker"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = AudioBroker()
+        return _broker
+
+
+def set_broker(broker: Optional[AudioBroker]) -> None:
+    """Replace the process-wide broker (e.g. with a WavFileSource one in tests)"""
+    global _broker
+    with _broker_lock:
+        if _broker is not None and _broker is not broker:
+            _broker.stop()
+        _broker = broker
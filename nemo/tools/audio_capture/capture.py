@@ -4,47 +4,168 @@ AudioCapture Tool - Microphone input abstraction
 Public tool for any key that needs audio input:
 - RIGHT SHIFT (speech-to-text)
 - RIGHT ALT (Gemini voice input)
+
+Audio comes from the process-wide AudioBroker: start_recording() subscribes
+to the shared stream (no device open on the hot path), stop_recording()
+collects the PCM recorded in between.
+
+Voice activity detection (vad.py) runs on the stream while recording: the
+collected PCM is trimmed to the speech region, recordings without speech
+come back empty (so keys can skip the recognizer), and on_speech_end fires
+as soon as the speaker pauses - before the key is released.
 """
 
-from typing import Optional, Callable
+from typing import Callable, Optional
+import threading
+
+from .broker import AudioBroker, get_broker
+from .vad import Endpointer, VoiceActivityDetector
+from ..metrics import get_registry
+
+try:
+    import speech_recognition as sr
+except ImportError:  # optional
+    sr = None
 
 
 class AudioCapture:
     """Handle microphone input for keys"""
-    
-    def __init__(self, energy_threshold: int = 300, timeout: int = 5):
+
+    def __init__(self, energy_threshold: int = 300, timeout: int = 5,
+                 broker: Optional[AudioBroker] = None,
+                 dynamic_energy_threshold: bool = False, vad: bool = True,
+                 end_silence_ms: int = 700):
         """
         Initialize audio capture
-        
+
         Args:
-            energy_threshold: Microphone sensitivity (lower = more sensitive)
+            energy_threshold: Microphone sensitivity (lower = more sensitive);
+                the VAD's RMS threshold (its minimum when dynamic)
             timeout: Recording timeout in seconds
+            broker: Shared audio stream (default: process-wide broker)
+            dynamic_energy_threshold: Adapt the threshold to the noise floor
+            vad: Trim silence, drop speechless recordings, detect end of speech
+            end_silence_ms: Pause that counts as end of speech
         """
         self.energy_threshold = energy_threshold
         self.timeout = timeout
         self.recording = False
-    
-    def start_recording(self) -> None:
-        """Start listening for audio"""
+        self.broker = broker
+        self.subscription = None
+        self.last_pcm = b''
+        self.raw_bytes = 0
+
+        self.vad_enabled = vad
+        self.vad = VoiceActivityDetector(energy_threshold=energy_threshold,
+                                         dynamic=dynamic_energy_threshold)
+        self.endpointer = Endpointer(self.vad, end_silence_ms)
+        self.on_speech_end: Optional[Callable[[], None]] = None
+        self.speech_ended = threading.Event()
+
+        metrics = get_registry()
+        self.trimmed_bytes = metrics.counter('audio_trimmed_bytes_total',
+                                             "PCM bytes removed as silence")
+        self.silent_recordings = metrics.counter('audio_silent_recordings_total',
+                                                 "Recordings with no speech")
+
+    def _broker(self) -> AudioBroker:
+        return self.broker if self.broker is not None else get_broker()
+
+    def prewarm(self) -> None:
+        """Open the shared stream ahead of the first recording"""
+        self._broker().prewarm()
+
+    def start_recording(self, on_speech_end: Optional[Callable[[], None]] = None) -> None:
+        """
+        Start listening for audio
+
+        Args:
+            on_speech_end: Called (on the audio thread - hand work off) each
+                time the speaker pauses for end_silence_ms after speaking
+        """
+        if self.subscription is not None:
+            self.subscription.close()
+        self.on_speech_end = on_speech_end
+        self.speech_ended.clear()
+        self.endpointer.reset()
+        callback = self._on_audio if self.vad_enabled else None
+        self.subscription = self._broker().subscribe(callback)
+        self.last_pcm = b''
         self.recording = True
-    
+
+    def _on_audio(self, block: memoryview) -> None:
+        """Per-block endpointing (broker thread)"""
+        if self.endpointer.feed(block) == 'end':
+            self.speech_ended.set()
+            if self.on_speech_end is not None:
+                self.on_speech_end()
+        elif self.endpointer.in_speech:
+            self.speech_ended.clear()
+
+    def _max_bytes(self) -> int:
+        broker = self.subscription.broker
+        return int(self.timeout * broker.sample_rate) * broker.sample_width
+
+    def peek_pcm(self) -> bytes:
+        """Speech recorded so far (trimmed), without stopping"""
+        if self.subscription is None:
+            return b''
+        pcm = self.subscription.peek(self._max_bytes())
+        return self._trim(pcm, count=False) if self.vad_enabled else pcm
+
     def stop_recording(self) -> Optional[str]:
         """Stop listening and return transcript (if STT)"""
         self.recording = False
+        if self.subscription is not None:
+            pcm = self.subscription.read(self._max_bytes())
+            self.subscription.close()
+            self.subscription = None
+            self.raw_bytes = len(pcm)
+            self.last_pcm = self._trim(pcm) if self.vad_enabled else pcm
         return None
-    
+
+    def _trim(self, pcm: bytes, count: bool = True) -> bytes:
+        trimmed = self.vad.trim(pcm)
+        if count:
+            self.trimmed_bytes.inc(len(pcm) - len(trimmed))
+            if not trimmed:
+                self.silent_recordings.inc()
+        return trimmed
+
+    def has_speech(self) -> bool:
+        """Whether the last recording contained speech"""
+        return bool(self.last_pcm)
+
+    def get_pcm(self) -> bytes:
+        """PCM (16-bit mono) of the last recording: speech only when VAD is on"""
+        return self.last_pcm
+
+    def get_audio_data(self, pcm: Optional[bytes] = None):
+        """Last recording (or pcm) as speech_recognition.AudioData; None if no speech"""
+        pcm = self.last_pcm if pcm is None else pcm
+        if not pcm or sr is None:
+            return None
+        broker = self._broker()
+        return sr.AudioData(pcm, broker.sample_rate, broker.sample_width)
+
     def is_recording(self) -> bool:
         """Check if currently recording"""
         return self.recording
-    
+
     def set_energy_threshold(self, threshold: int) -> None:
         """Adjust microphone sensitivity"""
         self.energy_threshold = threshold
-    
+        self.vad.energy_threshold = float(threshold)
+
     def get_status(self) -> dict:
         """Return audio capture status"""
         return {
             'recording': self.recording,
             'energy_threshold': self.energy_threshold,
+            'dynamic_energy_threshold': self.vad.dynamic,
+            'noise_floor': self.vad.noise_floor,
             'timeout': self.timeout,
+            'last_recording_bytes': len(self.last_pcm),
+            'last_raw_bytes': self.raw_bytes,
+            'broker': self._broker().get_status(),
         }
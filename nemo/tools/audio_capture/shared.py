@@ -0,0 +1,141 @@
+"""
+Shared PCM ring - The microphone stream for other processes
+
+Isolated key workers must not open the microphone themselves (that is the
+broker's job). SharedPcmRing subscribes to this process's AudioBroker and
+copies each block into a multiprocessing.shared_memory ring; in the worker,
+SharedPcmSource reads that ring as an AudioSource, so the worker's own
+AudioBroker/AudioCapture work unchanged and no PCM is pickled.
+
+Layout: 24-byte header (bytes written: u64, sample rate: u32, sample width:
+u32, ring bytes: u64) followed by the ring. The writer updates the counter after copying a
+block; readers copy out [position, written).
+"""
+
+from typing import Optional
+from multiprocessing import shared_memory
+import struct
+import time
+
+from .broker import AudioBroker, AudioSource, get_broker
+
+HEADER = struct.Struct('<QIIQ')
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without taking ownership (the creator unlinks it)"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Older versions register the name again; spawned workers share the
+        # creator's resource tracker, where that is a no-op
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedPcmRing:
+    """Writer side: mirror a broker's stream into shared memory"""
+
+    def __init__(self, broker: Optional[AudioBroker] = None, seconds: float = 10.0):
+        """
+        Args:
+            broker: Stream to mirror (default: process-wide broker)
+            seconds: Ring length; readers lagging further lose audio
+        """
+        self.broker = broker if broker is not None else get_broker()
+        self.seconds = seconds
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.subscription = None
+        self.size = 0
+        self.written = 0
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.shm.name if self.shm is not None else None
+
+    def start(self) -> str:
+        """Create the segment, subscribe to the broker; returns the segment name"""
+        if self.shm is None:
+            rate, width = self.broker.sample_rate, self.broker.sample_width
+            self.size = int(self.seconds * rate) * width
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER.size + self.size)
+            HEADER.pack_into(self.shm.buf, 0, 0, rate, width, self.size)
+            self.broker.prewarm()
+            self.subscription = self.broker.subscribe(self._on_block)
+        return self.shm.name
+
+    def _on_block(self, block: memoryview) -> None:
+        """Copy one block in (broker thread), then publish the new count"""
+        buf, size = self.shm.buf, self.size
+        offset = self.written % size
+        first = min(len(block), size - offset)
+        buf[HEADER.size + offset:HEADER.size + offset + first] = block[:first]
+        if first < len(block):
+            buf[HEADER.size:HEADER.size + len(block) - first] = block[first:]
+        self.written += len(block)
+        struct.pack_into('<Q', buf, 0, self.written)
+
+    def stop(self) -> None:
+        """Unsubscribe and free the segment"""
+        if self.subscription is not None:
+            self.subscription.close()
+            self.subscription = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def get_status(self) -> dict:
+        return {'name': self.name, 'ring_bytes': self.size, 'written': self.written}
+
+
+class SharedPcmSource(AudioSource):
+    """Reader side: a SharedPcmRing as an AudioSource (use in the worker)"""
+
+    def __init__(self, name: str, block_frames: int = 320, stall_timeout: float = 2.0):
+        """
+        Args:
+            name: SharedPcmRing segment name
+            block_frames: Frames returned per read()
+            stall_timeout: Raise OSError (broker reconnects) after this long
+                without new audio
+        """
+        self.name = name
+        self.block_frames = block_frames
+        self.stall_timeout = stall_timeout
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.position = 0
+        self.ring_size = 0
+
+    def open(self) -> None:
+        self.shm = attach_shared_memory(self.name)
+        (written, self.sample_rate, self.sample_width,
+         self.ring_size) = HEADER.unpack_from(self.shm.buf, 0)
+        self.position = written  # live: start at the current end
+
+    def read(self) -> bytes:
+        need = self.block_frames * self.sample_width
+        deadline = time.monotonic() + self.stall_timeout
+        while True:
+            written = struct.unpack_from('<Q', self.shm.buf, 0)[0]
+            if written - self.position >= need:
+                break
+            if time.monotonic() > deadline:
+                raise OSError("Shared PCM feed stalled")
+            time.sleep(self.block_seconds / 4)
+        if written - self.position > self.ring_size - need:
+            self.position = written - need  # fell a whole ring behind: skip ahead
+        offset = self.position % self.ring_size
+        base = HEADER.size
+        if offset + need <= self.ring_size:
+            block = bytes(self.shm.buf[base + offset:base + offset + need])
+        else:
+            first = self.ring_size - offset
+            block = bytes(self.shm.buf[base + offset:base + self.ring_size]) + \
+                bytes(self.shm.buf[base:base + need - first])
+        self.position += need
+        return block
+
+    def close(self) -> None:
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
@@ -0,0 +1,204 @@
+"""
+VAD - Voice activity detection and endpointing for 16-bit mono PCM
+
+Frame-level features are computed for a whole buffer at once with NumPy:
+RMS energy (same units as speech_recognition's energy_threshold) and
+zero-crossing rate. A frame is speech when its energy clears the threshold
+and its zero-crossing rate is not noise-like (or its energy is far above the
+threshold). Decisions are smoothed: a run of min_speech_ms starts speech,
+hangover_ms of quiet ends it. Shorter runs - typically key clicks passing
+the high-energy override - are dropped and never bridged into speech.
+
+With dynamic=True the threshold follows an adaptive noise floor: it drops
+immediately to quieter non-speech frames and creeps up slowly, so a fan
+turning on raises the threshold but speech does not.
+
+VoiceActivityDetector.analyze()/trim() work on finished recordings;
+Endpointer.feed() works block by block on a live stream and reports when
+the speaker has stopped.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class VadResult:
+    """Speech region of a recording"""
+
+    __slots__ = ('has_speech', 'start', 'end', 'speech_frames', 'frames', 'frame_bytes')
+
+    def __init__(self, has_speech: bool, start: int, end: int, speech_frames: int,
+                 frames: int, frame_bytes: int):
+        self.has_speech = has_speech
+        self.start = start  # byte offsets, padding included
+        self.end = end
+        self.speech_frames = speech_frames
+        self.frames = frames
+        self.frame_bytes = frame_bytes
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class VoiceActivityDetector:
+    """Vectorized energy + zero-crossing VAD with adaptive noise floor"""
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20,
+                 energy_threshold: float = 300, dynamic: bool = False,
+                 floor_ratio: float = 3.0, max_zcr: float = 0.35,
+                 min_speech_ms: int = 60, hangover_ms: int = 300, pad_ms: int = 150):
+        """
+        Args:
+            sample_rate: PCM sample rate
+            frame_ms: Analysis frame length
+            energy_threshold: RMS threshold (minimum threshold when dynamic)
+            dynamic: Track the noise floor and raise the threshold with it
+            floor_ratio: Threshold = noise floor × floor_ratio (dynamic)
+            max_zcr: Zero-crossing rate above which moderate energy is noise
+            min_speech_ms: Speech needed to count as an utterance
+            hangover_ms: Quiet needed to end an utterance
+            pad_ms: Audio kept around speech when trimming
+        """
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_bytes = self.frame_samples * 2
+        self.energy_threshold = float(energy_threshold)
+        self.dynamic = dynamic
+        self.floor_ratio = floor_ratio
+        self.max_zcr = max_zcr
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.pad_frames = pad_ms // frame_ms
+
+        self.noise_floor: Optional[float] = None
+        # Per-frame multiplicative rise of the floor (~+35%/s at 20 ms frames)
+        self.floor_rise = 1.006
+
+    def features(self, pcm) -> Tuple[np.ndarray, np.ndarray]:
+        """(RMS energy, zero-crossing rate) per whole frame"""
+        samples = np.frombuffer(pcm, dtype='<i2')
+        frames = len(samples) // self.frame_samples
+        if frames == 0:
+            empty = np.zeros(0, dtype=np.float32)
+            return empty, empty
+        x = samples[:frames * self.frame_samples].reshape(frames, self.frame_samples)
+        xf = x.astype(np.float32)
+        energy = np.sqrt(np.einsum('ij,ij->i', xf, xf) / self.frame_samples)
+        signs = np.signbit(x)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_samples - 1)
+        return energy, zcr.astype(np.float32)
+
+    def thresholds(self, energy: np.ndarray) -> np.ndarray:
+        """Per-frame thresholds, updating the noise floor (dynamic mode)"""
+        if not self.dynamic:
+            return np.full(len(energy), self.energy_threshold, dtype=np.float32)
+        floor = (self.noise_floor if self.noise_floor is not None
+                 else self.energy_threshold / self.floor_ratio)
+        out = np.empty(len(energy), dtype=np.float32)
+        minimum, ratio, rise = self.energy_threshold, self.floor_ratio, self.floor_rise
+        # Sequential by nature, but only a compare and a multiply per frame
+        for i, e in enumerate(energy.tolist()):
+            threshold = floor * ratio
+            if threshold < minimum:
+                threshold = minimum
+            out[i] = threshold
+            if e < floor:
+                floor = e
+            elif e <= threshold:
+                floor = min(floor * rise, e)
+        self.noise_floor = floor
+        return out
+
+    def classify(self, pcm) -> np.ndarray:
+        """Raw per-frame speech decisions"""
+        energy, zcr = self.features(pcm)
+        if not len(energy):
+            return np.zeros(0, dtype=bool)
+        threshold = self.thresholds(energy)
+        return (energy > threshold) & ((zcr < self.max_zcr) | (energy > 3 * threshold))
+
+    def smooth(self, speech: np.ndarray) -> np.ndarray:
+        """Drop blips shorter than min_speech and bridge gaps shorter than hangover"""
+        if not speech.any():
+            return speech
+        # Run-length encode
+        edges = np.flatnonzero(np.diff(speech.astype(np.int8))) + 1
+        starts = np.concatenate(([0], edges))
+        lengths = np.diff(np.concatenate((starts, [len(speech)])))
+        values = speech[starts]
+
+        kept = values & (lengths >= self.min_speech_frames)
+        # Short silences between kept speech runs become speech; dropped
+        # blips (key clicks) are not silences and must not be bridged
+        before = np.concatenate(([False], np.logical_or.accumulate(kept)[:-1]))
+        after = np.concatenate((np.logical_or.accumulate(kept[::-1])[::-1][1:], [False]))
+        gaps = ~values & (lengths < self.hangover_frames) & before & after
+        return np.repeat(kept | gaps, lengths)
+
+    def analyze(self, pcm) -> VadResult:
+        """Find the speech region (with padding) of a recording"""
+        speech = self.smooth(self.classify(pcm))
+        frames = len(speech)
+        if not speech.any():
+            return VadResult(False, 0, 0, 0, frames, self.frame_bytes)
+        active = np.flatnonzero(speech)
+        first = max(0, int(active[0]) - self.pad_frames)
+        last = min(frames, int(active[-1]) + 1 + self.pad_frames)
+        end = len(pcm) if last == frames else last * self.frame_bytes
+        return VadResult(True, first * self.frame_bytes, end, int(speech.sum()), frames,
+                         self.frame_bytes)
+
+    def trim(self, pcm) -> bytes:
+        """Recording with leading/trailing silence removed (b'' if no speech)"""
+        result = self.analyze(pcm)
+        return bytes(pcm[result.start:result.end]) if result.has_speech else b''
+
+
+class Endpointer:
+    """
+    Streaming end-of-speech detection
+
+    feed() takes PCM blocks as they arrive and returns 'start' when speech
+    begins, 'end' once end_silence_ms of quiet follows speech, else None.
+    """
+
+    def __init__(self, vad: VoiceActivityDetector, end_silence_ms: int = 700):
+        self.vad = vad
+        self.end_frames = max(1, end_silence_ms * vad.sample_rate // 1000 // vad.frame_samples)
+        self.reset()
+
+    def reset(self) -> None:
+        self.in_speech = False
+        self.speech_run = 0
+        self.silence_run = 0
+        self.segments = 0
+        self.frames = 0
+        self.end_frame: Optional[int] = None  # frame index where the last utterance ended
+        self._pending = b''
+
+    def feed(self, block) -> Optional[str]:
+        data = self._pending + bytes(block) if self._pending else block
+        usable = len(data) - len(data) % self.vad.frame_bytes
+        self._pending = bytes(data[usable:])
+        if not usable:
+            return None
+
+        event = None
+        for speech in self.vad.classify(memoryview(data)[:usable]).tolist():
+            self.frames += 1
+            if speech:
+                self.speech_run += 1
+                self.silence_run = 0
+                if not self.in_speech and self.speech_run >= self.vad.min_speech_frames:
+                    self.in_speech = True
+                    self.segments += 1
+                    event = 'start'
+            else:
+                self.speech_run = 0
+                self.silence_run += 1
+                if self.in_speech and self.silence_run >= self.end_frames:
+                    self.in_speech = False
+                    self.end_frame = self.frames - self.silence_run
+                    event = 'end'
+        return event
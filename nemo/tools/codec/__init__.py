@@ -0,0 +1,6 @@
+"""Codec Tool - Compression and optional encryption for stored artifacts"""
+from .codec import (Codec, CodecSet, available_codecs, default_codecs, load_key,
+                    train_dictionary)
+
+__all__ = ['Codec', 'CodecSet', 'available_codecs', 'default_codecs', 'load_key',
+           'train_dictionary']
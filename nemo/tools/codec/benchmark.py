@@ -0,0 +1,189 @@
+"""
+Codec benchmark - Pick compression settings per machine
+
+Measures ratio, compress MB/s and decompress MB/s of every available codec
+on representative Nemo data: screen tiles, keystroke stack records and
+window metadata. Small-record streams are measured with and without a
+trained dictionary, and with AES-256-GCM when --encrypt is given.
+
+Usage: python -m nemo.tools.codec.benchmark [--encrypt] [--file PATH ...]
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import random
+import time
+
+from .codec import Codec, available_codecs, train_dictionary
+
+
+LEVELS = {
+    'none': [0],
+    'zlib': [1, 6, 9],
+    'lzma': [0, 6],
+    'zstd': [1, 3, 9, 19],
+    'lz4': [0, 9],
+}
+
+KEY_NAMES = ['a', 'e', 'i', 'o', 't', 'n', 's', 'r', 'space', 'backspace',
+             'enter', 'shift', 'ctrl+c', 'ctrl+v', 'left', 'right', 'tab']
+APPS = [('code.exe', 'main.py - Nemo - Visual Studio Code'),
+        ('chrome.exe', 'Pull requests - Google Chrome'),
+        ('slack.exe', 'Slack | #engineering'),
+        ('excel.exe', 'Q3 forecast.xlsx - Excel')]
+
+
+def make_frame_tiles(count: int = 8, size: int = 256, seed: int = 0) -> List[bytes]:
+    """Raw RGB tiles resembling desktop UI: flat panels, bars and text rows"""
+    rng = random.Random(seed)
+    tiles = []
+    for _ in range(count):
+        background = bytes([rng.choice([30, 240]), rng.choice([30, 245]), rng.choice([34, 250])])
+        rows = []
+        for y in range(size):
+            if y % 18 < 12 and rng.random() < 0.6:
+                # Text row: runs of dark glyph pixels on the background
+                row = bytearray(background * size)
+                x = rng.randrange(8)
+                while x < size - 6:
+                    glyph = rng.randrange(2, 6)
+                    for px in range(x, x + glyph):
+                        shade = rng.randrange(0, 80)
+                        row[px * 3:px * 3 + 3] = bytes([shade, shade, shade])
+                    x += glyph + rng.randrange(1, 4)
+                rows.append(bytes(row))
+            elif y % 64 < 3:
+                rows.append(bytes([70, 110, 200]) * size)  # toolbar stripe
+            else:
+                rows.append(background * size)
+        tiles.append(b''.join(rows))
+    return tiles
+
+
+def make_keystroke_records(count: int = 2000, seed: int = 1) -> List[bytes]:
+    """Small keystroke stack records (one per burst)"""
+    rng = random.Random(seed)
+    t = 1_760_000_000.0
+    records = []
+    for _ in range(count):
+        events = []
+        for _ in range(rng.randrange(4, 24)):
+            t += rng.expovariate(8.0)
+            events.append({'t': round(t, 3), 'k': rng.choice(KEY_NAMES),
+                           'd': rng.choice(['down', 'up'])})
+        records.append(json.dumps({'type': 'keystrokes', 'events': events},
+                                  separators=(',', ':')).encode())
+    return records
+
+
+def make_metadata_records(count: int = 2000, seed: int = 2) -> List[bytes]:
+    """Small window/app metadata records"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        proc, title = rng.choice(APPS)
+        records.append(json.dumps({
+            'type': 'window', 'seq': i, 'pid': rng.randrange(1000, 30000),
+            'process': proc, 'title': title, 'focused': rng.random() < 0.3,
+            'rect': [rng.randrange(0, 1920), rng.randrange(0, 1080), 1280, 720],
+            'cpu': round(rng.random() * 40, 1), 'mem_mb': rng.randrange(80, 2400),
+        }, separators=(',', ':')).encode())
+    return records
+
+
+def measure(codec: Codec, records: List[bytes], min_time: float = 0.2) -> Dict[str, float]:
+    """
+    Benchmark one codec on a list of records
+
+    Returns:
+        ratio, compress_mb_s, decompress_mb_s
+    """
+    raw_bytes = sum(len(r) for r in records)
+    encoded = [codec.encode(r) for r in records]  # warm-up + output size
+    encoded_bytes = sum(len(e) for e in encoded)
+
+    def timed(fn, items):
+        rounds = 0
+        started = time.perf_counter()
+        while True:
+            for item in items:
+                fn(item)
+            rounds += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                return rounds * raw_bytes / elapsed / (1024 * 1024)
+
+    return {
+        'ratio': raw_bytes / encoded_bytes if encoded_bytes else 0.0,
+        'compress_mb_s': timed(codec.encode, records),
+        'decompress_mb_s': timed(codec.decode, encoded),
+    }
+
+
+def run(datasets: Dict[str, List[bytes]], encrypt: bool = False,
+        codecs: Optional[List[str]] = None, min_time: float = 0.2) -> List[Dict]:
+    """Benchmark every codec/level (and dictionary variant) on each dataset"""
+    key = Codec.generate_key() if encrypt else None
+    results = []
+    for data_name, records in datasets.items():
+        small = sum(len(r) for r in records) / max(len(records), 1) < 4096
+        train, test = (records[::2], records[1::2]) if small else (None, records)
+
+        for name in codecs or available_codecs():
+            dictionaries = [None]
+            if small and name in ('zlib', 'zstd', 'lz4'):
+                dictionaries.append(train_dictionary(train, codec=name))
+            for level in LEVELS[name]:
+                for dictionary in dictionaries:
+                    codec = Codec(name, level, dictionary=dictionary, key=key)
+                    row = measure(codec, test, min_time)
+                    row.update({'data': data_name, 'codec': name, 'level': level,
+                                'dict': dictionary is not None, 'encrypted': encrypt})
+                    results.append(row)
+    return results
+
+
+def print_results(results: List[Dict]) -> None:
+    """Print results as a table"""
+    print(f"{'data':<12}{'codec':<7}{'lvl':>4}{'dict':>6}{'enc':>5}"
+          f"{'ratio':>9}{'comp MB/s':>12}{'decomp MB/s':>13}")
+    print('-' * 68)
+    for r in results:
+        print(f"{r['data']:<12}{r['codec']:<7}{r['level']:>4}"
+              f"{'yes' if r['dict'] else '-':>6}{'yes' if r['encrypted'] else '-':>5}"
+              f"{r['ratio']:>9.2f}{r['compress_mb_s']:>12.1f}{r['decompress_mb_s']:>13.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark Nemo artifact codecs")
+    parser.add_argument('--encrypt', action='store_true', help="Include AES-256-GCM")
+    parser.add_argument('--codec', action='append', help="Limit to codec (repeatable)")
+    parser.add_argument('--file', action='append', default=[],
+                        help="Also benchmark a real artifact file (repeatable)")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="Seconds per measurement")
+    parser.add_argument('--json', action='store_true', help="Print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    datasets = {
+        'frames': make_frame_tiles(),
+        'keystrokes': make_keystroke_records(),
+        'metadata': make_metadata_records(),
+    }
+    for path in args.file:
+        with open(path, 'rb') as f:
+            datasets[os.path.basename(path)] = [f.read()]
+
+    results = run(datasets, encrypt=args.encrypt, codecs=args.codec,
+                  min_time=args.min_time)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == '__main__':
+    main()
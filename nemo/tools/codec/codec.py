@@ -0,0 +1,370 @@
+"""
+Codec Tool - Compression and optional encryption for stored artifacts
+
+Every persisted artifact (frames, keystroke stacks, metadata) is wrapped in a
+small self-describing frame, so settings can change per machine without
+breaking old data:
+
+    magic(2) version(1) flags(1) codec(1) level(1) dict_id(4) | payload
+
+Compression: none, zlib, lzma (stdlib), zstd (zstandard), lz4 (lz4).
+Encryption: AES-256-GCM (cryptography), authenticated over the header.
+Dictionaries: trained per stream so small records compress well.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import Counter
+import lzma
+import os
+import struct
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+try:
+    import lz4.block
+    import lz4.frame
+except ImportError:  # optional
+    lz4 = None
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:  # optional
+    AESGCM = None
+
+
+MAGIC = b'NM'
+VERSION = 1
+FLAG_ENCRYPTED = 0x01
+HEADER = struct.Struct('>2sBBBBI')
+NONCE_SIZE = 12
+
+CODEC_IDS = {'none': 0, 'zlib': 1, 'lzma': 2, 'zstd': 3, 'lz4': 4}
+CODEC_NAMES = {v: k for k, v in CODEC_IDS.items()}
+DEFAULT_LEVELS = {'none': 0, 'zlib': 6, 'lzma': 6, 'zstd': 3, 'lz4': 0}
+
+
+def available_codecs() -> List[str]:
+    """Codecs usable in this environment"""
+    names = ['none', 'zlib', 'lzma']
+    if zstandard is not None:
+        names.append('zstd')
+    if lz4 is not None:
+        names.append('lz4')
+    return names
+
+
+def dictionary_id(dictionary: Optional[bytes]) -> int:
+    """Stable id of a dictionary (0 = no dictionary)"""
+    if not dictionary:
+        return 0
+    return zlib.crc32(dictionary) or 1
+
+
+def train_dictionary(samples: List[bytes], size: int = 16 * 1024,
+                     codec: str = 'zlib') -> bytes:
+    """
+    Train a compression dictionary from sample records
+
+    Uses zstd's trainer when available and targeting zstd; otherwise builds a
+    dictionary from the most frequent substrings (usable as a zlib zdict).
+
+    Args:
+        samples: Representative small records of one stream
+        size: Maximum dictionary size in bytes
+        codec: Codec the dictionary is for
+
+    Returns:
+        Dictionary bytes
+    """
+    if codec == 'zstd' and zstandard is not None:
+        return zstandard.train_dictionary(size, samples).as_bytes()
+
+    gram = 8
+    counts = Counter()
+    for sample in samples:
+        seen = set()
+        for i in range(0, max(len(sample) - gram, 0) + 1, 2):
+            piece = sample[i:i + gram]
+            if piece not in seen:
+                seen.add(piece)
+                counts[piece] += 1
+
+    chosen = []
+    total = 0
+    for piece, n in counts.most_common():
+        if n < 2 or total + len(piece) > size:
+            break
+        chosen.append(piece)
+        total += len(piece)
+    # zlib weights the end of the dictionary most: put frequent pieces last
+    return b''.join(reversed(chosen))
+
+
+class Codec:
+    """Compression + optional encryption for one artifact stream"""
+
+    def __init__(self, name: str = 'zlib', level: Optional[int] = None,
+                 dictionary: Optional[bytes] = None, key: Optional[bytes] = None):
+        """
+        Initialize codec
+
+        Args:
+            name: 'none', 'zlib', 'lzma', 'zstd' or 'lz4'
+            level: Compression level (codec default if None)
+            dictionary: Trained dictionary for small records (zlib/zstd/lz4)
+            key: 32-byte key enables AES-256-GCM (off by default)
+        """
+        if name not in CODEC_IDS:
+            raise ValueError(f"Unknown codec: {name}")
+        if name not in available_codecs():
+            raise RuntimeError(f"Codec '{name}' requires an optional package")
+        if key is not None:
+            if AESGCM is None:
+                raise RuntimeError("Encryption requires the 'cryptography' package")
+            if len(key) != 32:
+                raise ValueError("Encryption key must be 32 bytes (AES-256)")
+
+        self.name = name
+        self.level = DEFAULT_LEVELS[name] if level is None else level
+        self.dictionary = dictionary or None
+        self.dict_id = dictionary_id(self.dictionary)
+        self.key = key
+        self._aead = AESGCM(key) if key is not None else None
+
+        self._compress, self._decompress = self._build()
+
+    @staticmethod
+    def generate_key() -> bytes:
+        """Create a random AES-256 key"""
+        return os.urandom(32)
+
+    def _build(self) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+        """Bind compress/decompress functions for this configuration"""
+        level = self.level
+        zdict = self.dictionary
+
+        if self.name == 'none':
+            return bytes, bytes
+
+        if self.name == 'zlib':
+            if not zdict:
+                return (lambda data: zlib.compress(data, level), zlib.decompress)
+
+            # Priming with the dictionary is the expensive part: do it once
+            # and copy the primed state per record
+            primed_c = zlib.compressobj(level, zlib.DEFLATED, 15, 9,
+                                        zlib.Z_DEFAULT_STRATEGY, zdict)
+            primed_d = zlib.decompressobj(15, zdict)
+
+            def compress(data):
+                c = primed_c.copy()
+                return c.compress(data) + c.flush()
+
+            def decompress(data):
+                d = primed_d.copy()
+                return d.decompress(data) + d.flush()
+            return compress, decompress
+
+        if self.name == 'lzma':
+            # lzma has no preset-dictionary API; dictionaries are ignored
+            return (lambda data: lzma.compress(data, preset=level),
+                    lzma.decompress)
+
+        if self.name == 'zstd':
+            zd = zstandard.ZstdCompressionDict(zdict) if zdict else None
+            cctx = zstandard.ZstdCompressor(level=level, dict_data=zd)
+            dctx = zstandard.ZstdDecompressor(dict_data=zd)
+            return cctx.compress, dctx.decompress
+
+        # lz4: block mode supports dictionaries, frame mode is self-delimiting
+        if zdict:
+            mode = 'high_compression' if level > 0 else 'default'
+            return (lambda data: lz4.block.compress(data, mode=mode, compression=level,
+                                                    dict=zdict),
+                    lambda data: lz4.block.decompress(data, dict=zdict))
+        return (lambda data: lz4.frame.compress(data, compression_level=level),
+                lz4.frame.decompress)
+
+    def encode(self, data: bytes) -> bytes:
+        """
+        Compress (and encrypt) a record
+
+        Returns:
+            Framed bytes
+        """
+        flags = FLAG_ENCRYPTED if self._aead else 0
+        header = HEADER.pack(MAGIC, VERSION, flags, CODEC_IDS[self.name],
+                             self.level & 0xFF, self.dict_id)
+        payload = self._compress(data)
+        if self._aead:
+            nonce = os.urandom(NONCE_SIZE)
+            payload = nonce + self._aead.encrypt(nonce, payload, header)
+        return header + payload
+
+    def decode(self, blob: bytes) -> bytes:
+        """
+        Verify, decrypt and decompress a framed record
+
+        Raises:
+            ValueError: Frame does not match this codec's settings
+        """
+        magic, version, flags, codec_id, _, dict_id = parse_header(blob)
+        if CODEC_NAMES.get(codec_id) != self.name or dict_id != self.dict_id:
+            raise ValueError("Frame was written with different codec settings")
+
+        payload = memoryview(blob)[HEADER.size:]
+        if flags & FLAG_ENCRYPTED:
+            if self._aead is None:
+                raise ValueError("Frame is encrypted but no key is configured")
+            nonce = bytes(payload[:NONCE_SIZE])
+            payload = self._aead.decrypt(nonce, bytes(payload[NONCE_SIZE:]),
+                                         bytes(blob[:HEADER.size]))
+        return self._decompress(bytes(payload))
+
+    def get_status(self) -> dict:
+        """Return codec settings"""
+        return {
+            'codec': self.name,
+            'level': self.level,
+            'dictionary': self.dict_id,
+            'encrypted': self._aead is not None,
+        }
+
+    def __reduce__(self):
+        # Rebuilt from settings (e.g. when a key worker process is spawned)
+        return (Codec, (self.name, self.level, self.dictionary, self.key))
+
+    def __repr__(self):
+        return f"<Codec {self.name}:{self.level}{' +aes' if self.key else ''}>"
+
+
+def parse_header(blob: bytes) -> Tuple[bytes, int, int, int, int, int]:
+    """Parse and validate a frame header"""
+    if len(blob) < HEADER.size:
+        raise ValueError("Truncated codec frame")
+    fields = HEADER.unpack_from(blob)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        raise ValueError("Not a Nemo codec frame")
+    return fields
+
+
+class CodecSet:
+    """
+    Per-stream codecs sharing one decode path
+
+    Streams ('frames', 'keystrokes', 'metadata', ...) each get their own
+    codec and dictionary; decode() picks the right one from the frame header.
+    """
+
+    def __init__(self, default: Optional[Codec] = None,
+                 streams: Optional[Dict[str, Codec]] = None, allow_plaintext: bool = False):
+        """
+        Args:
+            default: Codec for streams without their own settings
+            streams: stream name -> Codec
+            allow_plaintext: Let keyed codecs read unencrypted data (a one-off
+                migration of data written before encryption was turned on;
+                otherwise anyone who can write the store could swap in
+                unauthenticated plaintext)
+        """
+        self.default = default or Codec()
+        self.streams: Dict[str, Codec] = dict(streams or {})
+        self.allow_plaintext = allow_plaintext
+
+    @property
+    def encrypted(self) -> bool:
+        """True if any stream is encrypted"""
+        return any(codec.key is not None for codec in [self.default, *self.streams.values()])
+
+    def check_plaintext(self, what: str) -> None:
+        """
+        Vet unframed data read by a store using this set
+
+        Raises:
+            ValueError: The set is keyed and allow_plaintext is off
+        """
+        if self.encrypted and not self.allow_plaintext:
+            raise ValueError(f"{what} is not encrypted but a key is configured "
+                             "(allow_plaintext migrates data written before)")
+
+    def set_stream(self, stream: str, codec: Codec) -> None:
+        """Assign a codec to a stream"""
+        self.streams[stream] = codec
+
+    def for_stream(self, stream: Optional[str]) -> Codec:
+        """Codec used to encode a stream"""
+        return self.streams.get(stream, self.default) if stream else self.default
+
+    def encode(self, data: bytes, stream: Optional[str] = None) -> bytes:
+        """Encode with the stream's codec"""
+        return self.for_stream(stream).encode(data)
+
+    def decode(self, blob: bytes) -> bytes:
+        """
+        Decode a frame written by any codec in this set
+
+        The codec must match the frame's compression, dictionary and
+        encryption flag: a keyed codec rejects unencrypted frames unless
+        allow_plaintext is set (data written before encryption was turned
+        on). With several keys, each is tried until one authenticates the
+        frame.
+        """
+        _, _, flags, codec_id, _, dict_id = parse_header(blob)
+        name = CODEC_NAMES.get(codec_id)
+        encrypted = bool(flags & FLAG_ENCRYPTED)
+        candidates = [codec for codec in [self.default, *self.streams.values()]
+                      if codec.name == name and codec.dict_id == dict_id]
+        matching = [codec for codec in candidates if (codec.key is not None) == encrypted]
+        if not matching and not encrypted and self.allow_plaintext:
+            matching = candidates
+        if not matching:
+            raise ValueError(f"No codec configured for frame ({name}, dict {dict_id}, "
+                             f"{'encrypted' if encrypted else 'plain'})")
+        for codec in matching[:-1]:
+            try:
+                return codec.decode(blob)
+            except Exception:
+                continue  # another key
+        return matching[-1].decode(blob)
+
+    def get_status(self) -> dict:
+        """Return codec settings per stream"""
+        return {
+            'default': self.default.get_status(),
+            'streams': {name: c.get_status() for name, c in self.streams.items()},
+            'allow_plaintext': self.allow_plaintext,
+        }
+
+
+def load_key(path: str) -> bytes:
+    """Read a 32-byte key file, creating it (owner-only) if it doesn't exist"""
+    try:
+        with open(path, 'rb') as f:
+            key = f.read()
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        key = Codec.generate_key()
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+    if len(key) != 32:
+        raise ValueError(f"{path}: encryption key must be 32 bytes")
+    return key
+
+
+def default_codecs(key: Optional[bytes] = None, allow_plaintext: bool = False) -> CodecSet:
+    """
+    Codecs for Nemo's stores
+
+    zstd (zlib without the zstandard package) for every stream except
+    'frames', whose PNG tiles are already compressed and are only framed.
+    A key turns on AES-256-GCM for all streams; allow_plaintext lets it read
+    stores written before (see CodecSet).
+    """
+    name = 'zstd' if zstandard is not None else 'zlib'
+    return CodecSet(Codec(name, key=key), {'frames': Codec('none', key=key)},
+                    allow_plaintext=allow_plaintext)
@@ -0,0 +1,8 @@
+"""ContextIndex Tool - Local embedding index for semantic search"""
+from .embedders import (Embedder, HashingEmbedder, SentenceTransformerEmbedder,
+                        available_embedders, get_embedder)
+from .index import VectorIndex
+from .windows import WindowIndexer
+
+__all__ = ['VectorIndex', 'WindowIndexer', 'Embedder', 'HashingEmbedder', 'SentenceTransformerEmbedder',
+           'available_embedders', 'get_embedder']
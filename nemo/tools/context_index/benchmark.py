@@ -0,0 +1,136 @@
+"""
+Context index benchmark - Query latency and recall at a week of context
+
+Builds an index of synthetic captured context (window titles, OCR lines,
+file chunks) spread over N days, then measures add throughput, exact and
+IVF top-k latency, and IVF recall@k against exact search.
+
+Usage: python -m nemo.tools.context_index.benchmark [--rows 100000] [--dtype int8]
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import json
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from .embedders import get_embedder
+from .index import VectorIndex
+
+
+PROJECTS = ['nemo', 'timevault', 'billing', 'onboarding', 'forecast', 'website',
+            'infra', 'mobile', 'analytics', 'hiring', 'legal', 'design']
+APPS = ['Visual Studio Code', 'Google Chrome', 'Slack', 'Excel', 'Terminal', 'Figma']
+WORDS = ('fix test deploy review meeting notes draft budget chart query model index '
+         'cache latency error release plan roadmap invoice customer schema migration '
+         'screenshot keyboard audio capture timeline search report summary').split()
+
+
+def synthetic_context(rows: int, days: float = 7.0, seed: int = 0):
+    """(texts, sources, timestamps) resembling a week of captures"""
+    rng = random.Random(seed)
+    end = time.time()
+    start = end - days * 86400
+    texts, sources, timestamps = [], [], []
+    for i in range(rows):
+        project = PROJECTS[min(int(rng.expovariate(0.35)), len(PROJECTS) - 1)]
+        words = ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(4, 12)))
+        kind = rng.random()
+        if kind < 0.3:
+            texts.append(f"{project} {words} - {rng.choice(APPS)}")
+            sources.append('window')
+        elif kind < 0.8:
+            texts.append(f"{words} {project} {rng.randrange(1000)}")
+            sources.append('frame')
+        else:
+            texts.append(f"{project}/{rng.choice(WORDS)}.py {words}")
+            sources.append('file')
+        timestamps.append(start + (end - start) * i / rows)
+    return texts, sources, timestamps
+
+
+def run(rows: int = 100_000, dtype: str = 'int8', k: int = 10, queries: int = 50,
+        nprobe: int = 16, batch: int = 2048) -> Dict:
+    """Build an index and time queries"""
+    embedder = get_embedder('hashing')
+    texts, sources, timestamps = synthetic_context(rows)
+    with tempfile.TemporaryDirectory() as root:
+        index = VectorIndex(root, embedder, dtype=dtype, ivf_threshold=rows + 1, nprobe=nprobe)
+
+        started = time.perf_counter()
+        for i in range(0, rows, batch):
+            index.add(texts[i:i + batch], sources[i:i + batch], timestamps[i:i + batch])
+        index.flush()
+        add_seconds = time.perf_counter() - started
+
+        rng = random.Random(1)
+        query_texts = [f"when did I work on {rng.choice(PROJECTS)} {rng.choice(WORDS)}"
+                       for _ in range(queries)]
+        vectors = embedder.embed(query_texts)
+
+        def timed(**kwargs) -> tuple:
+            latencies, results = [], []
+            for q in vectors:
+                t0 = time.perf_counter()
+                results.append(index.search(q, k=k, **kwargs))
+                latencies.append((time.perf_counter() - t0) * 1000)
+            return np.array(latencies), results
+
+        exact_ms, exact_results = timed(exact=True)
+
+        started = time.perf_counter()
+        index.train_ivf()
+        train_seconds = time.perf_counter() - started
+        ivf_ms, ivf_results = timed()
+
+        recall = np.mean([
+            len({r['id'] for r in a} & {r['id'] for r in b}) / max(len(a), 1)
+            for a, b in zip(exact_results, ivf_results)
+        ])
+        status = index.get_status()
+        index.close()
+
+    return {
+        'rows': rows,
+        'dtype': dtype,
+        'dim': embedder.dim,
+        'bytes_on_disk': status['bytes_on_disk'],
+        'add_rows_per_sec': rows / add_seconds,
+        'exact_p50_ms': float(np.percentile(exact_ms, 50)),
+        'exact_p99_ms': float(np.percentile(exact_ms, 99)),
+        'ivf_lists': status['ivf_lists'],
+        'ivf_train_seconds': train_seconds,
+        'ivf_p50_ms': float(np.percentile(ivf_ms, 50)),
+        'ivf_p99_ms': float(np.percentile(ivf_ms, 99)),
+        f'ivf_recall_at_{k}': float(recall),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Context index benchmark")
+    parser.add_argument('--rows', type=int, default=100_000, help="Indexed texts")
+    parser.add_argument('--dtype', choices=['int8', 'float16'], default='int8')
+    parser.add_argument('--k', type=int, default=10, help="Results per query")
+    parser.add_argument('--queries', type=int, default=50, help="Queries timed")
+    parser.add_argument('--nprobe', type=int, default=16, help="IVF lists scanned per query")
+    parser.add_argument('--json', action='store_true', help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    result = run(args.rows, args.dtype, args.k, args.queries, args.nprobe)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for name, value in result.items():
+        if isinstance(value, float):
+            value = f"{value:,.3f}"
+        elif isinstance(value, int):
+            value = f"{value:,}"
+        print(f"{name:<22}{value:>14}")
+
+
+if __name__ == '__main__':
+    main()
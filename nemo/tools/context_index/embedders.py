@@ -0,0 +1,144 @@
+"""
+Embedders - Pluggable local (CPU) text embedding backends
+
+- hashing: deterministic feature hashing of words and character trigrams.
+  No model, no downloads, identical output on every machine; good for
+  tests and as a lexical fallback.
+- sentence-transformers: a small local model (e.g. all-MiniLM-L6-v2) on CPU,
+  when the optional package and model are available.
+
+All embedders return L2-normalized float32 rows, so a dot product is the
+cosine similarity.
+"""
+
+from typing import Dict, List, Sequence, Type
+import re
+import zlib
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional
+    SentenceTransformer = None
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows in place (zero rows stay zero)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+class Embedder:
+    """Base class: text → unit vectors"""
+
+    name = 'base'
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed a batch
+
+        Returns:
+            float32 array (len(texts), dim), rows L2-normalized
+        """
+        raise NotImplementedError
+
+    def embed_one(self, text: str) -> np.ndarray:
+        """Embed a single text"""
+        return self.embed([text])[0]
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic signed feature hashing (words + char trigrams)"""
+
+    name = 'hashing'
+
+    def __init__(self, dim: int = 384, trigram_weight: float = 0.5):
+        """
+        Args:
+            dim: Output dimension
+            trigram_weight: Weight of character trigrams relative to words
+                (trigrams make near-spellings and identifiers match)
+        """
+        super().__init__(dim)
+        self.trigram_weight = trigram_weight
+        self._cache: Dict[str, tuple] = {}
+
+    def _features(self, token: str) -> tuple:
+        """(indices, signs) for one token, memoized"""
+        features = self._cache.get(token)
+        if features is None:
+            indices = []
+            weights = []
+            h = zlib.crc32(token.encode('utf-8'))
+            indices.append(h % self.dim)
+            weights.append(1.0 if h & 0x80000000 else -1.0)
+            padded = f"#{token}#"
+            for i in range(len(padded) - 2):
+                h = zlib.crc32(padded[i:i + 3].encode('utf-8'), 0x9E3779B9)
+                indices.append(h % self.dim)
+                weights.append(self.trigram_weight if h & 0x80000000 else -self.trigram_weight)
+            features = (indices, weights)
+            if len(self._cache) < 200_000:
+                self._cache[token] = features
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indices: List[int] = []
+            weights: List[float] = []
+            for token in TOKEN_RE.findall(text.lower()):
+                token_indices, token_weights = self._features(token)
+                indices.extend(token_indices)
+                weights.extend(token_weights)
+            if indices:
+                np.add.at(vectors[row], indices, weights)
+        return normalize(vectors)
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """Local sentence-transformers model on CPU"""
+
+    name = 'sentence-transformers'
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', batch_size: int = 64):
+        if SentenceTransformer is None:
+            raise RuntimeError("sentence-transformers not installed")
+        self.model = SentenceTransformer(model_name, device='cpu')
+        self.model_name = model_name
+        self.batch_size = batch_size
+        super().__init__(self.model.get_sentence_embedding_dimension())
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.model.encode(list(texts), batch_size=self.batch_size,
+                                    convert_to_numpy=True, normalize_embeddings=True)
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+EMBEDDERS: Dict[str, Type[Embedder]] = {
+    'hashing': HashingEmbedder,
+    'sentence-transformers': SentenceTransformerEmbedder,
+}
+
+
+def available_embedders() -> List[str]:
+    """Embedders usable in this environment"""
+    names = ['hashing']
+    if SentenceTransformer is not None:
+        names.append('sentence-transformers')
+    return names
+
+
+def get_embedder(name: str = 'hashing', **kwargs) -> Embedder:
+    """Create an embedder by name"""
+    if name not in EMBEDDERS:
+        raise ValueError(f"Unknown embedder: {name}")
+    return EMBEDDERS[name](**kwargs)
@@ -0,0 +1,516 @@
+"""
+VectorIndex - Local semantic search over captured context
+
+Text captured from frames (OCR), window titles and extracted files is
+embedded locally and stored in a memory-mapped matrix:
+
+    root/header.json     dim, dtype, count, capacity, embedder, IVF state
+    root/vectors.bin     (capacity, dim) float16, or int8 + scales.bin
+    root/times.bin       float64 capture timestamps
+    root/lists.bin       int32 IVF list of each row (-1 = unassigned)
+    root/centroids.npy   IVF centroids
+    root/meta.jsonl      one record per row (source, text snippet, metadata);
+                         with a CodecSet each line is a base64 codec frame
+
+Search is a batched dot product over blocks of rows. Once the index passes
+ivf_threshold rows it is partitioned with spherical k-means (IVF) and a query
+only scans the nprobe closest partitions.
+
+The index is shared between threads (the agent key adds, the daemon
+searches): adds, remaps and IVF training hold `lock`; a search holds it only
+to take the current arrays and row count, then scans with its own buffer.
+
+Only meta.jsonl goes through the codecs: vectors and times stay plain so
+they can be memory-mapped (they hold no text, but hashed embeddings can
+hint at which words occurred).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+import base64
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from .embedders import Embedder, HashingEmbedder, normalize
+from ..codec import CodecSet
+
+
+HEADER_FILE = 'header.json'
+SNIPPET_CHARS = 200
+DTYPES = {'float16': np.float16, 'int8': np.int8}
+
+
+class VectorIndex:
+    """
+    Memory-mapped vector index with optional IVF partitioning
+
+    - add(): embed a batch and append (amortized O(batch))
+    - search(): top-k by cosine similarity, optionally within a time range
+      or for one source ('frame', 'window', 'file', ...)
+
+    Thread-safe (see the module docstring).
+    """
+
+    def __init__(self, root: str, embedder: Optional[Embedder] = None,
+                 dtype: str = 'int8', ivf_threshold: int = 50_000, nprobe: int = 16,
+                 block_rows: int = 4096, codecs: Optional[CodecSet] = None):
+        """
+        Open or create an index
+
+        Args:
+            root: Index directory
+            embedder: Embedding backend (default: HashingEmbedder)
+            dtype: 'int8' (per-row scale) or 'float16' for new indexes;
+                int8 is half the size and converts to float32 faster
+            ivf_threshold: Rows at which IVF partitioning kicks in
+            nprobe: Partitions scanned per IVF query
+            block_rows: Rows converted and multiplied per batch in exact
+                search (small enough for the float32 buffer to stay in cache)
+            codecs: Compression/encryption for the row records (plain
+                JSON lines if None)
+        """
+        self.root = root
+        self.codecs = codecs
+        self.embedder = embedder or HashingEmbedder()
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.block_rows = block_rows
+        self.lock = threading.RLock()
+        os.makedirs(root, exist_ok=True)
+
+        header_path = os.path.join(root, HEADER_FILE)
+        if os.path.exists(header_path):
+            with open(header_path) as f:
+                header = json.load(f)
+            if header['dim'] != self.embedder.dim:
+                raise ValueError(f"Index dim {header['dim']} != embedder dim {self.embedder.dim}")
+            if header['embedder'] != self.embedder.name:
+                print(f"[INDEX] Warning: index built with '{header['embedder']}', "
+                      f"querying with '{self.embedder.name}'")
+        else:
+            if dtype not in DTYPES:
+                raise ValueError(f"Unknown dtype: {dtype}")
+            header = {'version': 1, 'dim': self.embedder.dim, 'dtype': dtype, 'count': 0,
+                      'capacity': 0, 'embedder': self.embedder.name, 'ivf_trained_count': 0}
+
+        self.dim = header['dim']
+        self.dtype = header['dtype']
+        self.count = header['count']
+        self.capacity = header['capacity']
+        self.ivf_trained_count = header['ivf_trained_count']
+
+        self.records: List[Dict[str, Any]] = []
+        self._plain_records = 0  # plaintext lines read while a key is set (migration)
+        meta_path = os.path.join(root, 'meta.jsonl')
+        meta_end = 0  # bytes of meta.jsonl holding the kept records
+        if os.path.exists(meta_path):
+            with open(meta_path, 'rb') as f:
+                for line in f:
+                    if len(self.records) == self.count or not line.endswith(b'\n'):
+                        break
+                    try:
+                        self.records.append(self._decode_record(line))
+                    except ValueError:
+                        break
+                    meta_end += len(line)
+        # After an unclean stop the header count and meta.jsonl disagree:
+        # rows past the last complete record, and records past the header
+        # count (their rows were never flushed), are discarded
+        self.count = len(self.records)
+        if self._plain_records:
+            # allow_plaintext migration: re-encode the kept records once
+            tmp_path = meta_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                for record in self.records:
+                    f.write(self._encode_record(record) + '\n')
+            os.replace(tmp_path, meta_path)
+            meta_end = os.path.getsize(meta_path)
+        self._meta_file = open(meta_path, 'a')
+        self._meta_file.truncate(meta_end)
+
+        self.sources: Dict[str, int] = {}
+        source_codes = [self._source_code(r.get('source', '')) for r in self.records]
+        self._source_codes = np.array(source_codes, dtype=np.int16)
+
+        self.centroids: Optional[np.ndarray] = None
+        centroid_path = os.path.join(root, 'centroids.npy')
+        if self.ivf_trained_count and os.path.exists(centroid_path):
+            self.centroids = np.load(centroid_path)
+        self._lists_dirty = True
+        self._list_order: Optional[np.ndarray] = None
+        self._list_bounds: Optional[np.ndarray] = None
+
+        self._map(self.capacity)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _encode_record(self, record: Dict[str, Any]) -> str:
+        """One meta.jsonl line (without the newline)"""
+        line = json.dumps(record)
+        if self.codecs is None:
+            return line
+        frame = self.codecs.encode(line.encode('utf-8'), 'metadata')
+        return base64.b64encode(frame).decode('ascii')
+
+    def _decode_record(self, line: bytes) -> Dict[str, Any]:
+        """
+        Parse a plain or encoded meta.jsonl line
+
+        Raises:
+            ValueError: Malformed record (treated as the end of the file)
+            RuntimeError: Record these codecs can't read (wrong or missing
+                key, or plaintext while a key is set) - raised so the
+                records are not discarded
+        """
+        if line.startswith(b'{'):
+            if self.codecs is not None:
+                try:
+                    self.codecs.check_plaintext("meta.jsonl")
+                except ValueError as e:
+                    raise RuntimeError(str(e)) from e
+                self._plain_records += 1
+            return json.loads(line)
+        if self.codecs is None:
+            raise RuntimeError("meta.jsonl is encoded but no codecs are configured")
+        try:
+            data = self.codecs.decode(base64.b64decode(line))
+        except Exception as e:
+            raise RuntimeError(f"Can't decode meta.jsonl with these codecs: {e}") from e
+        return json.loads(data)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _map(self, capacity: int) -> None:
+        """(Re)map the row files at the given capacity"""
+        self.capacity = capacity
+        self.vectors = self._memmap('vectors.bin', DTYPES[self.dtype], (capacity, self.dim))
+        self.times = self._memmap('times.bin', np.float64, (capacity,))
+        self.lists = self._memmap('lists.bin', np.int32, (capacity,))
+        self.scales = (self._memmap('scales.bin', np.float32, (capacity,))
+                       if self.dtype == 'int8' else None)
+
+    def _memmap(self, name: str, dtype, shape) -> Optional[np.ndarray]:
+        """Memory-map a row file, growing it (zero-filled) to shape"""
+        if shape[0] == 0:
+            return None
+        path = self._path(name)
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(path, 'ab') as f:
+            if f.tell() < nbytes:
+                f.truncate(nbytes)
+        return np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the row files (call with lock held; searches keep the old maps)"""
+        if rows <= self.capacity:
+            return
+        capacity = max(1024, self.capacity)
+        while capacity < rows:
+            capacity *= 2
+        self._release_maps()
+        self._map(capacity)
+        if self.capacity:
+            # Rows added after the map was created have no IVF list yet
+            self.lists[self.count:] = -1
+
+    def _release_maps(self) -> None:
+        for array in (self.vectors, self.times, self.lists, self.scales):
+            if array is not None:
+                array.flush()
+        self.vectors = self.times = self.lists = self.scales = None
+
+    def _source_code(self, source: str) -> int:
+        code = self.sources.get(source)
+        if code is None:
+            code = self.sources[source] = len(self.sources)
+        return code
+
+    def flush(self) -> None:
+        """Write header, rows and metadata to disk"""
+        with self.lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        for array in (self.vectors, self.times, self.lists, self.scales):
+            if array is not None:
+                array.flush()
+        self._meta_file.flush()
+        if self.centroids is not None:
+            np.save(self._path('centroids.npy'), self.centroids)
+        header = {'version': 1, 'dim': self.dim, 'dtype': self.dtype, 'count': self.count,
+                  'capacity': self.capacity, 'embedder': self.embedder.name,
+                  'ivf_trained_count': self.ivf_trained_count}
+        tmp_path = self._path(HEADER_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(header, f)
+        os.replace(tmp_path, self._path(HEADER_FILE))
+
+    def close(self) -> None:
+        """Flush and release files"""
+        with self.lock:
+            self._flush()
+            self._release_maps()
+            self._meta_file.close()
+
+    # ------------------------------------------------------------------
+    # Adding
+    # ------------------------------------------------------------------
+
+    def add(self, texts: Sequence[str], source: Union[str, Sequence[str]] = 'text',
+            timestamps: Optional[Sequence[float]] = None,
+            metadata: Optional[Sequence[Dict[str, Any]]] = None) -> List[int]:
+        """
+        Embed and index a batch of texts
+
+        Args:
+            texts: Captured text (OCR, window titles, file chunks)
+            source: One source for all texts, or one per text
+            timestamps: Capture times (default: now)
+            metadata: Extra JSON-serializable fields per text
+
+        Returns:
+            Row ids
+        """
+        if not texts:
+            return []
+        vectors = self.embedder.embed(texts)
+        sources = [source] * len(texts) if isinstance(source, str) else list(source)
+        now = time.time()
+        records = []
+        for i, text in enumerate(texts):
+            record = dict(metadata[i]) if metadata else {}
+            record['source'] = sources[i]
+            record['text'] = text[:SNIPPET_CHARS]
+            records.append(record)
+        return self.add_vectors(vectors, records,
+                                timestamps if timestamps is not None else [now] * len(texts))
+
+    def add_vectors(self, vectors: np.ndarray, records: Sequence[Dict[str, Any]],
+                    timestamps: Sequence[float]) -> List[int]:
+        """Append pre-computed unit vectors with their records"""
+        with self.lock:
+            return self._add_vectors(vectors, records, timestamps)
+
+    def _add_vectors(self, vectors: np.ndarray, records: Sequence[Dict[str, Any]],
+                     timestamps: Sequence[float]) -> List[int]:
+        n = len(vectors)
+        start = self.count
+        self._ensure_capacity(start + n)
+
+        if self.dtype == 'int8':
+            scales = np.abs(vectors).max(axis=1)
+            scales[scales == 0] = 1.0
+            self.vectors[start:start + n] = np.rint(vectors * (127.0 / scales[:, None]))
+            self.scales[start:start + n] = scales / 127.0
+        else:
+            self.vectors[start:start + n] = vectors
+        self.times[start:start + n] = timestamps
+
+        if self.centroids is not None:
+            self.lists[start:start + n] = np.argmax(vectors @ self.centroids.T, axis=1)
+        else:
+            self.lists[start:start + n] = -1
+        self._lists_dirty = True
+
+        codes = np.empty(n, dtype=np.int16)
+        for i, record in enumerate(records):
+            self._meta_file.write(self._encode_record(record) + '\n')
+            codes[i] = self._source_code(record.get('source', ''))
+        self.records.extend(records)
+        self._source_codes = np.concatenate([self._source_codes, codes])
+        self.count += n
+
+        if self.count >= self.ivf_threshold and (
+                not self.ivf_trained_count or self.count >= 4 * self.ivf_trained_count):
+            self._train_ivf(None, 8, 20_000, 0)
+        return list(range(start, start + n))
+
+    # ------------------------------------------------------------------
+    # IVF
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _rows(vectors: np.ndarray, scales: Optional[np.ndarray], start: int, end: int,
+              buffer: np.ndarray) -> np.ndarray:
+        """Rows [start, end) as float32 (a view of the caller's buffer)"""
+        block = buffer[:end - start]
+        np.copyto(block, vectors[start:end])
+        if scales is not None:
+            block *= scales[start:end, None]
+        return block
+
+    @staticmethod
+    def _take(vectors: np.ndarray, scales: Optional[np.ndarray], ids: np.ndarray) -> np.ndarray:
+        """Rows by id as float32"""
+        block = vectors[ids].astype(np.float32)
+        if scales is not None:
+            block *= scales[ids, None]
+        return block
+
+    def train_ivf(self, nlist: Optional[int] = None, iterations: int = 8,
+                  sample_size: int = 20_000, seed: int = 0) -> None:
+        """
+        Partition rows with spherical k-means
+
+        Args:
+            nlist: Partitions (default: ~sqrt(count))
+            iterations: k-means iterations on the sample
+            sample_size: Rows used for training
+        """
+        with self.lock:
+            self._train_ivf(nlist, iterations, sample_size, seed)
+
+    def _train_ivf(self, nlist: Optional[int], iterations: int, sample_size: int,
+                   seed: int) -> None:
+        if self.count == 0:
+            return
+        started = time.time()
+        nlist = nlist or max(1, min(4096, int(np.sqrt(self.count))))
+        rng = np.random.default_rng(seed)
+        sample_ids = np.sort(rng.choice(self.count, min(sample_size, self.count), replace=False))
+        sample = self._take(self.vectors, self.scales, sample_ids)
+        nlist = min(nlist, len(sample))
+
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            empty = np.bincount(assign, minlength=nlist) == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = normalize(sums)
+
+        self.centroids = centroids.astype(np.float32)
+        buffer = np.empty((self.block_rows, self.dim), np.float32)
+        for start in range(0, self.count, self.block_rows):
+            end = min(start + self.block_rows, self.count)
+            rows = self._rows(self.vectors, self.scales, start, end, buffer)
+            self.lists[start:end] = np.argmax(rows @ self.centroids.T, axis=1)
+        self.ivf_trained_count = self.count
+        self._lists_dirty = True
+        print(f"[INDEX] IVF trained: {nlist} lists over {self.count} rows "
+              f"in {time.time() - started:.1f}s")
+
+    def _inverted_lists(self):
+        """Row ids grouped by IVF list, and each list's bounds (lock held)"""
+        if self._lists_dirty:
+            assign = np.asarray(self.lists[:self.count])
+            self._list_order = np.argsort(assign, kind='stable')
+            self._list_bounds = np.searchsorted(assign[self._list_order],
+                                                np.arange(len(self.centroids) + 1))
+            self._lists_dirty = False
+        return self._list_order, self._list_bounds
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, query: Union[str, np.ndarray], k: int = 10,
+               start: Optional[float] = None, end: Optional[float] = None,
+               source: Optional[str] = None, exact: bool = False) -> List[Dict[str, Any]]:
+        """
+        Top-k most similar rows
+
+        Args:
+            query: Text or unit vector
+            k: Results wanted
+            start, end: Restrict to capture times in [start, end)
+            source: Restrict to one source
+            exact: Scan every row even when IVF is trained
+
+        Returns:
+            Records with 'id', 'score' and 'timestamp', best first
+        """
+        q = self.embedder.embed_one(query) if isinstance(query, str) else query
+        q = np.asarray(q, dtype=np.float32)
+
+        # Rows below count are never rewritten and a remap leaves the old
+        # maps valid, so the scan below runs without the lock
+        with self.lock:
+            count = self.count
+            if count == 0:
+                return []
+            source_code = self.sources.get(source) if source is not None else None
+            if source is not None and source_code is None:
+                return []
+            vectors, scales, times = self.vectors, self.scales, self.times
+            source_codes = self._source_codes
+            centroids = None if exact else self.centroids
+            if centroids is not None:
+                order, bounds = self._inverted_lists()
+
+        if centroids is not None:
+            probes = np.argsort(centroids @ q)[::-1][:self.nprobe]
+            ids = np.sort(np.concatenate([order[bounds[c]:bounds[c + 1]] for c in probes]))
+            scores = self._take(vectors, scales, ids) @ q
+            candidates = self._filter(ids, scores, times, source_codes, start, end,
+                                      source_code)
+        else:
+            parts = []
+            buffer = np.empty((min(self.block_rows, count), self.dim), np.float32)
+            for block_start in range(0, count, self.block_rows):
+                block_end = min(block_start + self.block_rows, count)
+                ids = np.arange(block_start, block_end)
+                scores = self._rows(vectors, scales, block_start, block_end, buffer) @ q
+                ids, scores = self._filter(ids, scores, times, source_codes, start, end,
+                                           source_code)
+                if len(ids) > k:
+                    top = np.argpartition(scores, -k)[-k:]
+                    ids, scores = ids[top], scores[top]
+                parts.append((ids, scores))
+            candidates = (np.concatenate([p[0] for p in parts]),
+                          np.concatenate([p[1] for p in parts]))
+
+        ids, scores = candidates
+        if len(ids) > k:
+            top = np.argpartition(scores, -k)[-k:]
+            ids, scores = ids[top], scores[top]
+        ranked = np.argsort(scores)[::-1]
+
+        results = []
+        for i in ranked:
+            row = int(ids[i])
+            result = dict(self.records[row])
+            result.update(id=row, score=float(scores[i]), timestamp=float(times[row]))
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _filter(ids: np.ndarray, scores: np.ndarray, times: np.ndarray,
+                source_codes: np.ndarray, start: Optional[float], end: Optional[float],
+                source_code: Optional[int]):
+        """Apply time-range and source filters"""
+        mask = None
+        if start is not None or end is not None:
+            times = times[ids]
+            mask = np.ones(len(ids), dtype=bool)
+            if start is not None:
+                mask &= times >= start
+            if end is not None:
+                mask &= times < end
+        if source_code is not None:
+            source_mask = source_codes[ids] == source_code
+            mask = source_mask if mask is None else mask & source_mask
+        if mask is None:
+            return ids, scores
+        return ids[mask], scores[mask]
+
+    def get_status(self) -> dict:
+        """Return index status"""
+        return {
+            'root': self.root,
+            'rows': self.count,
+            'capacity': self.capacity,
+            'dim': self.dim,
+            'dtype': self.dtype,
+            'embedder': self.embedder.name,
+            'ivf_lists': 0 if self.centroids is None else len(self.centroids),
+            'sources': sorted(self.sources),
+            'bytes_on_disk': sum(os.path.getsize(self._path(n)) for n in os.listdir(self.root)),
+        }
@@ -0,0 +1,156 @@
+"""
+WindowIndexer - Focused-window titles into the VectorIndex
+
+A background thread polls the focused window (the ScreenLayout that
+ScreenCapture uses) every interval seconds. Each title change is queued
+with its time; queued titles are embedded and added to the index in one
+batch (source 'window') every flush_interval seconds or batch_size titles,
+so the hook thread and capture never wait for embedding.
+
+A title seen again within min_repeat seconds is not indexed again (alt-tab
+between two windows would otherwise add a row per switch). While the
+ResourceGovernor pauses background work, titles keep queueing (up to
+max_pending) and are indexed on resume.
+"""
+
+from typing import Any, Deque, Dict, Optional, Tuple
+from collections import OrderedDict, deque
+import threading
+import time
+
+from .index import VectorIndex
+from ..metrics import get_registry
+from ..screen_capture import ScreenLayout
+
+
+class WindowIndexer:
+    """Background thread indexing focused-window titles"""
+
+    def __init__(self, index: VectorIndex, layout: Optional[ScreenLayout] = None,
+                 interval: float = 2.0, flush_interval: float = 30.0, batch_size: int = 64,
+                 min_repeat: float = 300.0, max_pending: int = 1024):
+        """
+        Initialize the indexer
+
+        Args:
+            index: Index receiving the titles
+            layout: Focused-window source (default: a new ScreenLayout)
+            interval: Seconds between focused-window polls
+            flush_interval: Longest a title waits before being indexed
+            batch_size: Queued titles that trigger an early batch
+            min_repeat: Seconds before the same title is indexed again
+            max_pending: Titles kept while indexing is paused (oldest dropped)
+        """
+        self.index = index
+        self.layout = layout or ScreenLayout()
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.min_repeat = min_repeat
+        self.paused = False
+
+        self.last_title: Optional[str] = None
+        self._pending: Deque[Tuple[str, float, Any]] = deque(maxlen=max_pending)
+        self._indexed_at: 'OrderedDict[str, float]' = OrderedDict()  # title -> last queued
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+
+        metrics = get_registry()
+        self.titles_indexed = metrics.counter('window_titles_indexed_total',
+                                              "Window titles added to the context index")
+        self.flush_time = metrics.histogram('window_index_flush_seconds',
+                                            "Embed and index one batch of window titles")
+
+    def start(self) -> None:
+        """Poll and index in a daemon thread"""
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name='nemo-window-index', daemon=True)
+        self.thread.start()
+        print("[WINDOW INDEX] Indexing window titles")
+
+    def stop(self) -> None:
+        """Stop the thread and index what is queued"""
+        self.running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def _loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll_once()
+                due = time.monotonic() - self._last_flush >= self.flush_interval
+                if not self.paused and (due or len(self._pending) >= self.batch_size):
+                    self.flush()
+            except Exception as e:
+                print(f"[WINDOW INDEX ERROR] {e}")
+
+    def poll_once(self, timestamp: Optional[float] = None) -> bool:
+        """
+        Queue the focused window's title if it changed
+
+        Returns:
+            True if a title was queued
+        """
+        window = self.layout.active_window()
+        if window is None:
+            return False
+        return self.observe(window.title, timestamp, window.bbox)
+
+    def observe(self, title: str, timestamp: Optional[float] = None,
+                bbox: Optional[Tuple[int, int, int, int]] = None) -> bool:
+        """Queue a focused-window title (any thread; cheap)"""
+        title = title.strip()
+        if not title or title == self.last_title:
+            return False
+        self.last_title = title
+        now = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            last = self._indexed_at.get(title)
+            if last is not None and now - last < self.min_repeat:
+                return False
+            self._indexed_at[title] = now
+            self._indexed_at.move_to_end(title)
+            while len(self._indexed_at) > self._pending.maxlen:
+                self._indexed_at.popitem(last=False)
+            self._pending.append((title, now, bbox))
+        return True
+
+    def flush(self) -> int:
+        """Embed and index the queued titles; returns how many"""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        self._last_flush = time.monotonic()
+        if not batch:
+            return 0
+        start = time.perf_counter_ns()
+        self.index.add([title for title, _, _ in batch], source='window',
+                       timestamps=[ts for _, ts, _ in batch],
+                       metadata=[{'bbox': list(bbox)} if bbox else {} for _, _, bbox in batch])
+        self.titles_indexed.inc(len(batch))
+        self.flush_time.record_since(start)
+        return len(batch)
+
+    def apply_resource_settings(self, settings: Dict[str, Any]) -> None:
+        """Follow ResourceGovernor's background_paused"""
+        self.paused = settings['background_paused']
+
+    def get_status(self) -> dict:
+        """Return indexer status"""
+        return {
+            'running': self.running,
+            'paused': self.paused,
+            'interval': self.interval,
+            'pending': len(self._pending),
+            'last_title': self.last_title,
+        }
@@ -0,0 +1,5 @@
+"""FileExtraction Tool - Streaming text extraction for agent synthesis"""
+from .extractors import extract_chunks, available_extractors
+from .extractor import FileExtractor
+
+__all__ = ['FileExtractor', 'extract_chunks', 'available_extractors']
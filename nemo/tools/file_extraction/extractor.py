@@ -0,0 +1,255 @@
+"""
+FileExtractor - Process-pool extraction with a freshness-keyed cache
+
+Parsing runs in worker processes (xlsx/pdf parsing is pure Python and would
+otherwise hold the GIL next to the keyboard hook). Each worker streams a file
+through its extractor and keeps at most max_chars of text, so memory is
+bounded per file regardless of file size.
+
+Results are cached by (path, mtime, size): asking again for an unchanged file
+within cache_ttl seconds costs a stat() call.
+
+A worker that dies (a parser crashing on a malformed file) breaks the whole
+pool. The pool is replaced and each file that was in flight is retried on
+its own; a file that crashes its retry too gets an error entry instead of
+aborting the batch.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import os
+import threading
+import time
+
+from .extractors import extract_chunks
+from ..metrics import get_registry
+
+
+def extract_file(path: str, max_chars: int) -> Dict[str, Any]:
+    """
+    Extract one file (runs in a worker process)
+
+    Returns:
+        {'path', 'chunks', 'chars', 'truncated', 'error'}
+    """
+    chunks: List[str] = []
+    chars = 0
+    truncated = False
+    error = None
+    try:
+        for chunk in extract_chunks(path):
+            if chars + len(chunk) > max_chars:
+                chunks.append(chunk[:max_chars - chars])
+                chars = max_chars
+                truncated = True
+                break
+            chunks.append(chunk)
+            chars += len(chunk)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {'path': path, 'chunks': chunks, 'chars': chars,
+            'truncated': truncated, 'error': error}
+
+
+class FileExtractor:
+    """
+    Bounded-memory file extraction for agent synthesis
+
+    - Rejects unsupported types and files over max_file_size_mb up front
+    - Parses in a lazily created process pool
+    - LRU cache keyed by (path, mtime, size) with a time-to-live
+    """
+
+    def __init__(self, supported_file_types: Iterable[str] = ('.txt', '.py', '.md'),
+                 max_file_size_mb: float = 10, cache_ttl: float = 300,
+                 max_workers: Optional[int] = None, max_chars: int = 200_000,
+                 max_cache_entries: int = 256):
+        """
+        Initialize extractor
+
+        Args:
+            supported_file_types: Extensions to accept (e.g. '.pdf')
+            max_file_size_mb: Skip larger files
+            cache_ttl: Seconds a cached extraction stays valid
+            max_workers: Worker processes (default: min(4, CPUs))
+            max_chars: Text kept per file
+            max_cache_entries: Cached files kept (LRU)
+        """
+        self.supported_file_types = {t.lower() for t in supported_file_types}
+        self.max_file_bytes = int(max_file_size_mb * 1024 * 1024)
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_chars = max_chars
+        self.max_cache_entries = max_cache_entries
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # (path, mtime_ns, size) -> (cached_at, result)
+        self._cache: 'OrderedDict[Tuple[str, int, int], Tuple[float, Dict]]' = OrderedDict()
+
+        metrics = get_registry()
+        self.cache_hits = metrics.counter('extraction_cache_hits_total', "Extraction cache hits")
+        self.cache_misses = metrics.counter('extraction_cache_misses_total', "Extraction cache misses")
+        self.extract_time = metrics.histogram('extraction_seconds', "Batch extraction latency")
+        self.worker_crashes = metrics.counter('extraction_worker_crashes_total',
+                                              "Extraction worker processes that died")
+
+    def _cache_key(self, path: str) -> Optional[Tuple[str, int, int]]:
+        """(path, mtime, size) if the file is acceptable, else None"""
+        if os.path.splitext(path)[1].lower() not in self.supported_file_types:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size > self.max_file_bytes:
+            return None
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    def _cached(self, key: Tuple[str, int, int], now: float) -> Optional[Dict]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            cached_at, result = entry
+            if now - cached_at > self.cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return result
+
+    def _store(self, key: Tuple[str, int, int], result: Dict, now: float) -> None:
+        with self._lock:
+            self._cache[key] = (now, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a broken pool so the next submission starts a new one"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, path: str) -> Tuple[ProcessPoolExecutor, Future]:
+        """Submit one extraction, replacing the pool if it is already broken"""
+        pool = self._get_pool()
+        try:
+            return pool, pool.submit(extract_file, path, self.max_chars)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            pool = self._get_pool()
+            return pool, pool.submit(extract_file, path, self.max_chars)
+
+    def _retry_alone(self, path: str, broken: ProcessPoolExecutor) -> Dict[str, Any]:
+        """
+        Re-run an extraction whose pool broke, with nothing else in flight
+
+        Only the file that killed the worker fails again; its result is an
+        error entry.
+        """
+        self._discard_pool(broken)
+        pool = self._get_pool()
+        try:
+            return pool.submit(extract_file, path, self.max_chars).result()
+        except BrokenProcessPool:
+            self.worker_crashes.inc()
+            self._discard_pool(pool)
+            print(f"[EXTRACT] Worker crashed on {path}")
+            return {'path': path, 'chunks': [], 'chars': 0, 'truncated': False,
+                    'error': "BrokenProcessPool: worker crashed"}
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """
+        Resize the worker pool (at least one worker)
+
+        Extractions already submitted finish in the old pool; the next
+        submission starts a pool of the new size.
+        """
+        max_workers = max(1, max_workers)
+        with self._lock:
+            if max_workers == self.max_workers:
+                return
+            self.max_workers = max_workers
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def extract(self, paths: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Extract files, blocking until done
+
+        Unsupported, missing and oversized files are skipped. Results keep
+        the input order; a file that crashes its worker gets an error entry.
+        """
+        start = time.perf_counter_ns()
+        now = time.time()
+        results: List[Optional[Dict]] = []
+        pending: List[Tuple[int, Tuple[str, int, int], ProcessPoolExecutor, Future]] = []
+
+        for path in paths:
+            key = self._cache_key(path)
+            if key is None:
+                continue
+            cached = self._cached(key, now)
+            if cached is not None:
+                self.cache_hits.inc()
+                results.append(cached)
+                continue
+            self.cache_misses.inc()
+            pool, future = self._submit(key[0])
+            pending.append((len(results), key, pool, future))
+            results.append(None)
+
+        for index, key, pool, future in pending:
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                result = self._retry_alone(key[0], pool)
+            self._store(key, result, now)
+            results[index] = result
+
+        self.extract_time.record_since(start)
+        return results
+
+    def extract_async(self, paths: Iterable[str],
+                      callback: Callable[[List[Dict[str, Any]]], None]) -> threading.Thread:
+        """Extract in the background and hand the results to callback"""
+        paths = list(paths)
+        thread = threading.Thread(target=lambda: callback(self.extract(paths)), daemon=True)
+        thread.start()
+        return thread
+
+    def clear_cache(self) -> None:
+        """Drop all cached extractions"""
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self) -> None:
+        """Stop worker processes"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_status(self) -> dict:
+        """Return extractor status"""
+        return {
+            'supported_file_types': sorted(self.supported_file_types),
+            'max_file_size_mb': self.max_file_bytes / (1024 * 1024),
+            'workers': self.max_workers,
+            'pool_running': self._pool is not None,
+            'cached_files': len(self._cache),
+            'cache_hits': self.cache_hits.value,
+            'cache_misses': self.cache_misses.value,
+            'worker_crashes': self.worker_crashes.value,
+        }
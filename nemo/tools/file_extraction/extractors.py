@@ -0,0 +1,103 @@
+"""
+Extractors - Per-format generators of text chunks
+
+Every extractor yields text incrementally so memory stays bounded by the
+chunk size, not the file size:
+
+- Text (.txt, .py, .md): memory-mapped, decoded slice by slice
+- Spreadsheets (.xlsx): openpyxl read-only mode, a batch of rows per chunk
+- PDF (.pdf): pypdf, one page per chunk
+"""
+
+from typing import Callable, Dict, Iterator, List
+import codecs
+import mmap
+import os
+
+try:
+    import openpyxl
+except ImportError:  # optional
+    openpyxl = None
+
+try:
+    import pypdf
+except ImportError:  # optional
+    pypdf = None
+
+
+CHUNK_BYTES = 64 * 1024
+ROWS_PER_CHUNK = 200
+
+
+def iter_text_chunks(path: str, chunk_bytes: int = CHUNK_BYTES) -> Iterator[str]:
+    """Yield decoded text from a memory-mapped file"""
+    if os.path.getsize(path) == 0:
+        return
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        size = len(mapped)
+        for offset in range(0, size, chunk_bytes):
+            text = decoder.decode(mapped[offset:offset + chunk_bytes],
+                                  final=offset + chunk_bytes >= size)
+            if text:
+                yield text
+
+
+def iter_xlsx_rows(path: str, rows_per_chunk: int = ROWS_PER_CHUNK) -> Iterator[str]:
+    """Yield tab-separated rows, a batch at a time, sheet by sheet"""
+    if openpyxl is None:
+        raise RuntimeError("openpyxl not installed - .xlsx extraction unavailable")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            lines: List[str] = [f"# {sheet.title}"]
+            for row in sheet.iter_rows(values_only=True):
+                if any(cell is not None for cell in row):
+                    lines.append('\t'.join('' if cell is None else str(cell) for cell in row))
+                if len(lines) >= rows_per_chunk:
+                    yield '\n'.join(lines) + '\n'
+                    lines = []
+            if lines:
+                yield '\n'.join(lines) + '\n'
+    finally:
+        workbook.close()
+
+
+def iter_pdf_pages(path: str) -> Iterator[str]:
+    """Yield the text of one page at a time"""
+    if pypdf is None:
+        raise RuntimeError("pypdf not installed - .pdf extraction unavailable")
+    with open(path, 'rb') as f:
+        reader = pypdf.PdfReader(f)
+        for page in reader.pages:
+            text = page.extract_text() or ''
+            if text:
+                yield text + '\n'
+
+
+EXTRACTORS: Dict[str, Callable[[str], Iterator[str]]] = {
+    '.txt': iter_text_chunks,
+    '.py': iter_text_chunks,
+    '.md': iter_text_chunks,
+    '.xlsx': iter_xlsx_rows,
+    '.pdf': iter_pdf_pages,
+}
+
+
+def available_extractors() -> List[str]:
+    """File types extractable in this environment"""
+    types = ['.txt', '.py', '.md']
+    if openpyxl is not None:
+        types.append('.xlsx')
+    if pypdf is not None:
+        types.append('.pdf')
+    return types
+
+
+def extract_chunks(path: str) -> Iterator[str]:
+    """Yield text chunks for any supported file type"""
+    extension = os.path.splitext(path)[1].lower()
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise ValueError(f"Unsupported file type: {extension}")
+    return extractor(path)
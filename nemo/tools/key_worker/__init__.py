@@ -0,0 +1,6 @@
+"""KeyWorker Tool - Process-isolated keys with shared-memory payloads"""
+from .arena import SharedArena, SharedRef
+from .worker import IsolatedKey, KeyWorker, WorkerError, get_pcm_ring, stop_pcm_ring
+
+__all__ = ['IsolatedKey', 'KeyWorker', 'WorkerError', 'SharedArena', 'SharedRef',
+           'get_pcm_ring', 'stop_pcm_ring']
@@ -0,0 +1,107 @@
+"""
+SharedArena - Shared-memory transport for large call payloads
+
+Pickling a 4K frame or a few seconds of PCM through a pipe copies it several
+times and pushes it through the kernel in small writes. Instead, bytes-like
+values of at least inline_bytes (anywhere in the arguments/result: nested
+lists, tuples and dict values included) are copied once into a shared
+memory segment and replaced by a SharedRef (offset, length); the receiver
+copies them out.
+
+Each direction of a worker has its own arena, and only one call per
+direction is in flight, so allocation restarts at offset 0 for every
+message. Payloads that don't fit are pickled as usual.
+"""
+
+from typing import Any, Optional
+from multiprocessing import shared_memory
+
+from ..audio_capture.shared import attach_shared_memory
+
+
+class SharedRef:
+    """Placeholder for a payload stored in an arena"""
+
+    __slots__ = ('offset', 'length')
+
+    def __init__(self, offset: int, length: int):
+        self.offset = offset
+        self.length = length
+
+    def __reduce__(self):
+        return (SharedRef, (self.offset, self.length))
+
+
+class SharedArena:
+    """Bump-allocated shared-memory segment for one message at a time"""
+
+    def __init__(self, size: int = 32 * 1024 * 1024, name: Optional[str] = None,
+                 inline_bytes: int = 64 * 1024):
+        """
+        Args:
+            size: Segment size (creating side)
+            name: Attach to an existing segment instead of creating one
+            inline_bytes: Smaller payloads are pickled inline
+        """
+        self.owner = name is None
+        self.shm = (shared_memory.SharedMemory(create=True, size=size) if self.owner
+                    else attach_shared_memory(name))
+        self.size = size if self.owner else self.shm.size
+        self.inline_bytes = inline_bytes
+        self._offset = 0
+        self.shared_bytes = 0  # bytes written to / read from the arena by this side
+        self.overflows = 0  # payloads too large for the arena (pickled)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def pack(self, value: Any) -> Any:
+        """Move large payloads in value into the arena (resets the arena)"""
+        self._offset = 0
+        return self._pack(value, 0)
+
+    def _pack(self, value: Any, depth: int) -> Any:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            length = value.nbytes if isinstance(value, memoryview) else len(value)
+            if length < self.inline_bytes:
+                return value
+            if self._offset + length > self.size:
+                self.overflows += 1
+                return value
+            offset = self._offset
+            self.shm.buf[offset:offset + length] = value
+            self._offset += length
+            self.shared_bytes += length
+            return SharedRef(offset, length)
+        if depth >= 4:
+            return value
+        if isinstance(value, list):
+            return [self._pack(item, depth + 1) for item in value]
+        if isinstance(value, tuple) and type(value) is tuple:
+            return tuple(self._pack(item, depth + 1) for item in value)
+        if isinstance(value, dict):
+            return {key: self._pack(item, depth + 1) for key, item in value.items()}
+        return value
+
+    def unpack(self, value: Any) -> Any:
+        """Replace SharedRefs with bytes copied out of the arena"""
+        if isinstance(value, SharedRef):
+            self.shared_bytes += value.length
+            return bytes(self.shm.buf[value.offset:value.offset + value.length])
+        if isinstance(value, list):
+            return [self.unpack(item) for item in value]
+        if isinstance(value, tuple) and type(value) is tuple:
+            return tuple(self.unpack(item) for item in value)
+        if isinstance(value, dict):
+            return {key: self.unpack(item) for key, item in value.items()}
+        return value
+
+    def close(self) -> None:
+        """Detach (and free, on the creating side)"""
+        if self.shm is None:
+            return
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
@@ -0,0 +1,480 @@
+"""
+KeyWorker - Host a NemoKey in a supervised worker process
+
+CPU-heavy keys (PNG/base64 encoding, audio processing, recognizer decoding)
+share the GIL with the keyboard hook when they run in-process. A KeyWorker
+builds the key in its own process from a picklable factory (the key class,
+or a functools.partial of it) and forwards calls over a pipe:
+
+- on_press / on_hold / on_keystroke / apply_resource_settings are sent
+  without waiting (the hook thread only pickles a small tuple)
+- on_release and other call()s wait for the result, with a timeout
+- large bytes payloads in arguments and results go through SharedArena
+  (shared memory) instead of the pipe; one call at a time owns the arenas,
+  calls made meanwhile (e.g. status during a slow on_release) are pickled
+  and wait only for their own reply
+- the worker's AudioBroker reads this process's microphone stream through
+  a SharedPcmRing - the device is still opened once
+- the worker is spawned and the key built ahead of the first press
+  (prewarm); if the process dies it is restarted with backoff, and pending
+  calls fail fast instead of hanging
+- per-worker stats: call round-trip and handler latency histograms, worker
+  CPU seconds (and CPU% between status reads), restarts and errors
+
+IsolatedKey is the NemoKey proxy NemoEngine registers in place of the key.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import multiprocessing
+import pickle
+import threading
+import time
+
+from .arena import SharedArena
+from ..audio_capture import AudioBroker, SharedPcmRing, SharedPcmSource, set_broker
+from ..metrics import get_registry
+from ..nemo_key import NemoKey
+
+_pcm_ring: Optional[SharedPcmRing] = None
+_pcm_lock = threading.Lock()
+
+
+def get_pcm_ring() -> SharedPcmRing:
+    """Process-wide microphone mirror shared by every worker"""
+    global _pcm_ring
+    with _pcm_lock:
+        if _pcm_ring is None:
+            _pcm_ring = SharedPcmRing()
+        _pcm_ring.start()
+        return _pcm_ring
+
+
+def stop_pcm_ring() -> None:
+    """Free the microphone mirror (after all workers stopped)"""
+    global _pcm_ring
+    with _pcm_lock:
+        if _pcm_ring is not None:
+            _pcm_ring.stop()
+            _pcm_ring = None
+
+
+class WorkerError(Exception):
+    """The worker died, timed out or is not running"""
+
+
+def _worker_main(conn, factory: Callable[[], NemoKey], pcm_name: Optional[str],
+                 request_arena: str, reply_arena: str) -> None:
+    """Worker process: build the key, then serve calls in order"""
+    if pcm_name:
+        set_broker(AudioBroker(source_factory=lambda: SharedPcmSource(pcm_name)))
+    requests = SharedArena(name=request_arena)
+    replies = SharedArena(name=reply_arena)
+    try:
+        key = factory()
+    except Exception as e:
+        conn.send(('failed', None, f"{type(e).__name__}: {e}", 0.0, time.process_time()))
+        return
+    conn.send(('ready', None, {
+        'key_name': key.key_name,
+        'key_combo': key.key_combo,
+        'description': key.description,
+        'observes_keystrokes': key.observes_keystrokes,
+    }, 0.0, time.process_time()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        call_id, method, args, shared = message
+        start = time.perf_counter()
+        try:
+            result = getattr(key, method)(*requests.unpack(args))
+            kind = 'result'
+        except Exception as e:
+            result = f"{type(e).__name__}: {e}"
+            kind = 'error'
+            if call_id is None:
+                print(f"[WORKER] {key.key_name}.{method} failed: {result}")
+        elapsed = time.perf_counter() - start
+
+        if call_id is None and kind == 'result':
+            continue
+        if kind == 'result' and shared:
+            result = replies.pack(result)
+        try:
+            conn.send((kind, call_id, result, elapsed, time.process_time()))
+        except (pickle.PicklingError, TypeError, AttributeError, ValueError):
+            # Unpicklable result (e.g. a Thread handle): send its repr
+            conn.send((kind, call_id, repr(result), elapsed, time.process_time()))
+
+    try:
+        key.shutdown()
+    except Exception as e:
+        print(f"[WORKER] Shutdown error in {key.key_name}: {e}")
+    requests.close()
+    replies.close()
+
+
+class KeyWorker:
+    """Supervised worker process hosting one key"""
+
+    def __init__(self, factory: Callable[[], NemoKey], name: str = 'key',
+                 audio: bool = True, call_timeout: float = 30.0,
+                 arena_bytes: int = 32 * 1024 * 1024, max_restarts: int = 5,
+                 restart_window: float = 60.0, start_method: str = 'spawn'):
+        """
+        Args:
+            factory: Picklable callable building the key in the worker
+            name: Label for logs and metrics
+            audio: Give the worker the shared microphone stream
+            call_timeout: Default call() timeout in seconds
+            arena_bytes: Shared-memory arena size per direction
+            max_restarts: Crashes tolerated within restart_window
+            restart_window: Seconds over which restarts are counted
+            start_method: multiprocessing start method ('spawn' is safe
+                with the listener/broker threads of this process)
+        """
+        self.factory = factory
+        self.name = name
+        self.audio = audio
+        self.call_timeout = call_timeout
+        self.arena_bytes = arena_bytes
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.context = multiprocessing.get_context(start_method)
+
+        self.process = None
+        self.conn = None
+        self.info: Dict[str, Any] = {}
+        self.state = 'stopped'  # stopped, starting, ready, restarting, failed
+        self.last_error: Optional[str] = None
+        self.restart_times = []
+        self.restarts = 0
+
+        self._ready = threading.Event()
+        self._send_lock = threading.Lock()
+        self._spawn_lock = threading.Lock()
+        self._call_lock = threading.Lock()
+        self._pending: Dict[int, list] = {}  # call id -> [event, kind, value]
+        self._sticky: Dict[str, tuple] = {}  # state re-sent to every new process
+        self._arena_pending = set()  # call ids owning the arenas until their reply arrives
+        self._next_id = 1
+        self._stopping = False
+        self._requests: Optional[SharedArena] = None
+        self._replies: Optional[SharedArena] = None
+
+        self.cpu_seconds = 0.0
+        self._cpu_sample = (time.monotonic(), 0.0)
+        self.cpu_percent = 0.0
+        self.calls = 0
+        self.errors = 0
+
+        metrics = get_registry()
+        self.call_time = metrics.histogram('worker_call_seconds', "Worker call round trip",
+                                           worker=name)
+        self.handler_time = metrics.histogram('worker_handler_seconds',
+                                              "Key handler time inside the worker", worker=name)
+        self.restart_count = metrics.counter('worker_restarts_total', "Worker restarts",
+                                             worker=name)
+        self.error_count = metrics.counter('worker_errors_total', "Failed worker calls",
+                                           worker=name)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, wait: bool = True, timeout: float = 60.0) -> bool:
+        """Spawn the worker and build the key (prewarm); True once ready"""
+        with self._spawn_lock:
+            # (a crashed worker is already being restarted by its reader)
+            if self.state != 'restarting' and (self.process is None
+                                               or not self.process.is_alive()):
+                self._stopping = False
+                self._spawn()
+        if not wait:
+            return self._ready.is_set()
+        deadline = time.monotonic() + timeout
+        while not self._ready.wait(0.05):
+            if self.state == 'failed' or time.monotonic() > deadline:
+                return False
+        return True
+
+    def _spawn(self) -> None:
+        self.state = 'starting'
+        self._ready.clear()
+        if self._requests is None:
+            self._requests = SharedArena(self.arena_bytes)
+            self._replies = SharedArena(self.arena_bytes)
+        pcm_name = get_pcm_ring().name if self.audio else None
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_worker_main, name=f'nemo-worker-{self.name}', daemon=True,
+            args=(child_conn, self.factory, pcm_name, self._requests.name, self._replies.name),
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        threading.Thread(target=self._read_loop, args=(parent_conn, self.process),
+                         name=f'nemo-worker-{self.name}-reader', daemon=True).start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Shut the key down and end the worker process"""
+        self._stopping = True
+        process, conn = self.process, self.conn
+        if process is not None:
+            try:
+                with self._send_lock:
+                    conn.send(None)
+            except (OSError, ValueError):
+                pass
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+        self.process = None
+        self.state = 'stopped'
+        self._ready.clear()
+        self._fail_pending("Worker stopped")
+        for arena in (self._requests, self._replies):
+            if arena is not None:
+                arena.close()
+        self._requests = self._replies = None
+
+    def _read_loop(self, conn, process) -> None:
+        """Receive replies until the worker exits; then supervise"""
+        while True:
+            try:
+                kind, call_id, value, elapsed, cpu = conn.recv()
+            except (EOFError, OSError):
+                break
+            self.cpu_seconds = cpu
+            if kind == 'ready':
+                self.info = value
+                with self._send_lock:
+                    for method, args in self._sticky.items():
+                        conn.send((None, method, args, False))
+                self.state = 'ready'
+                self._ready.set()
+                continue
+            if kind == 'failed':
+                # The key can't be built: restarting won't help
+                self.last_error = value
+                self.state = 'failed'
+                self._stopping = True
+                print(f"[WORKER] {self.name} failed to start: {value}")
+                continue
+            self.handler_time.record_seconds(elapsed)
+            if kind == 'error':
+                self.errors += 1
+                self.error_count.inc()
+                self.last_error = value
+            elif self._replies is not None and call_id in self._arena_pending:
+                value = self._replies.unpack(value)
+            if call_id is not None:
+                self._arena_pending.discard(call_id)
+                slot = self._pending.pop(call_id, None)
+                if slot is not None:
+                    slot[1], slot[2] = kind, value
+                    slot[0].set()
+
+        conn.close()
+        process.join(1.0)
+        if self.process is not process or self._stopping:
+            return
+        self._on_crash(process.exitcode)
+
+    def _on_crash(self, exitcode: Optional[int]) -> None:
+        self._ready.clear()
+        self._fail_pending(f"Worker exited ({exitcode})")
+        now = time.monotonic()
+        self.restart_times = [t for t in self.restart_times if now - t < self.restart_window]
+        if len(self.restart_times) >= self.max_restarts:
+            self.state = 'failed'
+            print(f"[WORKER] {self.name} crashed {len(self.restart_times)} times "
+                  f"in {self.restart_window:.0f}s - giving up")
+            return
+        delay = min(10.0, 0.5 * 2 ** len(self.restart_times))
+        self.restart_times.append(now)
+        self.restarts += 1
+        self.restart_count.inc()
+        self.state = 'restarting'
+        print(f"[WORKER] {self.name} exited with code {exitcode}; restarting in {delay:.1f}s")
+        time.sleep(delay)
+        with self._spawn_lock:
+            if not self._stopping and self.state == 'restarting':
+                self._spawn()
+
+    def _fail_pending(self, reason: str) -> None:
+        pending, self._pending = self._pending, {}
+        self._arena_pending.clear()
+        for slot in pending.values():
+            slot[1], slot[2] = 'error', reason
+            slot[0].set()
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def send(self, method: str, *args: Any, sticky: bool = False) -> bool:
+        """
+        Fire-and-forget call (args are pickled); False if the worker isn't ready
+
+        sticky: Also replay this call (latest args) whenever a worker starts
+        """
+        if sticky:
+            self._sticky[method] = args
+        if not self._ready.is_set():
+            return False
+        try:
+            with self._send_lock:
+                self.conn.send((None, method, args, False))
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def call(self, method: str, *args: Any, timeout: Optional[float] = None) -> Any:
+        """Call a key method in the worker and return its result"""
+        timeout = self.call_timeout if timeout is None else timeout
+        if not self._ready.wait(timeout if self.state in ('starting', 'restarting') else 0):
+            raise WorkerError(f"Worker {self.name} is {self.state}")
+        start = time.perf_counter_ns()
+        # The lock covers packing and sending only: the reply is awaited
+        # without it, so a slow call doesn't hold up the others
+        with self._call_lock:
+            call_id = self._next_id
+            self._next_id += 1
+            slot = [threading.Event(), None, None]
+            self._pending[call_id] = slot
+            # The arenas hold one call's payloads: while another call (or a
+            # timed-out one) owns them, pickle through the pipe
+            shared = not self._arena_pending
+            packed = self._requests.pack(args) if shared else args
+            if shared:
+                self._arena_pending.add(call_id)
+            try:
+                with self._send_lock:
+                    self.conn.send((call_id, method, packed, shared))
+            except (OSError, ValueError) as e:
+                self._pending.pop(call_id, None)
+                self._arena_pending.discard(call_id)
+                raise WorkerError(f"Worker {self.name} unreachable: {e}")
+        if not slot[0].wait(timeout):
+            # (a late reply still releases the arenas in the read loop)
+            self._pending.pop(call_id, None)
+            self.errors += 1
+            self.error_count.inc()
+            raise WorkerError(f"{self.name}.{method} timed out after {timeout:.1f}s")
+        self.calls += 1
+        self.call_time.record_since(start)
+        if slot[1] == 'error':
+            raise WorkerError(slot[2])
+        return slot[2]
+
+    def get_status(self) -> dict:
+        """Return worker process state and resource use"""
+        now = time.monotonic()
+        last_time, last_cpu = self._cpu_sample
+        if now - last_time >= 1.0:
+            self.cpu_percent = 100.0 * (self.cpu_seconds - last_cpu) / (now - last_time)
+            self._cpu_sample = (now, self.cpu_seconds)
+        return {
+            'name': self.name,
+            'state': self.state,
+            'pid': self.process.pid if self.process is not None else None,
+            'cpu_seconds': self.cpu_seconds,
+            'cpu_percent': self.cpu_percent,
+            'calls': self.calls,
+            'errors': self.errors,
+            'restarts': self.restarts,
+            'last_error': self.last_error,
+            'call_p50_ms': self.call_time.percentile(50) / 1e6,
+            'call_p99_ms': self.call_time.percentile(99) / 1e6,
+            'handler_p50_ms': self.handler_time.percentile(50) / 1e6,
+            'shared_bytes': ((self._requests.shared_bytes + self._replies.shared_bytes)
+                             if self._requests is not None else 0),
+        }
+
+
+class IsolatedKey(NemoKey):
+    """NemoKey proxy whose handlers run in a KeyWorker"""
+
+    def __init__(self, factory: Callable[[], NemoKey], key_combo: Optional[str] = None,
+                 key_name: Optional[str] = None, description: str = '',
+                 observes_keystrokes: Optional[bool] = None, release_timeout: float = 30.0,
+                 **worker_options: Any):
+        """
+        Args:
+            factory: Picklable callable building the real key (e.g. the class)
+            key_combo: Known combo: the worker then starts in the background;
+                otherwise construction waits for the worker to report it
+            key_name, description: Shown until the worker reports its own
+            observes_keystrokes: Forward keystrokes (default: the key class's)
+            release_timeout: How long on_release waits for the worker
+            **worker_options: KeyWorker options (audio, arena_bytes, ...)
+        """
+        key_class = getattr(factory, 'func', factory)  # functools.partial
+        label = key_combo or getattr(key_class, '__name__', 'key')
+        self.worker = KeyWorker(factory, name=label, **worker_options)
+        self.release_timeout = release_timeout
+        self.remote_status: Dict[str, Any] = {}
+        if observes_keystrokes is None:
+            observes_keystrokes = bool(getattr(key_class, 'observes_keystrokes', False))
+
+        if key_combo is None:
+            if not self.worker.start(wait=True):
+                self.worker.stop()
+                raise WorkerError(f"Worker for {label} did not start: {self.worker.last_error}")
+            info = self.worker.info
+            key_combo, key_name = info['key_combo'], info['key_name']
+            description = info['description']
+            observes_keystrokes = info['observes_keystrokes']
+        else:
+            self.worker.start(wait=False)
+        super().__init__(key_name=key_name or getattr(key_class, '__name__', label),
+                         key_combo=key_combo, description=description)
+        self.observes_keystrokes = observes_keystrokes
+
+    def on_press(self) -> None:
+        self.worker.send('on_press')
+
+    def on_hold(self, duration: float) -> None:
+        self.worker.send('on_hold', duration)
+
+    def on_release(self, total_duration: float) -> Any:
+        try:
+            return self.worker.call('on_release', total_duration, timeout=self.release_timeout)
+        except WorkerError as e:
+            print(f"[WORKER] {self.key_name} release failed: {e}")
+            return None
+
+    def on_keystroke(self, key: str, timestamp: float) -> None:
+        self.worker.send('on_keystroke', key, timestamp)
+
+    def apply_resource_settings(self, settings: Dict[str, Any]) -> None:
+        self.worker.send('apply_resource_settings', dict(settings), sticky=True)
+
+    def prewarm(self) -> None:
+        if self.worker.state != 'failed':
+            self.worker.start(wait=False)
+            self.worker.send('prewarm')
+
+    def shutdown(self) -> None:
+        self.worker.stop()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Key status from the worker (cached if it's busy) plus worker stats"""
+        try:
+            self.remote_status = self.worker.call('get_status', timeout=0.5)
+        except WorkerError:
+            pass
+        if self.worker.info:
+            self.key_name = self.worker.info['key_name']
+            self.description = self.worker.info['description']
+        status = dict(self.remote_status)
+        status.update(super().get_status())
+        status['isolated'] = True
+        status['worker'] = self.worker.get_status()
+        return status
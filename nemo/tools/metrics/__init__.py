@@ -0,0 +1,6 @@
+"""Metrics Tool - Hot-path counters, latency histograms and exporters"""
+from .metrics import Counter, Histogram, MetricsRegistry, get_registry
+from .exporter import PrometheusExporter, JsonDumper
+
+__all__ = ['Counter', 'Histogram', 'MetricsRegistry', 'get_registry',
+           'PrometheusExporter', 'JsonDumper']
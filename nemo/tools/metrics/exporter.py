@@ -0,0 +1,122 @@
+"""
+Metrics exporters - Prometheus endpoint and periodic JSON dumps
+
+PrometheusExporter serves GET /metrics on localhost only.
+JsonDumper writes registry snapshots to a file (atomically) on an interval.
+"""
+
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+
+from .metrics import MetricsRegistry, get_registry
+
+
+class PrometheusExporter:
+    """Serve the registry as Prometheus text on 127.0.0.1"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None,
+                 port: int = 9464, host: str = '127.0.0.1'):
+        """
+        Args:
+            registry: Registry to export (process-wide default if None)
+            port: TCP port (0 picks a free one)
+            host: Bind address; keep it on loopback
+        """
+        self.registry = registry or get_registry()
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self) -> None:
+        """Start serving in a daemon thread"""
+        if self.server is not None:
+            return
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       name='nemo-metrics-http', daemon=True)
+        self.thread.start()
+        print(f"[METRICS] Prometheus endpoint on http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stop serving"""
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        self.thread = None
+
+
+class JsonDumper:
+    """Write registry snapshots to a JSON file periodically"""
+
+    def __init__(self, path: str, interval: float = 60.0,
+                 registry: Optional[MetricsRegistry] = None):
+        """
+        Args:
+            path: Output file (replaced atomically on each dump)
+            interval: Seconds between dumps
+            registry: Registry to dump (process-wide default if None)
+        """
+        self.path = path
+        self.interval = interval
+        self.registry = registry or get_registry()
+        self.running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+
+    def dump(self) -> None:
+        """Write one snapshot now"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.registry.snapshot(), f)
+        os.replace(tmp_path, self.path)
+
+    def start(self) -> None:
+        """Dump every interval seconds in a daemon thread"""
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name='nemo-metrics-json',
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop dumping (writes a final snapshot)"""
+        if not self.running:
+            return
+        self.running = False
+        self._stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.dump()
+
+    def _loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.dump()
+            except OSError as e:
+                print(f"[METRICS ERROR] {e}")
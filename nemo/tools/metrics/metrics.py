@@ -0,0 +1,255 @@
+"""
+Metrics - Counters and HDR-style latency histograms
+
+Designed for hot paths (keyboard hook, key dispatch, capture):
+- No locks: updates are plain list/int operations under the GIL. A rare
+  lost increment under contention is accepted in exchange for well under
+  1µs per sample.
+- Histograms use log-linear buckets (32 sub-buckets per power of two,
+  ~3% relative error) over integer nanoseconds, like HdrHistogram.
+
+Usage:
+    latency = get_registry().histogram('key_release_seconds', key='right alt')
+    start = time.perf_counter_ns()
+    ...
+    latency.record_since(start)
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import time
+
+_perf_ns = time.perf_counter_ns
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = SUB_BUCKETS >> 1
+MAX_VALUE_BITS = 42  # ~73 minutes in nanoseconds
+BUCKET_COUNT = SUB_BUCKETS + (MAX_VALUE_BITS - SUB_BUCKET_BITS) * HALF_SUB_BUCKETS
+
+
+def bucket_index(value: int) -> int:
+    """Log-linear bucket index of a non-negative integer"""
+    if value < SUB_BUCKETS:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    index = SUB_BUCKETS + (shift - 1) * HALF_SUB_BUCKETS + (value >> shift) - HALF_SUB_BUCKETS
+    return index if index < BUCKET_COUNT else BUCKET_COUNT - 1
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Inclusive (low, high) value range of a bucket"""
+    if index < SUB_BUCKETS:
+        return index, index
+    k = index - SUB_BUCKETS
+    shift = k // HALF_SUB_BUCKETS + 1
+    mantissa = k % HALF_SUB_BUCKETS + HALF_SUB_BUCKETS
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Counter:
+    """Monotonic counter"""
+
+    __slots__ = ('name', 'labels', 'help', 'value')
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...] = (), help: str = ''):
+        self.name = name
+        self.labels = labels
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        """Increment the counter"""
+        self.value += amount
+
+    def to_dict(self) -> dict:
+        return {'value': self.value}
+
+
+class Histogram:
+    """Latency histogram over integer nanoseconds"""
+
+    __slots__ = ('name', 'labels', 'help', 'buckets', 'count', 'total', 'max')
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...] = (), help: str = ''):
+        self.name = name
+        self.labels = labels
+        self.help = help
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value_ns: int) -> None:
+        """Record one sample in nanoseconds"""
+        # bucket_index() inlined: this is the hot path
+        if value_ns < SUB_BUCKETS:
+            if value_ns < 0:
+                value_ns = 0
+            index = value_ns
+        else:
+            shift = value_ns.bit_length() - SUB_BUCKET_BITS
+            index = (shift - 1) * HALF_SUB_BUCKETS + (value_ns >> shift) + HALF_SUB_BUCKETS
+            if index >= BUCKET_COUNT:
+                index = BUCKET_COUNT - 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+
+    def record_since(self, start_ns: int) -> int:
+        """Record time elapsed since a perf_counter_ns() start; returns it"""
+        elapsed = _perf_ns() - start_ns
+        self.record(elapsed)
+        return elapsed
+
+    def record_seconds(self, seconds: float) -> None:
+        """Record a duration given in seconds"""
+        self.record(int(seconds * 1e9))
+
+    def percentile(self, q: float) -> int:
+        """
+        Value at quantile q (0-100), in nanoseconds
+
+        Returns the upper bound of the bucket holding the q-th sample (the
+        max for the last bucket, which also holds every larger value).
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, int(self.count * q / 100.0 + 0.5))
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            if n:
+                seen += n
+                if seen >= target:
+                    if index == BUCKET_COUNT - 1:
+                        return self.max
+                    return min(bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self) -> None:
+        """Clear all samples"""
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def to_dict(self) -> dict:
+        """Summary in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': self.mean() / 1e6,
+            'p50_ms': self.percentile(50) / 1e6,
+            'p90_ms': self.percentile(90) / 1e6,
+            'p99_ms': self.percentile(99) / 1e6,
+            'p999_ms': self.percentile(99.9) / 1e6,
+            'max_ms': self.max / 1e6,
+        }
+
+
+class MetricsRegistry:
+    """Named, labelled counters and histograms"""
+
+    def __init__(self, prefix: str = ''):
+        """
+        Args:
+            prefix: Prepended to every metric name on export
+        """
+        self.prefix = prefix
+        self.counters: Dict[Tuple[str, tuple], Counter] = {}
+        self.histograms: Dict[Tuple[str, tuple], Histogram] = {}
+
+    def counter(self, name: str, help: str = '', **labels: str) -> Counter:
+        """Get or create a counter (bind once, then call inc() on the hot path)"""
+        key = (name, tuple(sorted(labels.items())))
+        metric = self.counters.get(key)
+        if metric is None:
+            metric = self.counters.setdefault(key, Counter(name, key[1], help))
+        return metric
+
+    def histogram(self, name: str, help: str = '', **labels: str) -> Histogram:
+        """Get or create a histogram (bind once, then record on the hot path)"""
+        key = (name, tuple(sorted(labels.items())))
+        metric = self.histograms.get(key)
+        if metric is None:
+            metric = self.histograms.setdefault(key, Histogram(name, key[1], help))
+        return metric
+
+    def iter_counters(self) -> Iterator[Counter]:
+        return iter(list(self.counters.values()))
+
+    def iter_histograms(self) -> Iterator[Histogram]:
+        return iter(list(self.histograms.values()))
+
+    def reset(self) -> None:
+        """Zero every metric (bound references stay valid)"""
+        for counter in self.iter_counters():
+            counter.value = 0
+        for histogram in self.iter_histograms():
+            histogram.reset()
+
+    def snapshot(self) -> dict:
+        """JSON-serializable view of every metric"""
+        return {
+            'timestamp': time.time(),
+            'counters': [
+                {'name': self.prefix + c.name, 'labels': dict(c.labels), 'value': c.value}
+                for c in self.iter_counters()
+            ],
+            'histograms': [
+                dict({'name': self.prefix + h.name, 'labels': dict(h.labels)}, **h.to_dict())
+                for h in self.iter_histograms()
+            ],
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition (histograms exported as summaries)"""
+        lines: List[str] = []
+        seen_help = set()
+
+        def header(name, kind, help_text):
+            if name not in seen_help:
+                seen_help.add(name)
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for c in sorted(self.iter_counters(), key=lambda m: (m.name, m.labels)):
+            name = self.prefix + c.name
+            header(name, 'counter', c.help)
+            lines.append(f"{name}{_labels(c.labels)} {c.value}")
+
+        for h in sorted(self.iter_histograms(), key=lambda m: (m.name, m.labels)):
+            name = self.prefix + h.name
+            header(name, 'summary', h.help)
+            for q in (0.5, 0.9, 0.99, 0.999):
+                labels = h.labels + (('quantile', str(q)),)
+                lines.append(f"{name}{_labels(labels)} {h.percentile(q * 100) / 1e9:.9f}")
+            lines.append(f"{name}_sum{_labels(h.labels)} {h.total / 1e9:.9f}")
+            lines.append(f"{name}_count{_labels(h.labels)} {h.count}")
+
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    body = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+        for k, v in labels
+    )
+    return '{' + body + '}'
+
+
+_default_registry: Optional[MetricsRegistry] = None
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide registry used by the engine, keys and tools"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry(prefix='nemo_')
+    return _default_registry
@@ -1,4 +1,5 @@
 """NemoEngine - Core orchestrator and hotkey registry"""
 from .engine import NemoEngine
+from .runtime import AsyncRuntime
 
-__all__ = ['NemoEngine']
+__all__ = ['NemoEngine', 'AsyncRuntime']
@@ -5,8 +5,15 @@ Manages all keys, handles keyboard events, routes to appropriate key handlers.
 This is the heart of Nemo - PUBLIC and auditable.
 """
 
-from typing import Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable
+import time
 from ..nemo_key import NemoKey
+from ..key_worker import IsolatedKey, stop_pcm_ring
+from ..resource_governor import ResourceGovernor
+from ..metrics import get_registry
+from ..tracing import get_tracer
+from ..usage_store import INTERACTION, OK, EMPTY, FAILED, get_usage_store
+from .runtime import AsyncRuntime
 
 
 class NemoEngine:
@@ -16,14 +23,36 @@ class NemoEngine:
     - Registers and manages all hotkeys
     - Routes keyboard events to appropriate keys
     - Maintains global configuration
+    - Applies ResourceGovernor decisions to keys
+    - Optionally runs key interactions on an AsyncRuntime
     """
     
-    def __init__(self):
-        """Initialize Nemo engine"""
+    def __init__(self, governor: Optional[ResourceGovernor] = None,
+                 runtime: Optional[AsyncRuntime] = None):
+        """
+        Initialize Nemo engine
+        
+        Args:
+            governor: Optional resource governor; its settings are pushed
+                to every key whenever the work profile changes
+            runtime: Optional asyncio runtime; key handlers then run as
+                cancellable interactions off the hook thread, and
+                on_key_press/on_key_release return immediately
+        """
         self.keys: Dict[str, NemoKey] = {}
         self.enabled = True
         self.version = "1.0.0"
         self.global_config = {}
+        self.runtime = runtime
+        self.metrics = get_registry()
+        self.tracer = get_tracer()
+        self._key_metrics: Dict[str, tuple] = {}
+        self._keystroke_observers: List[NemoKey] = []
+        
+        self.governor = governor
+        if governor is not None:
+            self.global_config['resources'] = dict(governor.settings)
+            governor.subscribe(self._apply_resource_settings)
     
     def register_key(self, key: NemoKey) -> None:
         """
@@ -33,15 +62,45 @@ class NemoEngine:
             key: NemoKey instance to register
         """
         self.keys[key.key_combo] = key
+        self._key_metrics[key.key_combo] = (
+            self.metrics.histogram('key_press_seconds', "on_press duration", key=key.key_combo),
+            self.metrics.histogram('key_release_seconds', "on_release duration", key=key.key_combo),
+            self.metrics.counter('key_presses_total', "Dispatched key presses", key=key.key_combo),
+        )
+        if 'resources' in self.global_config:
+            key.apply_resource_settings(self.global_config['resources'])
+        self._refresh_observers()
         print(f"[NEMO] Registered: {key.key_name} ({key.key_combo})")
     
+    def register_isolated(self, factory: Callable[[], NemoKey], **options: Any) -> NemoKey:
+        """
+        Register a key hosted in a supervised worker process
+        
+        Args:
+            factory: Picklable callable that builds the key (e.g. its class,
+                or functools.partial with arguments)
+            **options: IsolatedKey / KeyWorker options (key_combo, audio,
+                release_timeout, call_timeout, arena_bytes, ...)
+        
+        Returns:
+            The IsolatedKey proxy
+        """
+        key = IsolatedKey(factory, **options)
+        self.register_key(key)
+        return key
+    
     def unregister_key(self, key_combo: str) -> bool:
         """Unregister a hotkey"""
         if key_combo in self.keys:
             del self.keys[key_combo]
+            self._refresh_observers()
             return True
         return False
     
+    def _refresh_observers(self) -> None:
+        """Cache keys that want the raw keystroke stream"""
+        self._keystroke_observers = [k for k in self.keys.values() if k.observes_keystrokes]
+    
     def get_key(self, key_combo: str) -> Optional[NemoKey]:
         """Get a registered key"""
         return self.keys.get(key_combo)
@@ -82,7 +141,25 @@ class NemoEngine:
         """Handle key press event"""
         key = self.get_key(key_combo)
         if key and key.enabled and self.enabled:
-            key.on_press()
+            press_hist, release_hist, presses = self._key_metrics[key_combo]
+            presses.inc()
+            if self.runtime is not None:
+                self.runtime.press(key, press_hist, release_hist)
+                return
+            start = time.perf_counter_ns()
+            try:
+                with self.tracer.span('engine.on_press', key=key_combo):
+                    key.on_press()
+            finally:
+                press_hist.record_since(start)
+    
+    def on_keystroke(self, key: str, timestamp: float) -> None:
+        """Forward a raw keystroke to observing keys"""
+        if not self.enabled:
+            return
+        for observer in self._keystroke_observers:
+            if observer.enabled:
+                observer.on_keystroke(key, timestamp)
     
     def on_key_hold(self, key_combo: str, duration: float) -> None:
         """Handle key hold event"""
@@ -91,12 +168,68 @@ class NemoEngine:
             key.on_hold(duration)
     
     def on_key_release(self, key_combo: str, total_duration: float):
-        """Handle key release event"""
+        """
+        Handle key release event
+        
+        Returns:
+            The key's on_release result; with a runtime, a
+            concurrent.futures.Future for it
+        """
         key = self.get_key(key_combo)
         if key and key.enabled and self.enabled:
-            return key.on_release(total_duration)
+            _, release_hist, _ = self._key_metrics[key_combo]
+            key.execute()
+            if self.runtime is not None:
+                return self.runtime.release(key_combo, total_duration)
+            start = time.perf_counter_ns()
+            outcome = FAILED
+            try:
+                with self.tracer.span('engine.on_release', key=key_combo):
+                    result = key.on_release(total_duration)
+                outcome = EMPTY if result is None else OK
+                return result
+            finally:
+                release_hist.record_since(start)
+                get_usage_store().record(key_combo, INTERACTION, outcome, hold=total_duration,
+                                         latency=(time.perf_counter_ns() - start) / 1e9)
         return None
     
+    def prewarm_usual(self, when: Optional[float] = None) -> List[str]:
+        """
+        Prewarm keys usually used at the hour of `when` (UsageStore)
+        
+        Returns:
+            Combos that were prewarmed
+        """
+        usage = get_usage_store()
+        warmed = []
+        for combo, key in list(self.keys.items()):
+            if key.enabled and usage.usual_hour(combo, when):
+                try:
+                    key.prewarm()
+                    warmed.append(combo)
+                except Exception as e:
+                    print(f"[NEMO] Prewarm error in {key.key_name}: {e}")
+        return warmed
+    
+    def shutdown(self) -> None:
+        """Let every key flush its state"""
+        if self.runtime is not None:
+            self.runtime.stop()
+        for key in self.keys.values():
+            try:
+                key.shutdown()
+            except Exception as e:
+                print(f"[NEMO] Shutdown error in {key.key_name}: {e}")
+        if any(isinstance(key, IsolatedKey) for key in self.keys.values()):
+            stop_pcm_ring()
+    
+    def _apply_resource_settings(self, settings: Dict[str, Any]) -> None:
+        """Push governor settings to all keys"""
+        self.global_config['resources'] = dict(settings)
+        for key in self.keys.values():
+            key.apply_resource_settings(settings)
+    
     def get_status(self) -> dict:
         """Return Nemo engine status"""
         return {
@@ -104,6 +237,8 @@ class NemoEngine:
             'enabled': self.enabled,
             'keys_registered': len(self.keys),
             'keys': [k.get_status() for k in self.keys.values()],
+            'governor': self.governor.get_status() if self.governor else None,
+            'runtime': self.runtime.get_status() if self.runtime else None,
         }
     
     def __repr__(self):
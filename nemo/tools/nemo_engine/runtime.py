@@ -0,0 +1,286 @@
+"""
+AsyncRuntime - asyncio event loop for key interactions
+
+With a runtime attached, NemoEngine no longer runs key handlers on the
+keyboard hook thread. Each press starts one interaction task on the loop:
+
+    on_press_async() → wait for the release → on_release_async()
+
+- The hook thread only schedules work (microseconds), whatever the key does
+- Each stage has a timeout (press_timeout, and release_timeout or the key's
+  own release_timeout)
+- A new press of the same key cancels that key's in-flight interaction
+  (e.g. a Gemini query still waiting on the network): it is superseded.
+  Presses while the key's interaction is still held (OS auto-repeat) are
+  ignored
+- Sync handlers run in the runtime's thread pool (NemoKey's default async
+  variants). A thread can't be interrupted, so a cancelled sync handler
+  finishes in the background and its result is dropped; keys override the
+  async variants to add cancellation points between their stages
+- run() blocks on the loop until stop(): nothing polls, so an idle Nemo
+  uses no CPU
+
+Usage:
+    runtime = AsyncRuntime()
+    engine = NemoEngine(runtime=runtime)
+    runtime.run()          # or runtime.start() for a background thread
+"""
+
+from typing import Any, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import contextvars
+import threading
+import time
+
+from ..nemo_key import NemoKey
+from ..metrics import get_registry
+from ..tracing import get_tracer
+from ..usage_store import (INTERACTION, OK, EMPTY, FAILED, CANCELLED, TIMEOUT,
+                           get_usage_store)
+
+# Interaction outcome → UsageStore outcome ('completed' depends on the result)
+USAGE_OUTCOMES = {'superseded': CANCELLED, 'cancelled': CANCELLED, 'timeout': TIMEOUT,
+                  'failed': FAILED}
+
+
+class Interaction:
+    """One press → release of a key on the runtime"""
+
+    __slots__ = ('key', 'task', 'released', 'result', 'started', 'outcome', 'hold',
+                 'latency')
+
+    def __init__(self, key: NemoKey, result: Future):
+        self.key = key
+        self.task: Optional[asyncio.Task] = None
+        self.released: Optional[asyncio.Future] = None
+        self.result = result
+        self.started = time.time()
+        self.outcome: Optional[str] = None
+        self.hold = 0.0
+        self.latency = 0.0
+
+
+class AsyncRuntime:
+    """Event loop, thread pool and interaction bookkeeping for NemoEngine"""
+
+    def __init__(self, workers: int = 8, press_timeout: float = 5.0,
+                 release_timeout: float = 60.0):
+        """
+        Args:
+            workers: Threads for sync key handlers
+            press_timeout: Seconds on_press may take before the interaction
+                is abandoned
+            release_timeout: Default seconds for on_release (keys can set
+                their own release_timeout)
+        """
+        self.press_timeout = press_timeout
+        self.release_timeout = release_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='nemo-key')
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(self.executor)
+        self.interactions: Dict[str, Interaction] = {}
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+        self.stopping = False
+        self._stop_event: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self.metrics = get_registry()
+        self.tracer = get_tracer()
+        self._outcomes: Dict[tuple, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Loop lifecycle
+    # ------------------------------------------------------------------
+
+    def run(self) -> None:
+        """Run the loop in this thread until stop() (Ctrl+C propagates)"""
+        if self.loop.is_closed():
+            raise RuntimeError("AsyncRuntime can't be restarted")
+        self.running = True
+        try:
+            self.loop.run_until_complete(self._main())
+        finally:
+            self.running = False
+            self._drain()
+
+    def start(self) -> None:
+        """Run the loop in a background thread"""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.run, name='nemo-runtime', daemon=True)
+        self.thread.start()
+        self._ready.wait(timeout=5.0)
+
+    def stop(self) -> None:
+        """Cancel open interactions and end run() (any thread, idempotent)"""
+        self.stopping = True
+        if self.running and self._stop_event is not None:
+            self.loop.call_soon_threadsafe(self._stop_event.set)
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5.0)
+            self.thread = None
+
+    async def _main(self) -> None:
+        self._stop_event = asyncio.Event()
+        self._ready.set()
+        if not self.stopping:
+            await self._stop_event.wait()
+
+    def _drain(self) -> None:
+        """Cancel what's left, then close the loop and the pool"""
+        tasks = [task for task in asyncio.all_tasks(self.loop) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Dispatch (hook thread → loop)
+    # ------------------------------------------------------------------
+
+    def press(self, key: NemoKey, press_hist, release_hist) -> Future:
+        """
+        Start an interaction for key (superseding its previous one)
+
+        Returns:
+            Future for the interaction's on_release result (cancelled if
+            superseded, or at once if key's interaction is still held;
+            TimeoutError / the handler's exception on failure)
+        """
+        result: Future = Future()
+        if self.loop.is_closed():
+            result.cancel()
+            return result
+        interaction = Interaction(key, result)
+        # Carry the caller's context (trace interaction scope) into the task
+        context = contextvars.copy_context()
+        self.loop.call_soon_threadsafe(self._begin, interaction, press_hist, release_hist,
+                                       context=context)
+        return result
+
+    def release(self, key_combo: str, total_duration: float) -> Optional[Future]:
+        """Hand the release to key_combo's open interaction"""
+        if self.loop.is_closed():
+            return None
+        done: Future = Future()
+        self.loop.call_soon_threadsafe(self._release, key_combo, total_duration, done)
+        return done
+
+    def _begin(self, interaction: Interaction, press_hist, release_hist) -> None:
+        combo = interaction.key.key_combo
+        previous = self.interactions.get(combo)
+        if previous is not None and not previous.released.done():
+            interaction.result.cancel()  # key still held: a repeat, not a new press
+            return
+        if previous is not None and not previous.task.done():
+            previous.outcome = 'superseded'
+            previous.task.cancel()
+        interaction.released = self.loop.create_future()
+        interaction.task = self.loop.create_task(
+            self._interaction(interaction, press_hist, release_hist))
+        interaction.task.add_done_callback(lambda task: self._finished(interaction))
+        self.interactions[combo] = interaction
+
+    def _release(self, key_combo: str, total_duration: float, done: Future) -> None:
+        interaction = self.interactions.get(key_combo)
+        if interaction is None or interaction.released.done():
+            done.set_result(None)  # no open press (missed, or already released)
+            return
+        interaction.released.set_result(total_duration)
+
+        def chain(result: Future) -> None:
+            if result.cancelled():
+                done.cancel()
+            elif result.exception() is not None:
+                done.set_exception(result.exception())
+            else:
+                done.set_result(result.result())
+        interaction.result.add_done_callback(chain)
+
+    # ------------------------------------------------------------------
+    # Interaction
+    # ------------------------------------------------------------------
+
+    async def _interaction(self, interaction: Interaction, press_hist, release_hist) -> None:
+        key = interaction.key
+        combo = key.key_combo
+        result = interaction.result
+        try:
+            start = time.perf_counter_ns()
+            try:
+                with self.tracer.span('engine.on_press', key=combo):
+                    await asyncio.wait_for(key.on_press_async(), self.press_timeout)
+            finally:
+                press_hist.record_since(start)
+
+            total_duration = interaction.hold = await interaction.released
+            start = time.perf_counter_ns()
+            try:
+                with self.tracer.span('engine.on_release', key=combo):
+                    value = await asyncio.wait_for(key.on_release_async(total_duration),
+                                                   key.release_timeout or self.release_timeout)
+            finally:
+                release_hist.record_since(start)
+                interaction.latency = (time.perf_counter_ns() - start) / 1e9
+            interaction.outcome = 'completed'
+            result.set_result(value)
+        except asyncio.TimeoutError as e:
+            interaction.outcome = 'timeout'
+            print(f"[NEMO] {key.key_name} timed out")
+            result.set_exception(e)
+        except Exception as e:
+            interaction.outcome = 'failed'
+            print(f"[NEMO] {key.key_name} failed: {e}")
+            result.set_exception(e)
+
+    def _finished(self, interaction: Interaction) -> None:
+        """Settle the result and bookkeeping (also for tasks cancelled before starting)"""
+        if not interaction.result.done():
+            interaction.result.cancel()
+        combo = interaction.key.key_combo
+        outcome = interaction.outcome or 'cancelled'
+        self._count(combo, outcome)
+        if outcome == 'completed':
+            usage_outcome = EMPTY if interaction.result.result() is None else OK
+        else:
+            usage_outcome = USAGE_OUTCOMES[outcome]
+        get_usage_store().record(combo, INTERACTION, usage_outcome, hold=interaction.hold,
+                                 latency=interaction.latency)
+        if self.interactions.get(combo) is interaction:
+            del self.interactions[combo]
+
+    def schedule(self, interval: float, fn) -> None:
+        """Run fn in the thread pool every interval seconds while the loop runs"""
+        def run() -> None:
+            try:
+                fn()
+            except Exception as e:
+                print(f"[NEMO] Scheduled task failed: {e}")
+
+        def tick() -> None:
+            self.loop.run_in_executor(None, run)
+            self.loop.call_later(interval, tick)
+        self.loop.call_soon_threadsafe(self.loop.call_later, interval, tick)
+
+    def _count(self, combo: str, outcome: str) -> None:
+        counter = self._outcomes.get((combo, outcome))
+        if counter is None:
+            counter = self._outcomes[(combo, outcome)] = self.metrics.counter(
+                'key_interactions_total', "Key interactions by outcome", key=combo,
+                outcome=outcome)
+        counter.inc()
+
+    def get_status(self) -> dict:
+        """Return runtime status"""
+        now = time.time()
+        return {
+            'running': self.running,
+            'open': {combo: round(now - interaction.started, 3)
+                     for combo, interaction in list(self.interactions.items())},
+            'outcomes': {f"{combo}:{outcome}": counter.value
+                         for (combo, outcome), counter in self._outcomes.items()},
+        }
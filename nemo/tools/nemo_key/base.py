@@ -9,10 +9,19 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 import time
 
+from ..tracing import to_thread
+
 
 class NemoKey(ABC):
     """Abstract base class for all Nemo hotkeys"""
     
+    # Set True to receive on_keystroke() for every key pressed
+    observes_keystrokes = False
+    
+    # AsyncRuntime: seconds on_release may run before it is cancelled
+    # (None = the runtime's default)
+    release_timeout: Optional[float] = None
+    
     def __init__(self, key_name: str, key_combo: str, description: str):
         """
         Initialize a Nemo key
@@ -45,6 +54,23 @@ class NemoKey(ABC):
         """Called when key is released (total_duration in seconds)"""
         pass
     
+    async def on_press_async(self) -> None:
+        """
+        on_press under AsyncRuntime. Default: run on_press in the runtime's
+        thread pool. Override to add cancellation points (run blocking stages
+        with tracing.to_thread so slow-interaction profiles include them).
+        """
+        await to_thread(self.on_press)
+    
+    async def on_release_async(self, total_duration: float) -> Any:
+        """
+        on_release under AsyncRuntime. Default: run on_release in the
+        runtime's thread pool; if the interaction is cancelled (superseded,
+        timed out) the thread still finishes and its result is dropped.
+        Override to split slow stages so cancellation stops between them.
+        """
+        return await to_thread(self.on_release, total_duration)
+    
     def execute(self) -> Any:
         """Execute key logic (wrapper for lifecycle)"""
         self.execution_count += 1
@@ -63,6 +89,31 @@ class NemoKey(ABC):
         """Update key configuration"""
         self.config.update(config_dict)
     
+    def apply_resource_settings(self, settings: Dict[str, Any]) -> None:
+        """
+        React to ResourceGovernor settings (capture_interval, encode_profile,
+        indexing_concurrency, background_paused). Default: ignore.
+        """
+        pass
+    
+    def on_keystroke(self, key: str, timestamp: float) -> None:
+        """
+        Called for every key pressed (auto-repeat excluded) when
+        observes_keystrokes is True. Must be fast: runs on the hook thread.
+        """
+        pass
+    
+    def prewarm(self) -> None:
+        """
+        Get ready for likely use soon (called ahead of the hours the
+        UsageStore learned this key is usually used). Default: nothing.
+        """
+        pass
+    
+    def shutdown(self) -> None:
+        """Called once when Nemo stops (flush state, release devices)"""
+        pass
+    
     def get_status(self) -> Dict[str, Any]:
         """Return key status information"""
         return {
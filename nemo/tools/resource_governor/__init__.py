@@ -0,0 +1,6 @@
+"""ResourceGovernor Tool - Adapt background work to system load and battery"""
+from .governor import (ResourceGovernor, GovernorBudget, LoadSample, SystemSampler,
+                       ForegroundProbe, PROFILES)
+
+__all__ = ['ResourceGovernor', 'GovernorBudget', 'LoadSample', 'SystemSampler',
+           'ForegroundProbe', 'PROFILES']
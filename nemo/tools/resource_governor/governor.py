@@ -0,0 +1,353 @@
+"""
+ResourceGovernor - Adapt background work to system load and power state
+
+Watches CPU load, memory pressure, battery/AC state and how heavy the
+foreground app is, then picks a work profile:
+
+    full      AC power, idle machine
+    balanced  moderate load
+    eco       on battery or under pressure
+    paused    heavy foreground app, critical battery or memory: only
+              essential capture, no background indexing
+
+Capture, encoding and indexing read the active settings (or subscribe to
+changes): SnapshotRecorder follows capture_interval and encode_profile,
+AgentSynthesisKey sizes its extraction pool by indexing_concurrency, and
+background_paused holds back compaction rewrites and index writes. Every
+profile change is recorded as a decision and exposed through
+NemoEngine.get_status().
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict, deque
+import os
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:  # optional: fall back to /proc and load average
+    psutil = None
+
+try:
+    import pywinctl
+except ImportError:  # optional: focused window outside Windows
+    pywinctl = None
+
+
+PROFILE_ORDER = ['full', 'balanced', 'eco', 'paused']
+
+PROFILES = {
+    'full': {'capture_interval': 1.0, 'encode_profile': 'quality',
+             'indexing_concurrency': 4, 'background_paused': False},
+    'balanced': {'capture_interval': 2.0, 'encode_profile': 'balanced',
+                 'indexing_concurrency': 2, 'background_paused': False},
+    'eco': {'capture_interval': 5.0, 'encode_profile': 'fast',
+            'indexing_concurrency': 1, 'background_paused': False},
+    'paused': {'capture_interval': 15.0, 'encode_profile': 'fast',
+               'indexing_concurrency': 0, 'background_paused': True},
+}
+
+
+class GovernorBudget:
+    """Resource budgets the governor keeps Nemo within"""
+    cpu_balanced_percent = 50  # system CPU above this → balanced
+    cpu_eco_percent = 75  # system CPU above this → eco
+    memory_eco_percent = 80
+    memory_pause_percent = 92
+    battery_pause_percent = 15
+    foreground_heavy_percent = 60  # foreground app CPU above this → paused
+    recover_after = 10.0  # seconds of calm before stepping back up
+    smoothing = 0.3  # EMA weight of the newest sample
+
+
+class LoadSample:
+    """One observation of system state"""
+
+    __slots__ = ('timestamp', 'cpu_percent', 'memory_percent', 'on_battery',
+                 'battery_percent', 'foreground_cpu_percent')
+
+    def __init__(self, timestamp: float, cpu_percent: float, memory_percent: float,
+                 on_battery: bool = False, battery_percent: Optional[float] = None,
+                 foreground_cpu_percent: float = 0.0):
+        self.timestamp = timestamp
+        self.cpu_percent = cpu_percent
+        self.memory_percent = memory_percent
+        self.on_battery = on_battery
+        self.battery_percent = battery_percent
+        self.foreground_cpu_percent = foreground_cpu_percent
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def foreground_pid() -> Optional[int]:
+    """PID of the process owning the focused window (None if unknown)"""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+            user32 = ctypes.windll.user32
+            hwnd = user32.GetForegroundWindow()
+            if not hwnd:
+                return None
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            return pid.value or None
+        if pywinctl is not None:
+            window = pywinctl.getActiveWindow()
+            return window.getPID() if window is not None else None
+    except Exception:
+        return None
+    return None
+
+
+class ForegroundProbe:
+    """
+    CPU percent of the foreground app, for SystemSampler
+
+    Percent of the whole machine, like LoadSample.cpu_percent. Reads 0
+    without psutil, when the focused window's process is unknown, and for
+    Nemo itself.
+    """
+
+    def __init__(self, pid_source: Callable[[], Optional[int]] = foreground_pid,
+                 max_tracked: int = 8):
+        """
+        Args:
+            pid_source: Returns the foreground process id
+            max_tracked: Recently focused processes kept primed, so
+                switching back doesn't read 0 for one sample
+        """
+        self.pid_source = pid_source
+        self.max_tracked = max_tracked
+        self._processes: 'OrderedDict[int, Any]' = OrderedDict()
+
+    def __call__(self) -> float:
+        if psutil is None:
+            return 0.0
+        pid = self.pid_source()
+        if pid is None or pid == os.getpid():
+            return 0.0
+        process = self._processes.get(pid)
+        if process is None:
+            process = psutil.Process(pid)
+            process.cpu_percent(interval=None)  # prime the delta
+            self._processes[pid] = process
+            while len(self._processes) > self.max_tracked:
+                self._processes.popitem(last=False)
+            return 0.0
+        self._processes.move_to_end(pid)
+        try:
+            return process.cpu_percent(interval=None) / (os.cpu_count() or 1)
+        except psutil.Error:
+            del self._processes[pid]
+            return 0.0
+
+
+class SystemSampler:
+    """Read live system state (psutil when installed, /proc otherwise)"""
+
+    def __init__(self, foreground_probe: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            foreground_probe: Returns the foreground app's CPU percent
+                (platform-specific; treated as 0 when not provided)
+        """
+        self.foreground_probe = foreground_probe
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # prime the delta
+
+    def sample(self) -> LoadSample:
+        """Take one sample"""
+        now = time.time()
+        on_battery, battery = False, None
+
+        if psutil is not None:
+            cpu = psutil.cpu_percent(interval=None)
+            memory = psutil.virtual_memory().percent
+            sensors = getattr(psutil, 'sensors_battery', None)
+            info = sensors() if sensors else None
+            if info is not None:
+                on_battery = not info.power_plugged
+                battery = info.percent
+        else:
+            cpu = self._loadavg_percent()
+            memory = self._proc_memory_percent()
+
+        foreground = 0.0
+        if self.foreground_probe is not None:
+            try:
+                foreground = float(self.foreground_probe())
+            except Exception:
+                foreground = 0.0
+        return LoadSample(now, cpu, memory, on_battery, battery, foreground)
+
+    @staticmethod
+    def _loadavg_percent() -> float:
+        try:
+            return min(100.0, os.getloadavg()[0] / (os.cpu_count() or 1) * 100)
+        except (AttributeError, OSError):
+            return 0.0
+
+    @staticmethod
+    def _proc_memory_percent() -> float:
+        try:
+            info = {}
+            with open('/proc/meminfo') as f:
+                for line in f:
+                    name, value = line.split(':', 1)
+                    info[name] = int(value.split()[0])
+            return 100.0 * (1 - info['MemAvailable'] / info['MemTotal'])
+        except (OSError, KeyError, ValueError):
+            return 0.0
+
+
+class ResourceGovernor:
+    """Chooses capture rate, encode profile and indexing concurrency"""
+
+    def __init__(self, budget: Optional[GovernorBudget] = None,
+                 sampler: Optional[SystemSampler] = None,
+                 max_decisions: int = 50):
+        """
+        Initialize governor
+
+        Args:
+            budget: Budgets/thresholds (GovernorBudget defaults)
+            sampler: Source of LoadSample (live system if None)
+            max_decisions: How many past decisions get_status() keeps
+        """
+        self.budget = budget or GovernorBudget()
+        self.sampler = sampler
+        self.profile = 'full'
+        self.settings = dict(PROFILES['full'])
+        self.decisions = deque(maxlen=max_decisions)
+        self.subscribers: List[Callable[[Dict[str, Any]], None]] = []
+
+        self.cpu_ema: Optional[float] = None
+        self.memory_ema: Optional[float] = None
+        self.last_sample: Optional[LoadSample] = None
+        self.calm_since: Optional[float] = None
+
+        self.running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Call back with the new settings whenever the profile changes"""
+        self.subscribers.append(callback)
+
+    def start(self, interval: float = 2.0) -> None:
+        """Sample the system every interval seconds in a daemon thread"""
+        if self.running:
+            return
+        if self.sampler is None:
+            self.sampler = SystemSampler(foreground_probe=ForegroundProbe())
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, args=(interval,),
+                                       name='nemo-governor', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling"""
+        self.running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def _loop(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.update(self.sampler.sample())
+            except Exception as e:
+                print(f"[GOVERNOR ERROR] {e}")
+
+    def update(self, sample: LoadSample) -> str:
+        """
+        Feed one sample and adjust the profile
+
+        Steps down (less work) immediately; steps back up one level at a time
+        after budget.recover_after seconds of calm, to avoid flapping.
+
+        Returns:
+            Active profile name
+        """
+        b = self.budget
+        alpha = b.smoothing
+        if self.cpu_ema is None:
+            self.cpu_ema, self.memory_ema = sample.cpu_percent, sample.memory_percent
+        else:
+            self.cpu_ema += alpha * (sample.cpu_percent - self.cpu_ema)
+            self.memory_ema += alpha * (sample.memory_percent - self.memory_ema)
+        self.last_sample = sample
+
+        target, reason = self._target_profile(sample)
+        current = PROFILE_ORDER.index(self.profile)
+        wanted = PROFILE_ORDER.index(target)
+
+        if wanted > current:
+            self.calm_since = None
+            self._apply(target, reason, sample)
+        elif wanted < current:
+            if self.calm_since is None:
+                self.calm_since = sample.timestamp
+            elif sample.timestamp - self.calm_since >= b.recover_after:
+                self.calm_since = sample.timestamp
+                self._apply(PROFILE_ORDER[current - 1], f"recovered ({reason})", sample)
+        else:
+            self.calm_since = None
+        return self.profile
+
+    def _target_profile(self, sample: LoadSample):
+        """Most restrictive profile demanded by the current sample"""
+        b = self.budget
+        if sample.foreground_cpu_percent >= b.foreground_heavy_percent:
+            return 'paused', f"foreground app at {sample.foreground_cpu_percent:.0f}% CPU"
+        if self.memory_ema >= b.memory_pause_percent:
+            return 'paused', f"memory at {self.memory_ema:.0f}%"
+        if (sample.on_battery and sample.battery_percent is not None
+                and sample.battery_percent <= b.battery_pause_percent):
+            return 'paused', f"battery at {sample.battery_percent:.0f}%"
+        if sample.on_battery:
+            return 'eco', "on battery"
+        if self.cpu_ema >= b.cpu_eco_percent:
+            return 'eco', f"CPU at {self.cpu_ema:.0f}%"
+        if self.memory_ema >= b.memory_eco_percent:
+            return 'eco', f"memory at {self.memory_ema:.0f}%"
+        if self.cpu_ema >= b.cpu_balanced_percent:
+            return 'balanced', f"CPU at {self.cpu_ema:.0f}%"
+        return 'full', "idle on AC"
+
+    def _apply(self, profile: str, reason: str, sample: LoadSample) -> None:
+        """Switch profile, record the decision and notify subscribers"""
+        decision = {
+            'timestamp': sample.timestamp,
+            'from': self.profile,
+            'to': profile,
+            'reason': reason,
+            'cpu_ema': round(self.cpu_ema, 1),
+            'memory_ema': round(self.memory_ema, 1),
+        }
+        self.profile = profile
+        self.settings = dict(PROFILES[profile])
+        self.decisions.append(decision)
+        for callback in self.subscribers:
+            try:
+                callback(self.settings)
+            except Exception as e:
+                print(f"[GOVERNOR ERROR] subscriber failed: {e}")
+
+    def get_status(self) -> dict:
+        """Return governor state and recent decisions"""
+        return {
+            'running': self.running,
+            'profile': self.profile,
+            'settings': dict(self.settings),
+            'cpu_ema': self.cpu_ema,
+            'memory_ema': self.memory_ema,
+            'last_sample': self.last_sample.to_dict() if self.last_sample else None,
+            'decisions': list(self.decisions),
+        }
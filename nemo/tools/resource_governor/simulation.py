@@ -0,0 +1,116 @@
+"""
+Governor simulation - Drive ResourceGovernor with synthetic load traces
+
+Traces are lists of LoadSample on a virtual clock, so policy changes can be
+checked without touching the real machine.
+
+Usage: python -m nemo.tools.resource_governor.simulation
+"""
+
+from typing import Dict, List, Optional
+import math
+import random
+
+from .governor import GovernorBudget, LoadSample, ResourceGovernor, PROFILE_ORDER
+
+
+def idle_trace(duration: float = 300, step: float = 2.0, seed: int = 0) -> List[LoadSample]:
+    """Idle desktop on AC power"""
+    rng = random.Random(seed)
+    return [LoadSample(t, 5 + rng.random() * 10, 40 + rng.random() * 5)
+            for t in _times(duration, step)]
+
+
+def compile_burst_trace(duration: float = 300, step: float = 2.0,
+                        seed: int = 1) -> List[LoadSample]:
+    """Build job: CPU pinned for the middle third, then back to idle"""
+    rng = random.Random(seed)
+    samples = []
+    for t in _times(duration, step):
+        busy = duration / 3 <= t < 2 * duration / 3
+        cpu = 90 + rng.random() * 10 if busy else 8 + rng.random() * 10
+        samples.append(LoadSample(t, cpu, 55 + rng.random() * 5))
+    return samples
+
+
+def battery_drain_trace(duration: float = 600, step: float = 2.0,
+                        seed: int = 2) -> List[LoadSample]:
+    """Unplugged laptop draining from 40% to 5%"""
+    rng = random.Random(seed)
+    return [LoadSample(t, 20 + rng.random() * 15, 50, on_battery=True,
+                       battery_percent=40 - 35 * t / duration)
+            for t in _times(duration, step)]
+
+
+def foreground_game_trace(duration: float = 300, step: float = 2.0,
+                          seed: int = 3) -> List[LoadSample]:
+    """Heavy foreground app (game, video call) in periodic bursts"""
+    rng = random.Random(seed)
+    samples = []
+    for t in _times(duration, step):
+        heavy = math.sin(t / 40) > 0.3
+        fg = 70 + rng.random() * 20 if heavy else rng.random() * 10
+        samples.append(LoadSample(t, 30 + fg / 2, 60, foreground_cpu_percent=fg))
+    return samples
+
+
+TRACES = {
+    'idle': idle_trace,
+    'compile_burst': compile_burst_trace,
+    'battery_drain': battery_drain_trace,
+    'foreground_game': foreground_game_trace,
+}
+
+
+def _times(duration: float, step: float):
+    t = 0.0
+    while t < duration:
+        yield t
+        t += step
+
+
+def simulate(trace: List[LoadSample],
+             budget: Optional[GovernorBudget] = None) -> Dict:
+    """
+    Replay a trace through a fresh governor
+
+    Returns:
+        Time spent per profile, number of transitions, final status and the
+        profile timeline
+    """
+    governor = ResourceGovernor(budget=budget)
+    time_in = {name: 0.0 for name in PROFILE_ORDER}
+    timeline = []
+    previous = None
+
+    for sample in trace:
+        if previous is not None:
+            time_in[governor.profile] += sample.timestamp - previous
+        governor.update(sample)
+        timeline.append((sample.timestamp, governor.profile))
+        previous = sample.timestamp
+
+    return {
+        'time_in_profile': time_in,
+        'transitions': len(governor.decisions),
+        'timeline': timeline,
+        'status': governor.get_status(),
+    }
+
+
+def main() -> None:
+    """Run every built-in trace and print a summary"""
+    print(f"{'trace':<17}{'full':>8}{'balanced':>10}{'eco':>8}{'paused':>8}{'changes':>9}")
+    print('-' * 60)
+    for name, make_trace in TRACES.items():
+        result = simulate(make_trace())
+        t = result['time_in_profile']
+        print(f"{name:<17}{t['full']:>8.0f}{t['balanced']:>10.0f}{t['eco']:>8.0f}"
+              f"{t['paused']:>8.0f}{result['transitions']:>9}")
+        for decision in result['status']['decisions'][:6]:
+            print(f"    t={decision['timestamp']:>5.0f}s  {decision['from']:>8} → "
+                  f"{decision['to']:<8} {decision['reason']}")
+
+
+if __name__ == '__main__':
+    main()
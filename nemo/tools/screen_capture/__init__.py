@@ -1,4 +1,5 @@
 """ScreenCapture Tool - Screenshot abstraction"""
 from .capture import ScreenCapture
+from .layout import FixedLayout, ScreenLayout, Window
 
-__all__ = ['ScreenCapture']
+__all__ = ['ScreenCapture', 'ScreenLayout', 'FixedLayout', 'Window']
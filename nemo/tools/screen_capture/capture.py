@@ -4,44 +4,250 @@ ScreenCapture Tool - Screenshot abstraction
 Public tool for any key that needs screen images:
 - RIGHT ALT (Gemini with screenshots)
 - RIGHT ALT + UP (Agent synthesis)
+
+By default only the focused window is captured (clipped to the desktop),
+falling back to its monitor and then to the whole virtual desktop when no
+window metadata is available. capture_views() can add a low-resolution
+JPEG overview of the other monitors, so multi-monitor setups upload one
+window at full resolution instead of every screen. When the focused monitor
+sits between the others, its region of the overview is blanked.
 """
 
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from PIL import ImageGrab
 import base64
 import io
+import math
+import time
+
+from .layout import Rect, ScreenLayout, area, intersect, union
+from ..metrics import get_registry
+from ..tracing import get_tracer
+
+
+# PNG zlib level per ResourceGovernor encode profile
+ENCODE_PROFILES = {
+    'quality': 6,
+    'balanced': 3,
+    'fast': 1,
+}
+
+REGIONS = ('window', 'monitor', 'full')
 
 
 class ScreenCapture:
     """Handle screenshot capture for keys"""
     
-    def __init__(self):
-        """Initialize screenshot capture"""
+    def __init__(self, encode_profile: str = 'quality', region: str = 'window',
+                 overview: bool = False, overview_max_side: int = 1024,
+                 overview_quality: int = 60, max_side: Optional[int] = None,
+                 min_window_side: int = 200, layout: Optional[ScreenLayout] = None):
+        """
+        Initialize screenshot capture
+        
+        Args:
+            encode_profile: 'quality', 'balanced' or 'fast' PNG encoding
+            region: 'window' (focused window), 'monitor' (its monitor) or
+                'full' (virtual desktop)
+            overview: Add a low-res overview of the other monitors in
+                capture_views()
+            overview_max_side: Longest side of the overview image (pixels)
+            overview_quality: Overview JPEG quality
+            max_side: Downscale the main image to at most this many pixels
+                on its longest side (None = native resolution)
+            min_window_side: Smaller windows fall back to their monitor
+            layout: Monitor/window source (default: queried from the OS)
+        """
+        if region not in REGIONS:
+            raise ValueError(f"Unknown capture region: {region}")
         self.last_screenshot = None
+        self.last_views: List[Dict] = []
         self.capture_enabled = True
+        self.encode_profile = 'quality'
+        self.set_encode_profile(encode_profile)
+        self.region = region
+        self.overview = overview
+        self.overview_max_side = overview_max_side
+        self.overview_quality = overview_quality
+        self.max_side = max_side
+        self.min_window_side = min_window_side
+        self.layout = layout if layout is not None else ScreenLayout()
+        
+        metrics = get_registry()
+        self.grab_time = metrics.histogram('screen_grab_seconds', "Screen grab duration")
+        self.encode_time = metrics.histogram('screen_encode_seconds', "PNG encode duration")
+        self.payload_bytes = metrics.counter('screen_payload_bytes_total',
+                                             "Encoded screenshot bytes")
+        self.tracer = get_tracer()
     
-    def capture(self) -> Optional[bytes]:
+    def capture(self, region: Union[str, Rect, None] = None) -> Optional[bytes]:
         """
         Capture current screen
         
+        Args:
+            region: 'window', 'monitor', 'full' or a bbox (default: self.region)
+        
         Returns:
             PNG image bytes or None
         """
+        views = self.capture_views(region, overview=False)
+        return views[0]['data'] if views else None
+    
+    def capture_views(self, region: Union[str, Rect, None] = None,
+                      overview: Optional[bool] = None) -> List[Dict]:
+        """
+        Capture the region plus (optionally) an overview of the other screens
+        
+        Returns:
+            [{'name', 'mime_type', 'data', 'bbox', 'size', 'title'}, ...] -
+            main image first; empty on failure or when disabled
+        """
         if not self.capture_enabled:
-            return None
+            return []
+        overview = self.overview if overview is None else overview
         
         try:
-            screenshot = ImageGrab.grab()
+            name, bbox, title, focus, overview_bbox = self._plan(region or self.region, overview)
+            
+            start = time.perf_counter_ns()
+            with self.tracer.span('screen.grab', region=name):
+                if overview_bbox is None:
+                    screenshot = ImageGrab.grab(bbox=bbox, all_screens=True)
+                    desktop = None
+                else:
+                    desktop = ImageGrab.grab(all_screens=True)
+                    screenshot = self._crop(desktop, bbox)
             self.last_screenshot = screenshot
+            self.grab_time.record_since(start)
             
-            # Convert to PNG bytes
-            img_byte_arr = io.BytesIO()
-            screenshot.save(img_byte_arr, format='PNG')
-            return img_byte_arr.getvalue()
+            start = time.perf_counter_ns()
+            with self.tracer.span('screen.encode', profile=self.encode_profile) as span:
+                main = self._downscale(screenshot, self.max_side)
+                views = [self._view(name, 'image/png', self._encode_png(main), bbox,
+                                    main.size, title)]
+                if desktop is not None:
+                    small = self._overview_image(desktop, overview_bbox, focus)
+                    views.append(self._view('overview', 'image/jpeg',
+                                            self._encode_jpeg(small), overview_bbox,
+                                            small.size, None))
+                payload = sum(len(view['data']) for view in views)
+                span.set(bytes=payload)
+            self.encode_time.record_since(start)
+            self.payload_bytes.inc(payload)
+            self.last_views = views
+            return views
+        except Exception as e:
+            print(f"[SCREEN CAPTURE ERROR] {e}")
+            return []
+    
+    def grab(self, region: Union[str, Rect, None] = None):
+        """
+        Grab the region as an image without encoding it
+        
+        Returns:
+            PIL image or None on failure or when disabled
+        """
+        if not self.capture_enabled:
+            return None
+        try:
+            name, bbox, _, _, _ = self._plan(region or self.region, False)
+            start = time.perf_counter_ns()
+            with self.tracer.span('screen.grab', region=name):
+                screenshot = ImageGrab.grab(bbox=bbox, all_screens=True)
+            self.grab_time.record_since(start)
+            return screenshot
         except Exception as e:
             print(f"[SCREEN CAPTURE ERROR] {e}")
             return None
     
+    def _plan(self, region: Union[str, Rect], overview: bool
+              ) -> Tuple[str, Optional[Rect], Optional[str], Optional[Rect], Optional[Rect]]:
+        """
+        (view name, main bbox or None for everything, window title,
+        focused monitor, overview bbox)
+        """
+        monitors = self.layout.monitors()
+        if not isinstance(region, str):
+            return 'region', tuple(region), None, None, None
+        if region not in REGIONS:
+            raise ValueError(f"Unknown capture region: {region}")
+        if region == 'full' or not monitors:
+            return 'full', None, None, None, None
+        
+        window = self.layout.active_window()
+        focus = monitors[0]
+        for monitor in monitors:
+            if monitor[0] <= 0 < monitor[2] and monitor[1] <= 0 < monitor[3]:
+                focus = monitor  # primary
+                break
+        if window is not None:
+            focus = max(monitors, key=lambda m: area(intersect(m, window.bbox)))
+        
+        name, bbox, title = 'monitor', focus, None
+        if region == 'window' and window is not None:
+            clipped = intersect(window.bbox, union(monitors))
+            if clipped and min(clipped[2] - clipped[0],
+                               clipped[3] - clipped[1]) >= self.min_window_side:
+                name, bbox, title = 'window', clipped, window.title
+        
+        others = [m for m in monitors if m != focus]
+        overview_bbox = union(others) if overview and others else None
+        return name, bbox, title, focus, overview_bbox
+    
+    def _local(self, desktop, bbox: Rect) -> Optional[Rect]:
+        """Desktop-coordinate bbox → pixel box in a virtual-desktop grab"""
+        monitors = self.layout.monitors()
+        left, top = (min(m[0] for m in monitors), min(m[1] for m in monitors)) if monitors else (0, 0)
+        return intersect((bbox[0] - left, bbox[1] - top, bbox[2] - left, bbox[3] - top),
+                         (0, 0) + tuple(desktop.size))
+    
+    def _crop(self, desktop, bbox: Optional[Rect]):
+        """Crop a virtual-desktop grab to a bbox in desktop coordinates"""
+        local = self._local(desktop, bbox) if bbox is not None else None
+        return desktop.crop(local) if local else desktop
+    
+    def _overview_image(self, desktop, bbox: Rect, focus: Rect):
+        """Reduced grab of the other monitors with the focused one blanked"""
+        local = self._local(desktop, bbox)
+        hidden = intersect(focus, bbox)
+        if not hidden:
+            return self._downscale(desktop, self.overview_max_side, local)
+        # The other monitors are on both sides of the focused one: their
+        # union covers it, and it must not be sent a second time
+        image = desktop.crop(local)
+        hole = self._local(desktop, hidden)
+        image.paste((0,) * len(image.getbands()),
+                    (hole[0] - local[0], hole[1] - local[1], hole[2] - local[0], hole[3] - local[1]))
+        return self._downscale(image, self.overview_max_side)
+    
+    @staticmethod
+    def _downscale(image, max_side: Optional[int], box: Optional[Rect] = None):
+        """Integer box-filter reduction (of box) to at most max_side pixels"""
+        box = box or (0, 0) + tuple(image.size)
+        longest = max(box[2] - box[0], box[3] - box[1])
+        if not max_side or longest <= max_side:
+            return image.crop(box) if box != (0, 0) + tuple(image.size) else image
+        # reduce() reads the box in place - no intermediate crop of a huge grab
+        return image.reduce(math.ceil(longest / max_side), box=box)
+    
+    def _encode_png(self, image) -> bytes:
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', compress_level=ENCODE_PROFILES[self.encode_profile])
+        return buffer.getvalue()
+    
+    def _encode_jpeg(self, image) -> bytes:
+        buffer = io.BytesIO()
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.save(buffer, format='JPEG', quality=self.overview_quality)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _view(name: str, mime_type: str, data: bytes, bbox: Optional[Rect],
+              size: Tuple[int, int], title: Optional[str]) -> Dict:
+        return {'name': name, 'mime_type': mime_type, 'data': data, 'bbox': bbox,
+                'size': size, 'title': title}
+    
     def capture_base64(self) -> Optional[str]:
         """
         Capture and return as base64 (for API calls)
@@ -54,6 +260,12 @@ class ScreenCapture:
             return base64.b64encode(screenshot_bytes).decode('utf-8')
         return None
     
+    def set_encode_profile(self, profile: str) -> None:
+        """Select PNG encode effort ('quality', 'balanced', 'fast')"""
+        if profile not in ENCODE_PROFILES:
+            raise ValueError(f"Unknown encode profile: {profile}")
+        self.encode_profile = profile
+    
     def enable(self) -> None:
         """Enable screen capture"""
         self.capture_enabled = True
@@ -66,6 +278,12 @@ class ScreenCapture:
         """Check if capture is enabled"""
         return self.capture_enabled
     
+    def set_region(self, region: str) -> None:
+        """Select what capture() grabs by default ('window', 'monitor', 'full')"""
+        if region not in REGIONS:
+            raise ValueError(f"Unknown capture region: {region}")
+        self.region = region
+    
     def get_dimensions(self) -> Tuple[int, int]:
         """Get screen dimensions"""
         try:
@@ -73,3 +291,16 @@ class ScreenCapture:
             return screenshot.size
         except:
             return (0, 0)
+    
+    def get_status(self) -> dict:
+        """Return capture settings and the last capture's views"""
+        return {
+            'enabled': self.capture_enabled,
+            'region': self.region,
+            'overview': self.overview,
+            'encode_profile': self.encode_profile,
+            'monitors': len(self.layout.monitors()),
+            'last_views': [dict(name=view['name'], bbox=view['bbox'], size=view['size'],
+                                title=view['title'], bytes=len(view['data']))
+                           for view in self.last_views],
+        }
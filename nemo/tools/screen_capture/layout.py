@@ -0,0 +1,190 @@
+"""
+Screen layout - Monitors and the focused window
+
+Rectangles are PIL bboxes in virtual-desktop coordinates:
+(left, top, right, bottom), the same coordinates ImageGrab.grab() uses.
+
+Windows is queried through user32 (no extra packages; the thread is made
+per-monitor DPI aware for the query so rectangles match ImageGrab's
+physical pixels). Elsewhere the optional `screeninfo` and `pywinctl`
+packages are used when installed; without them there is no window metadata
+and ScreenCapture falls back to whole screens.
+"""
+
+from typing import List, Optional, Tuple
+import ctypes
+import sys
+import time
+
+try:
+    import screeninfo
+except ImportError:  # optional
+    screeninfo = None
+
+try:
+    import pywinctl
+except ImportError:  # optional
+    pywinctl = None
+
+Rect = Tuple[int, int, int, int]
+
+# DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2
+_PER_MONITOR_AWARE_V2 = -4
+# DWMWA_EXTENDED_FRAME_BOUNDS: window rectangle without the invisible resize border
+_DWMWA_EXTENDED_FRAME_BOUNDS = 9
+
+
+class Window:
+    """Focused top-level window"""
+
+    __slots__ = ('title', 'bbox')
+
+    def __init__(self, title: str, bbox: Rect):
+        self.title = title
+        self.bbox = bbox
+
+    def to_dict(self) -> dict:
+        return {'title': self.title, 'bbox': self.bbox}
+
+
+def area(rect: Optional[Rect]) -> int:
+    if rect is None:
+        return 0
+    return max(0, rect[2] - rect[0]) * max(0, rect[3] - rect[1])
+
+
+def intersect(a: Rect, b: Rect) -> Optional[Rect]:
+    """Overlap of two rectangles, or None"""
+    rect = (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+    return rect if rect[0] < rect[2] and rect[1] < rect[3] else None
+
+
+def union(rects: List[Rect]) -> Optional[Rect]:
+    """Bounding box of rectangles, or None"""
+    if not rects:
+        return None
+    return (min(r[0] for r in rects), min(r[1] for r in rects),
+            max(r[2] for r in rects), max(r[3] for r in rects))
+
+
+class _DpiAware:
+    """Per-monitor DPI awareness for the calling thread (Windows)"""
+
+    def __enter__(self):
+        self.previous = None
+        try:
+            user32 = ctypes.windll.user32
+            user32.SetThreadDpiAwarenessContext.restype = ctypes.c_void_p
+            self.previous = user32.SetThreadDpiAwarenessContext(
+                ctypes.c_void_p(_PER_MONITOR_AWARE_V2))
+        except (AttributeError, OSError):
+            pass
+        return self
+
+    def __exit__(self, *exc):
+        if self.previous:
+            ctypes.windll.user32.SetThreadDpiAwarenessContext(ctypes.c_void_p(self.previous))
+
+
+def _win32_monitors() -> List[Rect]:
+    from ctypes import wintypes
+    rects: List[Rect] = []
+    proc_type = ctypes.WINFUNCTYPE(ctypes.c_int, wintypes.HMONITOR, wintypes.HDC,
+                                   ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
+
+    def callback(monitor, dc, rect, data):
+        r = rect.contents
+        rects.append((r.left, r.top, r.right, r.bottom))
+        return 1
+
+    with _DpiAware():
+        ctypes.windll.user32.EnumDisplayMonitors(None, None, proc_type(callback), 0)
+    return rects
+
+
+def _win32_active_window() -> Optional[Window]:
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    with _DpiAware():
+        hwnd = user32.GetForegroundWindow()
+        if not hwnd or user32.IsIconic(hwnd):
+            return None
+        rect = wintypes.RECT()
+        try:
+            failed = ctypes.windll.dwmapi.DwmGetWindowAttribute(
+                wintypes.HWND(hwnd), _DWMWA_EXTENDED_FRAME_BOUNDS,
+                ctypes.byref(rect), ctypes.sizeof(rect))
+        except (AttributeError, OSError):
+            failed = True
+        if failed and not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            return None
+    length = user32.GetWindowTextLengthW(hwnd)
+    title = ctypes.create_unicode_buffer(length + 1)
+    user32.GetWindowTextW(hwnd, title, length + 1)
+    return Window(title.value, (rect.left, rect.top, rect.right, rect.bottom))
+
+
+class ScreenLayout:
+    """Monitor rectangles (cached) and the focused window (queried per call)"""
+
+    def __init__(self, monitor_ttl: float = 5.0):
+        """
+        Args:
+            monitor_ttl: Seconds to reuse the monitor list before re-querying
+        """
+        self.monitor_ttl = monitor_ttl
+        self._monitors: List[Rect] = []
+        self._monitors_at = 0.0
+
+    def monitors(self) -> List[Rect]:
+        """Monitor rectangles; empty if they can't be determined"""
+        now = time.monotonic()
+        if now - self._monitors_at >= self.monitor_ttl:
+            try:
+                self._monitors = self._query_monitors()
+            except Exception as e:
+                print(f"[SCREEN LAYOUT] Monitor query failed: {e}")
+                self._monitors = []
+            self._monitors_at = now
+        return self._monitors
+
+    def active_window(self) -> Optional[Window]:
+        """Focused window, or None if unknown"""
+        try:
+            return self._query_active_window()
+        except Exception:
+            return None
+
+    def _query_monitors(self) -> List[Rect]:
+        if sys.platform == 'win32':
+            return _win32_monitors()
+        if screeninfo is not None:
+            return [(m.x, m.y, m.x + m.width, m.y + m.height)
+                    for m in screeninfo.get_monitors()]
+        return []
+
+    def _query_active_window(self) -> Optional[Window]:
+        if sys.platform == 'win32':
+            return _win32_active_window()
+        if pywinctl is not None:
+            window = pywinctl.getActiveWindow()
+            if window is None or window.isMinimized:
+                return None
+            return Window(window.title, (window.left, window.top,
+                                         window.left + window.width, window.top + window.height))
+        return None
+
+
+class FixedLayout(ScreenLayout):
+    """Static monitors and focused window (tests, benchmarks, replay)"""
+
+    def __init__(self, monitors: List[Rect], window: Optional[Window] = None):
+        super().__init__()
+        self._fixed_monitors = list(monitors)
+        self.window = window
+
+    def monitors(self) -> List[Rect]:
+        return self._fixed_monitors
+
+    def active_window(self) -> Optional[Window]:
+        return self.window
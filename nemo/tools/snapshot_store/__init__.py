@@ -0,0 +1,7 @@
+"""SnapshotStore Tool - Snapshot history storage and compaction"""
+from .store import SnapshotStore
+from .compaction import CompactionEngine, RetentionPolicy, IOBudget
+from .recorder import SnapshotRecorder
+
+__all__ = ['SnapshotStore', 'CompactionEngine', 'RetentionPolicy', 'IOBudget',
+           'SnapshotRecorder']
@@ -0,0 +1,313 @@
+"""
+CompactionEngine - Retention, downsampling and garbage collection
+
+Runs in the background against a SnapshotStore:
+1. Retention: drops unpinned snapshots older than the retention window
+2. Downsampling: thins history as it ages (e.g. hourly after a day)
+3. GC: forgets chunks whose refcount reached zero
+4. Merge: rewrites sparse or small segments into fresh ones and deletes
+   the originals, reclaiming the space of dead chunks
+
+All rewrite I/O goes through an IOBudget so compaction never competes
+with capture. While the ResourceGovernor has background work paused,
+passes only drop expired snapshots and chunks (no I/O) and a running merge
+stops at the next segment boundary.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+from .store import SnapshotStore
+
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+
+class RetentionPolicy:
+    """How long history is kept and how it is thinned with age"""
+
+    MAX_RETENTION_DAYS = 30
+
+    def __init__(self, retention_days: float = 14,
+                 tiers: Optional[List[Tuple[float, float]]] = None):
+        """
+        Args:
+            retention_days: Unpinned snapshots older than this are purged
+                (default 2 weeks, up to 1 month)
+            tiers: (older_than_seconds, keep_one_per_seconds) pairs. Default
+                keeps full rate for a day, hourly after a day, and one
+                snapshot per 6 hours after a week.
+        """
+        if not 0 < retention_days <= self.MAX_RETENTION_DAYS:
+            raise ValueError(
+                f"retention_days must be in (0, {self.MAX_RETENTION_DAYS}]"
+            )
+        self.retention_days = retention_days
+        if tiers is None:
+            tiers = [(DAY, HOUR), (WEEK, 6 * HOUR)]
+        self.tiers = sorted(tiers)
+
+    def interval_for_age(self, age: float) -> float:
+        """Downsampling interval for a snapshot of this age (0 = keep all)"""
+        interval = 0.0
+        for older_than, keep_one_per in self.tiers:
+            if age >= older_than:
+                interval = keep_one_per
+        return interval
+
+    def select_expired(self, snapshots: List[Tuple[str, dict]], now: float) -> List[str]:
+        """
+        Pick snapshots to remove
+
+        Args:
+            snapshots: (id, record) pairs sorted oldest first
+            now: Reference time
+
+        Returns:
+            Snapshot ids to drop (never pinned ones)
+        """
+        max_age = self.retention_days * DAY
+        expired = []
+        kept_buckets = set()
+
+        for snapshot_id, record in snapshots:
+            if record['pinned']:
+                continue
+            age = now - record['timestamp']
+            if age > max_age:
+                expired.append(snapshot_id)
+                continue
+
+            interval = self.interval_for_age(age)
+            if interval <= 0:
+                continue
+            bucket = (interval, int(record['timestamp'] // interval))
+            if bucket in kept_buckets:
+                expired.append(snapshot_id)
+            else:
+                kept_buckets.add(bucket)
+        return expired
+
+
+class IOBudget:
+    """Token bucket limiting compaction I/O (bytes per second)"""
+
+    def __init__(self, bytes_per_sec: float = 8 * 1024 * 1024,
+                 is_busy: Optional[Callable[[], bool]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            bytes_per_sec: Sustained I/O allowance
+            is_busy: Returns True while capture is active; compaction waits
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.bytes_per_sec = bytes_per_sec
+        self.is_busy = is_busy
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = bytes_per_sec
+        self.last_refill = clock()
+        self.throttled_seconds = 0.0
+
+    def consume(self, nbytes: int) -> None:
+        """Block until nbytes of I/O are allowed"""
+        while self.is_busy is not None and self.is_busy():
+            self._wait(0.05)
+
+        self._refill()
+        self.tokens -= nbytes
+        if self.tokens < 0:
+            self._wait(-self.tokens / self.bytes_per_sec)
+
+    def _refill(self) -> None:
+        now = self.clock()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.tokens = min(self.bytes_per_sec, self.tokens + elapsed * self.bytes_per_sec)
+
+    def _wait(self, seconds: float) -> None:
+        self.throttled_seconds += seconds
+        self.sleep(seconds)
+
+
+class CompactionEngine:
+    """Background compaction for a SnapshotStore"""
+
+    def __init__(self, store: SnapshotStore,
+                 policy: Optional[RetentionPolicy] = None,
+                 budget: Optional[IOBudget] = None,
+                 min_live_ratio: float = 0.5,
+                 min_segment_bytes: int = 4 * 1024 * 1024):
+        """
+        Initialize compaction engine
+
+        Args:
+            store: Store to compact
+            policy: Retention/downsampling policy
+            budget: I/O budget for rewrites
+            min_live_ratio: Segments with less live data than this are merged
+            min_segment_bytes: Segments smaller than this are merged together
+        """
+        self.store = store
+        self.policy = policy or RetentionPolicy()
+        self.budget = budget or IOBudget()
+        self.min_live_ratio = min_live_ratio
+        self.min_segment_bytes = min_segment_bytes
+        self.paused = False
+
+        self.running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+
+        self.last_report: Optional[Dict[str, float]] = None
+        self.totals = {'runs': 0, 'bytes_reclaimed': 0, 'bytes_rewritten': 0,
+                       'snapshots_removed': 0, 'chunks_collected': 0}
+
+    def start(self, interval: float = 15 * 60) -> None:
+        """Run compaction every interval seconds in a daemon thread"""
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, args=(interval,),
+                                       name='nemo-compaction', daemon=True)
+        self.thread.start()
+        print("[COMPACTION] Started")
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        self.running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        print("[COMPACTION] Stopped")
+
+    def apply_resource_settings(self, settings: Dict[str, Any]) -> None:
+        """Follow ResourceGovernor's background_paused"""
+        self.paused = settings['background_paused']
+
+    def _interrupted(self) -> bool:
+        return self.paused or self._stop_event.is_set()
+
+    def _loop(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[COMPACTION ERROR] {e}")
+
+    def run_once(self, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Run one full compaction pass
+
+        Args:
+            now: Reference time for retention (defaults to wall clock)
+
+        Returns:
+            Report with reclaimed bytes and throughput
+        """
+        now = time.time() if now is None else now
+        started = time.perf_counter()
+
+        removed = self._apply_retention(now)
+        collected = self._collect_garbage()
+        merged, rewritten, reclaimed = (0, 0, 0) if self.paused else self._merge_segments()
+        self.store.save()
+
+        duration = time.perf_counter() - started
+        report = {
+            'snapshots_removed': removed,
+            'chunks_collected': collected,
+            'segments_merged': merged,
+            'bytes_rewritten': rewritten,
+            'bytes_reclaimed': reclaimed,
+            'duration': duration,
+            'throttled_seconds': self.budget.throttled_seconds,
+            'throughput_mb_s': (rewritten / (1024 * 1024)) / duration if duration > 0 else 0.0,
+        }
+        self.last_report = report
+        self.totals['runs'] += 1
+        for field in ('bytes_reclaimed', 'bytes_rewritten', 'snapshots_removed',
+                      'chunks_collected'):
+            self.totals[field] += report[field]
+        return report
+
+    def _apply_retention(self, now: float) -> int:
+        """Drop expired and downsampled snapshots"""
+        expired = self.policy.select_expired(self.store.list_snapshots(), now)
+        for snapshot_id in expired:
+            self.store.remove_snapshot(snapshot_id)
+        return len(expired)
+
+    def _collect_garbage(self) -> int:
+        """Forget every chunk with no remaining references"""
+        with self.store.lock:
+            dead = [key for key, entry in self.store.chunks.items() if entry[3] <= 0]
+            for key in dead:
+                self.store.drop_chunk(key)
+        return len(dead)
+
+    def _merge_segments(self) -> Tuple[int, int, int]:
+        """
+        Rewrite sparse and small sealed segments into new ones
+
+        Returns:
+            (segments merged, bytes rewritten, bytes reclaimed)
+        """
+        usage = self.store.segment_usage()
+        # Segments filled to half their rotation size are never "small"
+        small_limit = min(self.min_segment_bytes, self.store.max_segment_bytes // 2)
+        candidates = []
+        for segment_id, seg in sorted(usage.items()):
+            if segment_id == self.store.active_segment:
+                continue
+            live_ratio = seg['live'] / seg['total'] if seg['total'] else 0.0
+            if live_ratio < self.min_live_ratio or seg['total'] < small_limit:
+                candidates.append(segment_id)
+
+        # A lone small segment with no garbage gains nothing from a rewrite
+        if len(candidates) == 1:
+            seg = usage[candidates[0]]
+            if seg['live'] == seg['total']:
+                return 0, 0, 0
+        if not candidates:
+            return 0, 0, 0
+
+        rewritten = 0
+        reclaimed = 0
+        target = None
+        moved = []
+        for segment_id in candidates:
+            if self._interrupted():
+                break
+            for key, entry in self.store.iter_segment_chunks(segment_id):
+                if target is None or self.store.segments[target] >= self.store.max_segment_bytes:
+                    target = self.store.new_segment()
+                data = self.store.read_stored_chunk(key)
+                self.budget.consume(2 * len(data))  # read + write
+                rewritten += self.store.relocate_chunk(key, data, target)
+            moved.append(segment_id)
+
+        # The manifest must point at the moved chunks before the originals
+        # go: a crash in between then only leaves orphaned old segments
+        self.store.save()
+        for segment_id in moved:
+            reclaimed += self.store.delete_segment(segment_id)
+
+        return len(moved), rewritten, reclaimed - rewritten
+
+    def get_status(self) -> dict:
+        """Return compaction status"""
+        return {
+            'running': self.running,
+            'paused': self.paused,
+            'retention_days': self.policy.retention_days,
+            'last_report': self.last_report,
+            'totals': dict(self.totals),
+        }
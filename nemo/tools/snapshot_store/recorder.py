@@ -0,0 +1,166 @@
+"""
+SnapshotRecorder - Continuous screen history for a SnapshotStore
+
+Every interval seconds the screen is grabbed, cut into fixed tiles and
+stored as one snapshot whose parent is the previous one. Unchanged tiles
+are not re-encoded and dedupe to chunks already in the store, so a mostly
+static screen costs little more than a manifest entry per snapshot.
+
+`capturing` is True while a snapshot is being taken; CompactionEngine's
+IOBudget uses it as is_busy so rewrites never compete with capture. The
+interval and encode profile follow the ResourceGovernor.
+
+The thread also wakes when the store's manifest save is due, so a change is
+saved within the store's save_interval even if the capture interval is
+longer or grabs fail.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import io
+import threading
+import time
+
+from .store import SnapshotStore
+from ..metrics import get_registry
+from ..screen_capture import ScreenCapture
+from ..screen_capture.capture import ENCODE_PROFILES
+
+
+class SnapshotRecorder:
+    """Background thread writing tiled screen snapshots"""
+
+    def __init__(self, store: SnapshotStore, screen: Optional[ScreenCapture] = None,
+                 interval: float = 5.0, tile_size: int = 256):
+        """
+        Initialize the recorder
+
+        Args:
+            store: Store receiving the snapshots
+            screen: Capture source (default: whole desktop, fast encoding)
+            interval: Seconds between snapshots
+            tile_size: Tile edge in pixels (the unit of dedup)
+        """
+        self.store = store
+        self.screen = screen or ScreenCapture(encode_profile='fast', region='full')
+        self.interval = interval
+        self.tile_size = tile_size
+        self.last_id: Optional[str] = None
+        self.capturing = False
+
+        # tile box -> (digest of raw pixels, encoded PNG) from the last frame
+        self._tiles: Dict[Tuple[int, int, int, int], Tuple[bytes, bytes]] = {}
+
+        self.running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+
+        metrics = get_registry()
+        self.snapshot_time = metrics.histogram('snapshot_capture_seconds',
+                                               "Grab, tile and store one snapshot")
+        self.tiles_encoded = metrics.counter('snapshot_tiles_encoded_total',
+                                             "Changed snapshot tiles encoded")
+        self.snapshots_written = metrics.counter('snapshots_written_total',
+                                                 "Snapshots written by the recorder")
+
+    def start(self) -> None:
+        """Take a snapshot every interval seconds in a daemon thread"""
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name='nemo-snapshots', daemon=True)
+        self.thread.start()
+        print("[SNAPSHOTS] Recording")
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        self.running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        print("[SNAPSHOTS] Stopped")
+
+    def _loop(self) -> None:
+        # interval is re-read after every capture so changes apply without a restart
+        next_capture = time.monotonic() + self.interval
+        while True:
+            wait = next_capture - time.monotonic()
+            # Waking every save_interval catches changes made while asleep
+            save_due = self.store.save_due_in()
+            wait = min(wait, self.store.save_interval if save_due is None else save_due)
+            if self._stop_event.wait(max(wait, 0.05)):
+                break
+            try:
+                if time.monotonic() >= next_capture:
+                    next_capture = time.monotonic() + self.interval
+                    self.capture_once()
+                self.store.save_if_due()
+            except Exception as e:
+                print(f"[SNAPSHOTS ERROR] {e}")
+                self._stop_event.wait(1.0)  # a failing save is due again at once
+
+    def capture_once(self, timestamp: Optional[float] = None) -> Optional[str]:
+        """
+        Take one snapshot
+
+        Args:
+            timestamp: Capture time (defaults to now)
+
+        Returns:
+            Snapshot id, or None when the grab failed
+        """
+        start = time.perf_counter_ns()
+        self.capturing = True
+        try:
+            image = self.screen.grab()
+            if image is None:
+                return None
+
+            width, height = image.size
+            size = self.tile_size
+            tiles = {}
+            chunks = []
+            for top in range(0, height, size):
+                for left in range(0, width, size):
+                    box = (left, top, min(left + size, width), min(top + size, height))
+                    tile = image.crop(box)
+                    raw = hashlib.sha1(tile.tobytes()).digest()
+                    cached = self._tiles.get(box)
+                    if cached is None or cached[0] != raw:
+                        cached = (raw, self._encode(tile))
+                        self.tiles_encoded.inc()
+                    tiles[box] = cached
+                    chunks.append(('frames', cached[1]))
+            self._tiles = tiles
+
+            metadata = {'size': [width, height], 'tile_size': size}
+            self.last_id = self.store.add_snapshot(chunks, timestamp=timestamp,
+                                                   parent=self.last_id, metadata=metadata)
+            self.snapshots_written.inc()
+            return self.last_id
+        finally:
+            self.capturing = False
+            self.snapshot_time.record_since(start)
+
+    def apply_resource_settings(self, settings: Dict[str, Any]) -> None:
+        """Follow ResourceGovernor's capture_interval and encode_profile"""
+        self.interval = settings['capture_interval']
+        self.screen.set_encode_profile(settings['encode_profile'])
+
+    def _encode(self, tile) -> bytes:
+        buffer = io.BytesIO()
+        tile.save(buffer, format='PNG', compress_level=ENCODE_PROFILES[self.screen.encode_profile])
+        return buffer.getvalue()
+
+    def get_status(self) -> dict:
+        """Return recorder status"""
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'encode_profile': self.screen.encode_profile,
+            'tile_size': self.tile_size,
+            'last_snapshot': self.last_id,
+            'tiles': len(self._tiles),
+        }
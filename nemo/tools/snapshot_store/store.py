@@ -0,0 +1,409 @@
+"""
+SnapshotStore Tool - Segmented, content-addressed snapshot history
+
+Snapshots are lists of chunks (screen tiles, keystroke stacks, metadata blobs).
+Chunks are deduplicated by SHA-1 and appended to segment files, so a snapshot
+that only changed a few tiles shares the rest with its parent (delta chain).
+Every chunk carries a refcount; deleting a snapshot only drops references and
+leaves the bytes for the CompactionEngine to reclaim.
+
+Chunks and the manifest pass through an optional CodecSet (compression and
+encryption per stream, e.g. 'frames', 'keystrokes', 'metadata'). Digests are
+taken over raw data so dedup is independent of codec settings.
+
+The manifest is saved at most save_interval seconds after a change (and on
+pin/unpin, compaction and save()), so a crash loses at most that much
+history: SnapshotRecorder's thread calls save_if_due() even when no new
+snapshot arrives. Segment ids are never reused, and segment files the
+manifest does not list (written after the last save, e.g. merge targets of
+a crashed compaction) are deleted on load.
+
+Layout:
+    <root>/manifest.json          snapshots, chunk index, segment list
+    <root>/segments/seg-NNNNNN.dat
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+
+from ..codec import CodecSet
+from ..codec.codec import MAGIC
+
+
+# Record header: sha1 digest + payload length
+RECORD_HEADER = struct.Struct('>20sI')
+
+
+class SnapshotStore:
+    """Append-only chunk store with refcounted snapshots and pins"""
+
+    def __init__(self, root: str, max_segment_bytes: int = 64 * 1024 * 1024,
+                 codecs: Optional[CodecSet] = None, save_interval: float = 30.0):
+        """
+        Open (or create) a snapshot store
+
+        Args:
+            root: Directory holding the manifest and segment files
+            max_segment_bytes: Size at which the active segment is rotated
+            codecs: Per-stream codecs (stored uncompressed if None)
+            save_interval: Most seconds a new snapshot waits for the
+                manifest to be saved
+        """
+        self.root = root
+        self.codecs = codecs
+        self.save_interval = save_interval
+        self.last_saved = time.time()
+        self.changed_at: Optional[float] = None  # first change not yet saved
+        self.segment_dir = os.path.join(root, 'segments')
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.max_segment_bytes = max_segment_bytes
+        self.lock = threading.RLock()
+
+        # snapshot_id -> {timestamp, pinned, parent, chunks, metadata}
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        # chunk hex digest -> [segment_id, offset, length, refcount]
+        self.chunks: Dict[str, List[int]] = {}
+        # segment_id -> total bytes written (live + dead)
+        self.segments: Dict[int, int] = {}
+        self.active_segment = 0
+        self.next_segment = 1
+
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def add_snapshot(self, chunks: List[Union[bytes, Tuple[str, bytes]]],
+                     timestamp: Optional[float] = None,
+                     parent: Optional[str] = None,
+                     metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Store a snapshot
+
+        Args:
+            chunks: Raw payloads, or (stream, payload) pairs to pick a codec
+            timestamp: Capture time (defaults to now)
+            parent: Previous snapshot id in the delta chain
+            metadata: Small JSON-serializable metadata
+
+        Returns:
+            Snapshot id
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            digests = [
+                self.put_chunk(c[1], stream=c[0]) if isinstance(c, tuple) else self.put_chunk(c)
+                for c in chunks
+            ]
+            for digest in digests:
+                self.chunks[digest][3] += 1
+
+            snapshot_id = f"{timestamp:.6f}"
+            while snapshot_id in self.snapshots:
+                snapshot_id += '+'
+            self.snapshots[snapshot_id] = {
+                'timestamp': timestamp,
+                'pinned': False,
+                'parent': parent,
+                'chunks': digests,
+                'metadata': metadata or {},
+            }
+            self._mark_changed()
+            self.save_if_due()
+            return snapshot_id
+
+    def get_snapshot(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Get snapshot record (None if unknown)"""
+        return self.snapshots.get(snapshot_id)
+
+    def read_snapshot(self, snapshot_id: str) -> List[bytes]:
+        """Read all chunk payloads of a snapshot"""
+        with self.lock:
+            record = self.snapshots[snapshot_id]
+            return [self.read_chunk(digest) for digest in record['chunks']]
+
+    def list_snapshots(self, start: Optional[float] = None,
+                       end: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """List snapshots in a time range, oldest first"""
+        with self.lock:
+            items = [
+                (sid, rec) for sid, rec in self.snapshots.items()
+                if (start is None or rec['timestamp'] >= start)
+                and (end is None or rec['timestamp'] <= end)
+            ]
+        items.sort(key=lambda item: item[1]['timestamp'])
+        return items
+
+    def remove_snapshot(self, snapshot_id: str) -> int:
+        """
+        Drop a snapshot's chunk references
+
+        Chunk bytes stay on disk until compaction. Children that named this
+        snapshot as parent are relinked to its parent so chains stay intact.
+
+        Returns:
+            Number of chunks whose refcount reached zero
+        """
+        with self.lock:
+            record = self.snapshots.pop(snapshot_id, None)
+            if record is None:
+                return 0
+
+            freed = 0
+            for digest in record['chunks']:
+                entry = self.chunks[digest]
+                entry[3] -= 1
+                if entry[3] == 0:
+                    freed += 1
+
+            for child in self.snapshots.values():
+                if child['parent'] == snapshot_id:
+                    child['parent'] = record['parent']
+            self._mark_changed()
+            return freed
+
+    def pin(self, snapshot_id: str) -> bool:
+        """Pin a snapshot so retention never removes it"""
+        return self._set_pinned(snapshot_id, True)
+
+    def unpin(self, snapshot_id: str) -> bool:
+        """Release a pin"""
+        return self._set_pinned(snapshot_id, False)
+
+    def _set_pinned(self, snapshot_id: str, pinned: bool) -> bool:
+        with self.lock:
+            record = self.snapshots.get(snapshot_id)
+            if record is None:
+                return False
+            record['pinned'] = pinned
+            self.save()
+            return True
+
+    # ------------------------------------------------------------------
+    # Chunks and segments
+    # ------------------------------------------------------------------
+
+    def put_chunk(self, data: bytes, stream: Optional[str] = None) -> str:
+        """
+        Append a chunk unless an identical one is already stored
+
+        Refcounts are managed by snapshots, so a fresh chunk starts at zero.
+
+        Args:
+            data: Raw payload
+            stream: Artifact stream selecting the codec
+
+        Returns:
+            Hex digest of the chunk
+        """
+        digest = hashlib.sha1(data).digest()
+        key = digest.hex()
+        with self.lock:
+            if key not in self.chunks:
+                stored = self.codecs.encode(data, stream) if self.codecs else data
+                segment_id, offset = self._append(digest, stored)
+                self.chunks[key] = [segment_id, offset, len(stored), 0]
+            return key
+
+    def read_chunk(self, key: str) -> bytes:
+        """Read and decode a chunk payload by hex digest"""
+        stored = self.read_stored_chunk(key)
+        return self.codecs.decode(stored) if self.codecs else stored
+
+    def read_stored_chunk(self, key: str) -> bytes:
+        """Read a chunk exactly as stored on disk (still encoded)"""
+        with self.lock:
+            segment_id, offset, length, _ = self.chunks[key]
+            with open(self._segment_path(segment_id), 'rb') as f:
+                f.seek(offset)
+                return f.read(length)
+
+    def iter_segment_chunks(self, segment_id: int) -> Iterator[Tuple[str, List[int]]]:
+        """Yield (digest, entry) for every indexed chunk living in a segment"""
+        with self.lock:
+            items = [(k, e) for k, e in self.chunks.items() if e[0] == segment_id]
+        items.sort(key=lambda item: item[1][1])
+        return iter(items)
+
+    def segment_usage(self) -> Dict[int, Dict[str, int]]:
+        """Return total and live bytes per segment"""
+        with self.lock:
+            usage = {
+                seg: {'total': size, 'live': 0, 'dead': 0}
+                for seg, size in self.segments.items()
+            }
+            for entry in self.chunks.values():
+                record_size = RECORD_HEADER.size + entry[2]
+                bucket = 'live' if entry[3] > 0 else 'dead'
+                usage[entry[0]][bucket] += record_size
+            return usage
+
+    def relocate_chunk(self, key: str, data: bytes, target_segment: int) -> int:
+        """
+        Move a chunk into another (non-active) segment
+
+        Used by compaction when merging segments; data is the stored
+        (encoded) form. Returns bytes written.
+        """
+        with self.lock:
+            entry = self.chunks[key]
+            offset = self._write_record(target_segment, bytes.fromhex(key), data)
+            entry[0] = target_segment
+            entry[1] = offset
+            return RECORD_HEADER.size + len(data)
+
+    def drop_chunk(self, key: str) -> None:
+        """Forget an unreferenced chunk (its bytes die with its segment)"""
+        with self.lock:
+            entry = self.chunks.get(key)
+            if entry is not None and entry[3] <= 0:
+                del self.chunks[key]
+
+    def new_segment(self) -> int:
+        """Allocate an empty segment with a never-used id (not the active write target)"""
+        with self.lock:
+            segment_id = self.next_segment
+            self.next_segment += 1
+            self.segments[segment_id] = 0
+            open(self._segment_path(segment_id), 'wb').close()
+            return segment_id
+
+    def delete_segment(self, segment_id: int) -> int:
+        """
+        Delete a segment file that no indexed chunk points into
+
+        Returns:
+            Bytes reclaimed on disk
+        """
+        with self.lock:
+            if segment_id == self.active_segment:
+                raise ValueError("Cannot delete the active segment")
+            if any(entry[0] == segment_id for entry in self.chunks.values()):
+                raise ValueError(f"Segment {segment_id} still holds indexed chunks")
+            size = self.segments.pop(segment_id, 0)
+            try:
+                os.remove(self._segment_path(segment_id))
+            except FileNotFoundError:
+                pass
+            return size
+
+    def _append(self, digest: bytes, data: bytes) -> Tuple[int, int]:
+        """Append to the active segment, rotating it when full"""
+        if (self.active_segment not in self.segments
+                or self.segments[self.active_segment] >= self.max_segment_bytes):
+            self.active_segment = self.new_segment()
+        offset = self._write_record(self.active_segment, digest, data)
+        return self.active_segment, offset
+
+    def _write_record(self, segment_id: int, digest: bytes, data: bytes) -> int:
+        """Write one record, return payload offset"""
+        path = self._segment_path(segment_id)
+        with open(path, 'ab') as f:
+            start = f.tell()
+            f.write(RECORD_HEADER.pack(digest, len(data)))
+            f.write(data)
+        self.segments[segment_id] = start + RECORD_HEADER.size + len(data)
+        return start + RECORD_HEADER.size
+
+    def _segment_path(self, segment_id: int) -> str:
+        return os.path.join(self.segment_dir, f"seg-{segment_id:06d}.dat")
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _mark_changed(self) -> None:
+        if self.changed_at is None:
+            self.changed_at = time.time()
+
+    def save_due_in(self) -> Optional[float]:
+        """Seconds until unsaved changes must be saved (None if all saved)"""
+        with self.lock:
+            if self.changed_at is None:
+                return None
+            return max(0.0, self.changed_at + self.save_interval - time.time())
+
+    def save_if_due(self) -> bool:
+        """
+        Save the manifest if a change has waited save_interval seconds
+
+        Returns:
+            True if the manifest was saved
+        """
+        with self.lock:
+            if self.save_due_in() != 0.0:
+                return False
+            self.save()
+            return True
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        with self.lock:
+            manifest = {
+                'version': 1,
+                'active_segment': self.active_segment,
+                'next_segment': self.next_segment,
+                'segments': {str(k): v for k, v in self.segments.items()},
+                'chunks': self.chunks,
+                'snapshots': self.snapshots,
+            }
+            data = json.dumps(manifest, separators=(',', ':')).encode('utf-8')
+            if self.codecs:
+                data = self.codecs.encode(data, 'metadata')
+            tmp_path = self.manifest_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.manifest_path)
+            self.last_saved = time.time()
+            self.changed_at = None
+
+    def _load(self) -> None:
+        """Load the manifest if one exists and delete segments it does not list"""
+        # Ids past every file on disk, including ones the manifest never saw
+        on_disk = [int(name[4:10]) for name in os.listdir(self.segment_dir)
+                   if name.startswith('seg-') and name[4:10].isdigit()]
+        self.next_segment = max(on_disk, default=0) + 1
+        if not os.path.exists(self.manifest_path):
+            return
+        with open(self.manifest_path, 'rb') as f:
+            data = f.read()
+        if data.startswith(MAGIC):
+            if not self.codecs:
+                raise ValueError("Manifest is encoded but no codecs are configured")
+            data = self.codecs.decode(data)
+        elif self.codecs:
+            self.codecs.check_plaintext("Manifest")
+        manifest = json.loads(data)
+        self.active_segment = manifest.get('active_segment', 0)
+        self.segments = {int(k): v for k, v in manifest.get('segments', {}).items()}
+        self.chunks = manifest.get('chunks', {})
+        self.snapshots = manifest.get('snapshots', {})
+        self.next_segment = max(self.next_segment, manifest.get('next_segment', 1),
+                                max(self.segments, default=0) + 1)
+
+        # Written after the last save: merge targets of a crashed compaction,
+        # or a rotated segment whose chunks the manifest never saw
+        orphans = [seg for seg in on_disk if seg not in self.segments]
+        for segment_id in orphans:
+            os.remove(self._segment_path(segment_id))
+        if orphans:
+            print(f"[SNAPSHOTS] Deleted {len(orphans)} unreferenced segments")
+
+    def get_status(self) -> dict:
+        """Return store status"""
+        with self.lock:
+            return {
+                'root': self.root,
+                'snapshots': len(self.snapshots),
+                'pinned': sum(1 for s in self.snapshots.values() if s['pinned']),
+                'chunks': len(self.chunks),
+                'segments': len(self.segments),
+                'disk_bytes': sum(self.segments.values()),
+            }
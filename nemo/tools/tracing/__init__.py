@@ -0,0 +1,4 @@
+"""Tracing Tool - Span trees and slow-path profiling for hotkey interactions"""
+from .tracer import Tracer, get_tracer, to_thread
+
+__all__ = ['Tracer', 'get_tracer', 'to_thread']
@@ -0,0 +1,379 @@
+"""
+Tracer - Span trees for hotkey interactions
+
+One interaction = one hotkey press → release. KeyboardListener opens it,
+NemoEngine and the keys add nested spans for their stages (screenshot, mic,
+STT, model query), and the listener closes it on release.
+
+- Spans land in a fixed-size ring buffer as compact tuples
+- dump_chrome_trace() writes Chrome trace-event JSON (chrome://tracing,
+  Perfetto)
+- While an interaction is open, a stack sampler polls the threads working on
+  it; the folded stacks are kept only if the interaction turned out slow.
+  The hook thread joins through scope(); handler threads (AsyncRuntime's
+  pool) through to_thread() or attach(), from the propagated context
+- Disabled (the default), span() returns a shared no-op context manager
+"""
+
+from typing import Any, Dict, List, Optional
+from collections import Counter, deque
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+
+_current_parent: contextvars.ContextVar = contextvars.ContextVar('nemo_trace_parent',
+                                                                 default=None)
+
+
+class _NoopSpan:
+    """Returned by span() when tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """An open span; closes into the tracer's ring buffer"""
+
+    __slots__ = ('tracer', 'trace_id', 'span_id', 'parent_id', 'name', 'start_ns',
+                 'args', '_token')
+
+    def __init__(self, tracer: 'Tracer', trace_id: int, parent_id: Optional[int],
+                 name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = next(tracer._ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.args = args
+        self.start_ns = 0
+        self._token = None
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        self._token = _current_parent.set((self.trace_id, self.span_id))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        _current_parent.reset(self._token)
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer._record(self.trace_id, self.span_id, self.parent_id, self.name,
+                            self.start_ns, end_ns, threading.get_ident(), self.args)
+        return False
+
+    def set(self, **args) -> None:
+        """Attach extra arguments (e.g. payload sizes)"""
+        self.args.update(args)
+
+
+class Interaction:
+    """Root span of one hotkey press → release"""
+
+    __slots__ = ('trace_id', 'span_id', 'name', 'start_ns', 'threads', 'samples')
+
+    def __init__(self, trace_id: int, span_id: int, name: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.name = name
+        self.start_ns = time.perf_counter_ns()
+        self.threads = {threading.get_ident()}
+        self.samples: Counter = Counter()
+
+
+class _InteractionScope:
+    """Makes spans opened inside attach to an interaction"""
+
+    __slots__ = ('parent', '_token')
+
+    def __init__(self, parent):
+        self.parent = parent
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_parent.set(self.parent)
+        return self
+
+    def __exit__(self, *exc):
+        _current_parent.reset(self._token)
+        return False
+
+
+class _ThreadAttachment:
+    """Samples the current thread with an interaction until exit"""
+
+    __slots__ = ('interaction', '_tid')
+
+    def __init__(self, interaction: Interaction):
+        self.interaction = interaction
+        self._tid = None
+
+    def __enter__(self):
+        tid = threading.get_ident()
+        if tid not in self.interaction.threads:
+            self._tid = tid
+            self.interaction.threads.add(tid)
+        return self
+
+    def __exit__(self, *exc):
+        # Pool threads move on to other work: stop sampling them
+        if self._tid is not None:
+            self.interaction.threads.discard(self._tid)
+        return False
+
+
+class Tracer:
+    """Opt-in interaction tracer with ring buffer and slow-path profiler"""
+
+    def __init__(self, enabled: bool = False, capacity: int = 8192,
+                 slow_threshold: float = 2.0, sample_interval: float = 0.005,
+                 max_profiles: int = 16):
+        """
+        Initialize tracer
+
+        Args:
+            enabled: Start recording immediately
+            capacity: Ring buffer size in spans
+            slow_threshold: Interactions longer than this (seconds) keep their
+                stack samples
+            sample_interval: Stack sampler period in seconds
+            max_profiles: How many slow-interaction profiles to keep
+        """
+        self.enabled = False
+        self.spans = deque(maxlen=capacity)
+        self.slow_threshold = slow_threshold
+        self.sample_interval = sample_interval
+        self.profiles = deque(maxlen=max_profiles)
+        self.interactions: Dict[str, Interaction] = {}
+        self.pid = os.getpid()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop_event = threading.Event()
+        if enabled:
+            self.enable()
+
+    def enable(self) -> None:
+        """Start recording spans and sampling open interactions"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._stop_event.clear()
+        self._sampler = threading.Thread(target=self._sample_loop,
+                                         name='nemo-trace-sampler', daemon=True)
+        self._sampler.start()
+
+    def disable(self) -> None:
+        """Stop recording (buffered spans are kept)"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stop_event.set()
+        self._sampler.join()
+        self._sampler = None
+        self.interactions.clear()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def span(self, name: str, **args):
+        """
+        Context manager for a stage; nests under the current span/interaction
+
+        Usage:
+            with tracer.span('gemini.query', model='gemini-pro-vision'):
+                ...
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_parent.get()
+        if parent is None:
+            return Span(self, next(self._ids), None, name, args)
+        return Span(self, parent[0], parent[1], name, args)
+
+    def begin_interaction(self, name: str) -> None:
+        """Open the root span for a hotkey (called on press)"""
+        if not self.enabled:
+            return
+        trace_id = next(self._ids)
+        with self._lock:
+            self.interactions[name] = Interaction(trace_id, next(self._ids), name)
+
+    def scope(self, name: str):
+        """Attach spans opened inside to the open interaction for name"""
+        if not self.enabled:
+            return NOOP_SPAN
+        interaction = self.interactions.get(name)
+        if interaction is None:
+            return NOOP_SPAN
+        interaction.threads.add(threading.get_ident())
+        return _InteractionScope((interaction.trace_id, interaction.span_id))
+
+    def attach(self):
+        """
+        Sample the calling thread with the interaction of the current context
+
+        For handler threads: contextvars carry the interaction from the hook
+        thread through AsyncRuntime's task into asyncio.to_thread, but only
+        threads registered here (or via scope()) are profiled.
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_parent.get()
+        if parent is None:
+            return NOOP_SPAN
+        with self._lock:
+            interaction = next((i for i in self.interactions.values()
+                                if i.trace_id == parent[0]), None)
+        if interaction is None:
+            return NOOP_SPAN
+        return _ThreadAttachment(interaction)
+
+    def end_interaction(self, name: str, **args) -> Optional[float]:
+        """
+        Close the root span for a hotkey (called after release handling)
+
+        Returns:
+            Interaction duration in seconds (None if none was open)
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            interaction = self.interactions.pop(name, None)
+        if interaction is None:
+            return None
+
+        end_ns = time.perf_counter_ns()
+        duration = (end_ns - interaction.start_ns) / 1e9
+        args = dict(args, interaction=True)
+        if duration >= self.slow_threshold and interaction.samples:
+            self.profiles.append({
+                'trace_id': interaction.trace_id,
+                'name': name,
+                'duration': duration,
+                'sample_interval': self.sample_interval,
+                'stacks': dict(interaction.samples.most_common(50)),
+            })
+            args['profiled'] = True
+        self._record(interaction.trace_id, interaction.span_id, None,
+                     f"interaction:{name}", interaction.start_ns, end_ns,
+                     threading.get_ident(), args)
+        return duration
+
+    def _record(self, trace_id, span_id, parent_id, name, start_ns, end_ns, tid, args) -> None:
+        self.spans.append((trace_id, span_id, parent_id, name, start_ns, end_ns, tid, args))
+
+    def _sample_loop(self) -> None:
+        """Fold stacks of threads working on open interactions"""
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.sample_interval):
+            if not self.interactions:
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                open_interactions = list(self.interactions.values())
+            for interaction in open_interactions:
+                for tid in list(interaction.threads):
+                    frame = frames.get(tid)
+                    if frame is None or tid == own:
+                        continue
+                    interaction.samples[_fold(frame)] += 1
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Buffered spans as Chrome trace-event JSON"""
+        events = []
+        for trace_id, span_id, parent_id, name, start_ns, end_ns, tid, args in list(self.spans):
+            events.append({
+                'name': name,
+                'cat': 'nemo',
+                'ph': 'X',
+                'ts': start_ns / 1000.0,
+                'dur': (end_ns - start_ns) / 1000.0,
+                'pid': self.pid,
+                'tid': tid,
+                'args': dict(args, trace_id=trace_id, span_id=span_id, parent_id=parent_id),
+            })
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'slow_profiles': list(self.profiles)},
+        }
+
+    def dump_chrome_trace(self, path: str) -> int:
+        """
+        Write buffered spans to a Chrome trace file
+
+        Returns:
+            Number of events written
+        """
+        trace = self.to_chrome_trace()
+        with open(path, 'w') as f:
+            json.dump(trace, f)
+        return len(trace['traceEvents'])
+
+    def clear(self) -> None:
+        """Drop buffered spans and profiles"""
+        self.spans.clear()
+        self.profiles.clear()
+
+    def get_status(self) -> dict:
+        """Return tracer status"""
+        return {
+            'enabled': self.enabled,
+            'buffered_spans': len(self.spans),
+            'capacity': self.spans.maxlen,
+            'open_interactions': list(self.interactions),
+            'slow_profiles': len(self.profiles),
+        }
+
+
+def _fold(frame, limit: int = 32) -> str:
+    """Folded stack string, root first (flamegraph format)"""
+    names: List[str] = []
+    while frame is not None and len(names) < limit:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+_default_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer (disabled until enable() is called)"""
+    global _default_tracer
+    if _default_tracer is None:
+        _default_tracer = Tracer()
+    return _default_tracer
+
+
+async def to_thread(fn, *args, **kwargs) -> Any:
+    """asyncio.to_thread, with the thread sampled as part of the open interaction"""
+    def run():
+        with get_tracer().attach():
+            return fn(*args, **kwargs)
+    return await asyncio.to_thread(run)
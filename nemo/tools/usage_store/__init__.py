@@ -0,0 +1,8 @@
+"""UsageStore Tool - Persistent per-key usage patterns and learned settings"""
+from .store import (UsageStore, get_usage_store, open_usage_store, INTERACTION, ENGINE, HOLD,
+                    OUTCOMES, OK, EMPTY, LOW_CONFIDENCE, FAILED, CANCELLED, TIMEOUT, SPEECH,
+                    SILENT, FALLBACK)
+
+__all__ = ['UsageStore', 'get_usage_store', 'open_usage_store', 'INTERACTION', 'ENGINE', 'HOLD',
+           'OUTCOMES', 'OK', 'EMPTY', 'LOW_CONFIDENCE', 'FAILED', 'CANCELLED', 'TIMEOUT',
+           'SPEECH', 'SILENT', 'FALLBACK']
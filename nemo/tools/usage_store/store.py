@@ -0,0 +1,488 @@
+"""
+UsageStore - Persistent per-key usage patterns
+
+Keys and the engine record what happened (hold durations, outcomes,
+latencies, which STT engine answered) as fixed-size binary records:
+
+    timestamp f64 | name id u16 | kind u8 | outcome u8 | engine id u8 |
+    flags u8 | hold f32 | latency f32 | confidence f32        (26 bytes)
+
+- record() only appends a tuple to a queue; a background thread (idle
+  until a batch starts) packs each batch into one append to usage.log and
+  folds it into per-key aggregates
+- Every rollup_interval the aggregates are written to rollup.json together
+  with the log offset they cover, so opening the store replays only the log
+  tail; past max_log_bytes the log rotates to usage.log.1
+- Key and engine names are interned (names.json)
+- Learned parameters are recomputed after each batch, so readers
+  (min_hold, engine_order, usual_hour) are dictionary lookups
+- With a CodecSet every batch is one codec frame in the log (u32 length +
+  frame), and rollup.json/names.json are codec frames too; rollup.json
+  records the log format, so switching codecs on or off carries the old
+  log over through a rollup
+
+Layout:
+    <root>/usage.log        append-only records
+    <root>/rollup.json      aggregates up to a log offset
+    <root>/names.json       name ids
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+from collections import deque
+import json
+import os
+import random
+import struct
+import threading
+import time
+
+from ..codec import CodecSet
+from ..codec.codec import MAGIC
+from ..metrics import get_registry
+
+
+RECORD = struct.Struct('<dHBBBBfff')
+LOG_FRAME = struct.Struct('<I')  # framed log: length of the codec frame that follows
+
+# Record kinds
+INTERACTION = 0  # engine: one press → release (hold, on_release latency)
+ENGINE = 1  # key: one recognizer/model attempt (latency, confidence)
+HOLD = 2  # key: whether a hold contained speech (labels the minimum hold)
+
+# Outcomes
+OUTCOMES = ('ok', 'empty', 'low_confidence', 'failed', 'cancelled', 'timeout',
+            'speech', 'silent')
+OK, EMPTY, LOW_CONFIDENCE, FAILED, CANCELLED, TIMEOUT, SPEECH, SILENT = range(len(OUTCOMES))
+
+# Flags
+FALLBACK = 1  # ENGINE: not the first engine tried
+
+# Hold histogram: HOLD_STEP-wide buckets up to HOLD_BUCKETS * HOLD_STEP seconds
+HOLD_STEP = 0.05
+HOLD_BUCKETS = 40
+
+
+def _new_stats() -> Dict[str, Any]:
+    return {
+        'interactions': 0,
+        'outcomes': {},
+        'latency': 0.0,  # EWMA of on_release seconds
+        'hours': [0] * 24,  # interactions by local hour
+        'speech_holds': [0] * (HOLD_BUCKETS + 1),
+        'silent_holds': [0] * (HOLD_BUCKETS + 1),
+        'engines': {},
+    }
+
+
+def _ewma(current: float, sample: float, count: int, alpha: float = 0.2) -> float:
+    return sample if count <= 1 else current + alpha * (sample - current)
+
+
+class UsageStore:
+    """Append-only usage log with rollups and learned per-key parameters"""
+
+    def __init__(self, root: Optional[str] = None, flush_interval: float = 5.0,
+                 batch_size: int = 256, rollup_interval: float = 600.0,
+                 max_log_bytes: int = 8 * 1024 * 1024, min_samples: int = 20,
+                 explore: float = 0.05, codecs: Optional[CodecSet] = None):
+        """
+        Args:
+            root: Directory for the log and rollups (None = in memory only)
+            flush_interval: Seconds between batch writes
+            batch_size: Pending records that trigger an early write
+            rollup_interval: Seconds between rollup.json writes
+            max_log_bytes: Log size at which it rotates (after a rollup)
+            min_samples: Observations needed before a learned value replaces
+                the caller's default
+            explore: Chance engine_order() tries an engine with too few
+                attempts first (so fallbacks get measured too)
+            codecs: Compression/encryption for the log and rollups
+                (plain records if None)
+        """
+        self.root = root
+        self.codecs = codecs
+        self.log_format = 'frames' if codecs else 'records'
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.rollup_interval = rollup_interval
+        self.max_log_bytes = max_log_bytes
+        self.min_samples = min_samples
+        self.explore = explore
+        self.rng = random.Random()
+        self.lock = threading.Lock()
+
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+        self._names_saved = 0
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.learned: Dict[str, Dict[str, Any]] = {}
+        self.log_offset = 0  # log bytes folded into stats
+        self.rolled_offset = 0  # log bytes covered by rollup.json
+        self.last_rollup = time.time()
+
+        self._pending: deque = deque()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+
+        metrics = get_registry()
+        self.records_written = metrics.counter('usage_records_total', "Usage records written")
+        self.flush_time = metrics.histogram('usage_flush_seconds', "Usage batch write duration")
+
+        if root:
+            os.makedirs(root, exist_ok=True)
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Recording (any thread, hot path)
+    # ------------------------------------------------------------------
+
+    def record(self, key: str, kind: int, outcome: int, hold: float = 0.0,
+               latency: float = 0.0, confidence: float = 0.0,
+               engine: Optional[str] = None, flags: int = 0) -> None:
+        """Queue one record (written by the background thread)"""
+        self._pending.append((time.time(), self._intern(key), kind, outcome,
+                              self._intern(engine) if engine else 0, flags,
+                              hold, latency, confidence))
+        pending = len(self._pending)
+        if pending == 1 or pending >= self.batch_size:
+            self._wake.set()  # a batch started, or is full
+
+    def _intern(self, name: str) -> int:
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            with self.lock:
+                name_id = self.name_ids.get(name)
+                if name_id is None:
+                    if not self.names:
+                        self.names.append('')  # id 0: no name
+                    name_id = self.name_ids[name] = len(self.names)
+                    self.names.append(name)
+        return name_id
+
+    # ------------------------------------------------------------------
+    # Learned parameters (lookups)
+    # ------------------------------------------------------------------
+
+    def min_hold(self, key: str, default: float = 0.3) -> float:
+        """Shortest hold worth processing for key (default until learned)"""
+        return self.learned.get(key, {}).get('min_hold', default)
+
+    def engine_order(self, key: str, engines: Sequence[str]) -> List[str]:
+        """
+        engines reordered by expected time to a confident result
+
+        Ranked engines come first, then engines without min_samples attempts
+        (in the given order; occasionally one is tried first, see explore),
+        then engines that never succeeded.
+        """
+        learned = self.learned.get(key, {})
+        scores = learned.get('engine_scores', {})
+        failing = learned.get('failing_engines', ())
+        ranked = sorted((e for e in engines if e in scores), key=scores.get)
+        untried = [e for e in engines if e not in scores and e not in failing]
+        if ranked and untried and self.rng.random() < self.explore:
+            ranked.insert(0, untried.pop(0))
+        return ranked + untried + [e for e in engines if e in failing]
+
+    def usual_hour(self, key: str, when: Optional[float] = None) -> bool:
+        """Whether key is typically used at the local hour of `when`"""
+        hours = self.learned.get(key, {}).get('hours')
+        if not hours:
+            return False
+        return time.localtime(when if when is not None else time.time()).tm_hour in hours
+
+    # ------------------------------------------------------------------
+    # Background writer
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Write batches (and rollups) in a daemon thread"""
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name='nemo-usage', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Flush, write a final rollup and stop the thread"""
+        if self.running:
+            self.running = False
+            self._stop_event.set()
+            self._wake.set()
+            self.thread.join()
+            self.thread = None
+        self.flush()
+        self.rollup()
+
+    def _loop(self) -> None:
+        # Sleeps until a batch starts (no timer while idle), lets it fill
+        # for flush_interval (or until full), then writes it
+        while not self._stop_event.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if not self._stop_event.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+            try:
+                self.flush()
+                if time.time() - self.last_rollup >= self.rollup_interval:
+                    self.rollup()
+            except OSError as e:
+                print(f"[USAGE ERROR] {e}")
+
+    def flush(self) -> int:
+        """Write pending records and fold them into the aggregates"""
+        records = []
+        while self._pending:
+            records.append(self._pending.popleft())
+        if not records:
+            return 0
+        start = time.perf_counter_ns()
+        if self.root:
+            self._save_names()
+            data = b''.join(RECORD.pack(*record) for record in records)
+            if self.codecs:
+                frame = self.codecs.encode(data, 'usage')
+                data = LOG_FRAME.pack(len(frame)) + frame
+            with open(self._path('usage.log'), 'ab') as f:
+                f.write(data)
+            self.log_offset += len(data)
+        with self.lock:
+            touched = {self._fold(record) for record in records}
+            for key in touched:
+                self.learned[key] = self._learn(self.stats[key])
+        self.records_written.inc(len(records))
+        self.flush_time.record_since(start)
+        return len(records)
+
+    def rollup(self, rotate: bool = False) -> None:
+        """Persist the aggregates (and rotate an oversized log, or when asked)"""
+        self.last_rollup = time.time()
+        if not self.root:
+            return
+        with self.lock:
+            if (rotate or self.log_offset >= self.max_log_bytes) and \
+                    os.path.exists(self._path('usage.log')):
+                os.replace(self._path('usage.log'), self._path('usage.log.1'))
+                self.log_offset = 0
+            rollup = {
+                'version': 1,
+                'log_offset': self.log_offset,
+                'log_format': self.log_format,
+                'stats': self.stats,
+            }
+            self._write_json('rollup.json', rollup)
+            self.rolled_offset = self.log_offset
+
+    # ------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------
+
+    def _fold(self, record: tuple) -> str:
+        """Add one record to its key's stats; returns the key"""
+        timestamp, key_id, kind, outcome, engine_id, flags, hold, latency, confidence = record
+        key = self.names[key_id]
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = _new_stats()
+        outcome_name = OUTCOMES[outcome] if outcome < len(OUTCOMES) else 'unknown'
+
+        if kind == INTERACTION:
+            stats['interactions'] += 1
+            stats['outcomes'][outcome_name] = stats['outcomes'].get(outcome_name, 0) + 1
+            stats['latency'] = _ewma(stats['latency'], latency, stats['interactions'])
+            stats['hours'][time.localtime(timestamp).tm_hour] += 1
+        elif kind == HOLD:
+            bucket = min(int(hold / HOLD_STEP), HOLD_BUCKETS)
+            stats['speech_holds' if outcome == SPEECH else 'silent_holds'][bucket] += 1
+        elif kind == ENGINE:
+            engine = stats['engines'].setdefault(self.names[engine_id], {
+                'attempts': 0, 'successes': 0, 'fallbacks': 0, 'latency': 0.0})
+            engine['attempts'] += 1
+            engine['fallbacks'] += 1 if flags & FALLBACK else 0
+            if outcome == OK:
+                engine['successes'] += 1
+                engine['latency'] = _ewma(engine['latency'], latency, engine['successes'])
+        return key
+
+    def _learn(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive the parameters keys read"""
+        learned: Dict[str, Any] = {}
+
+        # Minimum hold: the bucket edge that misclassifies the fewest holds,
+        # counting a dropped hold with speech twice a silent one processed
+        speech, silent = stats['speech_holds'], stats['silent_holds']
+        if sum(speech) + sum(silent) >= self.min_samples:
+            best_cost, best_edge = None, 0
+            for edge in range(2, HOLD_BUCKETS // 2 + 1):  # 0.1 s .. 1.0 s
+                cost = 2 * sum(speech[:edge]) + sum(silent[edge:])
+                if best_cost is None or cost < best_cost:
+                    best_cost, best_edge = cost, edge
+            learned['min_hold'] = round(best_edge * HOLD_STEP, 3)
+
+        # Engines: latency of a success divided by the (smoothed) success rate
+        scores, failing = {}, []
+        for name, engine in stats['engines'].items():
+            if engine['attempts'] < self.min_samples:
+                continue
+            if engine['successes']:
+                rate = (engine['successes'] + 1) / (engine['attempts'] + 2)
+                scores[name] = engine['latency'] / rate
+            else:
+                failing.append(name)
+        if scores:
+            learned['engine_scores'] = scores
+        if failing:
+            learned['failing_engines'] = failing
+
+        # Usual hours: at least twice the uniform share of the key's use
+        total = sum(stats['hours'])
+        if total >= self.min_samples:
+            learned['hours'] = [hour for hour, count in enumerate(stats['hours'])
+                                if count * 24 >= 2 * total]
+        return learned
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _save_names(self) -> None:
+        """Write names.json if names were added (before records use them)"""
+        if len(self.names) == self._names_saved:
+            return
+        with self.lock:
+            names = list(self.names)
+        self._write_json('names.json', names)
+        self._names_saved = len(names)
+
+    def _write_json(self, name: str, value: Any) -> None:
+        """Write a JSON file atomically (as a codec frame with codecs)"""
+        data = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        if self.codecs:
+            data = self.codecs.encode(data, 'metadata')
+        tmp_path = self._path(name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(name))
+
+    def _read_json(self, name: str) -> Any:
+        """Read a file written by _write_json (plain or encoded)"""
+        with open(self._path(name), 'rb') as f:
+            data = f.read()
+        if data[:2] == MAGIC:
+            if not self.codecs:
+                raise ValueError(f"{name} is encoded but no codecs are configured")
+            data = self.codecs.decode(data)
+        elif self.codecs:
+            self.codecs.check_plaintext(name)
+        return json.loads(data)
+
+    def _parse_log(self, data: bytes, framed: bool):
+        """(records, bytes used) from log bytes, stopping at a torn tail"""
+        if not framed:
+            whole = len(data) // RECORD.size * RECORD.size
+            return list(RECORD.iter_unpack(data[:whole])), whole
+        records = []
+        used = 0
+        while used + LOG_FRAME.size <= len(data):
+            length, = LOG_FRAME.unpack_from(data, used)
+            end = used + LOG_FRAME.size + length
+            if end > len(data):
+                break
+            try:
+                batch = self.codecs.decode(data[used + LOG_FRAME.size:end])
+            except Exception:
+                break  # torn or corrupt frame
+            if len(batch) % RECORD.size:
+                break
+            records.extend(RECORD.iter_unpack(batch))
+            used = end
+        return records, used
+
+    def _load(self) -> None:
+        """Rollup, then replay the log past its offset (ignoring a torn tail)"""
+        if os.path.exists(self._path('names.json')):
+            self.names = self._read_json('names.json')
+            self.name_ids = {name: i for i, name in enumerate(self.names) if i}
+            self._names_saved = len(self.names)
+        log_format = self.log_format
+        if os.path.exists(self._path('rollup.json')):
+            rollup = self._read_json('rollup.json')
+            self.stats = rollup.get('stats', {})
+            self.rolled_offset = rollup.get('log_offset', 0)
+            log_format = rollup.get('log_format', 'records')
+        if log_format == 'frames' and not self.codecs:
+            raise ValueError("usage.log is encoded but no codecs are configured")
+        if log_format == 'records' and self.codecs and os.path.exists(self._path('usage.log')):
+            self.codecs.check_plaintext('usage.log')
+        log_path = self._path('usage.log')
+        size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+        if size < self.rolled_offset:
+            self.rolled_offset = 0  # log rotated after the rollup was read
+        start = self.rolled_offset
+        data = b''
+        if size > start:
+            with open(log_path, 'rb') as f:
+                f.seek(start)
+                data = f.read(size - start)
+        records, used = self._parse_log(data, log_format == 'frames')
+        whole = start + used
+        if whole < size:
+            with open(log_path, 'r+b') as f:
+                f.truncate(whole)
+        for record in records:
+            if 0 < record[0] < 1e11 and record[1] < len(self.names) and record[2] <= HOLD:
+                self._fold(record)
+        self.log_offset = whole
+        self.learned = {key: self._learn(stats) for key, stats in self.stats.items()}
+        if log_format != self.log_format:
+            # Codecs were switched on or off: the rollup now holds the old
+            # log's records, and new ones start a log in the new format
+            self.rollup(rotate=True)
+            self._names_saved = 0
+            self._save_names()
+
+    def get_status(self) -> dict:
+        """Return store status"""
+        return {
+            'root': self.root,
+            'running': self.running,
+            'pending': len(self._pending),
+            'log_bytes': self.log_offset,
+            'rolled_up_bytes': self.rolled_offset,
+            'keys': {key: {'interactions': stats['interactions'],
+                           'outcomes': dict(stats['outcomes']),
+                           'learned': self.learned.get(key, {})}
+                     for key, stats in list(self.stats.items())},
+        }
+
+
+_store: Optional[UsageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_usage_store() -> UsageStore:
+    """Process-wide usage store (in memory until open_usage_store())"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = UsageStore()
+                _store.start()
+    return _store
+
+
+def open_usage_store(root: str, **options: Any) -> UsageStore:
+    """Make a persistent store at root the process-wide one (call start())"""
+    global _store
+    with _store_lock:
+        previous, _store = _store, UsageStore(root, **options)
+    if previous is not None:
+        previous.stop()
+    return _store
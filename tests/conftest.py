@@ -0,0 +1,19 @@
+"""
+Shared test setup
+
+The OS-facing backends (keyboard hook, ImageGrab, microphone) are replaced
+by the benchmark fakes before any Nemo module imports them.
+"""
+
+import pytest
+
+from nemo.bench.fakes import install_fakes
+
+FAKES = install_fakes()
+
+
+@pytest.fixture
+def fakes():
+    """Installed fakes, with the keyboard hooks cleared after the test"""
+    yield FAKES
+    FAKES.keyboard.unhook_all()
@@ -0,0 +1,54 @@
+"""AudioBroker: device probing never stalls the capture thread"""
+
+import threading
+import time
+import wave
+
+from nemo.tools.audio_capture import AudioBroker, WavFileSource
+
+
+class SlowProbeSource(WavFileSource):
+    """A WAV source whose default-device probe is as slow as PyAudio's"""
+
+    probe_threads = []
+    switched = threading.Event()
+
+    def device_changed(self) -> bool:
+        self.probe_threads.append(threading.current_thread().name)
+        time.sleep(0.5)
+        if not self.switched.is_set():
+            self.switched.set()
+            return True
+        return False
+
+
+def test_device_probe_runs_beside_the_read_loop(tmp_path):
+    path = str(tmp_path / 'tone.wav')
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(bytes(32000))
+
+    sources = []
+
+    def factory():
+        sources.append(SlowProbeSource(path, realtime=True))
+        return sources[-1]
+
+    broker = AudioBroker(source_factory=factory, device_check_interval=0.05)
+    stamps = []
+    subscription = broker.subscribe(lambda view: stamps.append(time.monotonic()))
+    try:
+        deadline = time.monotonic() + 5
+        while broker.reopens == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.7)  # a second, unchanged probe
+    finally:
+        subscription.close()
+        broker.stop()
+
+    assert broker.reopens == 1 and len(sources) == 2
+    assert 'nemo-audio-broker' not in SlowProbeSource.probe_threads
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert max(gaps) < 0.25  # 20 ms blocks kept flowing through each 0.5s probe
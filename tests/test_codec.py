@@ -0,0 +1,142 @@
+"""Codec coverage: every store reads back what it wrote, and encrypts it"""
+
+import os
+import pickle
+
+import pytest
+
+from nemo.keys.right_alt_right_forward.predictor import KeystrokePredictor
+from nemo.tools.codec import Codec, CodecSet, default_codecs, load_key
+from nemo.tools.context_index import VectorIndex
+from nemo.tools.usage_store.store import INTERACTION, OK, UsageStore
+
+
+def _files(root):
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            with open(os.path.join(dirpath, name), 'rb') as f:
+                yield name, f.read()
+
+
+def test_decode_matches_the_encryption_flag():
+    key = Codec.generate_key()
+    codecs = CodecSet(Codec('zlib'), {'secret': Codec('zlib', key=key)})
+    assert codecs.decode(codecs.encode(b'typed password', 'secret')) == b'typed password'
+    assert codecs.decode(codecs.encode(b'window title')) == b'window title'
+
+    other = Codec.generate_key()
+    two_keys = CodecSet(Codec('zlib', key=key), {'other': Codec('zlib', key=other)})
+    assert two_keys.decode(two_keys.encode(b'a', 'other')) == b'a'
+    assert two_keys.decode(two_keys.encode(b'b')) == b'b'
+
+    plain_only = CodecSet(Codec('zlib'))
+    with pytest.raises(ValueError):
+        plain_only.decode(codecs.encode(b'typed password', 'secret'))
+
+
+def test_keyed_codecs_reject_plaintext_frames():
+    key = Codec.generate_key()
+    forged = CodecSet(Codec('zlib')).encode(b'{"text": "forged"}')
+    with pytest.raises(ValueError):
+        CodecSet(Codec('zlib', key=key)).decode(forged)
+    with pytest.raises(ValueError):
+        default_codecs(key).check_plaintext('manifest')
+
+    migrating = CodecSet(Codec('zlib', key=key), allow_plaintext=True)
+    assert migrating.decode(forged) == b'{"text": "forged"}'
+    default_codecs(key, allow_plaintext=True).check_plaintext('manifest')
+
+
+def test_codecs_survive_pickling():
+    codecs = default_codecs(Codec.generate_key())
+    copy = pickle.loads(pickle.dumps(codecs))
+    assert copy.decode(codecs.encode(b'tile', 'frames')) == b'tile'
+
+
+def test_load_key_creates_an_owner_only_file(tmp_path):
+    path = str(tmp_path / 'keys' / 'key')
+    key = load_key(path)
+    assert len(key) == 32 and load_key(path) == key
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_usage_store_encrypts_and_migrates(tmp_path):
+    root = str(tmp_path / 'usage')
+    plain = UsageStore(root)
+    plain.record('right shift', INTERACTION, OK, hold=1.0)
+    plain.stop()
+
+    key = Codec.generate_key()
+    codecs = default_codecs(key)
+    with pytest.raises(ValueError):
+        UsageStore(root, codecs=codecs)  # plaintext needs the migration flag
+    store = UsageStore(root, codecs=default_codecs(key, allow_plaintext=True))
+    assert store.stats['right shift']['interactions'] == 1
+    store.record('right shift', INTERACTION, OK, hold=1.0)
+    store.flush()  # log only; no rollup of this batch
+    reopened = UsageStore(root, codecs=codecs)
+    assert reopened.stats['right shift']['interactions'] == 2
+    reopened.stop()
+
+    for name, data in _files(root):
+        if name != 'usage.log.1':  # the plain log from before the switch
+            assert b'right shift' not in data, name
+    with pytest.raises(ValueError):
+        UsageStore(root)
+
+
+def test_index_records_are_encrypted(tmp_path):
+    root = str(tmp_path / 'index')
+    codecs = default_codecs(Codec.generate_key())
+    index = VectorIndex(root, codecs=codecs)
+    index.add(['Q3 forecast.xlsx - Excel', 'kernel build log'], source='window')
+    index.close()
+
+    for name, data in _files(root):
+        assert b'forecast' not in data, name
+    reopened = VectorIndex(root, codecs=codecs)
+    assert reopened.search('forecast spreadsheet', k=1)[0]['text'] == 'Q3 forecast.xlsx - Excel'
+    reopened.close()
+    with pytest.raises(RuntimeError):
+        VectorIndex(root)
+
+
+def test_index_migrates_plaintext_only_when_allowed(tmp_path):
+    root = str(tmp_path / 'index')
+    plain = VectorIndex(root)
+    plain.add(['Q3 forecast.xlsx - Excel'], source='window')
+    plain.close()
+
+    key = Codec.generate_key()
+    with pytest.raises(RuntimeError):  # refused, and the records are kept
+        VectorIndex(root, codecs=default_codecs(key))
+    migrated = VectorIndex(root, codecs=default_codecs(key, allow_plaintext=True))
+    assert migrated.count == 1
+    migrated.close()
+
+    for name, data in _files(root):
+        assert b'forecast' not in data, name
+    reopened = VectorIndex(root, codecs=default_codecs(key))
+    assert reopened.records[0]['text'] == 'Q3 forecast.xlsx - Excel'
+    reopened.close()
+
+
+def test_predictor_model_is_encrypted(tmp_path):
+    path = str(tmp_path / 'forward_model.bin')
+    codecs = default_codecs(Codec.generate_key())
+    predictor = KeystrokePredictor(table_bits=8)
+    for key in 'hunter2 hunter2 hunter2':
+        predictor.update(key)
+    predictor.save(path, codecs=codecs)
+
+    with open(path, 'rb') as f:
+        assert b'hunter' not in f.read().replace(b'\n', b'')
+    loaded = KeystrokePredictor.load(path, codecs=codecs)
+    assert loaded.to_bytes() == predictor.to_bytes()
+    with pytest.raises(ValueError):
+        KeystrokePredictor.load(path)
+
+    plain_path = str(tmp_path / 'plain_model.bin')
+    predictor.save(plain_path)
+    with pytest.raises(ValueError):
+        KeystrokePredictor.load(plain_path, codecs=codecs)
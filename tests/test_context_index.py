@@ -0,0 +1,77 @@
+"""VectorIndex: recovery after an unclean stop and concurrent use"""
+
+import os
+import random
+import threading
+
+from nemo.tools.context_index import VectorIndex
+
+WORDS = ['alpha', 'beta', 'gamma', 'delta', 'kernel', 'socket', 'invoice', 'budget',
+         'meeting', 'python', 'render', 'shader', 'report', 'deploy', 'browser']
+
+
+def test_reopen_drops_metadata_past_header_count(tmp_path):
+    root = str(tmp_path / 'index')
+    index = VectorIndex(root)
+    index.add(['alpha one', 'beta two'])
+    index.flush()
+    # Unclean stop: metadata reached the disk, the header count did not
+    index.add(['stale beta'] * 3)
+    index._meta_file.flush()
+    index._meta_file.close()
+
+    index = VectorIndex(root)
+    assert index.count == 2
+    index.add(['gamma new'])
+    assert [r['text'] for r in index.search('gamma new', k=1)] == ['gamma new']
+    assert 'stale beta' not in [r['text'] for r in index.search('beta', k=10)]
+    index.close()
+
+    with open(os.path.join(root, 'meta.jsonl')) as f:
+        assert len(f.readlines()) == 3
+    reopened = VectorIndex(root)
+    assert reopened.count == 3
+    assert [r['text'] for r in reopened.search('gamma new', k=1)] == ['gamma new']
+
+
+def test_searches_stay_correct_while_adding(tmp_path):
+    rng = random.Random(0)
+    index = VectorIndex(str(tmp_path / 'index'), block_rows=2048)
+    texts = [' '.join(rng.choice(WORDS) for _ in range(4)) + f' doc{i}' for i in range(5000)]
+    index.add(texts, timestamps=[1000.0 + i for i in range(len(texts))])
+    cutoff = 1000.0 + len(texts)
+    queries = [' '.join(rng.choice(WORDS) for _ in range(2)) for _ in range(20)]
+    expected = {q: [r['id'] for r in index.search(q, k=5, end=cutoff)] for q in queries}
+
+    wrong = []
+    errors = []
+    searches = [0]
+    done = threading.Event()
+
+    def add() -> None:
+        for batch in range(30):
+            index.add([f'{rng.choice(WORDS)} later{batch}-{i}' for i in range(200)],
+                      timestamps=[cutoff + batch] * 200)
+        done.set()
+
+    def search() -> None:
+        try:
+            while not done.is_set():
+                for q in queries:
+                    searches[0] += 1
+                    if [r['id'] for r in index.search(q, k=5, end=cutoff)] != expected[q]:
+                        wrong.append(q)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=add)] + [threading.Thread(target=search)
+                                                for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    index.close()
+
+    assert index.count == 11000
+    assert searches[0] > 0
+    assert errors == [] and wrong == []
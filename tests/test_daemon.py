@@ -0,0 +1,134 @@
+"""NemoDaemon: socket round trips through the nemo client"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from nemo.cli.client import NemoClient, RemoteError
+from nemo.cli.client import main as client_main
+from nemo.cli.daemon import NemoDaemon
+from nemo.tools import NemoEngine, SnapshotStore
+from nemo.tools.context_index import VectorIndex
+from nemo.bench.stubs import StubKey
+
+
+class App:
+    """The parts of NemoApp the daemon uses"""
+
+    def __init__(self, root):
+        self.engine = NemoEngine()
+        self.engine.register_key(StubKey('right shift'))
+        self.index = VectorIndex(str(root / 'index'))
+        self.snapshots = SnapshotStore(str(root / 'snapshots'))
+        self.stopped = threading.Event()
+
+    def get_status(self) -> dict:
+        return {'running': not self.stopped.is_set(), 'engine': self.engine.get_status()}
+
+    def request_stop(self) -> None:
+        self.stopped.set()
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    app = App(tmp_path)
+    daemon = NemoDaemon(app, str(tmp_path / 'nemo.sock'))
+    daemon.start()
+    yield daemon
+    daemon.stop()
+    app.index.close()
+
+
+def test_round_trip(daemon):
+    app = daemon.app
+    app.index.add(['Q3 forecast.xlsx - Excel', 'kernel build log'], source='window',
+                  timestamps=[100.0, 200.0])
+    app.snapshots.add_snapshot([b'tile', b'keystrokes'], timestamp=150.0)
+
+    with NemoClient(daemon.path) as client:
+        assert client.call('ping')['pong'] is True
+        assert [key['combo'] for key in client.call('keys')] == ['right shift']
+        assert client.call('disable_key', key='right shift') == {'key': 'right shift',
+                                                                 'enabled': False}
+        assert not app.engine.get_key('right shift').enabled
+
+        hits = client.call('search', query='forecast spreadsheet', k=1)
+        assert [hit['text'] for hit in hits] == ['Q3 forecast.xlsx - Excel']
+        assert client.call('search', query='forecast', k=5, start=150.0)[0]['timestamp'] == 200.0
+        [snapshot] = client.call('timeline')
+        assert snapshot['timestamp'] == 150.0 and snapshot['chunks'] == 2
+
+        # Pipelined: one failing call doesn't affect the others
+        status, missing, pong = client.pipeline([('status', {}), ('no_such_method', {}),
+                                                 ('ping', {})])
+        assert status['daemon']['connections'] == 1
+        assert isinstance(missing, RemoteError)
+        assert pong['pong'] is True
+        with pytest.raises(RemoteError):
+            client.call('enable_key', key='right alt')
+
+        assert client.call('stop') == {'stopping': True}
+    assert app.stopped.is_set()
+
+
+def test_concurrent_searches_while_adding(daemon):
+    index = daemon.app.index
+    index.add([f'report {i} budget' for i in range(2000)], timestamps=[1.0] * 2000)
+    expected = [hit['id'] for hit in index.search('budget report 7', k=3, end=2.0)]
+    failures = []
+
+    def search() -> None:
+        with NemoClient(daemon.path) as client:
+            for _ in range(25):
+                hits = client.call('search', query='budget report 7', k=3, end=2.0)
+                if [hit['id'] for hit in hits] != expected:
+                    failures.append(hits)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for batch in range(10):
+        index.add([f'later {batch} {i}' for i in range(300)], timestamps=[5.0] * 300)
+    for thread in threads:
+        thread.join()
+    assert failures == []
+
+
+def _serve_once(path, reply):
+    """Fake daemon: accept one connection and send reply (None = stay silent)"""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        conn.recv(4096)
+        if reply is None:
+            time.sleep(1.0)  # never answer
+        else:
+            conn.sendall(reply)
+        conn.close()
+        server.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.mark.parametrize('reply, message', [
+    (None, 'did not reply'),
+    (b'\xff' * 64, 'Lost connection'),  # garbage frame
+    (b'', 'Lost connection'),  # closed without a reply
+])
+def test_client_reports_daemon_failures_in_one_line(tmp_path, capsys, reply, message):
+    path = str(tmp_path / 'nemo.sock')
+    assert client_main(['--socket', path, 'ping']) == 2
+    assert 'No daemon listening' in capsys.readouterr().err
+
+    thread = _serve_once(path, reply)
+    assert client_main(['--socket', path, '--timeout', '0.2', 'ping']) == 2
+    err = capsys.readouterr().err
+    assert message in err and err.count('\n') == 1 and err.startswith('[NEMO]')
+    thread.join()
@@ -0,0 +1,73 @@
+"""FileExtractor: extraction, the freshness-keyed cache, and worker crashes"""
+
+import os
+
+import pytest
+
+from nemo.tools.file_extraction import FileExtractor
+from nemo.tools.file_extraction import extractors
+
+
+def _crash_on_bad(path):
+    """Stand-in for a parser that dies on a malformed file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data.startswith(b'BAD'):
+        os._exit(1)
+    yield data.decode()
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    # Workers are forked after the patch, so they see the crashing parser
+    monkeypatch.setitem(extractors.EXTRACTORS, '.crash', _crash_on_bad)
+    extractor = FileExtractor(['.txt', '.crash'], max_workers=2, max_chars=1000)
+    yield extractor
+    extractor.shutdown()
+
+
+def _write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_extracts_in_order_and_skips_unsupported(tmp_path, extractor):
+    long = _write(tmp_path / 'long.txt', 'x' * 5000)
+    short = _write(tmp_path / 'short.txt', 'hello')
+    skipped = [_write(tmp_path / 'notes.md', 'not accepted'), str(tmp_path / 'missing.txt')]
+
+    results = extractor.extract([long] + skipped + [short])
+
+    assert [r['path'] for r in results] == [os.path.abspath(long), os.path.abspath(short)]
+    assert results[0]['chars'] == 1000 and results[0]['truncated']
+    assert ''.join(results[1]['chunks']) == 'hello' and results[1]['error'] is None
+
+
+def test_cache_until_file_changes(tmp_path, extractor):
+    path = _write(tmp_path / 'a.txt', 'first')
+    hits, misses = extractor.cache_hits.value, extractor.cache_misses.value
+
+    assert extractor.extract([path])[0]['chunks'] == ['first']
+    assert extractor.extract([path])[0]['chunks'] == ['first']
+    assert (extractor.cache_hits.value - hits, extractor.cache_misses.value - misses) == (1, 1)
+
+    _write(tmp_path / 'a.txt', 'second!')  # new size -> new cache key
+    assert extractor.extract([path])[0]['chunks'] == ['second!']
+    assert extractor.cache_misses.value - misses == 2
+
+
+def test_worker_crash_fails_only_that_file(tmp_path, extractor):
+    good = [_write(tmp_path / f'good{i}.crash', f'ok {i}') for i in range(4)]
+    bad = _write(tmp_path / 'bad.crash', 'BAD header')
+    crashes = extractor.worker_crashes.value
+
+    results = extractor.extract(good[:2] + [bad] + good[2:])
+
+    assert [r['error'] is None for r in results] == [True, True, False, True, True]
+    assert 'worker crashed' in results[2]['error']
+    assert [''.join(r['chunks']) for r in results if r['error'] is None] == \
+        ['ok 0', 'ok 1', 'ok 2', 'ok 3']
+    assert extractor.worker_crashes.value - crashes == 1
+    # The pool was replaced and keeps working
+    assert extractor.extract([_write(tmp_path / 'after.txt', 'still up')])[0]['chunks'] == \
+        ['still up']
@@ -0,0 +1,105 @@
+"""ResourceGovernor: foreground probe and the components following its settings"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from nemo.keys.right_alt_up_agent import AgentSynthesisKey
+from nemo.tools.resource_governor import (PROFILES, ForegroundProbe, GovernorBudget, LoadSample,
+                                          ResourceGovernor)
+from nemo.tools.resource_governor import governor as governor_module
+from nemo.tools.screen_capture import FixedLayout, ScreenCapture
+from nemo.tools.snapshot_store import (CompactionEngine, IOBudget, SnapshotRecorder,
+                                       SnapshotStore)
+
+
+class ListIndex:
+    """Records VectorIndex.add calls"""
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, texts, source=None, metadata=None):
+        self.added.extend(texts)
+
+
+@pytest.mark.skipif(governor_module.psutil is None, reason="needs psutil")
+def test_foreground_probe_reads_the_focused_process():
+    busy = subprocess.Popen([sys.executable, '-c', 'while True: pass'])
+    try:
+        probe = ForegroundProbe(pid_source=lambda: busy.pid)
+        assert probe() == 0.0  # primes the delta
+        time.sleep(0.5)
+        share = probe()
+        assert 0.5 / (os.cpu_count() or 1) * 100 < share <= 100.0
+    finally:
+        busy.kill()
+        busy.wait()
+
+    assert ForegroundProbe(pid_source=os.getpid)() == 0.0  # Nemo itself
+    assert ForegroundProbe(pid_source=lambda: None)() == 0.0
+
+
+def test_governor_samples_the_foreground_app():
+    governor = ResourceGovernor()
+    governor.start(interval=3600)
+    try:
+        assert isinstance(governor.sampler.foreground_probe, ForegroundProbe)
+    finally:
+        governor.stop()
+
+
+def test_recorder_and_compaction_follow_settings(tmp_path, fakes):
+    store = SnapshotStore(str(tmp_path), max_segment_bytes=8 * 1024)
+    for i in range(40):
+        store.add_snapshot([f'tile {i} {j}'.encode() * 200 for j in range(3)],
+                           timestamp=1000.0 + i)
+    for snapshot_id, _ in store.list_snapshots()[::2]:
+        store.remove_snapshot(snapshot_id)
+
+    screen = ScreenCapture(region='full', layout=FixedLayout([(0, 0, 1920, 1080)]))
+    recorder = SnapshotRecorder(store, screen=screen)
+    compactor = CompactionEngine(store, budget=IOBudget(bytes_per_sec=1e12),
+                                 min_segment_bytes=0)
+    budget = GovernorBudget()
+    budget.recover_after = 0.0
+    governor = ResourceGovernor(budget=budget)
+    for component in (recorder, compactor):
+        governor.subscribe(component.apply_resource_settings)
+
+    governor.update(LoadSample(0.0, 10.0, 30.0, foreground_cpu_percent=90.0))
+    assert governor.profile == 'paused'
+    assert recorder.interval == PROFILES['paused']['capture_interval']
+    assert screen.encode_profile == 'fast'
+    report = compactor.run_once(now=1100.0)
+    assert report['chunks_collected'] > 0 and report['segments_merged'] == 0
+
+    for t in range(1, 10):
+        governor.update(LoadSample(float(t), 10.0, 30.0))
+    assert governor.profile == 'full'
+    assert recorder.interval == 1.0 and screen.encode_profile == 'quality'
+    assert compactor.run_once(now=1100.0)['segments_merged'] > 0
+
+
+def test_agent_key_sizes_pool_and_defers_indexing(tmp_path):
+    path = tmp_path / 'notes.txt'
+    path.write_text('quarterly budget notes')
+    index = ListIndex()
+    key = AgentSynthesisKey(watch_dirs=[str(tmp_path)], index=index)
+    try:
+        key.apply_resource_settings(PROFILES['paused'])
+        assert key.extractor.max_workers == 1
+        assert key.synthesize([str(path)])
+        assert index.added == []
+
+        key.apply_resource_settings(PROFILES['balanced'])
+        assert key.extractor.max_workers == 2
+        deadline = time.monotonic() + 5
+        while not index.added and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert index.added == ['quarterly budget notes']
+    finally:
+        key.shutdown()
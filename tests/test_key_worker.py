@@ -0,0 +1,94 @@
+"""KeyWorker / IsolatedKey: calls, shared-memory payloads and restarts"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from nemo.tools import NemoKey
+from nemo.tools.key_worker import IsolatedKey, KeyWorker, WorkerError
+
+
+class SlowKey(NemoKey):
+    """Releases take total_duration seconds (module level: picklable for workers)"""
+
+    def __init__(self):
+        super().__init__(key_name="Slow", key_combo="right alt", description="Test key")
+
+    def on_press(self) -> None:
+        pass
+
+    def on_hold(self, duration: float) -> None:
+        pass
+
+    def on_release(self, total_duration: float) -> str:
+        time.sleep(total_duration)
+        return 'released'
+
+    def echo(self, payload):
+        return {'payload': payload, 'pid': os.getpid()}
+
+    def crash(self) -> None:
+        os._exit(3)
+
+
+@pytest.fixture
+def worker():
+    worker = KeyWorker(SlowKey, name='slow', audio=False)
+    assert worker.start(wait=True)
+    yield worker
+    worker.stop()
+
+
+def test_status_answers_during_a_long_release():
+    key = IsolatedKey(SlowKey, audio=False)
+    try:
+        assert key.get_status()['worker']['state'] == 'ready'
+        results = []
+        release = threading.Thread(target=lambda: results.append(key.on_release(3.0)))
+        release.start()
+        time.sleep(0.2)
+
+        start = time.monotonic()
+        status = key.get_status()
+        assert time.monotonic() - start < 1.5  # the 0.5s status timeout, not the release
+        assert status['worker']['state'] == 'ready' and status['name'] == 'Slow'
+
+        release.join()
+        assert results == ['released']
+    finally:
+        key.shutdown()
+
+
+def test_large_payloads_go_through_shared_memory(worker):
+    payload = os.urandom(1024 * 1024)
+    reply = worker.call('echo', [payload, b'small'])
+    assert reply['payload'] == [payload, b'small']
+    assert reply['pid'] != os.getpid()
+    # one copy into the request arena, one back out of the reply arena
+    assert worker.get_status()['shared_bytes'] >= 2 * len(payload)
+
+
+def test_payloads_during_a_call_in_flight_are_pickled(worker):
+    release = threading.Thread(target=worker.call, args=('on_release', 1.0))
+    release.start()
+    time.sleep(0.2)
+    shared = worker.get_status()['shared_bytes']
+    payload = os.urandom(256 * 1024)
+    assert worker.call('echo', payload)['payload'] == payload  # queued behind the release
+    assert worker.get_status()['shared_bytes'] == shared
+    release.join()
+
+
+def test_crashed_worker_fails_pending_calls_and_restarts(worker):
+    first_pid = worker.process.pid
+    with pytest.raises(WorkerError):
+        worker.call('crash', timeout=10)
+
+    deadline = time.monotonic() + 30
+    while worker.state != 'ready' and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert worker.state == 'ready' and worker.restarts == 1
+    assert worker.process.pid != first_pid
+    assert worker.call('on_release', 0.0) == 'released'
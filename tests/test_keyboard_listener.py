@@ -0,0 +1,40 @@
+"""KeyboardListener: hotkey state and trace interactions"""
+
+from nemo.core.keyboard_listener import KeyboardListener
+from nemo.tools import NemoEngine
+from nemo.tools.tracing import Tracer
+from nemo.bench.stubs import StubKey
+
+
+def _interactions(tracer: Tracer):
+    return [(span[3], span[7]) for span in tracer.spans if span[3].startswith('interaction:')]
+
+
+def test_only_combo_keys_supersede_right_alt(fakes):
+    engine = NemoEngine()
+    for combo in ('right alt', 'right alt + left'):
+        engine.register_key(StubKey(combo))
+    listener = KeyboardListener(engine, clock=fakes.clock)
+    listener.tracer = tracer = Tracer(enabled=True)
+    listener.start()
+    emit = fakes.keyboard.emit
+    try:
+        # RIGHT ALT held while typing: still a solo RIGHT ALT interaction
+        for name, event_type in [('right alt', 'down'), ('a', 'down'), ('a', 'up'),
+                                 ('right alt', 'up')]:
+            emit(name, event_type, fakes.clock())
+        # RIGHT ALT + LEFT: the solo interaction becomes the combo
+        for name, event_type in [('right alt', 'down'), ('left', 'down'), ('right alt', 'up'),
+                                 ('left', 'up')]:
+            emit(name, event_type, fakes.clock())
+    finally:
+        listener.stop()
+        tracer.disable()
+
+    (first, first_args), (second, second_args), (third, third_args) = _interactions(tracer)
+    assert first == 'interaction:right alt' and 'superseded' not in first_args
+    assert 'hold' in first_args
+    assert second == 'interaction:right alt' and second_args['superseded'] is True
+    assert third == 'interaction:right alt + left'
+    assert engine.get_key('right alt').releases == 1
+    assert engine.get_key('right alt + left').releases == 1
@@ -0,0 +1,130 @@
+"""Histogram bucketing and percentiles, and the Prometheus endpoint"""
+
+import random
+import urllib.error
+import urllib.request
+
+import pytest
+
+from nemo.tools.metrics import MetricsRegistry, PrometheusExporter
+from nemo.tools.metrics.metrics import (BUCKET_COUNT, MAX_VALUE_BITS, SUB_BUCKETS, Histogram,
+                                        bucket_bounds, bucket_index)
+
+RELATIVE_ERROR = 1 / 16  # bucket width over its lower bound (32 sub-buckets)
+
+
+def _values(rng, count=5000):
+    """Edge cases around every power of two plus log-uniform samples"""
+    values = [0, 1, SUB_BUCKETS - 1, SUB_BUCKETS]
+    for bits in range(1, MAX_VALUE_BITS):
+        values += [(1 << bits) - 1, 1 << bits, (1 << bits) + 1]
+    values += [int(2 ** rng.uniform(0, MAX_VALUE_BITS - 0.01)) for _ in range(count)]
+    return values
+
+
+def test_buckets_tile_the_range_contiguously():
+    low, high = bucket_bounds(0)
+    assert (low, high) == (0, 0)
+    for index in range(1, BUCKET_COUNT):
+        next_low, next_high = bucket_bounds(index)
+        assert next_low == high + 1 and next_high >= next_low
+        high = next_high
+    assert high == (1 << MAX_VALUE_BITS) - 1
+
+
+def test_every_value_lands_in_a_bucket_holding_it():
+    histogram = Histogram('h')
+    for value in _values(random.Random(1)):
+        index = bucket_index(value)
+        low, high = bucket_bounds(index)
+        assert low <= value <= high
+        assert high - low <= max(0, low * RELATIVE_ERROR)
+        # record() inlines bucket_index(); they must agree
+        before = histogram.buckets[index]
+        histogram.record(value)
+        assert histogram.buckets[index] == before + 1
+
+
+def test_out_of_range_values_are_clamped():
+    histogram = Histogram('h')
+    histogram.record(-5)
+    histogram.record(1 << 50)
+    assert histogram.buckets[0] == 1 and histogram.buckets[-1] == 1
+    assert histogram.max == 1 << 50 and histogram.percentile(100) == 1 << 50
+
+
+@pytest.mark.parametrize('q', [1, 25, 50, 90, 99, 99.9, 100])
+def test_percentiles_within_bucket_error(q):
+    rng = random.Random(2)
+    samples = [int(rng.lognormvariate(13, 1.5)) for _ in range(20000)]  # ~0.4ms median
+    histogram = Histogram('h')
+    for value in samples:
+        histogram.record(value)
+
+    ordered = sorted(samples)
+    exact = ordered[max(1, int(len(ordered) * q / 100 + 0.5)) - 1]
+    estimate = histogram.percentile(q)
+    assert exact <= estimate <= exact * (1 + RELATIVE_ERROR)
+    assert histogram.count == len(samples) and histogram.total == sum(samples)
+
+
+def test_small_values_are_exact():
+    histogram = Histogram('h')
+    for value in range(1, 11):
+        histogram.record(value)
+    assert [histogram.percentile(q) for q in (10, 50, 100)] == [1, 5, 10]
+    assert histogram.to_dict()['max_ms'] == 10 / 1e6
+    assert Histogram('empty').percentile(50) == 0
+
+
+@pytest.fixture
+def exporter():
+    registry = MetricsRegistry(prefix='test_')
+    exporter = PrometheusExporter(registry, port=0)
+    exporter.start()
+    yield exporter
+    exporter.stop()
+
+
+def _get(exporter, path):
+    url = f"http://{exporter.host}:{exporter.port}{path}"
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.headers['Content-Type'], response.read().decode('utf-8')
+
+
+def test_prometheus_endpoint_serves_the_registry(exporter):
+    registry = exporter.registry
+    registry.counter('keys_total', "Keys executed", key='right "alt"').inc(3)
+    registry.counter('keys_total', "Keys executed", key='right shift').inc()
+    latency = registry.histogram('release_seconds', "Release latency")
+    for ms in range(1, 101):
+        latency.record_seconds(ms / 1000)
+
+    content_type, body = _get(exporter, '/metrics')
+    lines = body.splitlines()
+
+    assert content_type.startswith('text/plain; version=0.0.4')
+    assert lines[:4] == [
+        '# HELP test_keys_total Keys executed',
+        '# TYPE test_keys_total counter',
+        'test_keys_total{key="right \\"alt\\""} 3',
+        'test_keys_total{key="right shift"} 1',
+    ]
+    assert '# TYPE test_release_seconds summary' in lines
+    quantiles = {line.split('"')[1]: float(line.split()[-1])
+                 for line in lines if line.startswith('test_release_seconds{quantile=')}
+    assert list(quantiles) == ['0.5', '0.9', '0.99', '0.999']
+    assert quantiles['0.5'] == pytest.approx(0.050, rel=RELATIVE_ERROR)
+    assert quantiles['0.99'] == pytest.approx(0.099, rel=RELATIVE_ERROR)
+    assert 'test_release_seconds_count 100' in lines
+    sum_line = next(line for line in lines if line.startswith('test_release_seconds_sum'))
+    assert float(sum_line.split()[-1]) == pytest.approx(5.05)
+    assert body.endswith('\n')
+
+    # Served live: later updates show up on the next scrape
+    registry.counter('keys_total', key='right shift').inc()
+    assert 'test_keys_total{key="right shift"} 2' in _get(exporter, '/')[1]
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _get(exporter, '/other')
+    assert error.value.code == 404
@@ -0,0 +1,65 @@
+"""KeystrokePredictor shared between the hook thread and predictions/saves"""
+
+import sys
+import threading
+
+import pytest
+
+from nemo.keys.right_alt_right_forward.predictor import KeystrokePredictor
+
+TEXT = 'the quick brown fox jumps over the lazy dog '
+
+
+@pytest.fixture
+def fast_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_predictions_and_saves_while_typing(tmp_path, fast_switching):
+    predictor = KeystrokePredictor(table_bits=10)
+    for key in TEXT * 20:
+        predictor.update(key)
+    typed = TEXT * 200
+    done = threading.Event()
+    states = []
+
+    def type_text():
+        for key in typed:
+            predictor.update(key)
+        done.set()
+
+    def predict_and_save():
+        while not done.is_set():
+            predictor.predict_sequence(max_length=16, threshold=0.1, min_joint=0.0)
+            states.append(predictor.to_bytes())
+
+    threads = [threading.Thread(target=type_text), threading.Thread(target=predict_and_save)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # No keystroke lost to a swapped-out history, no prediction leaked in
+    assert predictor.updates == len(TEXT) * 220
+    assert [predictor.symbols[sid] for sid in predictor.snapshot_history()] == list(typed[-4:])
+    # Every save is a loadable state
+    assert states
+    for state in states[::max(1, len(states) // 20)]:
+        KeystrokePredictor.from_bytes(state)
+
+
+def test_release_does_not_print_predicted_text(tmp_path, capsys):
+    from nemo.keys.right_alt_right_forward.forward_key import ForwardKey
+
+    key = ForwardKey(state_path=str(tmp_path / 'model.bin'))
+    for position, char in enumerate('hunter2 ' * 50):
+        key.on_keystroke(char, position * 0.1)
+    capsys.readouterr()
+    text = key.on_release(0.2)
+    out = capsys.readouterr().out
+    assert len(text) > 3 and set(text) <= set('hunter2 ')
+    assert '[FORWARD] Predicted' in out
+    assert text.strip() not in out and 'hunter' not in out
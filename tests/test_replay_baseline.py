@@ -0,0 +1,46 @@
+"""Replay benchmark: committed baseline and regression tolerances"""
+
+import copy
+import json
+
+from nemo.bench.replay import BASELINE, compare
+from nemo.bench.traces import SYNTHETIC
+
+
+def _baseline():
+    with open(BASELINE) as f:
+        return json.load(f)
+
+
+def test_committed_baseline_covers_every_synthetic_trace():
+    baseline = _baseline()
+    assert set(baseline['traces']) == set(SYNTHETIC)
+    for name, trace in baseline['traces'].items():
+        assert trace['events'] == len(SYNTHETIC[name]())
+        assert trace['events_per_sec'] > 0 and trace['stages']
+
+
+def test_regressions_warn_then_fail():
+    baseline = _baseline()
+    results = list(copy.deepcopy(baseline['traces']).values())
+    assert compare(results, baseline) == ([], [])
+
+    mixed = next(r for r in results if r['trace'] == 'mixed')
+    mixed['events_per_sec'] /= 1.3  # run-to-run noise on one machine
+    failures, warnings = compare(results, baseline)
+    assert failures == [] and len(warnings) == 1
+
+    mixed['events_per_sec'] /= 2  # a real slowdown
+    mixed['stages']['screen_encode']['p99_ms'] *= 3
+    failures, warnings = compare(results, baseline)
+    assert len(failures) == 2 and warnings == []
+
+
+def test_sub_millisecond_jitter_is_not_a_regression():
+    baseline = _baseline()
+    results = list(copy.deepcopy(baseline['traces']).values())
+    for result in results:
+        for stats in result['stages'].values():
+            if stats['p99_ms'] < 0.1:
+                stats['p99_ms'] *= 4
+    assert compare(results, baseline) == ([], [])
@@ -0,0 +1,83 @@
+"""AsyncRuntime: press → release interactions driven by the keyboard listener"""
+
+import time
+
+from nemo.core.keyboard_listener import KeyboardListener
+from nemo.tools import AsyncRuntime, NemoEngine
+from nemo.tools.metrics import get_registry
+from nemo.bench.stubs import StubKey
+
+
+class HoldKey(StubKey):
+    """Records the hold duration of every release"""
+
+    def __init__(self, key_combo: str):
+        super().__init__(key_combo)
+        self.holds = []
+
+    def on_release(self, total_duration: float):
+        self.holds.append(total_duration)
+        return super().on_release(total_duration)
+
+
+def _outcome(combo: str, outcome: str) -> int:
+    return get_registry().counter('key_interactions_total', key=combo, outcome=outcome).value
+
+
+def _wait(condition, timeout: float = 5.0) -> None:
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_auto_repeat_hold_is_one_interaction(fakes):
+    runtime = AsyncRuntime()
+    engine = NemoEngine(runtime=runtime)
+    key = HoldKey('right shift')
+    engine.register_key(key)
+    listener = KeyboardListener(engine, clock=fakes.clock)
+    listener.start()
+    runtime.start()
+    completed = _outcome('right shift', 'completed')
+    superseded = _outcome('right shift', 'superseded')
+    try:
+        # 1.5 s hold; the OS repeats 'down' every 33 ms after 0.5 s
+        start = fakes.clock()
+        fakes.keyboard.emit('right shift', 'down', start)
+        repeat = start + 0.5
+        while repeat < start + 1.5:
+            fakes.clock.set(repeat)
+            fakes.keyboard.emit('right shift', 'down', repeat)
+            repeat += 0.033
+        fakes.clock.set(start + 1.5)
+        fakes.keyboard.emit('right shift', 'up', start + 1.5)
+        _wait(lambda: key.holds and not runtime.interactions)
+    finally:
+        listener.stop()
+        engine.shutdown()
+
+    assert key.presses == 1
+    assert len(key.holds) == 1 and abs(key.holds[0] - 1.5) < 1e-6
+    assert _outcome('right shift', 'completed') - completed == 1
+    assert _outcome('right shift', 'superseded') - superseded == 0
+
+
+def test_runtime_ignores_press_while_held():
+    runtime = AsyncRuntime()
+    engine = NemoEngine(runtime=runtime)
+    key = HoldKey('right alt')
+    engine.register_key(key)
+    runtime.start()
+    try:
+        engine.on_key_press('right alt')
+        engine.on_key_press('right alt')  # repeat reaching the engine directly
+        result = engine.on_key_release('right alt', 0.8)
+        assert result.result(timeout=5.0) == 1
+        # A press after the release is a new interaction
+        engine.on_key_press('right alt')
+        assert engine.on_key_release('right alt', 0.4).result(timeout=5.0) == 2
+    finally:
+        engine.shutdown()
+
+    assert key.presses == 2
+    assert key.holds == [0.8, 0.4]
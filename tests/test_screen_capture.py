@@ -0,0 +1,103 @@
+"""ScreenCapture: what gets grabbed on multi-monitor desktops (FixedLayout)"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from nemo.tools.screen_capture import FixedLayout, ScreenCapture, Window
+
+# A is left of the primary B and sits 200px higher; C is right of B
+A = (-1920, -200, 0, 880)
+B = (0, 0, 2560, 1440)
+C = (2560, 0, 4480, 1440)
+COLORS = {A: (255, 0, 0), B: (0, 255, 0), C: (0, 0, 255)}
+
+
+def _desktop(monitors):
+    """Virtual-desktop grab with each monitor filled with its color"""
+    left = min(m[0] for m in monitors)
+    top = min(m[1] for m in monitors)
+    image = Image.new('RGB', (max(m[2] for m in monitors) - left,
+                              max(m[3] for m in monitors) - top))
+    for m in monitors:
+        image.paste(COLORS[m], (m[0] - left, m[1] - top, m[2] - left, m[3] - top))
+    return image
+
+
+def _screen(monitors, window=None, **kwargs):
+    return ScreenCapture(layout=FixedLayout(monitors, window), **kwargs)
+
+
+@pytest.fixture
+def desktop(fakes):
+    """Serve a colored virtual desktop from the fake ImageGrab"""
+    frame = fakes.image_grab.frame
+
+    def install(monitors):
+        fakes.image_grab.frame = _desktop(monitors)
+        return fakes.image_grab.frame
+
+    yield install
+    fakes.image_grab.frame = frame
+
+
+def test_window_on_the_monitor_it_mostly_covers():
+    # Straddles A and B, mostly on A, and runs off the top of the desktop
+    window = Window('Editor', (-1000, -300, 500, 700))
+    name, bbox, title, focus, overview = _screen([A, B], window)._plan('window', True)
+    assert (name, title, focus) == ('window', 'Editor', A)
+    assert bbox == (-1000, -200, 500, 700)  # clipped to the desktop, not to A
+    assert overview == B
+
+
+def test_small_or_missing_window_falls_back_to_a_monitor():
+    tiny = Window('Toolbar', (2600, 100, 2750, 900))  # 150px wide
+    assert _screen([A, B, C], tiny)._plan('window', False)[:4] == ('monitor', C, None, C)
+    # No window metadata: the primary monitor (the one holding 0,0)
+    assert _screen([A, B, C])._plan('window', False)[:4] == ('monitor', B, None, B)
+    assert _screen([A, B, C])._plan('full', True) == ('full', None, None, None, None)
+    assert _screen([])._plan('window', True)[0] == 'full'
+
+
+def test_local_and_crop_use_the_virtual_desktop_origin():
+    screen = _screen([A, B, C])
+    desktop = _desktop([A, B, C])
+    assert desktop.size == (6400, 1640)
+    assert screen._local(desktop, B) == (1920, 200, 4480, 1640)
+    assert screen._local(desktop, (-5000, -5000, -1800, 0)) == (0, 0, 120, 200)
+
+    window = screen._crop(desktop, (-100, 0, 100, 50))  # across A and B
+    assert window.size == (200, 50)
+    assert window.getpixel((0, 0)) == COLORS[A] and window.getpixel((199, 49)) == COLORS[B]
+    assert screen._crop(desktop, None) is desktop
+
+
+def test_overview_leaves_out_the_focused_monitor_between_the_others(desktop):
+    desktop([A, B, C])
+    screen = _screen([A, B, C], Window('Mail', (100, 100, 1100, 900)), overview=True,
+                     overview_max_side=6400)
+    main, overview = screen.capture_views()
+
+    assert (main['name'], main['bbox'], main['size']) == ('window', (100, 100, 1100, 900),
+                                                         (1000, 800))
+    assert overview['bbox'] == (-1920, -200, 4480, 1440)
+    image = Image.open(io.BytesIO(overview['data'])).convert('RGB')
+    assert image.size == (6400, 1640)
+
+    def near(pixel, color):
+        return all(abs(p - c) < 40 for p, c in zip(pixel, color))
+
+    assert near(image.getpixel((960, 700)), COLORS[A])
+    assert near(image.getpixel((5440, 900)), COLORS[C])
+    assert near(image.getpixel((3200, 900)), (0, 0, 0))  # B blanked
+
+
+def test_overview_of_monitors_beside_the_focused_one_is_not_blanked(desktop):
+    desktop([A, B])
+    screen = _screen([A, B], Window('Mail', (100, 100, 1100, 900)), overview=True,
+                     overview_max_side=960)
+    _, overview = screen.capture_views()
+    image = Image.open(io.BytesIO(overview['data'])).convert('RGB')
+    assert overview['bbox'] == A and image.size == (960, 540)
+    assert all(abs(p - c) < 40 for p, c in zip(image.getpixel((480, 270)), COLORS[A]))
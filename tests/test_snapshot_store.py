@@ -0,0 +1,107 @@
+"""SnapshotStore, CompactionEngine and SnapshotRecorder persistence"""
+
+import os
+import time
+
+import pytest
+
+from nemo.tools.screen_capture import FixedLayout, ScreenCapture
+from nemo.tools.snapshot_store import (CompactionEngine, IOBudget, SnapshotRecorder,
+                                       SnapshotStore)
+
+
+def _fill(store, count=40):
+    """count snapshots of unique chunks; returns {id: payloads}"""
+    written = {}
+    for i in range(count):
+        chunks = [f'tile {i} {j}'.encode() * 200 for j in range(3)]
+        written[store.add_snapshot(chunks, timestamp=1000.0 + i)] = chunks
+    return written
+
+
+def test_crash_during_merge_keeps_history_readable(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path), max_segment_bytes=8 * 1024)
+    written = _fill(store)
+    for snapshot_id in list(written)[::2]:
+        store.remove_snapshot(snapshot_id)
+        del written[snapshot_id]
+    store.save()
+
+    engine = CompactionEngine(store, budget=IOBudget(bytes_per_sec=1e12),
+                              min_segment_bytes=0)
+
+    def crash():
+        raise SystemExit("crash before the manifest is saved")
+
+    monkeypatch.setattr(store, 'save', crash)
+    with pytest.raises(SystemExit):
+        engine.run_once(now=1100.0)
+
+    on_disk = len(os.listdir(tmp_path / 'segments'))
+    reopened = SnapshotStore(str(tmp_path))
+    for snapshot_id, chunks in written.items():
+        assert reopened.read_snapshot(snapshot_id) == chunks
+    # The merge targets written before the crash are reclaimed on load
+    remaining = sorted(os.listdir(tmp_path / 'segments'))
+    assert len(remaining) < on_disk
+    assert remaining == [f"seg-{seg:06d}.dat" for seg in sorted(reopened.segments)]
+
+    # A full pass on the reopened store reclaims space and keeps the data
+    report = CompactionEngine(reopened, budget=IOBudget(bytes_per_sec=1e12),
+                              min_segment_bytes=0).run_once(now=1100.0)
+    assert report['segments_merged'] > 0
+    again = SnapshotStore(str(tmp_path))
+    for snapshot_id, chunks in written.items():
+        assert again.read_snapshot(snapshot_id) == chunks
+
+
+def test_segment_ids_are_never_reused(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.new_segment()
+    second = store.new_segment()
+    store.delete_segment(second)
+    assert store.new_segment() > second
+    store.save()
+
+    reopened = SnapshotStore(str(tmp_path))
+    assert reopened.new_segment() > second + 1
+
+
+def test_new_snapshots_are_saved_without_explicit_save(tmp_path):
+    store = SnapshotStore(str(tmp_path), save_interval=0)
+    snapshot_id = store.add_snapshot([b'tile'], timestamp=5.0)
+    reopened = SnapshotStore(str(tmp_path))
+    assert reopened.read_snapshot(snapshot_id) == [b'tile']
+
+
+def test_recorder_thread_saves_a_change_within_save_interval(tmp_path, fakes):
+    store = SnapshotStore(str(tmp_path), save_interval=0.2)
+    screen = ScreenCapture(region='full', layout=FixedLayout([(0, 0, 640, 480)]))
+    recorder = SnapshotRecorder(store, screen=screen, interval=60)
+    recorder.start()
+    try:
+        snapshot_id = store.add_snapshot([b'pinned by hand'], timestamp=5.0)
+        assert SnapshotStore(str(tmp_path)).get_snapshot(snapshot_id) is None
+        deadline = time.monotonic() + 5
+        while store.save_due_in() is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        recorder.stop()
+    assert SnapshotStore(str(tmp_path)).read_snapshot(snapshot_id) == [b'pinned by hand']
+
+
+def test_recorder_chains_snapshots_and_shares_unchanged_tiles(tmp_path, fakes):
+    store = SnapshotStore(str(tmp_path))
+    screen = ScreenCapture(region='full', layout=FixedLayout([(0, 0, 1920, 1080)]))
+    recorder = SnapshotRecorder(store, screen=screen, tile_size=256)
+
+    first = recorder.capture_once(timestamp=1.0)
+    chunks = len(store.chunks)
+    encoded = recorder.tiles_encoded.value
+    second = recorder.capture_once(timestamp=2.0)
+
+    assert store.get_snapshot(second)['parent'] == first
+    assert len(store.get_snapshot(second)['chunks']) == 8 * 5  # 1920x1080 in 256px tiles
+    assert len(store.chunks) == chunks  # static screen: nothing new stored
+    assert recorder.tiles_encoded.value == encoded  # ... or encoded
+    assert not recorder.capturing
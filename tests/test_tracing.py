@@ -0,0 +1,62 @@
+"""Tracer: slow-interaction profiles sample the threads running the handlers"""
+
+import time
+
+import pytest
+
+from nemo.core.keyboard_listener import KeyboardListener
+from nemo.tools import AsyncRuntime, NemoEngine
+from nemo.tools.tracing import get_tracer
+from nemo.bench.stubs import StubKey
+
+
+def slow_work(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class SlowKey(StubKey):
+    """on_release busy for half a second"""
+
+    def on_release(self, total_duration: float):
+        slow_work(0.5)
+        return super().on_release(total_duration)
+
+
+@pytest.fixture
+def tracer():
+    tracer = get_tracer()
+    threshold = tracer.slow_threshold
+    tracer.slow_threshold = 0.2
+    tracer.clear()
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+    tracer.slow_threshold = threshold
+    tracer.clear()
+
+
+def test_slow_handler_frames_are_profiled(fakes, tracer):
+    runtime = AsyncRuntime()
+    engine = NemoEngine(runtime=runtime)
+    engine.register_key(SlowKey('right shift'))
+    listener = KeyboardListener(engine, clock=fakes.clock)
+    listener.start()
+    runtime.start()
+    try:
+        start = fakes.clock()
+        fakes.keyboard.emit('right shift', 'down', start)
+        fakes.clock.set(start + 1.0)
+        fakes.keyboard.emit('right shift', 'up', start + 1.0)
+        deadline = time.monotonic() + 5
+        while not tracer.profiles and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        listener.stop()
+        engine.shutdown()
+
+    assert len(tracer.profiles) == 1
+    stacks = tracer.profiles[0]['stacks']
+    slow = sum(count for stack, count in stacks.items() if ':slow_work:' in stack)
+    assert slow >= sum(stacks.values()) // 2
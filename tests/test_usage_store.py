@@ -0,0 +1,76 @@
+"""UsageStore: parameters learned from a replayed week of RIGHT SHIFT use"""
+
+import random
+
+from nemo.tools.usage_store import ENGINE, HOLD, UsageStore
+from nemo.tools.usage_store.store import FAILED, FALLBACK, LOW_CONFIDENCE, OK, SILENT, SPEECH
+
+KEY = 'right shift'
+ENGINES = ['google', 'sphinx', 'bing']  # STTKey.ENGINES order
+DEFAULT_MIN_HOLD = 0.3  # STTConfig.min_hold
+
+
+def _hold(rng):
+    """(seconds, speech) for one press: dictation, quick replies, taps, aborts"""
+    roll = rng.random()
+    if roll < 0.2:
+        return rng.uniform(0.04, 0.14), False  # shift tapped while typing
+    if roll < 0.25:
+        return rng.uniform(1.0, 3.0), False  # held, then nothing said
+    if roll < 0.4:
+        return rng.uniform(0.2, 0.3), True  # "yes", "ok", "send it"
+    return min(rng.lognormvariate(0.4, 0.5), 5.0), True
+
+
+def _attempt(rng, engine):
+    """(outcome, latency) of one recognizer call"""
+    if engine == 'google':  # flaky connection: times out half the time
+        return (OK, rng.uniform(0.7, 1.1)) if rng.random() < 0.5 else (FAILED, 3.0)
+    if engine == 'sphinx':  # offline: always answers, never confidently
+        return LOW_CONFIDENCE, rng.uniform(1.3, 1.8)
+    return (OK, rng.uniform(1.0, 1.4)) if rng.random() < 0.95 else (FAILED, 3.0)
+
+
+def _replay_week(store, presses=600):
+    """Record what STTKey._finish and _recognize would for each press"""
+    rng = random.Random(7)
+    store.rng = random.Random(7)
+    for press in range(presses):
+        hold, speech = _hold(rng)
+        store.record(KEY, HOLD, SPEECH if speech else SILENT, hold=hold)
+        if hold >= store.min_hold(KEY, DEFAULT_MIN_HOLD) and speech:
+            for position, engine in enumerate(store.engine_order(KEY, ENGINES)):
+                outcome, latency = _attempt(rng, engine)
+                store.record(KEY, ENGINE, outcome, latency=latency, engine=engine,
+                             flags=FALLBACK if position else 0)
+                if outcome != FAILED:
+                    break
+        if press % 10 == 9:
+            store.flush()  # background batches
+        if press == presses // 2:
+            store.rollup()  # reopening replays the rollup plus the log tail
+    store.flush()
+
+
+def test_replayed_log_learns_min_hold_and_engine_order(tmp_path):
+    root = str(tmp_path / 'usage')
+    store = UsageStore(root)
+    _replay_week(store)
+
+    for learned in (store, UsageStore(root, explore=0.0)):
+        # Taps (< 0.15s) are dropped; quick spoken replies are no longer cut
+        # off by the 0.3s default
+        assert learned.min_hold(KEY, DEFAULT_MIN_HOLD) == 0.15
+        # bing answers reliably, google is fast but times out, sphinx never
+        # gives a confident transcript
+        assert learned.engine_order(KEY, ENGINES) == ['bing', 'google', 'sphinx']
+
+
+def test_defaults_until_enough_samples(tmp_path):
+    store = UsageStore(str(tmp_path), min_samples=20)
+    for _ in range(19):
+        store.record(KEY, HOLD, SILENT, hold=0.05)
+        store.record(KEY, ENGINE, FAILED, latency=3.0, engine='google')
+    store.flush()
+    assert store.min_hold(KEY, DEFAULT_MIN_HOLD) == DEFAULT_MIN_HOLD
+    assert store.engine_order(KEY, ENGINES) == ENGINES
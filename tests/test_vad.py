@@ -0,0 +1,32 @@
+"""VoiceActivityDetector: speechless recordings never reach the recognizer"""
+
+import numpy as np
+
+from nemo.bench.vad import run, synthetic_recording
+from nemo.tools.audio_capture.vad import VoiceActivityDetector
+
+
+def test_silent_recordings_are_skipped_with_shipped_settings():
+    # Shipped STT settings: fixed threshold 300, no adaptive floor
+    rng = np.random.default_rng(0)
+    samples = [synthetic_recording(rng, speech=i % 4 != 0) for i in range(80)]
+    silent = sum(bounds is None for _, bounds in samples)
+
+    result = run(samples, energy_threshold=300, dynamic=False)
+    assert result['noise_sent_as_speech'] == 0
+    assert result['recognizer_calls_skipped'] == silent
+    assert result['speech_missed'] == 0
+
+
+def test_click_is_not_speech_but_short_pause_is():
+    vad = VoiceActivityDetector()
+    frame = vad.frame_samples
+    quiet = np.zeros(frame, dtype=np.int16)
+    click = np.full(frame, 4000, dtype=np.int16)  # loud, one frame, low ZCR
+    tone = (3000 * np.sin(np.arange(frame) * 2 * np.pi * 150 / 16000)).astype(np.int16)
+
+    pcm = np.concatenate([quiet] * 10 + [click] + [quiet] * 5 + [click] + [quiet] * 10)
+    assert not vad.smooth(vad.classify(pcm.tobytes())).any()
+
+    pcm = np.concatenate([tone] * 10 + [quiet] * 5 + [tone] * 10)
+    assert vad.smooth(vad.classify(pcm.tobytes())).all()
@@ -0,0 +1,49 @@
+"""WindowIndexer: focused-window titles reach the index in batches"""
+
+import time
+
+from nemo.tools.context_index import VectorIndex, WindowIndexer
+from nemo.tools.resource_governor import PROFILES
+from nemo.tools.screen_capture import FixedLayout, Window
+
+
+def test_title_changes_are_indexed_in_one_batch(tmp_path):
+    index = VectorIndex(str(tmp_path))
+    layout = FixedLayout([(0, 0, 1920, 1080)])
+    indexer = WindowIndexer(index, layout=layout, min_repeat=300.0)
+
+    for t, title in enumerate(['Q3 forecast.xlsx - Excel', 'Q3 forecast.xlsx - Excel',
+                               'kernel build log - Terminal', 'Q3 forecast.xlsx - Excel']):
+        layout.window = Window(title, (0, 0, 800, 600))
+        indexer.poll_once(timestamp=1000.0 + t)  # repeats and a quick return are skipped
+    layout.window = Window('Inbox - Mail', (0, 0, 800, 600))
+    indexer.poll_once(timestamp=2000.0)
+
+    assert index.count == 0  # nothing embedded on the polling path
+    assert indexer.flush() == 3
+    assert [r['text'] for r in index.records] == ['Q3 forecast.xlsx - Excel',
+                                                  'kernel build log - Terminal',
+                                                  'Inbox - Mail']
+    assert {r['source'] for r in index.records} == {'window'}
+    hit = index.search('forecast spreadsheet', k=1, source='window')[0]
+    assert hit['text'] == 'Q3 forecast.xlsx - Excel' and hit['bbox'] == [0, 0, 800, 600]
+    index.close()
+
+
+def test_titles_wait_while_background_work_is_paused(tmp_path):
+    index = VectorIndex(str(tmp_path))
+    layout = FixedLayout([(0, 0, 1920, 1080)], Window('Design doc - Editor', (0, 0, 10, 10)))
+    indexer = WindowIndexer(index, layout=layout, interval=0.01, flush_interval=0.0)
+    indexer.apply_resource_settings(PROFILES['paused'])
+    indexer.start()
+    try:
+        time.sleep(0.1)
+        assert index.count == 0 and indexer.get_status()['pending'] == 1
+        indexer.apply_resource_settings(PROFILES['balanced'])
+        deadline = time.monotonic() + 5
+        while index.count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert index.records[0]['text'] == 'Design doc - Editor'
+    finally:
+        indexer.stop()
+        index.close()